@@ -0,0 +1,5 @@
+"""
+In-process API benchmarks for CIMS Backend.
+
+See ``python -m benchmarks.run --help``.
+"""
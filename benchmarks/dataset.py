@@ -0,0 +1,92 @@
+"""
+Deterministic benchmark dataset stored in a SQLite file.
+
+Rows come from the generator in ``inject_mock_data`` with a pinned reference
+date, so a given spec always produces the same data. A dataset file is named
+after its spec and a fingerprint of the schema, and reused by later runs until
+either changes.
+"""
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+import hashlib
+import os
+import time
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from cims.database.models import Base
+from inject_mock_data import DatasetSpec, MockDataInjector
+
+DATA_DIR = Path(__file__).parent / ".data"
+REFERENCE_DATE = "2025-06-30"
+
+def benchmark_spec(candidates: int = 100_000, nominees: int = 1_000_000, customers: int = 200,
+                   projects: int = 400, headhunters: int = 20, seed: int = 42) -> DatasetSpec:
+    return replace(
+        DatasetSpec(),
+        candidates=candidates, nominees=nominees, customers=customers,
+        projects=projects, headhunters=headhunters, seed=seed, reference_date=REFERENCE_DATE,
+    )
+
+def schema_fingerprint() -> str:
+    """Short hash of the mapped tables and columns, so schema changes get a fresh dataset."""
+    schema = ";".join(
+        f"{table.name}({','.join(column.name for column in table.columns)})"
+        for table in sorted(Base.metadata.tables.values(), key=lambda table: table.name)
+    )
+    return hashlib.sha1(schema.encode()).hexdigest()[:8]
+
+def dataset_filename(spec: DatasetSpec) -> str:
+    return (
+        f"cims-s{spec.seed}-c{spec.candidates}-n{spec.nominees}-cu{spec.customers}"
+        f"-p{spec.projects}-h{spec.headhunters}-{spec.reference_date}-{schema_fingerprint()}.sqlite"
+    )
+
+class SQLiteSessionFactory:
+    """Session factory with the interface MockDataInjector and the API dependencies expect."""
+    def __init__(self, path: Path) -> None:
+        self.engine: Engine = create_engine(
+            f"sqlite:///{path}",
+            connect_args={"check_same_thread": False},
+        )
+        event.listen(self.engine, "connect", _configure_sqlite)
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+
+    def create_tables(self) -> None:
+        Base.metadata.create_all(bind=self.engine)
+
+    def get_session(self) -> Session:
+        return self.SessionLocal()
+
+def _configure_sqlite(dbapi_connection: Any, connection_record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+def build_dataset(spec: DatasetSpec, path: Path, workers: int = 1) -> None:
+    """Populate an empty SQLite file according to the spec."""
+    factory = SQLiteSessionFactory(path)
+    injector = MockDataInjector(session_factory=factory)
+    injector.create_tables()
+    injector.inject_all_data(spec, workers=workers, reuse_password_hash=True)
+    factory.engine.dispose()
+
+def ensure_dataset(spec: DatasetSpec, data_dir: Path = DATA_DIR, workers: int = os.cpu_count() or 1) -> Path:
+    """Return the dataset file for the spec, building it on first use."""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    path = data_dir / dataset_filename(spec)
+    if path.exists():
+        print(f"Reusing dataset {path}")
+        return path
+
+    start = time.perf_counter()
+    partial = path.with_suffix(".partial")
+    for leftover in data_dir.glob(partial.name + "*"):
+        leftover.unlink()
+    build_dataset(spec, partial, workers)
+    partial.rename(path)
+    print(f"Dataset ready in {time.perf_counter() - start:.1f}s")
+    return path
@@ -0,0 +1,282 @@
+"""
+Async load generator replaying a weighted mix of recruiter traffic.
+
+Usage:
+    python -m benchmarks.load --base-url http://127.0.0.1:8001 --rps 50 --concurrency 20 --duration 60
+    python -m benchmarks.load --spawn-server --candidates 20000 --nominees 200000 --rps 20
+
+Flows start on an open-loop schedule (Poisson arrivals) sized so the request
+rate matches ``--rps``; at most ``--concurrency`` flows run at once. When the
+server cannot keep up, flows wait for a free slot and the wait is reported as
+schedule lag rather than hidden. With ``--spawn-server`` a local uvicorn over
+the SQLite stand-in from ``benchmarks.serve`` is started for the run.
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.report import summarize
+from benchmarks.serve import add_dataset_arguments
+
+DEFAULT_PASSWORD = "password123"  # Password of every headhunter created by inject_mock_data
+NOMINEE_STATUSES = ["DECU", "PHONGVAN", "THUONGLUONG", "THUVIEC", "TUCHOI", "KYHOPDONG"]
+SEARCH_TERMS = ["Nguyen", "John", "Smith", "Anna", "Lee", "Maria", "David"]
+PROJECT_TERMS = ["Development", "Data", "Management", "Cloud", "Sales", "Design"]
+
+@dataclass
+class Recorder:
+    """Collects per-request outcomes keyed by request name."""
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    errors: Counter[str] = field(default_factory=Counter)
+    statuses: Counter[str] = field(default_factory=Counter)
+    schedule_lag: list[float] = field(default_factory=list)
+
+    async def request(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs: Any) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.latencies.setdefault(name, []).append(time.perf_counter() - start)
+            self.errors[name] += 1
+            self.statuses[type(e).__name__] += 1
+            return None
+
+        self.latencies.setdefault(name, []).append(time.perf_counter() - start)
+        self.statuses[str(response.status_code)] += 1
+        if response.status_code >= 400:
+            self.errors[name] += 1
+        return response
+
+@dataclass
+class Context:
+    """Identifiers discovered from the target before the run."""
+    emails: list[str]
+    nominee_count: int
+    candidate_pages: int
+
+FlowFn = Callable[[httpx.AsyncClient, Recorder, Context, random.Random], Awaitable[None]]
+
+@dataclass
+class Flow:
+    name: str
+    weight: float
+    requests: float  # Average requests per flow, used to turn --rps into a flow arrival rate
+    run: FlowFn
+
+async def login_and_me(client: httpx.AsyncClient, recorder: Recorder, context: Context, rng: random.Random) -> None:
+    response = await recorder.request(
+        client, "auth_login", "POST", "/api/v1/auth/login",
+        data={"username": rng.choice(context.emails), "password": DEFAULT_PASSWORD},
+    )
+    if response is None or response.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+    for _ in range(rng.randint(3, 6)):
+        await recorder.request(client, "auth_me", "GET", "/api/v1/auth/me", headers=headers)
+
+async def browse_candidates(client: httpx.AsyncClient, recorder: Recorder, context: Context, rng: random.Random) -> None:
+    page = rng.randint(1, context.candidate_pages)
+    for offset in range(rng.randint(2, 4)):
+        await recorder.request(
+            client, "candidates_list", "GET", "/api/v1/candidates/",
+            params={"page": min(page + offset, context.candidate_pages), "page_size": 20},
+        )
+
+async def search_candidates(client: httpx.AsyncClient, recorder: Recorder, context: Context, rng: random.Random) -> None:
+    params: dict[str, Any] = {"expertise_id": rng.randint(1, 15)}
+    if rng.random() < 0.5:
+        params["query"] = rng.choice(SEARCH_TERMS)
+    if rng.random() < 0.3:
+        params["area_id"] = rng.randint(1, 10)
+    await recorder.request(client, "candidates_search", "GET", "/api/v1/candidates/search", params=params)
+
+async def update_nominee_status(client: httpx.AsyncClient, recorder: Recorder, context: Context, rng: random.Random) -> None:
+    nominee_id = rng.randint(1, max(context.nominee_count, 1))
+    await recorder.request(
+        client, "nominee_status_update", "PUT", f"/api/v1/nominees/{nominee_id}",
+        json={"status": rng.choice(NOMINEE_STATUSES)},
+    )
+
+async def search_projects(client: httpx.AsyncClient, recorder: Recorder, context: Context, rng: random.Random) -> None:
+    await recorder.request(
+        client, "projects_search", "GET", "/api/v1/projects/search",
+        params={"query": rng.choice(PROJECT_TERMS), "page": rng.randint(1, 3)},
+    )
+
+TRAFFIC_MIX = [
+    Flow("login_and_me", weight=0.10, requests=5.5, run=login_and_me),
+    Flow("browse_candidates", weight=0.35, requests=3.0, run=browse_candidates),
+    Flow("search_candidates", weight=0.25, requests=1.0, run=search_candidates),
+    Flow("update_nominee_status", weight=0.10, requests=1.0, run=update_nominee_status),
+    Flow("search_projects", weight=0.20, requests=1.0, run=search_projects),
+]
+
+async def discover_context(client: httpx.AsyncClient) -> Context:
+    headhunters = (await client.get("/api/v1/headhunters/", params={"page_size": 50})).raise_for_status().json()
+    nominees = (await client.get("/api/v1/nominees/", params={"page_size": 1})).raise_for_status().json()
+    candidates = (await client.get("/api/v1/candidates/", params={"page_size": 20})).raise_for_status().json()
+    return Context(
+        emails=[headhunter["email"] for headhunter in headhunters["data"]],
+        nominee_count=nominees["pagination"]["total"],
+        candidate_pages=max(1, min(candidates["pagination"]["total_pages"], 500)),
+    )
+
+async def generate_load(
+    base_url: str,
+    rps: float,
+    concurrency: int,
+    duration: float,
+    seed: int,
+    mix: list[Flow] = TRAFFIC_MIX,
+    timeout: float = 30.0,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> dict[str, Any]:
+    """
+    Run the traffic mix for duration seconds and summarize the outcome.
+
+    Nominee status updates are real writes, so they change the target's data.
+    """
+    rng = random.Random(seed)
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    total_weight = sum(flow.weight for flow in mix)
+    requests_per_flow = sum(flow.weight * flow.requests for flow in mix) / total_weight
+    flow_rate = rps / requests_per_flow
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout, transport=transport) as client:
+        context = await discover_context(client)
+        slots = asyncio.Semaphore(concurrency)
+        flow_counts: Counter[str] = Counter()
+        tasks: set[asyncio.Task[None]] = set()
+
+        async def run_flow(flow: Flow, scheduled: float, flow_rng: random.Random) -> None:
+            async with slots:
+                recorder.schedule_lag.append(max(0.0, time.perf_counter() - scheduled))
+                await flow.run(client, recorder, context, flow_rng)
+
+        started = time.perf_counter()
+        next_start = started
+        while next_start < started + duration:
+            delay = next_start - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            flow = rng.choices(mix, weights=[flow.weight for flow in mix])[0]
+            flow_counts[flow.name] += 1
+            task = asyncio.create_task(run_flow(flow, next_start, random.Random(rng.random())))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            next_start += rng.expovariate(flow_rate)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    all_latencies = [latency for values in recorder.latencies.values() for latency in values]
+    total_errors = sum(recorder.errors.values())
+    overall = summarize(all_latencies, total_errors, elapsed)
+    return {
+        "meta": {
+            "base_url": base_url,
+            "target_rps": rps,
+            "concurrency": concurrency,
+            "duration_seconds": duration,
+            "seed": seed,
+            "flows": dict(flow_counts),
+        },
+        "overall": {
+            **overall,
+            "error_rate": round(total_errors / len(all_latencies), 4) if all_latencies else 0.0,
+            "schedule_lag_p95_ms": summarize(recorder.schedule_lag, 0, 1.0)["p95_ms"],
+        },
+        "statuses": dict(recorder.statuses),
+        "scenarios": {
+            name: summarize(values, recorder.errors[name], elapsed)
+            for name, values in sorted(recorder.latencies.items())
+        },
+    }
+
+def format_load_results(results: dict[str, Any]) -> str:
+    overall = results["overall"]
+    lines = [
+        f"{'request':<24} {'count':>7} {'errors':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    ]
+    for name, result in list(results["scenarios"].items()) + [("overall", overall)]:
+        lines.append(
+            f"{name:<24} {result['requests']:>7} {result['errors']:>6} {result['throughput_rps']:>8.1f} "
+            f"{result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['max_ms']:>9.2f}"
+        )
+    lines.append(
+        f"error rate {overall['error_rate']:.2%}, target {results['meta']['target_rps']} rps, "
+        f"schedule lag p95 {overall['schedule_lag_p95_ms']:.1f} ms, statuses {results['statuses']}"
+    )
+    return "\n".join(lines)
+
+def _spawn_server(args: argparse.Namespace) -> subprocess.Popen[bytes]:
+    command = [
+        sys.executable, "-m", "benchmarks.serve", "--port", str(args.port),
+        "--candidates", str(args.candidates), "--nominees", str(args.nominees),
+        "--customers", str(args.customers), "--projects", str(args.projects),
+        "--headhunters", str(args.headhunters), "--seed", str(args.seed), "--data-dir", str(args.data_dir),
+    ]
+    server = subprocess.Popen(command)
+    base_url = f"http://127.0.0.1:{args.port}"
+    # Building a large dataset on first use can take minutes
+    deadline = time.monotonic() + args.server_timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with status {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health/live", timeout=1.0).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError("Server did not become ready in time")
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a weighted mix of CIMS traffic against a running instance")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8001")
+    parser.add_argument("--rps", type=float, default=20.0, help="Target requests per second")
+    parser.add_argument("--concurrency", type=int, default=10, help="Maximum flows in flight")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of flow arrivals")
+    parser.add_argument("--load-seed", type=int, default=1, help="Seed for the traffic schedule and parameters")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    parser.add_argument("--spawn-server", action="store_true", help="Start benchmarks.serve on --port for the run")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--server-timeout", type=float, default=900.0)
+    add_dataset_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.base_url
+    if args.spawn_server:
+        server = _spawn_server(args)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        results = asyncio.run(generate_load(base_url, args.rps, args.concurrency, args.duration, args.load_seed))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    print(format_load_results(results))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Latency summaries and run-to-run comparison for benchmark results.
+
+Usage:
+    python -m benchmarks.report BASELINE.json CURRENT.json [--metric p95_ms] [--tolerance 0.10]
+
+Exits with status 1 when any scenario regressed by more than the tolerance.
+"""
+from typing import Any, Sequence
+import argparse
+import json
+import sys
+
+# Metrics where a higher value is a regression
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms", "mean_ms")
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile of already sorted values, q in [0, 100]."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def summarize(latencies: Sequence[float], errors: int, elapsed: float) -> dict[str, Any]:
+    """Summarize per-request latencies in seconds measured over elapsed wall time."""
+    values = sorted(latency * 1000 for latency in latencies)
+    requests = len(values)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 2) if elapsed > 0 else 0.0,
+        "mean_ms": round(sum(values) / requests, 3) if requests else 0.0,
+        "min_ms": round(values[0], 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(values[-1], 3) if values else 0.0,
+    }
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    metric: str = "p95_ms",
+    tolerance: float = 0.10
+) -> list[dict[str, Any]]:
+    """
+    Compare scenarios present in both runs.
+
+    A scenario regresses when its metric grew by more than ``tolerance`` (a
+    fraction) or when it reported errors that the baseline did not.
+    """
+    rows = []
+    for name, result in current["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if previous is None:
+            continue
+        before, after = previous[metric], result[metric]
+        change = (after - before) / before if before else 0.0
+        rows.append({
+            "scenario": name,
+            "baseline": before,
+            "current": after,
+            "change": round(change, 4),
+            "regressed": change > tolerance or (result["errors"] > 0 and previous["errors"] == 0),
+        })
+    return rows
+
+def format_comparison(rows: list[dict[str, Any]], metric: str) -> str:
+    lines = [f"{'scenario':<24} {'baseline ' + metric:>18} {'current ' + metric:>18} {'change':>9}"]
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        lines.append(
+            f"{row['scenario']:<24} {row['baseline']:>18.3f} {row['current']:>18.3f} {row['change']:>+9.1%}{flag}"
+        )
+    return "\n".join(lines)
+
+def format_results(results: dict[str, Any]) -> str:
+    lines = [f"{'scenario':<24} {'requests':>8} {'errors':>6} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"]
+    for name, result in results["scenarios"].items():
+        lines.append(
+            f"{name:<24} {result['requests']:>8} {result['errors']:>6} {result['throughput_rps']:>9.1f} "
+            f"{result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f}"
+        )
+    return "\n".join(lines)
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--metric", default="p95_ms", choices=LATENCY_METRICS)
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative slowdown, e.g. 0.10 for 10%%")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, args.metric, args.tolerance)
+    print(format_comparison(rows, args.metric))
+    return 1 if any(row["regressed"] for row in rows) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+Run the API benchmark suite in-process against a seeded SQLite dataset.
+
+Usage:
+    python -m benchmarks.run [--candidates 100000] [--nominees 1000000] [--requests 200]
+                             [--output results.json] [--baseline previous.json]
+
+Each scenario issues requests sequentially through ``TestClient``, so results
+measure per-request cost of the application code and queries without network
+or server overhead. The first run builds the dataset (see
+``benchmarks.dataset``); later runs with the same parameters reuse it.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")  # Per-request log lines would dominate the measurements
+
+from fastapi.testclient import TestClient
+from httpx import Response
+from sqlalchemy import func, select
+import sqlalchemy
+
+from benchmarks.dataset import SQLiteSessionFactory
+from benchmarks.serve import add_dataset_arguments, create_benchmark_app, dataset_from_arguments
+from benchmarks.report import compare, format_comparison, format_results, summarize
+from cims.database.models import CandidateDB, HeadhunterDB, NomineeDB
+
+DEFAULT_PASSWORD = "password123"  # Password of every headhunter created by MockDataInjector
+
+@dataclass
+class Scenario:
+    name: str
+    request: Callable[[TestClient, random.Random], Response]
+    # Share of --requests issued for this scenario; bcrypt-bound scenarios run fewer
+    share: float = 1.0
+
+def _load_context(factory: SQLiteSessionFactory) -> dict[str, Any]:
+    """Pick request parameters that hit populated data."""
+    with factory.get_session() as session:
+        busiest_projects = list(session.scalars(
+            select(NomineeDB.project_id)
+            .group_by(NomineeDB.project_id)
+            .order_by(func.count().desc(), NomineeDB.project_id)
+            .limit(10)
+        ))
+        names = list(session.scalars(select(CandidateDB.name).order_by(CandidateDB.candidate_id).limit(50)))
+        email = session.scalars(select(HeadhunterDB.email).order_by(HeadhunterDB.headhunter_id).limit(1)).one()
+        candidate_count = session.scalar(select(func.count()).select_from(CandidateDB)) or 0
+
+    return {
+        "project_ids": busiest_projects,
+        "surnames": sorted({name.split()[-1] for name in names}),
+        "email": email,
+        "candidate_pages": max(1, min(candidate_count // 20, 500)),
+    }
+
+def build_scenarios(context: dict[str, Any], token: str) -> list[Scenario]:
+    auth = {"Authorization": f"Bearer {token}"}
+    return [
+        Scenario("candidates_list", lambda client, rng: client.get(
+            "/api/v1/candidates/", params={"page": rng.randint(1, context["candidate_pages"]), "page_size": 20}
+        )),
+        Scenario("candidates_search", lambda client, rng: client.get(
+            "/api/v1/candidates/search", params={"query": rng.choice(context["surnames"])}
+        )),
+        Scenario("projects_search", lambda client, rng: client.get(
+            "/api/v1/projects/search", params={"query": rng.choice(["Development", "Data", "Corp", "Management"])}
+        )),
+        Scenario("nominees_by_project", lambda client, rng: client.get(
+            f"/api/v1/nominees/by-project/{rng.choice(context['project_ids'])}", params={"page": rng.randint(1, 5)}
+        )),
+        Scenario("project_matches", lambda client, rng: client.get(
+            f"/api/v1/projects/{rng.choice(context['project_ids'])}/matches", params={"limit": 20}
+        )),
+        Scenario("analytics_funnel", lambda client, rng: client.get(
+            "/api/v1/analytics/funnel", params=rng.choice([{}, {"project_id": rng.choice(context["project_ids"])}])
+        )),
+        Scenario("analytics_leaderboard", lambda client, rng: client.get(
+            "/api/v1/analytics/leaderboard", params={"period": rng.choice(["week", "month", "quarter"]), "start": "2020-01-01"}
+        )),
+        Scenario("analytics_salaries", lambda client, rng: client.get(
+            "/api/v1/analytics/salaries", params={"group_by": rng.choice([["expertise"], ["expertise", "level", "area"]])}
+        )),
+        Scenario("auth_login", lambda client, rng: client.post(
+            "/api/v1/auth/login", data={"username": context["email"], "password": DEFAULT_PASSWORD}
+        ), share=0.1),
+        Scenario("auth_me", lambda client, rng: client.get("/api/v1/auth/me", headers=auth)),
+    ]
+
+def create_client(factory: SQLiteSessionFactory) -> TestClient:
+    # Not used as a context manager, so no lifespan events run
+    return TestClient(create_benchmark_app(factory))
+
+def run_scenario(client: TestClient, scenario: Scenario, requests: int, warmup: int, seed: int) -> dict[str, Any]:
+    rng = random.Random(f"{seed}:{scenario.name}")
+    for _ in range(warmup):
+        scenario.request(client, rng)
+
+    latencies: list[float] = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = scenario.request(client, rng)
+        latencies.append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            errors += 1
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark hot API endpoints in-process")
+    add_dataset_arguments(parser)
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per scenario")
+    parser.add_argument("--scenarios", help="Comma-separated subset of scenarios to run")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    parser.add_argument("--baseline", type=Path, help="Compare against a previous results file")
+    parser.add_argument("--metric", default="p95_ms")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    factory = dataset_from_arguments(args)
+    context = _load_context(factory)
+    client = create_client(factory)
+
+    login = client.post("/api/v1/auth/login", data={"username": context["email"], "password": DEFAULT_PASSWORD})
+    login.raise_for_status()
+    token = login.json()["data"]["access_token"]
+
+    scenarios = build_scenarios(context, token)
+    if args.scenarios:
+        selected = set(args.scenarios.split(","))
+        scenarios = [scenario for scenario in scenarios if scenario.name in selected]
+
+    results: dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "dataset": {name: getattr(args, name) for name in ("candidates", "nominees", "customers", "projects", "headhunters", "seed")},
+            "requests": args.requests,
+            "warmup": args.warmup,
+        },
+        "scenarios": {},
+    }
+    for scenario in scenarios:
+        requests = max(1, int(args.requests * scenario.share))
+        warmup = max(1, int(args.warmup * scenario.share))
+        results["scenarios"][scenario.name] = run_scenario(client, scenario, requests, warmup, args.seed)
+
+    print(format_results(results))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        rows = compare(baseline, results, args.metric, args.tolerance)
+        print(format_comparison(rows, args.metric))
+        if any(row["regressed"] for row in rows):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
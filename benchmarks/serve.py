@@ -0,0 +1,71 @@
+"""
+Serve the API with uvicorn on top of a seeded SQLite dataset.
+
+Usage:
+    python -m benchmarks.serve [--candidates 100000] [--nominees 1000000] [--port 8001]
+
+A stand-in for a PostgreSQL-backed deployment when generating load locally
+(see ``benchmarks.load``). The dataset is built on first use.
+"""
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Generator
+import argparse
+import os
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")  # Per-request log lines would dominate the measurements
+
+from fastapi import FastAPI
+from sqlalchemy.orm import Session
+import uvicorn
+
+from benchmarks.dataset import DATA_DIR, SQLiteSessionFactory, benchmark_spec, ensure_dataset
+from cims.deps import get_db_engine, get_db_session
+
+@asynccontextmanager
+async def _no_lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # The dataset already has its tables; the regular lifespan would connect to PostgreSQL
+    yield
+
+def create_benchmark_app(factory: SQLiteSessionFactory) -> FastAPI:
+    """The production app with its database dependencies pointed at the SQLite dataset."""
+    from cims.main import app
+
+    def override_get_db() -> Generator[Session, None, None]:
+        session = factory.get_session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db_session] = override_get_db
+    app.dependency_overrides[get_db_engine] = lambda: factory.engine
+    app.router.lifespan_context = _no_lifespan
+    return app
+
+def add_dataset_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = benchmark_spec()
+    parser.add_argument("--candidates", type=int, default=defaults.candidates)
+    parser.add_argument("--nominees", type=int, default=defaults.nominees)
+    parser.add_argument("--customers", type=int, default=defaults.customers)
+    parser.add_argument("--projects", type=int, default=defaults.projects)
+    parser.add_argument("--headhunters", type=int, default=defaults.headhunters)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+
+def dataset_from_arguments(args: argparse.Namespace) -> SQLiteSessionFactory:
+    spec = benchmark_spec(args.candidates, args.nominees, args.customers, args.projects, args.headhunters, args.seed)
+    return SQLiteSessionFactory(ensure_dataset(spec, args.data_dir))
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the API over a seeded SQLite dataset")
+    add_dataset_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args(argv)
+
+    app = create_benchmark_app(dataset_from_arguments(args))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -2,52 +2,368 @@
 """
 Mock Data Injection Script for CIMS Backend Database
 
-This script creates and injects mock data into the PostgreSQL database:
+This script creates and injects mock data into the PostgreSQL database.
+By default it creates:
 - 10 Headhunters
 - 70 Candidates (with 30 of them being nominees)
-- 20 Customers
-- Supporting data for areas, fields, expertises, levels, and projects
+- 20 Customers and 40 projects
+- Supporting data for areas, fields, expertises and levels
+
+Counts scale with --scale (or per-table flags), output is deterministic for a
+given --seed, rows are generated in parallel worker processes and inserted with
+COPY on PostgreSQL (multi-row INSERTs elsewhere). Generated datasets can be
+written to CSV files and reloaded later without regenerating.
 
 Usage:
     python inject_mock_data.py
+    python inject_mock_data.py --scale 1000 --seed 7 --workers 8 --reuse-password-hash
+    python inject_mock_data.py --scale 1000 --write-dataset datasets/large --no-db
+    python inject_mock_data.py --load-dataset datasets/large
 """
 
+import argparse
+import csv
+import datetime
+import io
+import json
 import os
 import sys
 import random
-from typing import List
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional
 from faker import Faker
+from sqlalchemy import Table, insert, text
 from sqlalchemy.orm import Session
 
-# Add the app directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
-
 from cims.database.session import PostgresSessionFactory
 from cims.database.models import (
-    CandidateDB, ProjectDB, NomineeDB, CustomerDB, 
-    HeadhunterDB, LevelDB, ExpertiseDB, FieldDB, AreaDB
+    CandidateDB, ProjectDB, NomineeDB, CustomerDB,
+    HeadhunterDB, LevelDB, ExpertiseDB, FieldDB, AreaDB, ProjectPipelineSummaryDB, HeadhunterDailyStatsDB,
+    CandidateDuplicateKeysDB, OutboxMessageDB
 )
+from cims.integrations.sqlalchemy.project_summary import refresh_project_summaries
+from cims.integrations.sqlalchemy.headhunter_stats import refresh_headhunter_daily_stats
+from cims.integrations.sqlalchemy.candidate_dedup import refresh_candidate_duplicate_keys
 from cims.config import settings
 import bcrypt
 
-# Initialize Faker
-fake = Faker()
+DEFAULT_PASSWORD = "password123"
+CHUNK_SIZE = 5_000  # Rows per generation task; fixed so output does not depend on the worker count
+
+AREAS = [
+    "North America", "Europe", "Asia Pacific", "Latin America",
+    "Middle East", "Africa", "Southeast Asia", "Eastern Europe",
+    "Central America", "Oceania"
+]
+FIELDS = [
+    "Technology", "Healthcare", "Finance", "Education", "Manufacturing",
+    "Retail", "Consulting", "Media", "Real Estate", "Transportation",
+    "Energy", "Telecommunications"
+]
+EXPERTISES = [
+    "Software Development", "Data Science", "Project Management",
+    "Digital Marketing", "Financial Analysis", "HR Management",
+    "Sales", "Operations", "Quality Assurance", "DevOps",
+    "UI/UX Design", "Business Analysis", "Cybersecurity",
+    "Cloud Architecture", "Mobile Development"
+]
+LEVELS = [
+    "Entry Level", "Junior", "Mid-Level", "Senior",
+    "Lead", "Principal", "Director", "VP", "C-Level"
+]
+HEADHUNTER_ROLES = ["Senior Recruiter", "Lead Headhunter", "Talent Acquisition Manager",
+                    "Executive Recruiter", "Technical Recruiter"]
+COMPANY_TYPES = ["Corp", "Inc", "LLC", "Ltd", "Technologies", "Solutions",
+                 "Systems", "Group", "Enterprises", "Industries"]
+PROJECT_TYPES = ["CODINH", "THOIVU"]
+PROJECT_STATUSES = ["TIMKIEMUNGVIEN", "UNGVIENPHONGVAN", "UNGVIENTHUVIEC", "TAMNGUNG", "HUY", "HOANTHANH"]
+CURRENCIES = ["USD", "EUR", "GBP", "CAD", "AUD"]
+GENDERS = ["NAM", "NU", "KHAC"]
+EDUCATION_LEVELS = [
+    "Bachelor's in Computer Science", "Master's in Business Administration",
+    "Bachelor's in Engineering", "Master's in Data Science",
+    "PhD in Computer Science", "Bachelor's in Marketing",
+    "Master's in Finance", "Bachelor's in Psychology",
+    "Master's in Project Management", "Bachelor's in Economics"
+]
+SOURCES = [
+    "LinkedIn", "Indeed", "Company Website", "Referral",
+    "Job Fair", "University Career Center", "Recruitment Agency",
+    "Professional Network", "Social Media", "Direct Application"
+]
+NOMINEE_STATUSES = ["DECU", "PHONGVAN", "THUONGLUONG", "THUVIEC", "TUCHOI", "KYHOPDONG"]
+CAMPAIGNS = [
+    "Q1 Hiring Drive", "Tech Talent Search", "Senior Leadership Hunt",
+    "Graduate Recruitment", "Expert Acquisition", "Rapid Hiring",
+    "Strategic Placement", "Executive Search", "Skill-specific Hunt"
+]
+
+# Insert order respects foreign keys; clearing runs in reverse
+MODELS = [AreaDB, FieldDB, ExpertiseDB, LevelDB, HeadhunterDB, CustomerDB, ProjectDB, CandidateDB, NomineeDB]
+# Tables computed from the generated ones; cleared with them and rebuilt after loading
+DERIVED_MODELS = [ProjectPipelineSummaryDB, HeadhunterDailyStatsDB, CandidateDuplicateKeysDB]
+# Pending work about the cleared rows; cleared with them
+QUEUE_MODELS = [OutboxMessageDB]
+LOOKUPS = {"areas": AREAS, "fields": FIELDS, "expertises": EXPERTISES, "levels": LEVELS}
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Row counts and seed of a generated dataset"""
+    headhunters: int = 10
+    customers: int = 20
+    projects: int = 40
+    candidates: int = 70
+    nominees: int = 30
+    seed: int = 42
+    # Timestamps are spread over the year before this date; fixed, so a seed always gives the same rows
+    reference_date: str = "2025-06-30"
+
+    @classmethod
+    def scaled(cls, scale: float, **overrides: Any) -> "DatasetSpec":
+        """Multiply the default counts by scale; explicit counts in overrides win"""
+        base = cls()
+        counts = {
+            name: max(1, round(getattr(base, name) * scale))
+            for name in ("headhunters", "customers", "projects", "candidates", "nominees")
+        }
+        counts.update({name: value for name, value in overrides.items() if value is not None})
+        return replace(base, **counts)
+
+    def count(self, table_name: str) -> int:
+        if table_name in LOOKUPS:
+            return len(LOOKUPS[table_name])
+        return getattr(self, table_name)
+
+def hash_password(password: str) -> str:
+    """Hash password using bcrypt"""
+    salt = bcrypt.gensalt()
+    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
+    return hashed.decode('utf-8')
+
+# Row builders. Primary keys are assigned here (1..N per table) so rows of
+# different tables can be generated independently and in parallel.
+
+def _timestamps(rng: random.Random, spec: DatasetSpec) -> dict[str, datetime.datetime]:
+    reference = datetime.datetime.fromisoformat(spec.reference_date).replace(tzinfo=datetime.timezone.utc)
+    created_at = reference - datetime.timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+    return {"created_at": created_at, "updated_at": created_at}
+
+def _unique_email(fake: Faker, row_id: int) -> str:
+    # Faker repeats addresses at scale; the row id keeps login emails unique
+    return f"{fake.user_name()}{row_id}@{fake.free_email_domain()}"[:60]
+
+def _headhunter_row(row_id: int, rng: random.Random, fake: Faker, spec: DatasetSpec, password_hash: Optional[str]) -> dict[str, Any]:
+    return {
+        "headhunter_id": row_id,
+        "name": fake.name()[:40],
+        "phone": fake.phone_number()[:15],
+        "email": _unique_email(fake, row_id),
+        "address": fake.address()[:120],
+        "hashed_password": password_hash or hash_password(DEFAULT_PASSWORD),
+        "role": rng.choice(HEADHUNTER_ROLES),
+        "area_id": rng.randint(1, len(AREAS)),
+        **_timestamps(rng, spec),
+    }
+
+def _customer_row(row_id: int, rng: random.Random, fake: Faker, spec: DatasetSpec, password_hash: Optional[str]) -> dict[str, Any]:
+    return {
+        "customer_id": row_id,
+        "name": f"{fake.company().split()[0]} {rng.choice(COMPANY_TYPES)}"[:60],
+        "field_id": rng.randint(1, len(FIELDS)),
+        "representative_name": fake.name()[:40],
+        "representative_phone": fake.phone_number()[:15],
+        "representative_email": fake.email()[:60],
+        "representative_role": rng.choice(["Manager", "Director", "VP", "Executive"]),
+        **_timestamps(rng, spec),
+    }
+
+def _project_row(row_id: int, rng: random.Random, fake: Faker, spec: DatasetSpec, password_hash: Optional[str]) -> dict[str, Any]:
+    reference = datetime.date.fromisoformat(spec.reference_date)
+    start_date = reference - datetime.timedelta(days=rng.randint(0, 365))
+    end_date = start_date + datetime.timedelta(days=rng.randint(0, 365))
+    expertise_id = rng.randint(1, len(EXPERTISES))
+    customer_id = rng.randint(1, spec.customers)
+    return {
+        "project_id": row_id,
+        "name": f"[Customer {customer_id}] {EXPERTISES[expertise_id - 1]}",
+        "start_date": start_date,
+        "end_date": end_date,
+        "budget": round(rng.uniform(50000, 500000), 2),
+        "budget_currency": rng.choice(CURRENCIES),
+        "type": rng.choice(PROJECT_TYPES),
+        "required_recruits": rng.randint(1, 10),
+        "recruited": rng.randint(0, 10),
+        "status": rng.choice(PROJECT_STATUSES),
+        "customer_id": customer_id,
+        "expertise_id": expertise_id,
+        "area_id": rng.randint(1, len(AREAS)),
+        "level_id": rng.randint(1, len(LEVELS)),
+        **_timestamps(rng, spec),
+    }
+
+def _candidate_row(row_id: int, rng: random.Random, fake: Faker, spec: DatasetSpec, password_hash: Optional[str]) -> dict[str, Any]:
+    return {
+        "candidate_id": row_id,
+        "name": fake.name()[:40],
+        "phone": fake.phone_number()[:15],
+        "email": _unique_email(fake, row_id),
+        "year_of_birth": rng.randint(1970, 2000),
+        "gender": rng.choice(GENDERS),
+        "education": rng.choice(EDUCATION_LEVELS),
+        "source": rng.choice(SOURCES),
+        "expertise_id": rng.randint(1, len(EXPERTISES)),
+        "field_id": rng.randint(1, len(FIELDS)),
+        "area_id": rng.randint(1, len(AREAS)),
+        "level_id": rng.randint(1, len(LEVELS)),
+        "headhunter_id": rng.randint(1, spec.headhunters),
+        "note": fake.text(max_nb_chars=200) if rng.random() < 0.5 else None,
+        **_timestamps(rng, spec),
+    }
+
+def _nominee_candidate_id(row_id: int, rng: random.Random, spec: DatasetSpec) -> int:
+    if spec.nominees > spec.candidates:
+        return rng.randint(1, spec.candidates)
+    # Fewer nominees than candidates: spread rows over distinct candidates with a
+    # fixed permutation of 1..N, so no candidate is nominated twice
+    stride = 7919  # prime; skipped when it divides the candidate count
+    if spec.candidates % stride == 0:
+        stride = 104729
+    return (row_id * stride) % spec.candidates + 1
+
+def _nominee_row(row_id: int, rng: random.Random, fake: Faker, spec: DatasetSpec, password_hash: Optional[str]) -> dict[str, Any]:
+    return {
+        "nominee_id": row_id,
+        "campaign": rng.choice(CAMPAIGNS),
+        "status": rng.choice(NOMINEE_STATUSES),
+        "years_of_experience": rng.randint(0, 20),
+        "salary_expectation": round(rng.uniform(40000, 200000), 2),
+        "notice_period": rng.randint(0, 90),  # days
+        "candidate_id": _nominee_candidate_id(row_id, rng, spec),
+        "project_id": rng.randint(1, spec.projects),
+        **_timestamps(rng, spec),
+    }
+
+ROW_BUILDERS: dict[str, Callable[[int, random.Random, Faker, DatasetSpec, Optional[str]], dict[str, Any]]] = {
+    "headhunters": _headhunter_row,
+    "customers": _customer_row,
+    "projects": _project_row,
+    "candidates": _candidate_row,
+    "nominees": _nominee_row,
+}
+
+def generate_chunk(task: tuple[str, DatasetSpec, int, Optional[str]]) -> list[dict[str, Any]]:
+    """
+    Generate one chunk of rows for a table.
+
+    Each chunk has its own generators seeded from (seed, table, chunk), so the
+    rows are identical whichever process builds them.
+    """
+    table_name, spec, chunk_index, password_hash = task
+    seed = f"{spec.seed}:{table_name}:{chunk_index}"
+    rng = random.Random(seed)
+    fake = Faker()
+    fake.seed_instance(seed)
+
+    build = ROW_BUILDERS[table_name]
+    first_id = chunk_index * CHUNK_SIZE + 1
+    last_id = min(first_id + CHUNK_SIZE - 1, spec.count(table_name))
+    return [build(row_id, rng, fake, spec, password_hash) for row_id in range(first_id, last_id + 1)]
+
+def _lookup_rows(table_name: str, spec: DatasetSpec) -> list[dict[str, Any]]:
+    primary_key = next(model for model in MODELS if model.__tablename__ == table_name).__mapper__.primary_key[0].key
+    reference = datetime.datetime.fromisoformat(spec.reference_date).replace(tzinfo=datetime.timezone.utc)
+    return [
+        {primary_key: row_id, "name": name, "created_at": reference, "updated_at": reference}
+        for row_id, name in enumerate(LOOKUPS[table_name], start=1)
+    ]
+
+def generate_dataset(spec: DatasetSpec, workers: int = 1, password_hash: Optional[str] = None) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+    """
+    Yield (table name, rows) batches for the whole dataset in insert order.
+
+    Without password_hash every headhunter gets its own full-cost bcrypt hash.
+    """
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for model in MODELS:
+            table_name = model.__tablename__
+            if table_name in LOOKUPS:
+                yield table_name, _lookup_rows(table_name, spec)
+                continue
+
+            chunks = (spec.count(table_name) + CHUNK_SIZE - 1) // CHUNK_SIZE
+            tasks = [(table_name, spec, chunk_index, password_hash) for chunk_index in range(chunks)]
+            results = executor.map(generate_chunk, tasks) if executor else map(generate_chunk, tasks)
+            for rows in results:
+                yield table_name, rows
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+class DatasetWriter:
+    """Writes generated rows to one CSV file per table plus a manifest, for fast reloading"""
+    def __init__(self, directory: Path, spec: DatasetSpec):
+        self.directory = directory
+        self.spec = spec
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._files: dict[str, Any] = {}
+        self._writers: dict[str, Any] = {}
+
+    def write(self, table_name: str, rows: list[dict[str, Any]]) -> None:
+        if table_name not in self._writers:
+            handle = open(self.directory / f"{table_name}.csv", "w", newline="")
+            columns = [column.key for column in _table(table_name).columns]
+            writer = csv.DictWriter(handle, fieldnames=columns)
+            writer.writeheader()
+            self._files[table_name] = handle
+            self._writers[table_name] = writer
+        self._writers[table_name].writerows(rows)
+
+    def close(self) -> None:
+        for handle in self._files.values():
+            handle.close()
+        manifest = {"spec": asdict(self.spec), "tables": [model.__tablename__ for model in MODELS]}
+        (self.directory / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+def _table(table_name: str) -> Table:
+    return next(model.__table__ for model in MODELS if model.__tablename__ == table_name)  # type: ignore[return-value]
+
+def _parse_csv_value(python_type: type, raw: str) -> Any:
+    # Empty unquoted fields are NULL, as in PostgreSQL's CSV COPY format
+    if raw == "":
+        return None
+    if python_type is datetime.datetime:
+        return datetime.datetime.fromisoformat(raw)
+    if python_type is datetime.date:
+        return datetime.date.fromisoformat(raw)
+    return python_type(raw)
+
+def read_dataset_file(path: Path, table_name: str, batch_size: int) -> Iterator[list[dict[str, Any]]]:
+    """Read a dataset CSV back into typed row batches"""
+    types = {column.key: column.type.python_type for column in _table(table_name).columns}
+    with open(path, newline="") as handle:
+        batch: list[dict[str, Any]] = []
+        for record in csv.DictReader(handle):
+            batch.append({key: _parse_csv_value(types[key], value) for key, value in record.items()})
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
 
 class MockDataInjector:
-    def __init__(self):
-        self.session_factory = PostgresSessionFactory(
+    def __init__(self, session_factory: Optional[Any] = None):
+        # Any object with get_session() and create_tables() works, e.g. a SQLite-backed factory for benchmarks
+        self.session_factory = session_factory or PostgresSessionFactory(
             host="localhost",  # Use localhost for local development
             port=settings.POSTGRES_PORT,
             name=settings.POSTGRES_DB,
             user=settings.POSTGRES_USER,
             password=settings.POSTGRES_PASSWORD
         )
-        
-    def hash_password(self, password: str) -> str:
-        """Hash password using bcrypt"""
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed.decode('utf-8')
 
     def create_tables(self):
         """Create all database tables"""
@@ -58,324 +374,201 @@ class MockDataInjector:
     def clear_existing_data(self, session: Session):
         """Clear existing data from all tables"""
         print("Clearing existing data...")
-        
-        # Delete in order to respect foreign key constraints
-        session.query(NomineeDB).delete()
-        session.query(CandidateDB).delete()
-        session.query(ProjectDB).delete()
-        session.query(CustomerDB).delete()
-        session.query(HeadhunterDB).delete()
-        session.query(LevelDB).delete()
-        session.query(ExpertiseDB).delete()
-        session.query(FieldDB).delete()
-        session.query(AreaDB).delete()
-        
+
+        if session.get_bind().dialect.name == "postgresql":
+            table_names = ", ".join(model.__tablename__ for model in MODELS + DERIVED_MODELS + QUEUE_MODELS)
+            session.execute(text(f"TRUNCATE {table_names} RESTART IDENTITY CASCADE"))
+        else:
+            # Delete in order to respect foreign key constraints
+            for model in QUEUE_MODELS + DERIVED_MODELS + list(reversed(MODELS)):
+                session.query(model).delete()
+
         session.commit()
         print("Existing data cleared!")
 
-    def create_areas(self, session: Session) -> List[AreaDB]:
-        """Create area records"""
-        print("Creating areas...")
-        
-        areas_data = [
-            "North America", "Europe", "Asia Pacific", "Latin America", 
-            "Middle East", "Africa", "Southeast Asia", "Eastern Europe",
-            "Central America", "Oceania"
-        ]
-        
-        areas: list[AreaDB] = []
-        for area_name in areas_data:
-            area = AreaDB(name=area_name)
-            areas.append(area)
-            session.add(area)
-        
-        session.commit()
-        print(f"Created {len(areas)} areas")
-        return areas
-
-    def create_fields(self, session: Session) -> List[FieldDB]:
-        """Create field records"""
-        print("Creating fields...")
-        
-        fields_data = [
-            "Technology", "Healthcare", "Finance", "Education", "Manufacturing",
-            "Retail", "Consulting", "Media", "Real Estate", "Transportation",
-            "Energy", "Telecommunications"
-        ]
-        
-        fields: list[FieldDB] = []
-        for field_name in fields_data:
-            field = FieldDB(name=field_name)
-            fields.append(field)
-            session.add(field)
-        
-        session.commit()
-        print(f"Created {len(fields)} fields")
-        return fields
-
-    def create_expertises(self, session: Session) -> List[ExpertiseDB]:
-        """Create expertise records"""
-        print("Creating expertises...")
-        
-        expertises_data = [
-            "Software Development", "Data Science", "Project Management", 
-            "Digital Marketing", "Financial Analysis", "HR Management",
-            "Sales", "Operations", "Quality Assurance", "DevOps",
-            "UI/UX Design", "Business Analysis", "Cybersecurity",
-            "Cloud Architecture", "Mobile Development"
-        ]
-        
-        expertises: list[ExpertiseDB] = []
-        for expertise_name in expertises_data:
-            expertise = ExpertiseDB(name=expertise_name)
-            expertises.append(expertise)
-            session.add(expertise)
-        
-        session.commit()
-        print(f"Created {len(expertises)} expertises")
-        return expertises
-
-    def create_levels(self, session: Session) -> List[LevelDB]:
-        """Create level records"""
-        print("Creating levels...")
-        
-        levels_data = [
-            "Entry Level", "Junior", "Mid-Level", "Senior", 
-            "Lead", "Principal", "Director", "VP", "C-Level"
-        ]
-        
-        levels: list[LevelDB] = []
-        for level_name in levels_data:
-            level = LevelDB(name=level_name)
-            levels.append(level)
-            session.add(level)
-        
-        session.commit()
-        print(f"Created {len(levels)} levels")
-        return levels
-
-    def create_headhunters(self, session: Session, areas: List[AreaDB]) -> List[HeadhunterDB]:
-        """Create 10 headhunter records"""
-        print("Creating headhunters...")
-        
-        roles = ["Senior Recruiter", "Lead Headhunter", "Talent Acquisition Manager", 
-                "Executive Recruiter", "Technical Recruiter"]
-        
-        headhunters: list[HeadhunterDB] = []
-        for _ in range(10):
-            headhunter = HeadhunterDB(
-                name=fake.name(),
-                phone=fake.phone_number()[:15],
-                email=fake.email(),
-                address=fake.address(),
-                hashed_password=self.hash_password("password123"),  # Default password
-                role=random.choice(roles),
-                area_id=random.choice(areas).area_id
-            )
-            headhunters.append(headhunter)
-            session.add(headhunter)
-        
-        session.commit()
-        print(f"Created {len(headhunters)} headhunters")
-        return headhunters
-
-    def create_customers(self, session: Session, fields: List[FieldDB]) -> List[CustomerDB]:
-        """Create 20 customer records"""
-        print("Creating customers...")
-        
-        company_types = ["Corp", "Inc", "LLC", "Ltd", "Technologies", "Solutions", 
-                        "Systems", "Group", "Enterprises", "Industries"]
-        
-        customers: list[CustomerDB] = []
-        for _ in range(20):
-            company_name = f"{fake.company().split()[0]} {random.choice(company_types)}"
-            customer = CustomerDB(
-                name=company_name,
-                field_id=random.choice(fields).field_id,
-                representative_name=fake.name(),
-                representative_phone=fake.phone_number()[:15],
-                representative_email=fake.email(),
-                representative_role=random.choice(["Manager", "Director", "VP", "Executive"]),
-            )
-            customers.append(customer)
-            session.add(customer)
-        
-        session.commit()
-        print(f"Created {len(customers)} customers")
-        return customers
-
-    def create_projects(self, session: Session, customers: List[CustomerDB], 
-                       expertises: List[ExpertiseDB], areas: List[AreaDB], 
-                       levels: List[LevelDB]) -> List[ProjectDB]:
-        """Create project records"""
-        print("Creating projects...")
-        
-        project_types = ["CODINH", "THOIVU"]
-        statuses = ["TIMKIEMUNGVIEN", "UNGVIENPHONGVAN", "UNGVIENTHUVIEC", "TAMNGUNG", "HUY", "HOANTHANH"]
-        currencies = ["USD", "EUR", "GBP", "CAD", "AUD"]
-        
-        projects: list[ProjectDB] = []
-        for customer in customers:
-            # Each customer gets 1-3 projects
-            num_projects = random.randint(1, 3)
-            for _ in range(num_projects):
-                start_date = fake.date_between(start_date="-1y", end_date="today")
-                end_date = fake.date_between(start_date=start_date, end_date="+6m")
-                expertise = random.choice(expertises)
-
-                project = ProjectDB(
-                    name=f"[{customer.name}] {expertise.name}",
-                    start_date=start_date,
-                    end_date=end_date,
-                    budget=round(random.uniform(50000, 500000), 2),
-                    budget_currency=random.choice(currencies),
-                    type=random.choice(project_types),
-                    required_recruits=random.randint(1, 10),
-                    recruited=random.randint(0, 10),
-                    status=random.choice(statuses),
-                    customer_id=customer.customer_id,
-                    expertise_id=expertise.expertise_id,
-                    area_id=random.choice(areas).area_id,
-                    level_id=random.choice(levels).level_id
-                )
-                projects.append(project)
-                session.add(project)
-        
-        session.commit()
-        print(f"Created {len(projects)} projects")
-        return projects
-
-    def create_candidates(self, session: Session, expertises: List[ExpertiseDB], 
-                         fields: List[FieldDB], areas: List[AreaDB], 
-                         levels: List[LevelDB], headhunters: List[HeadhunterDB]) -> List[CandidateDB]:
-        """Create 70 candidate records"""
-        print("Creating candidates...")
-        
-        genders = ["NAM", "NU", "KHAC"]
-        education_levels = [
-            "Bachelor's in Computer Science", "Master's in Business Administration",
-            "Bachelor's in Engineering", "Master's in Data Science", 
-            "PhD in Computer Science", "Bachelor's in Marketing",
-            "Master's in Finance", "Bachelor's in Psychology",
-            "Master's in Project Management", "Bachelor's in Economics"
-        ]
-        sources = [
-            "LinkedIn", "Indeed", "Company Website", "Referral", 
-            "Job Fair", "University Career Center", "Recruitment Agency",
-            "Professional Network", "Social Media", "Direct Application"
-        ]
-        
-        candidates: list[CandidateDB] = []
-        for _ in range(70):
-            candidate = CandidateDB(
-                name=fake.name(),
-                phone=fake.phone_number()[:15],
-                email=fake.email(),
-                year_of_birth=random.randint(1970, 2000),
-                gender=random.choice(genders),
-                education=random.choice(education_levels),
-                source=random.choice(sources),
-                expertise_id=random.choice(expertises).expertise_id,
-                field_id=random.choice(fields).field_id,
-                area_id=random.choice(areas).area_id,
-                level_id=random.choice(levels).level_id,
-                headhunter_id=random.choice(headhunters).headhunter_id,
-                note=fake.text(max_nb_chars=200) if random.choice([True, False]) else None
-            )
-            candidates.append(candidate)
-            session.add(candidate)
-        
-        session.commit()
-        print(f"Created {len(candidates)} candidates")
-        return candidates
-
-    def create_nominees(self, session: Session, candidates: List[CandidateDB], 
-                       projects: List[ProjectDB]) -> List[NomineeDB]:
-        """Create 30 nominee records from existing candidates"""
-        print("Creating nominees...")
-        
-        statuses = ["DECU", "PHONGVAN", "THUONGLUONG", "THUVIEC", "TUCHOI", "KYHOPDONG"]
-        campaigns = [
-            "Q1 Hiring Drive", "Tech Talent Search", "Senior Leadership Hunt",
-            "Graduate Recruitment", "Expert Acquisition", "Rapid Hiring",
-            "Strategic Placement", "Executive Search", "Skill-specific Hunt"
-        ]
-        
-        # Select 30 random candidates to be nominees
-        selected_candidates = random.sample(candidates, 30)
-        
-        nominees: list[NomineeDB] = []
-        for candidate in selected_candidates:
-            nominee = NomineeDB(
-                campaign=random.choice(campaigns),
-                status=random.choice(statuses),
-                years_of_experience=random.randint(0, 20),
-                salary_expectation=round(random.uniform(40000, 200000), 2),
-                notice_period=random.randint(0, 90),  # days
-                candidate_id=candidate.candidate_id,
-                project_id=random.choice(projects).project_id
-            )
-            nominees.append(nominee)
-            session.add(nominee)
-        
-        session.commit()
-        print(f"Created {len(nominees)} nominees")
-        return nominees
+    def insert_rows(self, session: Session, table_name: str, rows: list[dict[str, Any]]) -> None:
+        """Insert a batch with COPY on PostgreSQL, or as multi-row INSERTs otherwise"""
+        table = _table(table_name)
+        if session.get_bind().dialect.name != "postgresql":
+            session.execute(insert(table), rows)
+            return
+
+        buffer = io.StringIO()
+        columns = [column.key for column in table.columns]
+        csv.DictWriter(buffer, fieldnames=columns).writerows(rows)
+        buffer.seek(0)
+        self._copy(session, table_name, columns, buffer)
+
+    def _copy(self, session: Session, table_name: str, columns: List[str], source: Any) -> None:
+        cursor = session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", source)
+        finally:
+            cursor.close()
+
+    def reset_sequences(self, session: Session):
+        """Move PostgreSQL id sequences past the explicitly inserted primary keys"""
+        if session.get_bind().dialect.name != "postgresql":
+            return
+        for model in MODELS:
+            primary_key = model.__mapper__.primary_key[0].key
+            session.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{model.__tablename__}', '{primary_key}'), "
+                f"COALESCE(MAX({primary_key}), 1), MAX({primary_key}) IS NOT NULL) FROM {model.__tablename__}"
+            ))
+
+    def rebuild_summaries(self, session: Session):
+        """Recompute the per-project pipeline summaries, headhunter daily stats and candidate duplicate keys from the loaded rows"""
+        refresh_project_summaries(session)
+        refresh_headhunter_daily_stats(session)
+        refresh_candidate_duplicate_keys(session)
+
+    def inject_all_data(self, spec: Optional[DatasetSpec] = None, workers: int = 1,
+                        reuse_password_hash: bool = False, dataset_dir: Optional[Path] = None) -> dict[str, int]:
+        """
+        Generate the dataset and insert it, optionally also writing it to dataset_dir.
+
+        :return: Number of rows per table.
+        """
+        spec = spec or DatasetSpec()
+        print(f"Starting mock data injection ({asdict(spec)}, workers={workers})...")
+        password_hash = hash_password(DEFAULT_PASSWORD) if reuse_password_hash else None
+        writer = DatasetWriter(dataset_dir, spec) if dataset_dir else None
+        counts = {model.__tablename__: 0 for model in MODELS}
+        start = time.perf_counter()
 
-    def inject_all_data(self):
-        """Main method to inject all mock data"""
-        print("Starting mock data injection...")
-        
         with self.session_factory.get_session() as session:
             try:
-                # Clear existing data
                 self.clear_existing_data(session)
-                
-                # Create lookup tables first
-                areas = self.create_areas(session)
-                fields = self.create_fields(session)
-                expertises = self.create_expertises(session)
-                levels = self.create_levels(session)
-                
-                # Create main entities
-                headhunters = self.create_headhunters(session, areas)
-                customers = self.create_customers(session, fields)
-                projects = self.create_projects(session, customers, expertises, areas, levels)
-                candidates = self.create_candidates(session, expertises, fields, areas, levels, headhunters)
-                nominees = self.create_nominees(session, candidates, projects)
-                
-                print("\n" + "="*50)
-                print("MOCK DATA INJECTION SUMMARY")
-                print("="*50)
-                print(f"Areas: {len(areas)}")
-                print(f"Fields: {len(fields)}")
-                print(f"Expertises: {len(expertises)}")
-                print(f"Levels: {len(levels)}")
-                print(f"Headhunters: {len(headhunters)}")
-                print(f"Customers: {len(customers)}")
-                print(f"Projects: {len(projects)}")
-                print(f"Candidates: {len(candidates)}")
-                print(f"Nominees: {len(nominees)}")
-                print("="*50)
-                print("Mock data injection completed successfully!")
-                
+                for table_name, rows in generate_dataset(spec, workers, password_hash):
+                    self.insert_rows(session, table_name, rows)
+                    if writer:
+                        writer.write(table_name, rows)
+                    counts[table_name] += len(rows)
+                self.reset_sequences(session)
+                self.rebuild_summaries(session)
+                session.commit()
             except Exception as e:
                 session.rollback()
                 print(f"Error during data injection: {e}")
                 raise
+            finally:
+                if writer:
+                    writer.close()
+
+        print_summary(counts, time.perf_counter() - start)
+        return counts
+
+    def load_dataset(self, dataset_dir: Path, batch_size: int = 10_000) -> dict[str, int]:
+        """
+        Load a dataset written with --write-dataset, without regenerating it.
+
+        :return: Number of rows per table.
+        """
+        manifest = json.loads((dataset_dir / "manifest.json").read_text())
+        print(f"Loading dataset from {dataset_dir} ({manifest['spec']})...")
+        counts = {}
+        start = time.perf_counter()
+
+        with self.session_factory.get_session() as session:
+            try:
+                self.clear_existing_data(session)
+                postgres = session.get_bind().dialect.name == "postgresql"
+                for table_name in manifest["tables"]:
+                    path = dataset_dir / f"{table_name}.csv"
+                    if postgres:
+                        with open(path, newline="") as handle:
+                            columns = handle.readline().strip().split(",")
+                            self._copy(session, table_name, columns, handle)
+                    else:
+                        for batch in read_dataset_file(path, table_name, batch_size):
+                            self.insert_rows(session, table_name, batch)
+                    counts[table_name] = session.execute(text(f"SELECT COUNT(*) FROM {table_name}")).scalar_one()
+                self.reset_sequences(session)
+                self.rebuild_summaries(session)
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                print(f"Error during dataset load: {e}")
+                raise
+
+        print_summary(counts, time.perf_counter() - start)
+        return counts
+
+
+def export_dataset(spec: DatasetSpec, dataset_dir: Path, workers: int = 1,
+                   reuse_password_hash: bool = False) -> dict[str, int]:
+    """Generate the dataset into CSV files only, without a database"""
+    print(f"Writing dataset to {dataset_dir} ({asdict(spec)}, workers={workers})...")
+    password_hash = hash_password(DEFAULT_PASSWORD) if reuse_password_hash else None
+    writer = DatasetWriter(dataset_dir, spec)
+    counts = {model.__tablename__: 0 for model in MODELS}
+    start = time.perf_counter()
+    try:
+        for table_name, rows in generate_dataset(spec, workers, password_hash):
+            writer.write(table_name, rows)
+            counts[table_name] += len(rows)
+    finally:
+        writer.close()
+
+    print_summary(counts, time.perf_counter() - start)
+    return counts
+
+
+def print_summary(counts: dict[str, int], elapsed: float):
+    print("\n" + "="*50)
+    print("MOCK DATA INJECTION SUMMARY")
+    print("="*50)
+    for table_name, count in counts.items():
+        print(f"{table_name.capitalize()}: {count}")
+    print(f"Elapsed: {elapsed:.1f}s")
+    print("="*50)
+    print("Mock data injection completed successfully!")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate and inject mock data into the CIMS database")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply the default row counts")
+    parser.add_argument("--seed", type=int, default=DatasetSpec.seed, help="Seed for deterministic output")
+    parser.add_argument("--reference-date", help="Spread timestamps over the year before this date (YYYY-MM-DD); defaults to %(default)s",
+                        default=DatasetSpec.reference_date)
+    for table_name in ROW_BUILDERS:
+        parser.add_argument(f"--{table_name}", type=int, help=f"Number of {table_name}, overriding --scale")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes generating rows")
+    parser.add_argument("--reuse-password-hash", action="store_true",
+                        help=f"Hash '{DEFAULT_PASSWORD}' once and reuse it for every headhunter")
+    parser.add_argument("--write-dataset", type=Path, help="Also write the generated rows as CSV files to this directory")
+    parser.add_argument("--no-db", action="store_true", help="Only write dataset files, do not touch the database")
+    parser.add_argument("--load-dataset", type=Path, help="Load a previously written dataset instead of generating one")
+    return parser.parse_args(argv)
 
 
 def main():
     """Main function to run the mock data injection"""
+    args = parse_args()
     try:
+        overrides = {table_name: getattr(args, table_name) for table_name in ROW_BUILDERS}
+        spec = DatasetSpec.scaled(args.scale, **overrides)
+        spec = replace(spec, seed=args.seed, reference_date=args.reference_date)
+
+        if args.no_db:
+            if not args.write_dataset:
+                print("--no-db requires --write-dataset")
+                sys.exit(2)
+            export_dataset(spec, args.write_dataset, args.workers, args.reuse_password_hash)
+            return
+
         injector = MockDataInjector()
-        
+
         # Create tables if they don't exist
         injector.create_tables()
-        
-        # Inject mock data
-        injector.inject_all_data()
-        
+
+        if args.load_dataset:
+            injector.load_dataset(args.load_dataset)
+        else:
+            # Inject mock data
+            injector.inject_all_data(spec, args.workers, args.reuse_password_hash, args.write_dataset)
+
     except Exception as e:
         print(f"Failed to inject mock data: {e}")
         sys.exit(1)
@@ -0,0 +1,86 @@
+"""
+Streaming export helpers for bulk NDJSON and CSV downloads.
+"""
+from fastapi.responses import StreamingResponse
+from typing import Any, Callable, Iterable, Iterator, Literal, Optional
+import csv
+import datetime
+import io
+import json
+
+ExportFormat = Literal["ndjson", "csv"]
+
+# Number of CSV rows buffered before a chunk is flushed to the client
+CSV_CHUNK_ROWS = 500
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return str(value)
+
+def iter_ndjson(rows: Iterable[dict[str, Any]]) -> Iterator[str]:
+    """
+    Encode rows as newline-delimited JSON, one line per row.
+    """
+    for row in rows:
+        yield json.dumps(row, default=_json_default, ensure_ascii=False) + "\n"
+
+def iter_csv(rows: Iterable[dict[str, Any]], columns: list[str]) -> Iterator[str]:
+    """
+    Encode rows as CSV with a header line, flushing every CSV_CHUNK_ROWS rows.
+
+    Columns missing from a row are written as empty values.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= CSV_CHUNK_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+
+    yield buffer.getvalue()
+
+def create_export_response(
+    rows: Iterable[dict[str, Any]],
+    columns: list[str],
+    export_format: ExportFormat,
+    filename: str,
+    on_close: Optional[Callable[[], None]] = None,
+) -> StreamingResponse:
+    """
+    Stream rows to the client as an NDJSON or CSV attachment.
+
+    :param Iterable[dict[str, Any]] rows: Lazily produced rows to export.
+    :param list[str] columns: CSV header columns, in output order.
+    :param ExportFormat export_format: Either "ndjson" or "csv".
+    :param str filename: Attachment file name without extension.
+    :param on_close: Called once the stream is exhausted or aborted, e.g. to release the database session.
+    :return: A streaming response that encodes rows as they are fetched.
+    :rtype: StreamingResponse
+    """
+    if export_format == "csv":
+        body = iter_csv(rows, columns)
+        media_type = "text/csv"
+    else:
+        body = iter_ndjson(rows)
+        media_type = "application/x-ndjson"
+
+    def stream() -> Iterator[str]:
+        try:
+            yield from body
+        finally:
+            if on_close:
+                on_close()
+
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
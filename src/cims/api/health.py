@@ -0,0 +1,97 @@
+"""
+Liveness and readiness probes for load balancers and orchestrators.
+"""
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy import Engine, text
+from sqlalchemy.pool import QueuePool
+from typing import Any, Optional
+import asyncio
+import time
+
+from cims.config import settings
+from cims.deps import get_db_engine
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+# Cached readiness result per engine: (monotonic time of the probe, HTTP status, body)
+_readiness_cache: dict[int, tuple[float, int, dict[str, Any]]] = {}
+_readiness_lock = asyncio.Lock()
+
+def pool_status(engine: Engine) -> Optional[dict[str, Any]]:
+    """
+    Describe connection pool usage, or None for pools without a fixed capacity.
+
+    Saturation is the share of the maximum connections (size plus overflow) currently checked out.
+    The pool does not expose its overflow limit, so the configured ``DB_POOL_MAX_OVERFLOW`` is used.
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return None
+
+    max_overflow = settings.DB_POOL_MAX_OVERFLOW
+    capacity = pool.size() + max_overflow
+    checked_out = pool.checkedout()
+    return {
+        "size": pool.size(),
+        "max_overflow": max_overflow,
+        "checked_out": checked_out,
+        "overflow": pool.overflow(),
+        "saturation": round(checked_out / capacity, 3) if capacity > 0 else 0.0,
+    }
+
+def _select_one(engine: Engine, timeout: float) -> None:
+    with engine.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout * 1000)}")
+        connection.execute(text("SELECT 1"))
+
+async def _probe(engine: Engine) -> tuple[int, dict[str, Any]]:
+    timeout = settings.HEALTH_PROBE_TIMEOUT_SECONDS
+    pool = pool_status(engine)
+
+    # A saturated pool would make the probe queue behind real traffic, so report it directly
+    if pool and pool["saturation"] >= 1.0:
+        return 503, {"status": "unavailable", "database": {"status": "pool_exhausted"}, "pool": pool}
+
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(run_in_threadpool(_select_one, engine, timeout), timeout=timeout)
+    except asyncio.TimeoutError:
+        return 503, {"status": "unavailable", "database": {"status": "timeout", "timeout_seconds": timeout}, "pool": pool}
+    except Exception as e:
+        return 503, {"status": "unavailable", "database": {"status": "error", "error": type(e).__name__}, "pool": pool}
+
+    latency_ms = round((time.perf_counter() - start) * 1000, 2)
+    return 200, {"status": "ready", "database": {"status": "ok", "latency_ms": latency_ms}, "pool": pool_status(engine)}
+
+@router.get("/live",
+    summary="Liveness probe",
+    description="Report that the process is up and serving requests, without touching dependencies"
+)
+async def liveness() -> dict[str, str]:
+    """Liveness only proves the event loop is responsive."""
+    return {"status": "alive"}
+
+@router.get("/ready",
+    summary="Readiness probe",
+    description="Check the database through the shared connection pool; results are cached briefly"
+)
+async def readiness(engine: Engine = Depends(get_db_engine)) -> JSONResponse:
+    """Run SELECT 1 with a short timeout and report pool saturation; 503 when not ready."""
+    key = id(engine)
+    cached = _readiness_cache.get(key)
+    if cached and time.monotonic() - cached[0] < settings.HEALTH_CACHE_SECONDS:
+        return JSONResponse(status_code=cached[1], content={**cached[2], "cached": True})
+
+    async with _readiness_lock:
+        # Another request may have refreshed the result while this one waited
+        cached = _readiness_cache.get(key)
+        if not cached or time.monotonic() - cached[0] >= settings.HEALTH_CACHE_SECONDS:
+            status_code, body = await _probe(engine)
+            cached = (time.monotonic(), status_code, body)
+            _readiness_cache[key] = cached
+            return JSONResponse(status_code=status_code, content={**body, "cached": False})
+
+    return JSONResponse(status_code=cached[1], content={**cached[2], "cached": True})
@@ -0,0 +1,18 @@
+"""
+Prometheus-compatible metrics endpoint.
+"""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from cims.metrics import REGISTRY
+
+router = APIRouter(tags=["monitoring"])
+
+@router.get("/metrics",
+    response_class=PlainTextResponse,
+    summary="Metrics",
+    description="Expose request, database pool, password hashing and MCP tool metrics in Prometheus text format"
+)
+async def metrics() -> PlainTextResponse:
+    """Render all registered metrics."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
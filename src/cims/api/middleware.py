@@ -0,0 +1,95 @@
+"""
+HTTP middleware for request-level instrumentation.
+"""
+from fastapi import Request, Response
+from typing import AsyncIterator, Awaitable, Callable
+import time
+
+from cims.config import CLogger
+from cims.database.instrumentation import track_queries
+from cims.metrics import DB_QUERIES, HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
+from cims.tracing import REQUEST_ID_HEADER, current_trace_id, parse_trace_headers, start_span
+
+logger = CLogger(__name__).get_logger()
+
+def _route_template(request: Request) -> str:
+    """
+    Return the path template of the route that handled the request, e.g. ``/api/v1/candidates/{candidate_id}``.
+
+    Labelling by template rather than raw path keeps metric cardinality bounded.
+    The router stores the matched route in the scope during dispatch.
+    """
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+async def instrument_request(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+    """
+    Count SQL statements and time spent in the database for each request.
+
+    The totals are reported in the ``Server-Timing`` and ``X-DB-Queries`` response
+    headers and in the request log line, and feed the per-route latency and query
+    metrics. Statements issued while a streaming body is being sent happen after
+    the headers and are not included.
+    """
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        with track_queries(f"{request.method} {request.url.path}") as stats:
+            response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        elapsed = time.perf_counter() - start
+        route = _route_template(request)
+        HTTP_REQUEST_DURATION.observe(elapsed, method=request.method, route=route, status=str(status_code))
+
+    total_ms = elapsed * 1000
+    DB_QUERIES.inc(stats.count, route=route)
+
+    response.headers["Server-Timing"] = (
+        f'db;dur={stats.duration_ms:.1f};desc="{stats.count} queries", app;dur={total_ms:.1f}'
+    )
+    response.headers["X-DB-Queries"] = str(stats.count)
+
+    request_id = current_trace_id()
+    logger.info(
+        f"{request.method} {request.url.path} {status_code} "
+        f"{total_ms:.1f}ms db={stats.count} queries/{stats.duration_ms:.1f}ms"
+        + (f" request_id={request_id}" if request_id else "")
+    )
+    return response
+
+async def count_in_flight(request: Request) -> AsyncIterator[None]:
+    """
+    Count the requests a route is handling; installed as an app-wide dependency.
+
+    Dependencies run once the router has matched the route, so in-flight
+    requests get the same route template label as their latency, which a
+    middleware only learns after the response.
+    """
+    labels = {"method": request.method, "route": _route_template(request)}
+    HTTP_REQUESTS_IN_FLIGHT.inc(**labels)
+    try:
+        yield
+    finally:
+        HTTP_REQUESTS_IN_FLIGHT.dec(**labels)
+
+async def trace_request(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+    """
+    Run the request inside a server span and echo its correlation ID.
+
+    An ``X-Request-ID`` or ``traceparent`` header sent by the caller (e.g. the MCP
+    server) continues that trace; otherwise a new trace ID is generated. The ID
+    is returned in ``X-Request-ID`` and attached to the request log line and to
+    every SQL statement issued while handling the request.
+    """
+    trace_id, parent_id = parse_trace_headers(request.headers)
+    with start_span(f"{request.method} {request.url.path}", "http.server", trace_id=trace_id, parent_id=parent_id) as span:
+        response = await call_next(request)
+        if span is None:
+            return response
+        span.name = f"{request.method} {_route_template(request)}"
+        span.attributes.update(path=request.url.path, status_code=response.status_code)
+        if response.status_code >= 500:
+            span.status = "error"
+        response.headers[REQUEST_ID_HEADER] = span.trace_id
+    return response
@@ -0,0 +1,148 @@
+"""
+On-demand request profiling with a stack sampler.
+
+A request is profiled when it carries a valid signature in the
+``X-Profile-Signature`` header or the ``profile`` query parameter. The
+signature is an HMAC-SHA256 of ``"<METHOD> <path>"`` keyed with
+``PROFILING_SECRET`` (see :func:`sign_profile_request`), so a signature only
+unlocks the endpoint it was issued for.
+
+While the request runs, a background thread samples the Python stacks of all
+threads, which covers the event loop as well as sync endpoints and
+dependencies running in the threadpool. The result is written in collapsed
+stack format (one ``frame;frame;frame count`` line per stack), which
+flamegraph.pl, speedscope and inferno read directly. Samples of other requests
+served concurrently end up in the same profile.
+"""
+from collections import Counter
+from fastapi import Request, Response
+from fastapi.responses import PlainTextResponse
+from pathlib import Path
+from types import FrameType
+from typing import Awaitable, Callable, Optional
+import datetime
+import hashlib
+import hmac
+import re
+import sys
+import threading
+
+from cims.config import CLogger, settings
+
+logger = CLogger(__name__).get_logger()
+
+PROFILE_HEADER = "X-Profile-Signature"
+PROFILE_QUERY_PARAM = "profile"
+
+# Leaf frames in these modules are threads waiting for work, not CPU time
+IDLE_MODULES = ("threading", "selectors", "queue", "concurrent.futures.thread")
+
+_profile_lock = threading.Lock()
+
+def sign_profile_request(method: str, path: str, secret: Optional[str] = None) -> str:
+    """
+    Return the signature that enables profiling for one endpoint, e.g. ``sign_profile_request("GET", "/api/v1/projects/")``.
+    """
+    key = secret or settings.PROFILING_SECRET or settings.SECRET_KEY
+    return hmac.new(key.encode(), f"{method.upper()} {path}".encode(), hashlib.sha256).hexdigest()
+
+def _frame_label(frame: FrameType) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}"
+
+class StackSampler:
+    """Samples the stacks of all other threads at a fixed interval and counts identical stacks."""
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.samples = 0
+        self._stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="cims-stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        self._thread.join()
+        return self._stacks
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or frame.f_globals.get("__name__") in IDLE_MODULES:
+                    continue
+                labels = []
+                current: Optional[FrameType] = frame
+                while current is not None:
+                    labels.append(_frame_label(current))
+                    current = current.f_back
+                labels.append(names.get(thread_id, str(thread_id)))
+                self._stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+def render_collapsed(stacks: Counter[str]) -> str:
+    """Render stack counts in collapsed (folded) format, heaviest stacks first."""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+def _is_signed(request: Request) -> bool:
+    signature = request.headers.get(PROFILE_HEADER) or request.query_params.get(PROFILE_QUERY_PARAM)
+    if not signature:
+        return False
+    return hmac.compare_digest(signature, sign_profile_request(request.method, request.url.path))
+
+def _store_profile(request: Request, collapsed: str) -> Path:
+    directory = Path(settings.PROFILING_OUTPUT_DIR)  # type: ignore[arg-type]
+    directory.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    endpoint = re.sub(r"[^A-Za-z0-9]+", "_", request.url.path).strip("_") or "root"
+    path = directory / f"{timestamp}-{request.method.lower()}-{endpoint}.folded"
+    path.write_text(collapsed)
+    return path
+
+async def profile_request(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+    """
+    Profile signed requests; every other request passes through untouched.
+
+    The response body is drained inside the profile so serialization and
+    streaming are included. With ``PROFILING_OUTPUT_DIR`` set the profile is
+    stored there and the response is returned as usual with an
+    ``X-Profile-File`` header; otherwise the collapsed stacks replace the
+    response body and the original status is reported in ``X-Profiled-Status``.
+    Only one request is profiled at a time.
+    """
+    if not _is_signed(request):
+        return await call_next(request)
+
+    if not _profile_lock.acquire(blocking=False):
+        response = await call_next(request)
+        response.headers["X-Profile"] = "busy"
+        return response
+
+    try:
+        sampler = StackSampler(settings.PROFILING_INTERVAL_MS / 1000)
+        sampler.start()
+        try:
+            response = await call_next(request)
+            body = b"".join([chunk async for chunk in response.body_iterator])  # type: ignore[attr-defined]
+        finally:
+            stacks = sampler.stop()
+    finally:
+        _profile_lock.release()
+
+    collapsed = render_collapsed(stacks)
+    logger.info(f"Profiled {request.method} {request.url.path}: {sampler.samples} samples, {len(stacks)} distinct stacks")
+
+    if settings.PROFILING_OUTPUT_DIR:
+        path = _store_profile(request, collapsed)
+        profiled = Response(content=body, status_code=response.status_code)
+        profiled.raw_headers = response.raw_headers
+        profiled.headers["X-Profile-File"] = str(path)
+        return profiled
+
+    return PlainTextResponse(
+        collapsed,
+        headers={"X-Profiled-Status": str(response.status_code), "X-Profile-Samples": str(sampler.samples)}
+    )
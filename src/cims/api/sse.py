@@ -0,0 +1,74 @@
+"""
+Server-sent event streaming of committed entity changes.
+"""
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Optional
+import asyncio
+import json
+
+from cims.config import settings
+from cims.core.change_events import ChangeEvent, ChangeEventBus, ChangeEventFilter
+
+# Delay browsers wait before reconnecting a dropped stream
+RECONNECT_DELAY_MS = 3000
+
+def format_sse(data: Any, event: Optional[str] = None, event_id: Optional[str] = None) -> str:
+    """Encode one server-sent event with JSON data."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+def _format_change(event: ChangeEvent) -> str:
+    return format_sse(event.to_dict(), event="change", event_id=event.event_id)
+
+async def iter_change_events(
+    bus: ChangeEventBus,
+    event_filter: ChangeEventFilter,
+    last_event_id: Optional[str] = None,
+    heartbeat_seconds: Optional[float] = None,
+    max_seconds: Optional[float] = None
+) -> AsyncIterator[str]:
+    """
+    Subscribe and stream: the events missed since ``last_event_id`` or a reset, then live events and heartbeats.
+
+    The stream ends after ``max_seconds`` or once the subscriber falls too far
+    behind; browsers then reconnect with the ID of the last event they received
+    and resume from the backlog. The subscription is only made once the
+    response starts streaming, so a client gone before then leaves none
+    behind, and it is closed when the stream ends or the client goes away.
+    """
+    heartbeat = settings.CHANGE_EVENT_HEARTBEAT_SECONDS if heartbeat_seconds is None else heartbeat_seconds
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + (settings.CHANGE_EVENT_STREAM_MAX_SECONDS if max_seconds is None else max_seconds)
+    subscription, missed = bus.subscribe(event_filter, last_event_id)
+    try:
+        yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+        if missed is None:
+            # The client's state cannot be brought up to date event by event; it has to reload
+            yield format_sse({"last_event_id": subscription.start_event_id}, event="reset", event_id=subscription.start_event_id)
+        else:
+            for event in missed:
+                yield _format_change(event)
+
+        while (remaining := deadline - loop.time()) > 0:
+            events = await subscription.next_events(min(heartbeat, remaining))
+            if subscription.overflowed:
+                break
+            for event in events:
+                yield _format_change(event)
+            if not events:
+                yield ": keep-alive\n\n"
+    finally:
+        bus.unsubscribe(subscription)
+
+def create_event_stream_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        # Proxies must pass events through as they are written
+        headers={"X-Accel-Buffering": "no"},
+    )
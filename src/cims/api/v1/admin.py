@@ -0,0 +1,229 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from cims.database.session import SlowQueryRecorder, get_slow_query_recorder
+from cims.core.repositories.candidate_repository import CandidateRepository
+from cims.core.repositories.headhunter_repository import HeadhunterRepository
+from cims.core.repositories.project_repository import ProjectRepository
+from cims.deps import get_candidate_repository, get_headhunter_repository, get_project_repository, require_admin
+from cims.tracing import InMemoryTraceExporter, get_trace_exporter
+from cims.schemas import (
+    SlowQueryRecord,
+    SlowQueryListResponse,
+    TraceSummary,
+    TraceListResponse,
+    TraceResponse,
+    DuplicateCluster,
+    DuplicateClusterListResponse,
+    BaseResponse,
+    ErrorResponse,
+)
+from cims.config import CLogger
+
+logger = CLogger(__name__).get_logger()
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)],
+    responses={
+        401: {"model": ErrorResponse, "description": "Authentication failed"},
+        403: {"model": ErrorResponse, "description": "Admin role required"},
+        404: {"model": ErrorResponse, "description": "Diagnostic is disabled or record not found"},
+    }
+)
+
+def _require_recorder(recorder: Optional[SlowQueryRecorder]) -> SlowQueryRecorder:
+    if recorder is None:
+        raise HTTPException(status_code=404, detail="Slow-query recording is disabled; set SLOW_QUERY_THRESHOLD_MS to enable it")
+    return recorder
+
+def _require_exporter(exporter: Optional[InMemoryTraceExporter]) -> InMemoryTraceExporter:
+    if exporter is None:
+        raise HTTPException(status_code=404, detail="Tracing is disabled; set TRACING_ENABLED to enable it")
+    return exporter
+
+@router.get("/slow-queries",
+    response_model=SlowQueryListResponse,
+    summary="List slow queries",
+    description="Return the most recent statements slower than SLOW_QUERY_THRESHOLD_MS"
+)
+async def list_slow_queries(
+    limit: int = Query(50, ge=1, le=1000, description="Maximum number of records to return"),
+    recorder: Optional[SlowQueryRecorder] = Depends(get_slow_query_recorder)
+) -> SlowQueryListResponse:
+    """
+    List recorded slow queries, most recent first.
+
+    :param int limit: Maximum number of records to return.
+    :return: SlowQueryListResponse: Slow queries with redacted parameters and plans.
+    :rtype: SlowQueryListResponse
+    :raises HTTPException: If slow-query recording is disabled.
+    """
+    records = _require_recorder(recorder).records(limit)
+    return SlowQueryListResponse(
+        success=True,
+        message=f"Retrieved {len(records)} slow queries",
+        data=[SlowQueryRecord(**record) for record in records]
+    )
+
+@router.delete("/slow-queries",
+    response_model=BaseResponse,
+    summary="Clear slow queries",
+    description="Empty the slow-query buffer"
+)
+async def clear_slow_queries(
+    recorder: Optional[SlowQueryRecorder] = Depends(get_slow_query_recorder)
+) -> BaseResponse:
+    """
+    Clear recorded slow queries.
+
+    :return: BaseResponse: Confirmation of the operation.
+    :rtype: BaseResponse
+    :raises HTTPException: If slow-query recording is disabled.
+    """
+    _require_recorder(recorder).clear()
+    logger.info("Slow-query buffer cleared")
+    return BaseResponse(success=True, message="Slow-query buffer cleared")
+
+@router.get("/traces",
+    response_model=TraceListResponse,
+    summary="List recent traces",
+    description="Return the most recent request traces with their time breakdown per span kind"
+)
+async def list_traces(
+    limit: int = Query(50, ge=1, le=1000, description="Maximum number of traces to return"),
+    exporter: Optional[InMemoryTraceExporter] = Depends(get_trace_exporter)
+) -> TraceListResponse:
+    """
+    List recent traces, most recent first.
+
+    :param int limit: Maximum number of traces to return.
+    :return: TraceListResponse: Traces with their spans and time per span kind.
+    :rtype: TraceListResponse
+    :raises HTTPException: If tracing is disabled.
+    """
+    traces = _require_exporter(exporter).traces(limit)
+    return TraceListResponse(
+        success=True,
+        message=f"Retrieved {len(traces)} traces",
+        data=[TraceSummary(**trace) for trace in traces]
+    )
+
+@router.get("/traces/{trace_id}",
+    response_model=TraceResponse,
+    summary="Get a trace",
+    description="Return the spans recorded for a correlation ID, e.g. the X-Request-ID of a response"
+)
+async def get_trace(
+    trace_id: str,
+    exporter: Optional[InMemoryTraceExporter] = Depends(get_trace_exporter)
+) -> TraceResponse:
+    """
+    Get the spans recorded for a trace.
+
+    :param str trace_id: Correlation ID of the trace.
+    :return: TraceResponse: The trace with its spans and time per span kind.
+    :rtype: TraceResponse
+    :raises HTTPException: If tracing is disabled or the trace is not in the buffer.
+    """
+    trace = _require_exporter(exporter).get_trace(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail=f"Trace {trace_id} not found")
+    return TraceResponse(success=True, message="Trace retrieved", data=TraceSummary(**trace))
+
+@router.post("/project-summaries/refresh",
+    response_model=BaseResponse,
+    summary="Rebuild project pipeline summaries",
+    description="Recompute every project's pipeline summary from the nominees, e.g. after a bulk load or manual SQL"
+)
+async def refresh_project_summaries(
+    project_repo: ProjectRepository = Depends(get_project_repository)
+) -> BaseResponse:
+    """
+    Rebuild the pipeline summaries of all projects.
+
+    :return: BaseResponse: Confirmation of the operation.
+    :rtype: BaseResponse
+    :raises HTTPException: If the refresh fails.
+    """
+    try:
+        project_repo.refresh_pipeline_summaries()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    logger.info("Project pipeline summaries rebuilt")
+    return BaseResponse(success=True, message="Project pipeline summaries rebuilt")
+
+@router.post("/headhunter-stats/refresh",
+    response_model=BaseResponse,
+    summary="Rebuild headhunter daily stats",
+    description="Recompute the daily headhunter stats behind the leaderboard from candidates and nominees"
+)
+async def refresh_headhunter_stats(
+    headhunter_repo: HeadhunterRepository = Depends(get_headhunter_repository)
+) -> BaseResponse:
+    """
+    Rebuild the daily stats of all headhunters.
+
+    :return: BaseResponse: Confirmation of the operation.
+    :rtype: BaseResponse
+    :raises HTTPException: If the refresh fails.
+    """
+    try:
+        headhunter_repo.refresh_daily_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    logger.info("Headhunter daily stats rebuilt")
+    return BaseResponse(success=True, message="Headhunter daily stats rebuilt")
+
+@router.get("/candidate-duplicates",
+    response_model=DuplicateClusterListResponse,
+    summary="Find duplicate candidates",
+    description="Group all candidates sharing a normalized phone, email, or name and year of birth into clusters"
+)
+async def list_candidate_duplicates(
+    strong_only: bool = Query(False, description="Only link candidates sharing a phone or email"),
+    min_size: int = Query(2, ge=2, description="Minimum number of candidates in a cluster"),
+    limit: int = Query(100, ge=1, le=10000, description="Maximum number of clusters to return"),
+    candidate_repo: CandidateRepository = Depends(get_candidate_repository)
+) -> DuplicateClusterListResponse:
+    """
+    Scan the whole candidate table for duplicate clusters, largest first.
+
+    :param bool strong_only: Only link candidates sharing a phone or email.
+    :param int min_size: Minimum number of candidates in a cluster.
+    :param int limit: Maximum number of clusters to return.
+    :return: DuplicateClusterListResponse: Clusters with their candidate IDs and linking keys.
+    :rtype: DuplicateClusterListResponse
+    :raises HTTPException: If the scan fails.
+    """
+    try:
+        clusters = candidate_repo.find_duplicate_clusters(strong_only=strong_only, min_size=min_size)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return DuplicateClusterListResponse(
+        success=True,
+        message=f"Found {len(clusters)} duplicate clusters",
+        data=[DuplicateCluster(**cluster) for cluster in clusters[:limit]]
+    )
+
+@router.post("/candidate-duplicates/refresh",
+    response_model=BaseResponse,
+    summary="Rebuild candidate duplicate keys",
+    description="Recompute the normalized phone, email and name keys of every candidate, e.g. after a bulk load or manual SQL"
+)
+async def refresh_candidate_duplicate_keys(
+    candidate_repo: CandidateRepository = Depends(get_candidate_repository)
+) -> BaseResponse:
+    """
+    Rebuild the duplicate keys of all candidates.
+
+    :return: BaseResponse: Confirmation of the operation.
+    :rtype: BaseResponse
+    :raises HTTPException: If the refresh fails.
+    """
+    try:
+        candidate_repo.refresh_duplicate_keys()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    logger.info("Candidate duplicate keys rebuilt")
+    return BaseResponse(success=True, message="Candidate duplicate keys rebuilt")
@@ -0,0 +1,216 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+import datetime
+from cims.core.analytics import LeaderboardMetric, build_funnel, build_leaderboard, period_start
+from cims.core.entities.nominee import NomineeStatus
+from cims.core.repositories.headhunter_repository import HeadhunterRepository, StatsPeriod
+from cims.core.repositories.nominee_repository import NomineeRepository
+from cims.core.repositories.project_repository import ProjectRepository
+from cims.core.salary_stats import SALARY_DIMENSIONS, SalaryDimension, compute_salary_stats, percentile_rank, salary_stats_cache
+from cims.deps import get_headhunter_repository, get_nominee_repository, get_project_repository
+from cims.schemas import (
+    FunnelSummary,
+    FunnelResponse,
+    LeaderboardSummary,
+    LeaderboardResponse,
+    SalaryStatsSummary,
+    SalaryStatsResponse,
+    BudgetCheck,
+    BudgetCheckResponse,
+    ErrorResponse,
+)
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["analytics"],
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid request data"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    }
+)
+
+@router.get("/funnel",
+    response_model=FunnelResponse,
+    summary="Recruitment funnel",
+    description="Count nominees per pipeline stage and the conversion between stages, aggregated in the database"
+)
+async def get_funnel(
+    project_id: Optional[int] = Query(None, gt=0, description="Project ID filter"),
+    customer_id: Optional[int] = Query(None, gt=0, description="Customer ID filter"),
+    campaign: Optional[str] = Query(None, min_length=1, description="Campaign filter (exact match)"),
+    headhunter_id: Optional[int] = Query(None, gt=0, description="Headhunter ID filter, by candidate owner"),
+    created_from: Optional[datetime.date] = Query(None, description="Only nominees created on or after this day"),
+    created_to: Optional[datetime.date] = Query(None, description="Only nominees created on or before this day"),
+    nominee_repo: NomineeRepository = Depends(get_nominee_repository)
+) -> FunnelResponse:
+    """
+    Get the recruitment funnel for the nominees matching the filters.
+
+    :return: FunnelResponse: Stage counts with conversion and rejection rates.
+    :rtype: FunnelResponse
+    :raises HTTPException: If the date window is empty or the query fails.
+    """
+    if created_from and created_to and created_from > created_to:
+        raise HTTPException(status_code=400, detail="created_from must not be after created_to")
+
+    try:
+        status_counts = nominee_repo.count_nominees_by_status(
+            project_id=project_id,
+            customer_id=customer_id,
+            campaign=campaign,
+            headhunter_id=headhunter_id,
+            created_from=created_from,
+            created_to=created_to
+        )
+        funnel = build_funnel(status_counts)
+
+        return FunnelResponse(
+            success=True,
+            message=f"Funnel computed over {funnel['total']} nominees",
+            data=FunnelSummary(**funnel)
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/leaderboard",
+    response_model=LeaderboardResponse,
+    summary="Headhunter leaderboard",
+    description="Rank headhunters per week, month or quarter by contracts signed, nominees or candidates sourced"
+)
+async def get_leaderboard(
+    period: StatsPeriod = Query("month", description="Bucket size; weeks start on Monday"),
+    start: Optional[datetime.date] = Query(None, description="First day covered; defaults to the start of the period containing end"),
+    end: Optional[datetime.date] = Query(None, description="Last day covered; defaults to today (UTC)"),
+    rank_by: LeaderboardMetric = Query("contracts_signed", description="Count to rank headhunters by"),
+    limit: int = Query(10, ge=1, le=100, description="Maximum number of headhunters per period"),
+    headhunter_repo: HeadhunterRepository = Depends(get_headhunter_repository)
+) -> LeaderboardResponse:
+    """
+    Get the headhunter leaderboard for every period between start and end.
+
+    Days are UTC days. Nominees count towards the period they were nominated in,
+    with their current status; periods cut by the window only count the days inside it.
+
+    :return: LeaderboardResponse: Ranked headhunters per period.
+    :rtype: LeaderboardResponse
+    :raises HTTPException: If the date window is empty or the query fails.
+    """
+    end = end or datetime.datetime.now(datetime.timezone.utc).date()
+    start = start or period_start(end, period)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    try:
+        period_stats = headhunter_repo.get_period_stats(period, start, end)
+        periods = build_leaderboard(period_stats, period, rank_by, limit)
+
+        return LeaderboardResponse(
+            success=True,
+            message=f"Leaderboard computed over {len(periods)} periods",
+            data=LeaderboardSummary(period=period, rank_by=rank_by, start=start, end=end, periods=periods)
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/salaries",
+    response_model=SalaryStatsResponse,
+    summary="Salary expectation statistics",
+    description="Percentiles, histograms and experience regressions of nominee salary expectations per project expertise, level and area"
+)
+async def get_salary_stats(
+    group_by: List[SalaryDimension] = Query(list(SALARY_DIMENSIONS), description="Dimensions to group by"),
+    expertise_id: Optional[int] = Query(None, gt=0, description="Project expertise filter"),
+    level_id: Optional[int] = Query(None, gt=0, description="Project level filter"),
+    area_id: Optional[int] = Query(None, gt=0, description="Project area filter"),
+    status: Optional[NomineeStatus] = Query(None, description="Nominee status filter"),
+    bins: int = Query(10, ge=1, le=100, description="Number of histogram bins"),
+    min_samples: int = Query(1, ge=1, description="Leave out groups with fewer nominees"),
+    nominee_repo: NomineeRepository = Depends(get_nominee_repository)
+) -> SalaryStatsResponse:
+    """
+    Get salary expectation statistics per group.
+
+    Results are cached until nominees change.
+
+    :return: SalaryStatsResponse: One entry per group with spread, histogram and regression.
+    :rtype: SalaryStatsResponse
+    :raises HTTPException: If the query fails.
+    """
+    dimensions = [dimension for dimension in SALARY_DIMENSIONS if dimension in group_by]
+    key = ("groups", tuple(dimensions), expertise_id, level_id, area_id, status, bins, min_samples)
+
+    try:
+        groups = salary_stats_cache.get(key)
+        if groups is None:
+            generation = salary_stats_cache.generation
+            columns = nominee_repo.get_salary_columns(expertise_id=expertise_id, level_id=level_id, area_id=area_id, status=status)
+            groups = compute_salary_stats(columns, dimensions, bins=bins, min_samples=min_samples)
+            salary_stats_cache.put(key, groups, generation)
+
+        total = sum(group["count"] for group in groups)
+        return SalaryStatsResponse(
+            success=True,
+            message=f"Salary statistics computed for {len(groups)} groups",
+            data=SalaryStatsSummary(group_by=dimensions, total=total, groups=groups)
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/salaries/budget-check/{project_id}",
+    response_model=BudgetCheckResponse,
+    summary="Project budget check",
+    description="Compare a project's budget per recruit with the salary expectations of nominees for projects with the same expertise, level and area",
+    responses={404: {"model": ErrorResponse, "description": "Project not found"}}
+)
+async def check_project_budget(
+    project_id: int,
+    project_repo: ProjectRepository = Depends(get_project_repository),
+    nominee_repo: NomineeRepository = Depends(get_nominee_repository)
+) -> BudgetCheckResponse:
+    """
+    Rank a project's budget per recruit among comparable salary expectations.
+
+    :return: BudgetCheckResponse: The percentile rank of the budget and the comparable statistics.
+    :rtype: BudgetCheckResponse
+    :raises HTTPException: If the project does not exist or the query fails.
+    """
+    project = project_repo.get_project_by_id(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail=f"Project with ID {project_id} not found")
+
+    key = ("budget", project.expertise_id, project.level_id, project.area_id)
+    try:
+        cached = salary_stats_cache.get(key)
+        if cached is None:
+            generation = salary_stats_cache.generation
+            columns = nominee_repo.get_salary_columns(expertise_id=project.expertise_id, level_id=project.level_id, area_id=project.area_id)
+            groups = compute_salary_stats(columns, list(SALARY_DIMENSIONS))
+            cached = (groups[0] if groups else None, columns["salary_expectation"])
+            salary_stats_cache.put(key, cached, generation)
+        stats, salaries = cached
+
+        budget_per_recruit = project.budget / max(project.required_recruits, 1)
+        assessment = None
+        if stats:
+            assessment = "low" if budget_per_recruit < stats["percentiles"]["p25"] else "high" if budget_per_recruit > stats["percentiles"]["p75"] else "typical"
+
+        return BudgetCheckResponse(
+            success=True,
+            message=f"Budget compared with {len(salaries)} salary expectations",
+            data=BudgetCheck(
+                project_id=project_id,
+                budget=project.budget,
+                budget_currency=project.budget_currency,
+                required_recruits=project.required_recruits,
+                budget_per_recruit=round(budget_per_recruit, 2),
+                percentile_rank=percentile_rank(salaries, budget_per_recruit),
+                assessment=assessment,
+                stats=stats
+            )
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -111,13 +111,12 @@ async def login_headhunter(
             data=token_data
         )
     except NotFoundError as e:
-        logger.error(f"Headhunter not found: {str(e)}")
-        logger.error(traceback.format_exc())
+        # Expected client errors: no traceback, so failed login bursts stay cheap to log
+        logger.warning(f"Headhunter not found: {str(e)}")
         raise HTTPException(status_code=404, detail=str(e))
     
     except InvalidCredentialsError as e:
-        logger.error(f"Authentication failed for user {form_data.username}: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.warning(f"Authentication failed for user {form_data.username}: {str(e)}")
         raise HTTPException(status_code=401, detail=str(e))
     
     except Exception as e:
@@ -1,6 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from typing import Optional, Any
+import csv
 import datetime
+import io
+import json
+
+from cims.api.export import ExportFormat, create_export_response
 
 from cims.core.repositories.candidate_repository import CandidateRepository
 from cims.core.repositories.expertise_repository import ExpertiseRepository
@@ -8,15 +17,22 @@ from cims.core.repositories.field_repository import FieldRepository
 from cims.core.repositories.area_repository import AreaRepository
 from cims.core.repositories.level_repository import LevelRepository
 from cims.core.repositories.headhunter_repository import HeadhunterRepository
+from cims.core.repositories.nominee_repository import NomineeRepository
+from cims.core.repositories.project_repository import ProjectRepository
 from cims.core.entities.candidate import Candidate
+from cims.core.dedup import STRONG_KEYS, duplicate_keys, is_strong_match
 from cims.core.exceptions import NotFoundError
+from cims.config import settings
 from cims.deps import (
+    get_db_session,
     get_candidate_repository,
     get_expertise_repository,
     get_field_repository,
     get_area_repository,
     get_level_repository,
-    get_headhunter_repository
+    get_headhunter_repository,
+    get_nominee_repository,
+    get_project_repository,
 )
 from cims.schemas import (
     CandidateCreate,
@@ -24,9 +40,25 @@ from cims.schemas import (
     CandidateResponse,
     CandidateDetailResponse,
     CandidateListResponse,
+    CandidateImportRowResult,
+    CandidateImportSummary,
+    CandidateImportResponse,
+    CandidateCreateResponse,
+    DuplicateCandidate,
+    HeadhunterResponse,
+    NomineeResponse,
+    ProjectResponse,
     ErrorResponse,
 )
-from cims.schemas.utils import create_list_response, entity_to_response_model
+from cims.schemas.utils import (
+    create_list_response,
+    create_sparse_list_response,
+    create_included_response,
+    entity_to_response_model,
+    parse_fields_param,
+    parse_include_param,
+    sparse_columns,
+)
 
 router = APIRouter(
     prefix="/candidates",
@@ -38,49 +70,343 @@ router = APIRouter(
     }
 )
 
+# Upper bound on the number of rows accepted by a single bulk import
+BULK_IMPORT_MAX_ROWS = 50000
+
+# Enriched name fields and the candidate column each one is resolved from
+CANDIDATE_NAME_LOOKUPS = {
+    "expertise_name": "expertise_id",
+    "field_name": "field_id",
+    "area_name": "area_id",
+    "level_name": "level_id",
+    "headhunter_name": "headhunter_id",
+}
+
+def _populate_candidate_names(
+    rows: list[dict[str, Any]],
+    selected: list[str],
+    expertise_repo: ExpertiseRepository,
+    field_repo: FieldRepository,
+    area_repo: AreaRepository,
+    level_repo: LevelRepository,
+    headhunter_repo: HeadhunterRepository,
+) -> None:
+    """Resolve the requested name fields on candidate rows, skipping lookups that were not requested."""
+    if not rows:
+        return
+
+    resolvers = {
+        "expertise_name": lambda ids: {e.expertise_id: e.name for e in expertise_repo.get_expertises_by_ids(ids)},
+        "field_name": lambda ids: {f.field_id: f.name for f in field_repo.get_fields_by_ids(ids)},
+        "area_name": lambda ids: {a.area_id: a.name for a in area_repo.get_areas_by_ids(ids)},
+        "level_name": lambda ids: {l.level_id: l.name for l in level_repo.get_levels_by_ids(ids)},
+        "headhunter_name": lambda ids: {h.headhunter_id: h.name for h in headhunter_repo.get_headhunters_by_ids(ids)},
+    }
+
+    for name_field, resolve in resolvers.items():
+        if name_field not in selected:
+            continue
+        id_field = CANDIDATE_NAME_LOOKUPS[name_field]
+        name_map = resolve(list({row[id_field] for row in rows}))
+        for row in rows:
+            row[name_field] = name_map.get(row[id_field])
+
+# Related entities that can be embedded into candidate responses with include=
+CANDIDATE_INCLUDES = {"headhunter", "nominees", "nominees.project"}
+
+def _include_candidate_relations(
+    items: list[dict[str, Any]],
+    includes: set[str],
+    headhunter_repo: HeadhunterRepository,
+    nominee_repo: NomineeRepository,
+    project_repo: ProjectRepository,
+) -> None:
+    """Embed the requested related entities into serialized candidates, using one batched query per relation."""
+    if not items:
+        return
+
+    if "headhunter" in includes:
+        headhunters = headhunter_repo.get_headhunters_by_ids(list({item["headhunter_id"] for item in items}))
+        headhunter_map = {h.headhunter_id: entity_to_response_model(h, HeadhunterResponse).model_dump() for h in headhunters}
+        for item in items:
+            item["headhunter"] = headhunter_map.get(item["headhunter_id"])
+
+    if "nominees" in includes:
+        nominees = nominee_repo.get_nominees_by_candidate_ids([item["candidate_id"] for item in items])
+        nominee_dicts = [entity_to_response_model(n, NomineeResponse).model_dump() for n in nominees]
+
+        if "nominees.project" in includes:
+            projects = project_repo.get_projects_by_ids(list({n.project_id for n in nominees}))
+            project_map = {p.project_id: entity_to_response_model(p, ProjectResponse).model_dump() for p in projects}
+            for nominee in nominee_dicts:
+                project = project_map.get(nominee["project_id"])
+                nominee["project"] = project
+                nominee["project_name"] = project["name"] if project else None
+
+        nominees_by_candidate: dict[int, list[dict[str, Any]]] = {item["candidate_id"]: [] for item in items}
+        for nominee in nominee_dicts:
+            nominees_by_candidate[nominee["candidate_id"]].append(nominee)
+        for item in items:
+            for nominee in nominees_by_candidate[item["candidate_id"]]:
+                nominee["nominee_name"] = item["name"]
+            item["nominees"] = nominees_by_candidate[item["candidate_id"]]
+
+def _candidate_from_create(candidate_data: CandidateCreate) -> Candidate:
+    """Build a new candidate entity from validated create data."""
+    return Candidate(
+        candidate_id=None,
+        name=candidate_data.name,
+        phone=candidate_data.phone,
+        email=str(candidate_data.email),
+        year_of_birth=candidate_data.year_of_birth,
+        gender=candidate_data.gender,
+        education=candidate_data.education,
+        source=candidate_data.source,
+        expertise_id=candidate_data.expertise_id,
+        field_id=candidate_data.field_id,
+        area_id=candidate_data.area_id,
+        level_id=candidate_data.level_id,
+        headhunter_id=candidate_data.headhunter_id,
+        note=candidate_data.note,
+        created_at=None,
+        updated_at=None
+    )
+
+def _parse_csv_rows(content: bytes) -> list[dict[str, Any]]:
+    """Parse CSV content into row dicts, dropping empty cells so optional fields fall back to defaults."""
+    reader = csv.DictReader(io.StringIO(content.decode("utf-8-sig")))
+    return [
+        {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+        for row in reader
+    ]
+
+def _insert_import_batch(candidate_repo: CandidateRepository, batch: list[tuple[CandidateImportRowResult, Candidate]]) -> None:
+    """
+    Insert a batch with one multi-row insert and commit, recording the created IDs.
+
+    A failing batch is retried row by row, so only the rows that cannot be
+    inserted are marked failed, each with its own error.
+    """
+    try:
+        created = candidate_repo.create_many([candidate for _, candidate in batch])
+    except Exception as e:
+        if len(batch) > 1:
+            for row in batch:
+                _insert_import_batch(candidate_repo, [row])
+            return
+        result, _ = batch[0]
+        result.success = False
+        result.errors = [f"Insert failed: {str(getattr(e, 'orig', e)).strip()}"]
+        return
+
+    for (result, _), created_candidate in zip(batch, created):
+        result.candidate_id = created_candidate.candidate_id
+
+def _check_import_duplicates(
+    candidate_repo: CandidateRepository,
+    pending: list[tuple[CandidateImportRowResult, Candidate]],
+    allow_duplicate: bool
+) -> list[tuple[CandidateImportRowResult, Candidate]]:
+    """
+    Apply DUPLICATE_CANDIDATE_POLICY to the valid rows of an import and return those to insert.
+
+    Every row reports the existing candidates it may duplicate, looked up for
+    all rows at once. With the "reject" policy a row sharing a phone or email
+    with an existing candidate, or with an earlier row of the same import,
+    fails unless allow_duplicate is set.
+    """
+    policy = settings.DUPLICATE_CANDIDATE_POLICY
+    if policy == "off" or not pending:
+        return pending
+
+    rejecting = policy == "reject" and not allow_duplicate
+    accepted: list[tuple[CandidateImportRowResult, Candidate]] = []
+    rows_by_key: dict[tuple[str, str], int] = {}
+    for (result, candidate), duplicates in zip(pending, candidate_repo.find_duplicates_many([candidate for _, candidate in pending])):
+        result.duplicates = [DuplicateCandidate(**duplicate) for duplicate in duplicates]
+        strong = [duplicate for duplicate in duplicates if is_strong_match(duplicate["reasons"])]
+        keys = duplicate_keys(candidate.name, candidate.phone, candidate.email, candidate.year_of_birth)
+        strong_keys = [(key, keys[key]) for key in STRONG_KEYS if keys[key]]
+        earlier = sorted({rows_by_key[key] for key in strong_keys if key in rows_by_key})
+        if rejecting and (strong or earlier):
+            result.success = False
+            if strong:
+                result.errors.append(f"Candidate already exists with the same phone or email: {', '.join(str(d['candidate_id']) for d in strong)}")
+            if earlier:
+                result.errors.append(f"Same phone or email as row {', '.join(str(row) for row in earlier)}")
+            continue
+        for key in strong_keys:
+            rows_by_key.setdefault(key, result.row)
+        accepted.append((result, candidate))
+    return accepted
+
+async def _read_import_rows(request: Request) -> list[Any]:
+    """Read bulk import rows from a JSON array, a raw CSV body or a multipart CSV upload."""
+    content_type = request.headers.get("content-type", "")
+
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise ValueError("Multipart uploads must include a 'file' part")
+        return _parse_csv_rows(await upload.read())
+
+    body = await request.body()
+    if content_type.startswith("text/csv"):
+        return _parse_csv_rows(body)
+
+    try:
+        payload = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON body: {e.msg}")
+    if not isinstance(payload, list):
+        raise ValueError("Expected a JSON array of candidates")
+    return payload
+
 @router.post("/",
-    response_model=CandidateDetailResponse,
+    response_model=CandidateCreateResponse,
     status_code=201,
     summary="Create a new candidate",
-    description="Create a new candidate in the system"
+    description="Create a new candidate in the system, reporting or rejecting likely duplicates per DUPLICATE_CANDIDATE_POLICY",
+    responses={409: {"model": ErrorResponse, "description": "A candidate with the same phone or email exists"}}
 )
 async def create_candidate(
     candidate_data: CandidateCreate,
+    allow_duplicate: bool = Query(False, description="Create the candidate even if the policy rejects duplicates"),
     candidate_repo: CandidateRepository = Depends(get_candidate_repository),
 ):
-    """Create a new candidate."""
+    """
+    Create a new candidate.
+
+    Existing candidates sharing a normalized phone, email, or name and year of
+    birth are returned as duplicates. With the "reject" policy a shared phone
+    or email fails the request with 409 unless allow_duplicate is set. The check
+    is a lookup on indexed keys before the insert, so two concurrent requests
+    can still both pass; the duplicate scan in the admin API finds those.
+    """
     try:
-        candidate = Candidate(
-            candidate_id=None,
-            name=candidate_data.name,
-            phone=candidate_data.phone,
-            email=str(candidate_data.email),
-            year_of_birth=candidate_data.year_of_birth,
-            gender=candidate_data.gender,
-            education=candidate_data.education,
-            source=candidate_data.source,
-            expertise_id=candidate_data.expertise_id,
-            field_id=candidate_data.field_id,
-            area_id=candidate_data.area_id,
-            level_id=candidate_data.level_id,
-            headhunter_id=candidate_data.headhunter_id,
-            note=candidate_data.note,
-            created_at=None,
-            updated_at=None
-        )
-        
+        candidate = _candidate_from_create(candidate_data)
+
+        policy = settings.DUPLICATE_CANDIDATE_POLICY
+        duplicates = candidate_repo.find_duplicates(candidate) if policy != "off" else []
+        strong = [duplicate for duplicate in duplicates if is_strong_match(duplicate["reasons"])]
+        if policy == "reject" and strong and not allow_duplicate:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Candidate already exists with the same phone or email: {', '.join(str(d['candidate_id']) for d in strong)}"
+            )
+
         created_candidate = candidate_repo.create_candidate(candidate)
         candidate_response = entity_to_response_model(created_candidate, CandidateResponse)
-        
-        return CandidateDetailResponse(
+
+        message = "Candidate created successfully"
+        if duplicates:
+            message += f"; possible duplicate of {', '.join(str(d['candidate_id']) for d in duplicates)}"
+        return CandidateCreateResponse(
             success=True,
-            message="Candidate created successfully",
-            data=candidate_response
+            message=message,
+            data=candidate_response,
+            duplicates=[DuplicateCandidate(**duplicate) for duplicate in duplicates]
         )
-        
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/bulk",
+    response_model=CandidateImportResponse,
+    summary="Bulk import candidates",
+    description="Import candidates from a JSON array or a CSV upload, inserting valid rows in batches; likely duplicates are reported or rejected per DUPLICATE_CANDIDATE_POLICY",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": {"$ref": "#/components/schemas/CandidateCreate"}}
+                },
+                "text/csv": {"schema": {"type": "string"}},
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"file": {"type": "string", "format": "binary"}},
+                        "required": ["file"],
+                    }
+                },
+            },
+        }
+    }
+)
+async def bulk_import_candidates(
+    request: Request,
+    dry_run: bool = Query(False, description="Only validate rows without inserting them"),
+    batch_size: int = Query(500, ge=1, le=5000, description="Number of rows inserted per statement and commit"),
+    allow_duplicate: bool = Query(False, description="Import rows even if the policy rejects duplicates"),
+    candidate_repo: CandidateRepository = Depends(get_candidate_repository),
+):
+    """
+    Validate every row with CandidateCreate and insert the valid ones in batches.
+
+    Rows are checked for duplicates like single creates, see
+    _check_import_duplicates; the check also runs on dry runs.
+    """
+    try:
+        items = await _read_import_rows(request)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if len(items) > BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Bulk import is limited to {BULK_IMPORT_MAX_ROWS} rows per request"
+        )
+
+    try:
+        results = [CandidateImportRowResult(row=index + 1, success=True) for index in range(len(items))]
+        pending: list[tuple[CandidateImportRowResult, Candidate]] = []
+
+        for result, item in zip(results, items):
+            try:
+                pending.append((result, _candidate_from_create(CandidateCreate.model_validate(item))))
+            except ValidationError as e:
+                result.success = False
+                result.errors = [
+                    f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+                    for error in e.errors()
+                ]
+            except ValueError as e:
+                result.success = False
+                result.errors = [str(e)]
+
+        pending = _check_import_duplicates(candidate_repo, pending, allow_duplicate)
+
+        if not dry_run:
+            for start in range(0, len(pending), batch_size):
+                _insert_import_batch(candidate_repo, pending[start:start + batch_size])
+
+        succeeded = sum(1 for result in results if result.success)
+        failed = len(results) - succeeded
+        action = "validated" if dry_run else "imported"
+        message = f"{succeeded} of {len(results)} candidates {action}"
+        possible_duplicates = sum(1 for result in results if result.success and result.duplicates)
+        if possible_duplicates:
+            message += f"; {possible_duplicates} possible duplicates"
+
+        return CandidateImportResponse(
+            success=failed == 0,
+            message=message,
+            data=CandidateImportSummary(
+                total=len(results),
+                succeeded=succeeded,
+                failed=failed,
+                dry_run=dry_run,
+                results=results
+            )
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/",
     response_model=CandidateListResponse,
     summary="Get all candidates",
@@ -89,6 +415,7 @@ async def create_candidate(
 async def get_candidates(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return for each candidate"),
     candidate_repo: CandidateRepository = Depends(get_candidate_repository),
     expertise_repo: ExpertiseRepository = Depends(get_expertise_repository),
     field_repo: FieldRepository = Depends(get_field_repository),
@@ -97,8 +424,32 @@ async def get_candidates(
     headhunter_repo: HeadhunterRepository = Depends(get_headhunter_repository),
 ):
     """Get all candidates with pagination."""
+    try:
+        selected = parse_fields_param(fields, CandidateResponse, always_include=("candidate_id",))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         offset = (page - 1) * page_size
+
+        if selected:
+            rows = candidate_repo.get_candidate_rows(
+                fields=sparse_columns(selected, CANDIDATE_NAME_LOOKUPS),
+                limit=page_size,
+                offset=offset
+            )
+            total = candidate_repo.count_all_candidates()
+            _populate_candidate_names(rows, selected, expertise_repo, field_repo, area_repo, level_repo, headhunter_repo)
+
+            return create_sparse_list_response(
+                data=rows,
+                selected=selected,
+                total=total,
+                page=page,
+                page_size=page_size,
+                message="Candidates retrieved successfully"
+            )
+
         candidates = candidate_repo.get_all_candidates(limit=page_size, offset=offset)
         total = candidate_repo.count_all_candidates()
 
@@ -155,6 +506,7 @@ async def search_candidates(
     headhunter_id: Optional[int] = Query(None, description="Headhunter ID filter"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return for each candidate"),
     candidate_repo: CandidateRepository = Depends(get_candidate_repository),
     expertise_repo: ExpertiseRepository = Depends(get_expertise_repository),
     field_repo: FieldRepository = Depends(get_field_repository),
@@ -163,6 +515,11 @@ async def search_candidates(
     headhunter_repo: HeadhunterRepository = Depends(get_headhunter_repository)
 ):
     """Search candidates by name and/or filters."""
+    try:
+        selected = parse_fields_param(fields, CandidateResponse, always_include=("candidate_id",))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         # Validate that at least one search criteria is provided
         has_query = query and query.strip()
@@ -178,23 +535,57 @@ async def search_candidates(
         search_name = query.strip() if (query and query.strip()) else None
         
         offset = (page - 1) * page_size
-        candidates = candidate_repo.search_candidates_with_filters(
+
+        # Counting brings the name index up to date first, which can be a full rebuild; keep it off the event loop
+        total = await run_in_threadpool(
+            candidate_repo.count_candidates_with_filters,
             name=search_name,
             expertise_id=expertise_id,
             field_id=field_id,
             area_id=area_id,
             level_id=level_id,
-            headhunter_id=headhunter_id,
-            limit=page_size,
-            offset=offset
         )
 
-        total = candidate_repo.count_candidates_with_filters(
+        search_description = []
+        if search_name:
+            search_description.append(f"query '{search_name}'")
+        if any([expertise_id, field_id, area_id, level_id]):
+            search_description.append("filters")
+        
+        message = f"Found {total} candidates matching {' and '.join(search_description)}"
+
+        if selected:
+            rows = candidate_repo.get_candidate_rows(
+                fields=sparse_columns(selected, CANDIDATE_NAME_LOOKUPS),
+                name=search_name,
+                expertise_id=expertise_id,
+                field_id=field_id,
+                area_id=area_id,
+                level_id=level_id,
+                headhunter_id=headhunter_id,
+                limit=page_size,
+                offset=offset
+            )
+            _populate_candidate_names(rows, selected, expertise_repo, field_repo, area_repo, level_repo, headhunter_repo)
+
+            return create_sparse_list_response(
+                data=rows,
+                selected=selected,
+                total=total,
+                page=page,
+                page_size=page_size,
+                message=message
+            )
+
+        candidates = candidate_repo.search_candidates_with_filters(
             name=search_name,
             expertise_id=expertise_id,
             field_id=field_id,
             area_id=area_id,
             level_id=level_id,
+            headhunter_id=headhunter_id,
+            limit=page_size,
+            offset=offset
         )
 
         candidate_responses = [entity_to_response_model(candidate, CandidateResponse) for candidate in candidates]
@@ -225,14 +616,6 @@ async def search_candidates(
                 candidate_response.level_name = level_map.get(candidate_response.level_id)
                 candidate_response.headhunter_name = headhunter_map.get(candidate_response.headhunter_id)
         
-        search_description = []
-        if search_name:
-            search_description.append(f"query '{search_name}'")
-        if any([expertise_id, field_id, area_id, level_id]):
-            search_description.append("filters")
-        
-        message = f"Found {total} candidates matching {' and '.join(search_description)}"
-        
         return create_list_response(
             data=candidate_responses,
             total=total,
@@ -244,6 +627,45 @@ async def search_candidates(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/export",
+    response_class=StreamingResponse,
+    summary="Export candidates",
+    description="Stream all candidates matching the filters as NDJSON or CSV"
+)
+async def export_candidates(
+    export_format: ExportFormat = Query("ndjson", alias="format", description="Export format: ndjson or csv"),
+    query: Optional[str] = Query(None, description="Name filter"),
+    expertise_id: Optional[int] = Query(None, description="Expertise ID filter"),
+    field_id: Optional[int] = Query(None, description="Field ID filter"),
+    area_id: Optional[int] = Query(None, description="Area ID filter"),
+    level_id: Optional[int] = Query(None, description="Level ID filter"),
+    headhunter_id: Optional[int] = Query(None, description="Headhunter ID filter"),
+    db_session: Session = Depends(get_db_session),
+    candidate_repo: CandidateRepository = Depends(get_candidate_repository)
+):
+    """Export candidates without pagination, streaming rows as they are read."""
+    try:
+        rows = candidate_repo.iter_candidate_rows(
+            name=query.strip() if query and query.strip() else None,
+            expertise_id=expertise_id,
+            field_id=field_id,
+            area_id=area_id,
+            level_id=level_id,
+            headhunter_id=headhunter_id,
+        )
+
+        # The session has to outlive the request handler while rows are streamed
+        return create_export_response(
+            rows=rows,
+            columns=list(CandidateResponse.model_fields),
+            export_format=export_format,
+            filename="candidates",
+            on_close=db_session.close
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/{candidate_id}",
     response_model=CandidateDetailResponse,
     summary="Get candidate by ID",
@@ -251,9 +673,18 @@ async def search_candidates(
 )
 async def get_candidate(
     candidate_id: int,
-    candidate_repo: CandidateRepository = Depends(get_candidate_repository)
+    include: Optional[str] = Query(None, description="Comma-separated related entities to embed: headhunter, nominees, nominees.project"),
+    candidate_repo: CandidateRepository = Depends(get_candidate_repository),
+    headhunter_repo: HeadhunterRepository = Depends(get_headhunter_repository),
+    nominee_repo: NomineeRepository = Depends(get_nominee_repository),
+    project_repo: ProjectRepository = Depends(get_project_repository)
 ):
     """Get a candidate by ID."""
+    try:
+        includes = parse_include_param(include, CANDIDATE_INCLUDES)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         candidate = candidate_repo.get_candidate_by_id(candidate_id)
         
@@ -262,11 +693,19 @@ async def get_candidate(
         
         candidate_response = entity_to_response_model(candidate, CandidateResponse)
         
-        return CandidateDetailResponse(
+        detail_response = CandidateDetailResponse(
             success=True,
             message="Candidate retrieved successfully",
             data=candidate_response
         )
+
+        if includes:
+            return create_included_response(
+                detail_response,
+                lambda items: _include_candidate_relations(items, includes, headhunter_repo, nominee_repo, project_repo)
+            )
+
+        return detail_response
         
     except HTTPException:
         raise
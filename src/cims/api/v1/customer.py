@@ -1,5 +1,7 @@
 from cims.core.repositories.field_repository import FieldRepository
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional, Any
 import datetime
 from cims.core.repositories.customer_repository import CustomerRepository
 from cims.core.entities.customer import Customer
@@ -13,7 +15,13 @@ from cims.schemas import (
     CustomerListResponse,
     ErrorResponse,
 )
-from cims.schemas.utils import create_list_response, entity_to_response_model
+from cims.schemas.utils import (
+    create_list_response,
+    create_sparse_list_response,
+    entity_to_response_model,
+    parse_fields_param,
+    sparse_columns,
+)
 
 router = APIRouter(
     prefix="/customers",
@@ -25,6 +33,21 @@ router = APIRouter(
     }
 )
 
+# Enriched name fields and the customer column each one is resolved from
+CUSTOMER_NAME_LOOKUPS = {
+    "field_name": "field_id",
+}
+
+def _populate_customer_names(rows: list[dict[str, Any]], selected: list[str], field_repo: FieldRepository) -> None:
+    """Resolve the requested name fields on customer rows, skipping lookups that were not requested."""
+    if not rows or "field_name" not in selected:
+        return
+
+    fields = field_repo.get_fields_by_ids(list({row["field_id"] for row in rows}))
+    field_map = {f.field_id: f.name for f in fields}
+    for row in rows:
+        row["field_name"] = field_map.get(row["field_id"])
+
 @router.post("/",
     response_model=CustomerDetailResponse,
     status_code=201,
@@ -69,12 +92,36 @@ async def create_customer(
 async def get_customers(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return for each customer"),
     customer_repo: CustomerRepository = Depends(get_customer_repository),
     field_repo: FieldRepository = Depends(get_field_repository)
 ):
     """Get all customers with pagination."""
+    try:
+        selected = parse_fields_param(fields, CustomerResponse, always_include=("customer_id",))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         offset = (page - 1) * page_size
+
+        if selected:
+            rows = customer_repo.get_customer_rows(
+                fields=sparse_columns(selected, CUSTOMER_NAME_LOOKUPS),
+                limit=page_size,
+                offset=offset
+            )
+            _populate_customer_names(rows, selected, field_repo)
+
+            return create_sparse_list_response(
+                data=rows,
+                selected=selected,
+                total=len(rows),
+                page=page,
+                page_size=page_size,
+                message="Customers retrieved successfully"
+            )
+
         customers = customer_repo.get_all_customers(limit=page_size, offset=offset)
         
         customer_responses = [entity_to_response_model(customer, CustomerResponse) for customer in customers]
@@ -109,13 +156,43 @@ async def search_customers(
     query: str = Query(..., min_length=1, description="Search query"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return for each customer"),
     customer_repo: CustomerRepository = Depends(get_customer_repository),
     field_repo: FieldRepository = Depends(get_field_repository)
 ):
     """Search customers by name, email, company, or phone."""
+    try:
+        selected = parse_fields_param(fields, CustomerResponse, always_include=("customer_id",))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         offset = (page - 1) * page_size
-        customers = customer_repo.search_customers_by_name(
+
+        if selected:
+            # A name search can rebuild the name index first; keep it off the event loop
+            rows = await run_in_threadpool(
+                customer_repo.get_customer_rows,
+                fields=sparse_columns(selected, CUSTOMER_NAME_LOOKUPS),
+                name_query=query,
+                limit=page_size,
+                offset=offset
+            )
+            _populate_customer_names(rows, selected, field_repo)
+
+            total = len(rows)
+
+            return create_sparse_list_response(
+                data=rows,
+                selected=selected,
+                total=total,
+                page=page,
+                page_size=page_size,
+                message=f"Found {total} customers matching '{query}'"
+            )
+
+        customers = await run_in_threadpool(
+            customer_repo.search_customers_by_name,
             name_query=query,
             limit=page_size,
             offset=offset
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from cims.api.sse import create_event_stream_response, iter_change_events
+from cims.core.change_events import ChangeEntityType, ChangeEventFilter, change_event_bus
+from cims.config import settings
+from cims.schemas import ErrorResponse
+
+router = APIRouter(
+    prefix="/events",
+    tags=["events"],
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid filter or event ID"},
+        404: {"model": ErrorResponse, "description": "Change events are disabled"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    }
+)
+
+@router.get("/stream",
+    response_class=StreamingResponse,
+    summary="Stream entity changes",
+    description="Push committed candidate, customer, project and nominee changes as server-sent events"
+)
+async def stream_changes(
+    entity_type: Optional[list[ChangeEntityType]] = Query(None, description="Only changes of these entity types"),
+    project_id: Optional[int] = Query(None, description="Only changes concerning this project"),
+    customer_id: Optional[int] = Query(None, description="Only changes concerning this customer"),
+    last_event_id: Optional[str] = Query(None, description="Resume after this event; the Last-Event-ID header takes precedence"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Subscribe to committed changes instead of polling.
+
+    Every ``change`` event carries the entity type and ID, the action, the
+    changed fields of updates and the projects and customers it concerns, so
+    the client can refetch just what changed. Browsers reconnect with the ID of
+    the last event they received and get what they missed; a ``reset`` event
+    means that is no longer possible and the client should reload its data.
+    """
+    if not settings.CHANGE_EVENTS_ENABLED:
+        raise HTTPException(status_code=404, detail="Change events are disabled; set CHANGE_EVENTS_ENABLED to enable them")
+
+    resume_after = last_event_id_header or last_event_id
+    try:
+        event_filter = ChangeEventFilter(entity_type, project_id=project_id, customer_id=customer_id)
+        if resume_after:
+            change_event_bus.validate_event_id(resume_after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Subscribed by the stream itself, so nothing is left subscribed if the client leaves before it starts
+    return create_event_stream_response(iter_change_events(change_event_bus, event_filter, resume_after))
@@ -1,21 +1,48 @@
 from cims.core.repositories.candidate_repository import CandidateRepository
 from cims.core.repositories.project_repository import ProjectRepository
 from cims.core.repositories.headhunter_repository import HeadhunterRepository
+from cims.core.repositories.customer_repository import CustomerRepository
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional, Any
 import datetime
+from cims.api.export import ExportFormat, create_export_response
 from cims.core.repositories.nominee_repository import NomineeRepository
 from cims.core.entities.nominee import Nominee
 from cims.core.exceptions import NotFoundError
-from cims.deps import get_nominee_repository, get_candidate_repository, get_project_repository, get_headhunter_repository
+from cims.deps import (
+    get_db_session,
+    get_nominee_repository,
+    get_candidate_repository,
+    get_project_repository,
+    get_headhunter_repository,
+    get_customer_repository,
+)
 from cims.schemas import (
     NomineeCreate,
     NomineeUpdate,
     NomineeResponse,
     NomineeDetailResponse,
     NomineeListResponse,
+    NomineeBulkStatusUpdate,
+    NomineeBulkStatusResult,
+    NomineeBulkStatusResponse,
+    CandidateResponse,
+    ProjectResponse,
+    CustomerResponse,
+    HeadhunterResponse,
     ErrorResponse,
 )
-from cims.schemas.utils import create_list_response, entity_to_response_model
+from cims.schemas.utils import (
+    create_list_response,
+    create_sparse_list_response,
+    create_included_response,
+    entity_to_response_model,
+    parse_fields_param,
+    parse_include_param,
+    sparse_columns,
+)
 
 router = APIRouter(
     prefix="/nominees",
@@ -27,6 +54,89 @@ router = APIRouter(
     }
 )
 
+# Enriched name fields and the nominee column each one is resolved from
+NOMINEE_NAME_LOOKUPS = {
+    "nominee_name": "candidate_id",
+    "headhunter_name": "candidate_id",
+    "project_name": "project_id",
+}
+
+def _populate_nominee_names(
+    rows: list[dict[str, Any]],
+    selected: list[str],
+    candidate_repo: CandidateRepository,
+    project_repo: ProjectRepository,
+    headhunter_repo: HeadhunterRepository,
+) -> None:
+    """Resolve the requested name fields on nominee rows, skipping lookups that were not requested."""
+    if not rows:
+        return
+
+    if "nominee_name" in selected or "headhunter_name" in selected:
+        candidates = candidate_repo.get_candidates_by_ids(list({row["candidate_id"] for row in rows}))
+        candidate_map = {c.candidate_id: c for c in candidates}
+
+        headhunter_map: dict[int, str] = {}
+        if "headhunter_name" in selected:
+            headhunters = headhunter_repo.get_headhunters_by_ids(list({c.headhunter_id for c in candidates}))
+            headhunter_map = {h.headhunter_id: h.name for h in headhunters}
+
+        for row in rows:
+            candidate = candidate_map.get(row["candidate_id"])
+            if candidate:
+                row["nominee_name"] = candidate.name
+                row["headhunter_name"] = headhunter_map.get(candidate.headhunter_id, 'Unknown')
+            else:
+                row["nominee_name"] = 'Unknown'
+                row["headhunter_name"] = 'Unknown'
+
+    if "project_name" in selected:
+        projects = project_repo.get_projects_by_ids(list({row["project_id"] for row in rows}))
+        project_map = {p.project_id: p.name for p in projects}
+        for row in rows:
+            row["project_name"] = project_map.get(row["project_id"], 'Unknown')
+
+# Related entities that can be embedded into nominee responses with include=
+NOMINEE_INCLUDES = {"candidate", "candidate.headhunter", "project", "project.customer"}
+
+def _include_nominee_relations(
+    items: list[dict[str, Any]],
+    includes: set[str],
+    candidate_repo: CandidateRepository,
+    project_repo: ProjectRepository,
+    headhunter_repo: HeadhunterRepository,
+    customer_repo: CustomerRepository,
+) -> None:
+    """Embed the requested related entities into serialized nominees, using one batched query per relation."""
+    if not items:
+        return
+
+    if "candidate" in includes:
+        candidates = candidate_repo.get_candidates_by_ids(list({item["candidate_id"] for item in items}))
+        candidate_map = {c.candidate_id: entity_to_response_model(c, CandidateResponse).model_dump() for c in candidates}
+
+        if "candidate.headhunter" in includes:
+            headhunters = headhunter_repo.get_headhunters_by_ids(list({c.headhunter_id for c in candidates}))
+            headhunter_map = {h.headhunter_id: entity_to_response_model(h, HeadhunterResponse).model_dump() for h in headhunters}
+            for candidate in candidate_map.values():
+                candidate["headhunter"] = headhunter_map.get(candidate["headhunter_id"])
+
+        for item in items:
+            item["candidate"] = candidate_map.get(item["candidate_id"])
+
+    if "project" in includes:
+        projects = project_repo.get_projects_by_ids(list({item["project_id"] for item in items}))
+        project_map = {p.project_id: entity_to_response_model(p, ProjectResponse).model_dump() for p in projects}
+
+        if "project.customer" in includes:
+            customers = customer_repo.get_customers_by_ids(list({p.customer_id for p in projects}))
+            customer_map = {c.customer_id: entity_to_response_model(c, CustomerResponse).model_dump() for c in customers}
+            for project in project_map.values():
+                project["customer"] = customer_map.get(project["customer_id"])
+
+        for item in items:
+            item["project"] = project_map.get(item["project_id"])
+
 @router.post("/",
     response_model=NomineeDetailResponse,
     status_code=201,
@@ -92,14 +202,39 @@ async def create_nominee(
 async def get_nominees(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return for each nominee"),
     nominee_repo: NomineeRepository = Depends(get_nominee_repository),
     candidate_repo: CandidateRepository = Depends(get_candidate_repository),
     project_repo: ProjectRepository = Depends(get_project_repository),
     headhunter_repo: HeadhunterRepository = Depends(get_headhunter_repository)
 ):
     """Get all nominees with pagination."""
+    try:
+        selected = parse_fields_param(fields, NomineeResponse, always_include=("nominee_id",))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         offset = (page - 1) * page_size
+
+        if selected:
+            rows = nominee_repo.get_nominee_rows(
+                fields=sparse_columns(selected, NOMINEE_NAME_LOOKUPS),
+                limit=page_size,
+                offset=offset
+            )
+            total = nominee_repo.count_all_nominees()
+            _populate_nominee_names(rows, selected, candidate_repo, project_repo, headhunter_repo)
+
+            return create_sparse_list_response(
+                data=rows,
+                selected=selected,
+                total=total,
+                page=page,
+                page_size=page_size,
+                message="Nominees retrieved successfully"
+            )
+
         nominees = nominee_repo.get_all_nominees(limit=page_size, offset=offset)
         total = nominee_repo.count_all_nominees()
         
@@ -152,14 +287,41 @@ async def search_nominees(
     query: str = Query(..., min_length=1, description="Search query"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return for each nominee"),
     nominee_repo: NomineeRepository = Depends(get_nominee_repository),
     candidate_repo: CandidateRepository = Depends(get_candidate_repository),
     project_repo: ProjectRepository = Depends(get_project_repository),
     headhunter_repo: HeadhunterRepository = Depends(get_headhunter_repository)
 ):
     """Search nominees by status."""
+    try:
+        selected = parse_fields_param(fields, NomineeResponse, always_include=("nominee_id",))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         offset = (page - 1) * page_size
+
+        if selected:
+            rows = nominee_repo.get_nominee_rows(
+                fields=sparse_columns(selected, NOMINEE_NAME_LOOKUPS),
+                status=query,
+                limit=page_size,
+                offset=offset
+            )
+            _populate_nominee_names(rows, selected, candidate_repo, project_repo, headhunter_repo)
+
+            total = len(rows)
+
+            return create_sparse_list_response(
+                data=rows,
+                selected=selected,
+                total=total,
+                page=page,
+                page_size=page_size,
+                message=f"Found {total} nominees matching status '{query}'"
+            )
+
         nominees = nominee_repo.search_nominees_by_status(
             status_query=query,
             limit=page_size,
@@ -208,6 +370,62 @@ async def search_nominees(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/export",
+    response_class=StreamingResponse,
+    summary="Export nominees",
+    description="Stream all nominees matching the filters as NDJSON or CSV"
+)
+async def export_nominees(
+    export_format: ExportFormat = Query("ndjson", alias="format", description="Export format: ndjson or csv"),
+    status: Optional[str] = Query(None, description="Status filter"),
+    project_id: Optional[int] = Query(None, description="Project ID filter"),
+    candidate_id: Optional[int] = Query(None, description="Candidate ID filter"),
+    db_session: Session = Depends(get_db_session),
+    nominee_repo: NomineeRepository = Depends(get_nominee_repository)
+):
+    """Export nominees without pagination, streaming rows as they are read."""
+    try:
+        rows = nominee_repo.iter_nominee_rows(
+            status=status,
+            project_id=project_id,
+            candidate_id=candidate_id
+        )
+
+        # The session has to outlive the request handler while rows are streamed
+        return create_export_response(
+            rows=rows,
+            columns=list(NomineeResponse.model_fields),
+            export_format=export_format,
+            filename="nominees",
+            on_close=db_session.close
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.patch("/status",
+    response_model=NomineeBulkStatusResponse,
+    summary="Update nominee statuses",
+    description="Move several nominees to the same status in a single statement"
+)
+async def update_nominee_statuses(
+    status_data: NomineeBulkStatusUpdate,
+    nominee_repo: NomineeRepository = Depends(get_nominee_repository)
+):
+    """Move the given nominees to a new status."""
+    try:
+        nominee_ids = list(dict.fromkeys(status_data.nominee_ids))
+        updated = nominee_repo.update_many({nominee_id: {"status": status_data.status} for nominee_id in nominee_ids})
+
+        return NomineeBulkStatusResponse(
+            success=True,
+            message=f"Updated {updated} of {len(nominee_ids)} nominees to status '{status_data.status}'",
+            data=NomineeBulkStatusResult(requested=len(nominee_ids), updated=updated)
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/by-candidate/{candidate_id}",
     response_model=NomineeListResponse,
     summary="Get nominees by candidate ID",
@@ -217,12 +435,19 @@ async def get_nominees_by_candidate(
     candidate_id: int,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    include: Optional[str] = Query(None, description="Comma-separated related entities to embed: candidate, candidate.headhunter, project, project.customer"),
     nominee_repo: NomineeRepository = Depends(get_nominee_repository),
     candidate_repo: CandidateRepository = Depends(get_candidate_repository),
     project_repo: ProjectRepository = Depends(get_project_repository),
-    headhunter_repo: HeadhunterRepository = Depends(get_headhunter_repository)
+    headhunter_repo: HeadhunterRepository = Depends(get_headhunter_repository),
+    customer_repo: CustomerRepository = Depends(get_customer_repository)
 ):
     """Get nominees by candidate ID."""
+    try:
+        includes = parse_include_param(include, NOMINEE_INCLUDES)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         offset = (page - 1) * page_size
 
@@ -261,13 +486,21 @@ async def get_nominees_by_candidate(
 
         total = len(nominees)
         
-        return create_list_response(
+        list_response = create_list_response(
             data=nominee_responses,
             total=total,
             page=page,
             page_size=page_size,
             message=f"Found {total} nominees for candidate {candidate_id}"
         )
+
+        if includes:
+            return create_included_response(
+                list_response,
+                lambda items: _include_nominee_relations(items, includes, candidate_repo, project_repo, headhunter_repo, customer_repo)
+            )
+
+        return list_response
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -281,12 +514,19 @@ async def get_nominees_by_project(
     project_id: int,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    include: Optional[str] = Query(None, description="Comma-separated related entities to embed: candidate, candidate.headhunter, project, project.customer"),
     nominee_repo: NomineeRepository = Depends(get_nominee_repository),
     project_repo: ProjectRepository = Depends(get_project_repository),
     headhunter_repo: HeadhunterRepository = Depends(get_headhunter_repository),
-    candidate_repo: CandidateRepository = Depends(get_candidate_repository)
+    candidate_repo: CandidateRepository = Depends(get_candidate_repository),
+    customer_repo: CustomerRepository = Depends(get_customer_repository)
 ):
     """Get nominees by project ID."""
+    try:
+        includes = parse_include_param(include, NOMINEE_INCLUDES)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         offset = (page - 1) * page_size
 
@@ -301,28 +541,16 @@ async def get_nominees_by_project(
             offset=offset
         )
 
-        # Get all unique candidate IDs from nominees
+        # Fetch candidate details for all nominees in one query
         candidate_ids = list(set([nominee.candidate_id for nominee in nominees]))
-        
-        # Fetch candidate details for all nominees
-        candidate_details_list = []
-        for candidate_id in candidate_ids:
-            candidate = candidate_repo.get_candidate_by_id(candidate_id)
-            if candidate:
-                candidate_details_list.append(candidate)
+        candidate_details_list = candidate_repo.get_candidates_by_ids(candidate_ids) if candidate_ids else []
 
         # Create mappings for quick lookup
         candidate_map = {candidate.candidate_id: candidate for candidate in candidate_details_list}
         
-        # Get all unique headhunter IDs from candidates
+        # Fetch headhunter details for all candidates in one query
         headhunter_ids = list(set([candidate.headhunter_id for candidate in candidate_details_list]))
-        
-        # Fetch headhunter details
-        headhunter_details_list = []
-        for headhunter_id in headhunter_ids:
-            headhunter = headhunter_repo.get_headhunter_by_id(headhunter_id)
-            if headhunter:
-                headhunter_details_list.append(headhunter)
+        headhunter_details_list = headhunter_repo.get_headhunters_by_ids(headhunter_ids) if headhunter_ids else []
 
         headhunter_map = {headhunter.headhunter_id: headhunter for headhunter in headhunter_details_list}
 
@@ -350,13 +578,21 @@ async def get_nominees_by_project(
 
         total = len(nominees)
         
-        return create_list_response(
+        list_response = create_list_response(
             data=nominee_responses,
             total=total,
             page=page,
             page_size=page_size,
             message=f"Found {total} nominees for project {project_id}"
         )
+
+        if includes:
+            return create_included_response(
+                list_response,
+                lambda items: _include_nominee_relations(items, includes, candidate_repo, project_repo, headhunter_repo, customer_repo)
+            )
+
+        return list_response
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -368,12 +604,19 @@ async def get_nominees_by_project(
 )
 async def get_nominee(
     nominee_id: int,
+    include: Optional[str] = Query(None, description="Comma-separated related entities to embed: candidate, candidate.headhunter, project, project.customer"),
     nominee_repo: NomineeRepository = Depends(get_nominee_repository),
     candidate_repo: CandidateRepository = Depends(get_candidate_repository),
     project_repo: ProjectRepository = Depends(get_project_repository),
-    headhunter_repo: HeadhunterRepository = Depends(get_headhunter_repository)
+    headhunter_repo: HeadhunterRepository = Depends(get_headhunter_repository),
+    customer_repo: CustomerRepository = Depends(get_customer_repository)
 ):
     """Get a nominee by ID."""
+    try:
+        includes = parse_include_param(include, NOMINEE_INCLUDES)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         nominee = nominee_repo.get_nominee_by_id(nominee_id)
         
@@ -400,11 +643,19 @@ async def get_nominee(
         
         nominee_response = NomineeResponse(**nominee_dict)
         
-        return NomineeDetailResponse(
+        detail_response = NomineeDetailResponse(
             success=True,
             message="Nominee retrieved successfully",
             data=nominee_response
         )
+
+        if includes:
+            return create_included_response(
+                detail_response,
+                lambda items: _include_nominee_relations(items, includes, candidate_repo, project_repo, headhunter_repo, customer_repo)
+            )
+
+        return detail_response
         
     except HTTPException:
         raise
@@ -1,18 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
 from datetime import date, datetime
-from cims.core.repositories.project_repository import ProjectRepository
+from typing import Optional, Any
+from cims.api.export import ExportFormat, create_export_response
+from cims.core.repositories.project_repository import ProjectRepository, ProjectSort
 from cims.core.repositories.customer_repository import CustomerRepository
 from cims.core.repositories.expertise_repository import ExpertiseRepository
 from cims.core.repositories.area_repository import AreaRepository
 from cims.core.repositories.level_repository import LevelRepository
+from cims.core.repositories.nominee_repository import NomineeRepository
+from cims.core.repositories.candidate_repository import CandidateRepository
 from cims.core.entities.project import Project
+from cims.core.matching import candidate_index
 from cims.core.exceptions import NotFoundError
 from cims.deps import (
+    get_db_session,
     get_project_repository,
     get_customer_repository,
     get_expertise_repository,
     get_area_repository,
-    get_level_repository
+    get_level_repository,
+    get_nominee_repository,
+    get_candidate_repository,
 )
 from cims.schemas import (
     ProjectCreate,
@@ -20,9 +31,24 @@ from cims.schemas import (
     ProjectResponse,
     ProjectDetailResponse,
     ProjectListResponse,
+    ProjectPipelineSummary,
+    ProjectPipelineListResponse,
+    ProjectMatches,
+    ProjectMatchResponse,
+    CustomerResponse,
+    NomineeResponse,
+    CandidateResponse,
     ErrorResponse,
 )
-from cims.schemas.utils import create_list_response, entity_to_response_model
+from cims.schemas.utils import (
+    create_list_response,
+    create_sparse_list_response,
+    create_included_response,
+    entity_to_response_model,
+    parse_fields_param,
+    parse_include_param,
+    sparse_columns,
+)
 
 router = APIRouter(
     prefix="/projects",
@@ -34,6 +60,81 @@ router = APIRouter(
     }
 )
 
+# Enriched name fields and the project column each one is resolved from
+PROJECT_NAME_LOOKUPS = {
+    "customer_name": "customer_id",
+    "expertise_name": "expertise_id",
+    "area_name": "area_id",
+    "level_name": "level_id",
+}
+
+def _populate_project_names(
+    rows: list[dict[str, Any]],
+    selected: list[str],
+    customer_repo: CustomerRepository,
+    expertise_repo: ExpertiseRepository,
+    area_repo: AreaRepository,
+    level_repo: LevelRepository,
+) -> None:
+    """Resolve the requested name fields on project rows, skipping lookups that were not requested."""
+    if not rows:
+        return
+
+    resolvers = {
+        "customer_name": lambda ids: {c.customer_id: c.name for c in customer_repo.get_customers_by_ids(ids)},
+        "expertise_name": lambda ids: {e.expertise_id: e.name for e in expertise_repo.get_expertises_by_ids(ids)},
+        "area_name": lambda ids: {a.area_id: a.name for a in area_repo.get_areas_by_ids(ids)},
+        "level_name": lambda ids: {l.level_id: l.name for l in level_repo.get_levels_by_ids(ids)},
+    }
+
+    for name_field, resolve in resolvers.items():
+        if name_field not in selected:
+            continue
+        id_field = PROJECT_NAME_LOOKUPS[name_field]
+        name_map = resolve(list({row[id_field] for row in rows}))
+        for row in rows:
+            row[name_field] = name_map.get(row[id_field], "")
+
+# Related entities that can be embedded into project responses with include=
+PROJECT_INCLUDES = {"customer", "nominees", "nominees.candidate"}
+
+def _include_project_relations(
+    items: list[dict[str, Any]],
+    includes: set[str],
+    customer_repo: CustomerRepository,
+    nominee_repo: NomineeRepository,
+    candidate_repo: CandidateRepository,
+) -> None:
+    """Embed the requested related entities into serialized projects, using one batched query per relation."""
+    if not items:
+        return
+
+    if "customer" in includes:
+        customers = customer_repo.get_customers_by_ids(list({item["customer_id"] for item in items}))
+        customer_map = {c.customer_id: entity_to_response_model(c, CustomerResponse).model_dump() for c in customers}
+        for item in items:
+            item["customer"] = customer_map.get(item["customer_id"])
+
+    if "nominees" in includes:
+        nominees = nominee_repo.get_nominees_by_project_ids([item["project_id"] for item in items])
+        nominee_dicts = [entity_to_response_model(n, NomineeResponse).model_dump() for n in nominees]
+
+        if "nominees.candidate" in includes:
+            candidates = candidate_repo.get_candidates_by_ids(list({n.candidate_id for n in nominees}))
+            candidate_map = {c.candidate_id: entity_to_response_model(c, CandidateResponse).model_dump() for c in candidates}
+            for nominee in nominee_dicts:
+                candidate = candidate_map.get(nominee["candidate_id"])
+                nominee["candidate"] = candidate
+                nominee["nominee_name"] = candidate["name"] if candidate else None
+
+        nominees_by_project: dict[int, list[dict[str, Any]]] = {item["project_id"]: [] for item in items}
+        for nominee in nominee_dicts:
+            nominees_by_project[nominee["project_id"]].append(nominee)
+        for item in items:
+            for nominee in nominees_by_project[item["project_id"]]:
+                nominee["project_name"] = item["name"]
+            item["nominees"] = nominees_by_project[item["project_id"]]
+
 @router.post("/",
     response_model=ProjectDetailResponse,
     status_code=201,
@@ -99,6 +200,8 @@ async def create_project(
 async def get_projects(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return for each project"),
+    sort: Optional[ProjectSort] = Query(None, description="Pipeline ordering, e.g. most_behind; most recently updated first when omitted"),
     project_repo: ProjectRepository = Depends(get_project_repository),
     customer_repo: CustomerRepository = Depends(get_customer_repository),
     expertise_repo: ExpertiseRepository = Depends(get_expertise_repository),
@@ -106,9 +209,34 @@ async def get_projects(
     level_repo: LevelRepository = Depends(get_level_repository)
 ):
     """Get all projects with pagination."""
+    try:
+        selected = parse_fields_param(fields, ProjectResponse, always_include=("project_id",))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         offset = (page - 1) * page_size
-        projects = project_repo.get_all_projects(limit=page_size, offset=offset)
+
+        if selected:
+            rows = project_repo.get_project_rows(
+                fields=sparse_columns(selected, PROJECT_NAME_LOOKUPS),
+                limit=page_size,
+                offset=offset,
+                sort=sort
+            )
+            total = project_repo.count_all_projects()
+            _populate_project_names(rows, selected, customer_repo, expertise_repo, area_repo, level_repo)
+
+            return create_sparse_list_response(
+                data=rows,
+                selected=selected,
+                total=total,
+                page=page,
+                page_size=page_size,
+                message="Projects retrieved successfully"
+            )
+
+        projects = project_repo.get_all_projects(limit=page_size, offset=offset, sort=sort)
         total = project_repo.count_all_projects()
         
         project_responses = [entity_to_response_model(project, ProjectResponse) for project in projects]
@@ -159,6 +287,7 @@ async def search_projects(
     query: str = Query(..., min_length=1, description="Search query"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return for each project"),
     project_repo: ProjectRepository = Depends(get_project_repository),
     customer_repo: CustomerRepository = Depends(get_customer_repository),
     expertise_repo: ExpertiseRepository = Depends(get_expertise_repository),
@@ -166,8 +295,33 @@ async def search_projects(
     level_repo: LevelRepository = Depends(get_level_repository)
 ):
     """Search projects by name, customer name, or expertise name."""
+    try:
+        selected = parse_fields_param(fields, ProjectResponse, always_include=("project_id",))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         offset = (page - 1) * page_size
+
+        if selected:
+            rows = project_repo.get_project_rows(
+                fields=sparse_columns(selected, PROJECT_NAME_LOOKUPS),
+                query=query,
+                limit=page_size,
+                offset=offset
+            )
+            total = project_repo.count_projects_comprehensive(query)
+            _populate_project_names(rows, selected, customer_repo, expertise_repo, area_repo, level_repo)
+
+            return create_sparse_list_response(
+                data=rows,
+                selected=selected,
+                total=total,
+                page=page,
+                page_size=page_size,
+                message=f"Found {total} projects matching '{query}'"
+            )
+
         projects = project_repo.search_projects_comprehensive(
             query=query,
             limit=page_size,
@@ -214,6 +368,70 @@ async def search_projects(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/pipeline",
+    response_model=ProjectPipelineListResponse,
+    summary="Get project pipeline summaries",
+    description="Retrieve fill rate, nominee counts and time to fill per project from the precomputed summaries"
+)
+async def get_project_pipelines(
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    sort: Optional[ProjectSort] = Query("most_behind", description="Pipeline ordering"),
+    customer_id: Optional[int] = Query(None, gt=0, description="Customer ID filter"),
+    project_repo: ProjectRepository = Depends(get_project_repository)
+):
+    """Get project recruitment progress without loading nominees."""
+    try:
+        rows = project_repo.get_pipeline_summaries(
+            sort=sort,
+            customer_id=customer_id,
+            limit=page_size,
+            offset=(page - 1) * page_size
+        )
+        total = project_repo.count_projects_by_customer_id(customer_id) if customer_id else project_repo.count_all_projects()
+
+        return create_list_response(
+            data=[ProjectPipelineSummary(**row) for row in rows],
+            total=total,
+            page=page,
+            page_size=page_size,
+            message="Project pipelines retrieved successfully"
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/export",
+    response_class=StreamingResponse,
+    summary="Export projects",
+    description="Stream all projects matching the filters as NDJSON or CSV"
+)
+async def export_projects(
+    export_format: ExportFormat = Query("ndjson", alias="format", description="Export format: ndjson or csv"),
+    query: Optional[str] = Query(None, description="Search query on project, customer or expertise name"),
+    customer_id: Optional[int] = Query(None, description="Customer ID filter"),
+    db_session: Session = Depends(get_db_session),
+    project_repo: ProjectRepository = Depends(get_project_repository)
+):
+    """Export projects without pagination, streaming rows as they are read."""
+    try:
+        rows = project_repo.iter_project_rows(
+            query=query.strip() if query and query.strip() else None,
+            customer_id=customer_id
+        )
+
+        # The session has to outlive the request handler while rows are streamed
+        return create_export_response(
+            rows=rows,
+            columns=list(ProjectResponse.model_fields),
+            export_format=export_format,
+            filename="projects",
+            on_close=db_session.close
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/customer/{customer_id}",
     response_model=ProjectListResponse,
     summary="Get projects by customer ID",
@@ -292,9 +510,18 @@ async def get_projects_by_customer(
 )
 async def get_project(
     project_id: int,
-    project_repo: ProjectRepository = Depends(get_project_repository)
+    include: Optional[str] = Query(None, description="Comma-separated related entities to embed: customer, nominees, nominees.candidate"),
+    project_repo: ProjectRepository = Depends(get_project_repository),
+    customer_repo: CustomerRepository = Depends(get_customer_repository),
+    nominee_repo: NomineeRepository = Depends(get_nominee_repository),
+    candidate_repo: CandidateRepository = Depends(get_candidate_repository)
 ):
     """Get a project by ID."""
+    try:
+        includes = parse_include_param(include, PROJECT_INCLUDES)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         project = project_repo.get_project_by_id(project_id)
         
@@ -303,17 +530,73 @@ async def get_project(
         
         project_response = entity_to_response_model(project, ProjectResponse)
         
-        return ProjectDetailResponse(
+        detail_response = ProjectDetailResponse(
             success=True,
             message="Project retrieved successfully",
             data=project_response
         )
+
+        if includes:
+            return create_included_response(
+                detail_response,
+                lambda items: _include_project_relations(items, includes, customer_repo, nominee_repo, candidate_repo)
+            )
+
+        return detail_response
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/{project_id}/matches",
+    response_model=ProjectMatchResponse,
+    summary="Match candidates to a project",
+    description="Score candidates on expertise, level (adjacent levels get partial credit), area, the customer's field and past nominee outcomes",
+    responses={404: {"model": ErrorResponse, "description": "Project not found"}}
+)
+async def get_project_matches(
+    project_id: int,
+    limit: int = Query(20, ge=1, le=100, description="Number of candidates to return"),
+    source: Optional[str] = Query(None, min_length=1, description="Only consider candidates from this source"),
+    include_nominated: bool = Query(False, description="Also return candidates already nominated for the project"),
+    project_repo: ProjectRepository = Depends(get_project_repository),
+    customer_repo: CustomerRepository = Depends(get_customer_repository),
+    nominee_repo: NomineeRepository = Depends(get_nominee_repository),
+    candidate_repo: CandidateRepository = Depends(get_candidate_repository)
+):
+    """Get the best-scoring candidates for a project from the in-memory matching index."""
+    project = project_repo.get_project_by_id(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    try:
+        customer = customer_repo.get_customer_by_id(project.customer_id)
+        nominated = [] if include_nominated else [nominee.candidate_id for nominee in nominee_repo.get_nominees_by_project_ids([project_id])]
+
+        # A rebuild loads every candidate; keep it off the event loop
+        await run_in_threadpool(candidate_index.refresh, candidate_repo.get_match_profiles)
+        scored, matches = candidate_index.match(
+            {
+                "expertise_id": project.expertise_id,
+                "level_id": project.level_id,
+                "area_id": project.area_id,
+                "field_id": customer.field_id if customer else None,
+            },
+            limit=limit,
+            exclude=nominated,
+            source=source
+        )
+
+        return ProjectMatchResponse(
+            success=True,
+            message=f"{len(matches)} of {scored} scored candidates returned",
+            data=ProjectMatches(project_id=project_id, candidates_scored=scored, matches=matches)
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.put("/{project_id}",
     response_model=ProjectDetailResponse,
     summary="Update project",
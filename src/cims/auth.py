@@ -5,6 +5,7 @@ from fastapi.security import OAuth2PasswordBearer
 from fastapi import HTTPException, Depends
 from jose import JWTError, jwt
 from cims.core.repositories.headhunter_repository import HeadhunterRepository, Headhunter
+from cims.metrics import PASSWORD_HASH_DURATION
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
@@ -23,10 +24,12 @@ class Authenticator:
         self._headhunter_repository = headhunter_repository
 
     def get_password_hash(self, password: str) -> str:
-        return pwd_context.hash(password)
+        with PASSWORD_HASH_DURATION.time(operation="hash"):
+            return pwd_context.hash(password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+        with PASSWORD_HASH_DURATION.time(operation="verify"):
+            return pwd_context.verify(plain_password, hashed_password)
 
     def create_access_token(self, data: dict[str, Any]):
         to_encode = data.copy()
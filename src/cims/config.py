@@ -1,6 +1,15 @@
 from pydantic_settings import BaseSettings
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
+import atexit
+import datetime
+import json
 import logging
+import queue
+import threading
+import time
+
+from cims.metrics import LOG_RECORDS_DROPPED
 
 class Settings(BaseSettings):
     MCP_HOST: str
@@ -11,12 +20,66 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
+    DB_POOL_SIZE: int = 10  # Connections kept open by the shared engine's pool
+    DB_POOL_MAX_OVERFLOW: int = 20  # Connections opened beyond DB_POOL_SIZE under load
 
     SECRET_KEY: str
     ALGORITHM: str = "HS256"  # Default algorithm for JWT
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30  # Default expiration time for access
 
     LOG_LEVEL: str = "INFO"  # Default log level
+    LOG_FORMAT: str = "text"  # "text" or "json"
+    LOG_ASYNC: bool = False  # Hand records to a background thread through a queue instead of writing inline
+    LOG_QUEUE_SIZE: int = 10000  # Records waiting for the background writer; further records are dropped
+    LOG_ERROR_SAMPLE_BURST: int = 10  # Errors logged per call site and window before sampling kicks in; 0 disables
+    LOG_ERROR_SAMPLE_WINDOW_SECONDS: float = 60.0
+
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2.0  # Timeout for the readiness SELECT 1
+    HEALTH_CACHE_SECONDS: float = 1.0  # How long a readiness result is reused
+
+    SLOW_QUERY_THRESHOLD_MS: Optional[float] = None  # Record statements slower than this; disabled when unset
+    SLOW_QUERY_BUFFER_SIZE: int = 200  # Number of slow queries kept in memory
+    SLOW_QUERY_EXPLAIN: bool = True  # Capture EXPLAIN plans for slow SELECTs on Postgres
+
+    PROFILING_ENABLED: bool = False  # Install the on-demand request profiler (debug only)
+    PROFILING_SECRET: Optional[str] = None  # Key for profile request signatures; SECRET_KEY when unset
+    PROFILING_INTERVAL_MS: float = 2.0  # Stack sampling interval
+    PROFILING_OUTPUT_DIR: Optional[str] = None  # Store profiles here instead of returning them
+
+    HEADHUNTER_DAILY_STATS: bool = True  # Maintain per-headhunter daily aggregates on candidate and nominee writes
+    SALARY_STATS_CACHE_SECONDS: float = 300.0  # Upper bound on salary statistics staleness; 0 disables the cache
+    MATCHING_INDEX_MAX_AGE_SECONDS: float = 600.0  # Rebuild the candidate matching index after this long
+    DUPLICATE_CANDIDATE_POLICY: str = "warn"  # "off", "warn" or "reject" new candidates sharing a phone or email
+    NAME_SEARCH_INDEX: bool = True  # Serve candidate and customer name searches from in-memory fuzzy indexes instead of ILIKE
+    NAME_SEARCH_MIN_SIMILARITY: float = 0.5  # Share of a query word's trigrams a name word must contain to match it
+    NAME_SEARCH_INDEX_MAX_AGE_SECONDS: float = 600.0  # Rebuild the name search indexes after this long
+    CHANGE_EVENTS_ENABLED: bool = True  # Publish committed candidate, customer, project and nominee changes to the event stream
+    CHANGE_EVENT_BACKLOG: int = 10000  # Recent events kept for clients resuming with Last-Event-ID
+    CHANGE_EVENT_SUBSCRIBER_QUEUE: int = 1000  # Events held for a slow stream client before it is asked to reconnect
+    CHANGE_EVENT_HEARTBEAT_SECONDS: float = 15.0  # Comment sent on idle streams to keep proxies from closing them
+    CHANGE_EVENT_STREAM_MAX_SECONDS: float = 300.0  # Close streams after this long; clients reconnect and resume
+    AGGREGATE_REFRESH_MODE: str = "inline"  # "inline" or "outbox": refresh pipeline summaries and headhunter stats in the write's transaction or from the outbox worker
+    OUTBOX_WORKER_ENABLED: Optional[bool] = None  # Drain the outbox from a background task of the API process; when unset, only with AGGREGATE_REFRESH_MODE "outbox"
+    OUTBOX_BATCH_SIZE: int = 200  # Messages claimed per batch
+    OUTBOX_POLL_SECONDS: float = 1.0  # Wait between polls while the outbox is empty
+    OUTBOX_LEASE_SECONDS: float = 60.0  # Claimed messages are handed to another worker after this long
+    OUTBOX_MAX_ATTEMPTS: int = 8  # Give up on a message after this many failures
+    OUTBOX_RETRY_BASE_SECONDS: float = 2.0  # First retry delay, doubled after every further failure
+    OUTBOX_RETRY_MAX_SECONDS: float = 600.0
+    OUTBOX_RETENTION_HOURS: float = 24.0  # Delete processed messages after this long
+    SCHEDULER_ENABLED: bool = True  # Run the periodic jobs from a background task of the API process
+    SCHEDULER_JITTER: float = 0.1  # Spread job runs by up to this share of their interval
+    SCHEDULER_LOCK_DIR: Optional[str] = None  # Directory of the job lock files on databases without advisory locks; the temp directory when unset
+    JOB_PROJECT_SUMMARIES_SECONDS: float = 21600.0  # Rebuild all project pipeline summaries this often; 0 disables the job
+    JOB_HEADHUNTER_STATS_SECONDS: float = 21600.0  # Rebuild all headhunter daily stats this often; 0 disables the job
+    JOB_DUPLICATE_KEYS_SECONDS: float = 86400.0  # Rebuild all candidate duplicate keys this often; 0 disables the job
+    JOB_INDEX_WARMUP_SECONDS: float = 300.0  # Bring the in-memory search indexes up to date this often; 0 disables the job
+    JOB_OUTBOX_PURGE_SECONDS: float = 3600.0  # Delete processed outbox messages this often; 0 disables the job
+
+    TRACING_ENABLED: bool = False  # Correlate requests, tool calls and SQL under one trace ID
+    TRACE_SQL_COMMENTS: bool = False  # Append the request ID to SQL statements as a comment
+    TRACE_BUFFER_SIZE: int = 1000  # Number of recent traces kept in memory
+    TRACE_EXPORT_FILE: Optional[str] = None  # Also append finished spans to this JSON-lines file
 
     class Config:
         env_file = ".env"
@@ -41,6 +104,143 @@ class ColorFormatter(logging.Formatter):
         return f"{color}{message}{self.RESET}"
 
 
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(funcName)s - %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers."""
+    def format(self, record):  # type: ignore[override]
+        entry = {
+            "timestamp": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "location": f"{record.filename}:{record.lineno}",
+            "function": record.funcName,
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ErrorSamplingFilter(logging.Filter):
+    """
+    Let through the first ``burst`` errors from each call site per window, then drop the rest.
+
+    The first record after a window with dropped records reports how many were suppressed,
+    so an error storm costs a dictionary lookup per record instead of a write.
+    """
+    def __init__(self, burst: int, window: float):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._sites: dict[tuple[str, int], list[float]] = {}  # call site -> [window start, seen, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.ERROR:
+            return True
+
+        now = time.monotonic()
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.window:
+                suppressed = int(site[2]) if site else 0
+                self._sites[key] = [now, 1, 0]
+            else:
+                site[1] += 1
+                if site[1] > self.burst:
+                    site[2] += 1
+                    return False
+                suppressed = 0
+
+        if suppressed:
+            record.msg = f"{record.getMessage()} [{suppressed} similar messages suppressed]"
+            record.args = None
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks or formats on the calling thread.
+
+    Records are only stripped of their arguments here; formatting, including
+    tracebacks, happens on the listener thread. When the queue is full the record
+    is dropped and counted, in ``dropped`` and in ``cims_log_records_dropped_total``.
+    """
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+
+def _build_formatter(stream) -> logging.Formatter:
+    if settings.LOG_FORMAT.lower() == "json":
+        return JsonFormatter()
+    # Escape codes only make sense on a terminal, not in files or log collectors
+    if getattr(stream, "isatty", lambda: False)():
+        return ColorFormatter(LOG_FORMAT)
+    return logging.Formatter(LOG_FORMAT)
+
+
+def _build_stream_handler() -> logging.Handler:
+    handler = logging.StreamHandler()
+    handler.setFormatter(_build_formatter(handler.stream))
+    return handler
+
+
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_queue_listener: Optional[QueueListener] = None
+_queue_lock = threading.Lock()
+
+
+def _stop_queue_listener(listener: QueueListener, handler: NonBlockingQueueHandler, stream_handler: logging.Handler) -> None:
+    """Flush what is still queued on shutdown, then report the records dropped over the process's life."""
+    listener.stop()
+    if handler.dropped:
+        stream_handler.handle(logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0,
+            "%d log records were dropped because the log queue was full; consider raising LOG_QUEUE_SIZE",
+            (handler.dropped,), None
+        ))
+
+
+def get_queue_handler() -> NonBlockingQueueHandler:
+    """
+    The handler shared by all loggers in async mode; starts the background writer on first use.
+    """
+    global _queue_handler, _queue_listener
+    if _queue_handler is None:
+        with _queue_lock:
+            if _queue_handler is None:
+                log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+                stream_handler = _build_stream_handler()
+                _queue_listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+                _queue_listener.start()
+                _queue_handler = NonBlockingQueueHandler(log_queue)
+                atexit.register(_stop_queue_listener, _queue_listener, _queue_handler, stream_handler)
+    return _queue_handler
+
+
+_sampling_filter = (
+    ErrorSamplingFilter(settings.LOG_ERROR_SAMPLE_BURST, settings.LOG_ERROR_SAMPLE_WINDOW_SECONDS)
+    if settings.LOG_ERROR_SAMPLE_BURST > 0 else None
+)
+
+
 class CLogger:
     def __init__(self, name: Optional[str] = None):
         match settings.LOG_LEVEL.upper():
@@ -64,12 +264,10 @@ class CLogger:
 
         # Avoid adding multiple handlers if logger already configured
         if not self.logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = ColorFormatter(
-                '%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(funcName)s - %(message)s'
-            )
-            handler.setFormatter(formatter)
+            handler = get_queue_handler() if settings.LOG_ASYNC else _build_stream_handler()
             self.logger.addHandler(handler)
+            if _sampling_filter is not None:
+                self.logger.addFilter(_sampling_filter)
 
     def get_logger(self):
         return self.logger
@@ -0,0 +1,120 @@
+"""
+Recruitment analytics computed from aggregates returned by the repositories.
+"""
+from typing import Any, Literal, Optional
+import datetime
+
+from cims.core.entities.nominee import NOMINEE_FUNNEL_STAGES, NOMINEE_REJECTED_STATUS
+from cims.core.repositories.headhunter_repository import StatsPeriod
+
+LeaderboardMetric = Literal["contracts_signed", "nominees", "candidates_sourced"]
+
+def _rate(numerator: int, denominator: int) -> Optional[float]:
+    return round(numerator / denominator, 4) if denominator else None
+
+def build_funnel(status_counts: dict[str, int]) -> dict[str, Any]:
+    """
+    Turn nominee counts per current status into funnel stages with conversion rates.
+
+    Only the current status of a nominee is stored, so a nominee counts as having
+    reached every stage up to its current one. Rejected nominees are known to
+    have been nominated but not how far they got, so they only count towards the
+    first stage.
+
+    Example:
+        ```python
+        build_funnel({"DECU": 5, "PHONGVAN": 3, "KYHOPDONG": 2, "TUCHOI": 4})
+        ```
+        The ``PHONGVAN`` stage is reached by 5 nominees (3 interviewing and
+        2 hired) and converts at 5 / 14 from the 14 nominated.
+
+    :param dict[str, int] status_counts: Number of nominees per current status.
+    :return: Totals, rejection and overall conversion rates, and one entry per stage.
+    :rtype: dict[str, Any]
+    """
+    rejected = status_counts.get(NOMINEE_REJECTED_STATUS, 0)
+    total = sum(status_counts.get(status, 0) for status in NOMINEE_FUNNEL_STAGES) + rejected
+
+    stages: list[dict[str, Any]] = []
+    reached = total
+    previous = total
+    for index, status in enumerate(NOMINEE_FUNNEL_STAGES):
+        if index > 0:
+            reached -= status_counts.get(NOMINEE_FUNNEL_STAGES[index - 1], 0) + (rejected if index == 1 else 0)
+        stages.append({
+            "status": status,
+            "current": status_counts.get(status, 0),
+            "reached": reached,
+            "conversion_from_previous": _rate(reached, previous),
+            "conversion_from_start": _rate(reached, total),
+        })
+        previous = reached
+
+    hired = status_counts.get(NOMINEE_FUNNEL_STAGES[-1], 0)
+    return {
+        "total": total,
+        "rejected": rejected,
+        "hired": hired,
+        "rejection_rate": _rate(rejected, total),
+        "overall_conversion": _rate(hired, total),
+        "stages": stages,
+    }
+
+def period_start(day: datetime.date, period: StatsPeriod) -> datetime.date:
+    """First day of the week (Monday), month or quarter containing the day."""
+    if period == "week":
+        return day - datetime.timedelta(days=day.weekday())
+    if period == "month":
+        return day.replace(day=1)
+    return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+
+def period_end(start: datetime.date, period: StatsPeriod) -> datetime.date:
+    """Last day of the period starting on the given day."""
+    if period == "week":
+        return start + datetime.timedelta(days=6)
+    months = 1 if period == "month" else 3
+    year, month = divmod(start.month - 1 + months, 12)
+    return datetime.date(start.year + year, month + 1, 1) - datetime.timedelta(days=1)
+
+def build_leaderboard(period_stats: list[dict[str, Any]], period: StatsPeriod, rank_by: LeaderboardMetric, limit: int) -> list[dict[str, Any]]:
+    """
+    Rank headhunters within each period by one of their activity counts.
+
+    Headhunters with equal counts share a rank and the next rank is skipped
+    (1, 1, 3); ties are listed by headhunter ID. Headhunters without activity
+    in a period are not listed for it.
+
+    :param list[dict[str, Any]] period_stats: Rows from ``HeadhunterRepository.get_period_stats``.
+    :param StatsPeriod period: The bucket size the rows were aggregated with.
+    :param LeaderboardMetric rank_by: The count to rank by.
+    :param int limit: The maximum number of headhunters per period.
+    :return: Periods in chronological order, each with its ranked entries.
+    :rtype: list[dict[str, Any]]
+    """
+    hired_status = NOMINEE_FUNNEL_STAGES[-1]
+    periods: dict[datetime.date, list[dict[str, Any]]] = {}
+    for row in period_stats:
+        contracts_signed = row["stage_counts"].get(hired_status, 0)
+        periods.setdefault(row["period_start"], []).append({
+            **row,
+            "contracts_signed": contracts_signed,
+            "contract_rate": _rate(contracts_signed, row["nominees"]),
+        })
+
+    leaderboard = []
+    for start in sorted(periods):
+        entries = sorted(periods[start], key=lambda entry: (-entry[rank_by], entry["headhunter_id"]))
+        previous: Optional[int] = None
+        rank = 0
+        for position, entry in enumerate(entries, start=1):
+            if entry[rank_by] != previous:
+                rank, previous = position, entry[rank_by]
+            entry["rank"] = rank
+            del entry["period_start"]
+        leaderboard.append({
+            "period_start": start,
+            "period_end": period_end(start, period),
+            "headhunters": len(entries),
+            "entries": entries[:limit],
+        })
+    return leaderboard
@@ -0,0 +1,233 @@
+"""
+In-process bus of committed entity changes, pushed to clients as server-sent events.
+
+Repository write methods publish one event per created, updated or deleted
+entity once their transaction commits (see
+``cims.integrations.sqlalchemy.change_events``). Every event is tagged with the
+projects and customers it concerns, so a client watching one project's
+pipeline only receives that project's nominee and project changes.
+
+Events are numbered per process and the most recent ``CHANGE_EVENT_BACKLOG``
+are kept, so a client reconnecting with the ID of the last event it saw gets
+what it missed. When that event has already left the backlog, or was issued by
+another process or before a restart (the ID carries a per-process epoch), the
+client is told to reset, i.e. reload its data, instead. Each process only sees
+its own writes.
+"""
+from collections import deque
+from typing import Any, Iterable, Literal, Optional
+import asyncio
+import datetime
+import secrets
+import threading
+
+from cims.config import settings
+
+ChangeEntityType = Literal["candidate", "customer", "project", "nominee"]
+CHANGE_ENTITY_TYPES: tuple[ChangeEntityType, ...] = ("candidate", "customer", "project", "nominee")
+ChangeAction = Literal["created", "updated", "deleted"]
+
+class ChangeEvent:
+    """A committed change of one entity."""
+    __slots__ = ("entity_type", "action", "entity_id", "project_ids", "customer_ids", "fields", "sequence", "event_id", "occurred_at")
+
+    def __init__(
+        self,
+        entity_type: ChangeEntityType,
+        action: ChangeAction,
+        entity_id: int,
+        project_ids: Iterable[int] = (),
+        customer_ids: Iterable[int] = (),
+        fields: Optional[Iterable[str]] = None
+    ) -> None:
+        self.entity_type = entity_type
+        self.action = action
+        self.entity_id = entity_id
+        self.project_ids = tuple(sorted(set(project_ids)))
+        self.customer_ids = tuple(sorted(set(customer_ids)))
+        self.fields = tuple(sorted(fields)) if fields is not None else None
+        # Assigned when published
+        self.sequence = 0
+        self.event_id = ""
+        self.occurred_at: Optional[datetime.datetime] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "event_id": self.event_id,
+            "entity_type": self.entity_type,
+            "action": self.action,
+            "entity_id": self.entity_id,
+            "project_ids": list(self.project_ids),
+            "customer_ids": list(self.customer_ids),
+            "fields": list(self.fields) if self.fields is not None else None,
+            "occurred_at": self.occurred_at.isoformat() if self.occurred_at else None,
+        }
+
+class ChangeEventFilter:
+    """Selects events by entity type and by the project or customer they concern."""
+    __slots__ = ("entity_types", "project_id", "customer_id")
+
+    def __init__(
+        self,
+        entity_types: Optional[Iterable[ChangeEntityType]] = None,
+        project_id: Optional[int] = None,
+        customer_id: Optional[int] = None
+    ) -> None:
+        for name, value in (("project_id", project_id), ("customer_id", customer_id)):
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be a positive integer, got {value}")
+        self.entity_types = frozenset(entity_types) if entity_types else None
+        self.project_id = project_id
+        self.customer_id = customer_id
+
+    def matches(self, event: ChangeEvent) -> bool:
+        if self.entity_types is not None and event.entity_type not in self.entity_types:
+            return False
+        if self.project_id is not None and self.project_id not in event.project_ids:
+            return False
+        if self.customer_id is not None and self.customer_id not in event.customer_ids:
+            return False
+        return True
+
+class ChangeSubscription:
+    """
+    The events one subscriber has yet to receive, handed over on its event loop.
+
+    A subscriber falling more than ``max_pending`` events behind is marked as
+    overflowed and receives nothing more; it should reconnect and resume from
+    the backlog.
+    """
+    def __init__(self, event_filter: ChangeEventFilter, loop: asyncio.AbstractEventLoop, max_pending: int) -> None:
+        self.event_filter = event_filter
+        self.max_pending = max_pending
+        self.overflowed = False
+        # The last event published before the subscription started
+        self.start_event_id = ""
+        self._loop = loop
+        self._pending: deque[ChangeEvent] = deque()
+        self._ready = asyncio.Event()
+
+    def _offer(self, events: list[ChangeEvent]) -> bool:
+        """Queue the matching events from the publishing thread; False once the loop is gone."""
+        matching = [event for event in events if self.event_filter.matches(event)]
+        if not matching:
+            return True
+        try:
+            self._loop.call_soon_threadsafe(self._deliver, matching)
+        except RuntimeError:
+            return False
+        return True
+
+    def _deliver(self, events: list[ChangeEvent]) -> None:
+        if self.overflowed:
+            return
+        if len(self._pending) + len(events) > self.max_pending:
+            self.overflowed = True
+            self._pending.clear()
+        else:
+            self._pending.extend(events)
+        self._ready.set()
+
+    async def next_events(self, timeout: float) -> list[ChangeEvent]:
+        """Wait up to ``timeout`` seconds for events; an empty list when none arrived or after an overflow."""
+        if not self._pending and not self.overflowed:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        self._ready.clear()
+        events = list(self._pending)
+        self._pending.clear()
+        return events
+
+class ChangeEventBus:
+    """Numbers published events, keeps the most recent ones and fans them out to subscribers."""
+    def __init__(self, backlog_size: Optional[int] = None) -> None:
+        self.epoch = secrets.token_hex(4)
+        self._backlog: deque[ChangeEvent] = deque(maxlen=backlog_size or settings.CHANGE_EVENT_BACKLOG)
+        self._sequence = 0
+        self._subscriptions: set[ChangeSubscription] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def last_event_id(self) -> str:
+        return f"{self.epoch}-{self._sequence}"
+
+    def publish(self, events: list[ChangeEvent]) -> None:
+        """Number, timestamp and keep the events, then offer them to every subscriber."""
+        if not events:
+            return
+        occurred_at = datetime.datetime.now(datetime.timezone.utc)
+        with self._lock:
+            for event in events:
+                self._sequence += 1
+                event.sequence = self._sequence
+                event.event_id = f"{self.epoch}-{self._sequence}"
+                event.occurred_at = occurred_at
+            self._backlog.extend(events)
+            # Offered under the lock, so every subscriber gets concurrent publications in sequence order
+            closed = [subscription for subscription in self._subscriptions if not subscription._offer(events)]
+            self._subscriptions.difference_update(closed)
+
+    @staticmethod
+    def validate_event_id(last_event_id: str) -> None:
+        """Raise ValueError unless the ID has the ``<epoch>-<sequence>`` form of the IDs handed out."""
+        epoch, separator, sequence = last_event_id.partition("-")
+        if not epoch or not separator or not sequence.isdigit():
+            raise ValueError(f"{last_event_id!r} is not a valid event ID. Must be of the form '<epoch>-<sequence>'.")
+
+    def _missed_events(self, last_event_id: str) -> Optional[list[ChangeEvent]]:
+        """Events after the given one, or None when the backlog cannot tell what was missed."""
+        epoch, _, sequence = last_event_id.partition("-")
+        if epoch != self.epoch or not sequence.isdigit() or int(sequence) > self._sequence:
+            return None
+        after = int(sequence)
+        oldest = self._backlog[0].sequence if self._backlog else self._sequence + 1
+        if after < oldest - 1:
+            return None
+        return [event for event in self._backlog if event.sequence > after]
+
+    def subscribe(
+        self,
+        event_filter: ChangeEventFilter,
+        last_event_id: Optional[str] = None,
+        max_pending: Optional[int] = None
+    ) -> tuple[ChangeSubscription, Optional[list[ChangeEvent]]]:
+        """
+        Start receiving events on the running event loop.
+
+        :param ChangeEventFilter event_filter: Selects the events to receive.
+        :param str last_event_id: Resume after this event, e.g. the ``Last-Event-ID`` of a reconnecting client.
+        :param int max_pending: Events held for a slow subscriber; defaults to ``CHANGE_EVENT_SUBSCRIBER_QUEUE``.
+        :return: The subscription and the matching events missed since ``last_event_id``:
+            an empty list without one, None when they cannot be replayed and the client must reset.
+        :rtype: tuple[ChangeSubscription, Optional[list[ChangeEvent]]]
+        """
+        subscription = ChangeSubscription(
+            event_filter,
+            asyncio.get_running_loop(),
+            max_pending or settings.CHANGE_EVENT_SUBSCRIBER_QUEUE
+        )
+        # Replay and registration happen under one lock so no event falls between them
+        with self._lock:
+            missed = self._missed_events(last_event_id) if last_event_id else []
+            subscription.start_event_id = self.last_event_id
+            self._subscriptions.add(subscription)
+        if missed is not None:
+            missed = [event for event in missed if event_filter.matches(event)]
+        return subscription, missed
+
+    def unsubscribe(self, subscription: ChangeSubscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscriptions)
+
+    def recent_events(self, limit: int = 100) -> list[ChangeEvent]:
+        """The most recent events, oldest first."""
+        with self._lock:
+            return list(self._backlog)[-limit:] if limit > 0 else []
+
+change_event_bus = ChangeEventBus()
@@ -0,0 +1,125 @@
+"""
+Normalized match keys for candidate duplicate detection and clustering of candidates that share them.
+
+Every candidate gets three keys: its phone number in national form, its email
+address without sub-address tags, and its accent-folded, word-sorted name with
+the year of birth. Phone and email keys identify a person on their own; a name
+key is only a hint, since common names repeat. Duplicates are found by exact
+lookups on the keys (blocking), so no pair of candidates is ever compared
+directly.
+"""
+from typing import Any, Iterable, Literal, Optional
+
+from cims.core.text import name_tokens
+
+DuplicateKey = Literal["phone_key", "email_key", "name_key"]
+DUPLICATE_KEYS: tuple[DuplicateKey, ...] = ("phone_key", "email_key", "name_key")
+# Keys that identify a person on their own; a shared name key alone is only reported
+STRONG_KEYS: tuple[DuplicateKey, ...] = ("phone_key", "email_key")
+DuplicatePolicy = Literal["off", "warn", "reject"]
+
+COUNTRY_CODE = "84"
+# Fewer digits than this are placeholders rather than phone numbers
+MIN_PHONE_DIGITS = 8
+# Providers that ignore dots in the local part of an address
+DOTLESS_EMAIL_DOMAINS = {"gmail.com": "gmail.com", "googlemail.com": "gmail.com"}
+
+def normalize_phone(phone: str) -> Optional[str]:
+    """
+    A phone number as national digits, e.g. "+84 (91) 234-5678" -> "0912345678".
+
+    :return: The normalized number, or None when too short to identify anyone.
+    """
+    digits = "".join(char for char in phone if char.isdigit())
+    if digits.startswith("00" + COUNTRY_CODE):
+        digits = digits[2:]
+    if digits.startswith(COUNTRY_CODE) and len(digits) > 10:
+        digits = "0" + digits[len(COUNTRY_CODE):]
+    return digits if len(digits) >= MIN_PHONE_DIGITS else None
+
+def normalize_email(email: str) -> Optional[str]:
+    """
+    A lowercased address without a "+tag", and without dots for providers that ignore them.
+
+    :return: The normalized address, or None when it is not an address.
+    """
+    local, separator, domain = email.strip().lower().rpartition("@")
+    if not separator or not local or not domain:
+        return None
+    local = local.split("+", 1)[0]
+    if domain in DOTLESS_EMAIL_DOMAINS:
+        domain = DOTLESS_EMAIL_DOMAINS[domain]
+        local = local.replace(".", "")
+    return f"{local}@{domain}" if local else None
+
+def name_key(name: str, year_of_birth: Optional[int]) -> Optional[str]:
+    """
+    The accent-folded words of a name in sorted order, with the year of birth.
+
+    Sorting makes "Nguyễn Văn An" and "An Nguyen Van" share a key; the birth
+    year keeps namesakes apart.
+    """
+    tokens = name_tokens(name)
+    if not tokens:
+        return None
+    return f"{' '.join(sorted(tokens))}|{year_of_birth or ''}"
+
+def duplicate_keys(name: str, phone: str, email: str, year_of_birth: Optional[int]) -> dict[DuplicateKey, Optional[str]]:
+    """All match keys of a candidate."""
+    return {
+        "phone_key": normalize_phone(phone),
+        "email_key": normalize_email(email),
+        "name_key": name_key(name, year_of_birth),
+    }
+
+def is_strong_match(reasons: Iterable[str]) -> bool:
+    return any(reason in STRONG_KEYS for reason in reasons)
+
+def cluster_blocks(blocks: Iterable[tuple[DuplicateKey, list[int]]], min_size: int = 2) -> list[dict[str, Any]]:
+    """
+    Merge blocks of candidates sharing a key into clusters of likely duplicates.
+
+    Blocks are joined transitively with a union-find, linking each member to
+    the first one of its block, so the work is linear in the block sizes.
+
+    :param blocks: (key, candidate IDs) for every key value shared by more than one candidate.
+    :param int min_size: Leave out smaller clusters.
+    :return: Clusters with their sorted candidate IDs and the keys that linked them, largest first.
+    :rtype: list[dict[str, Any]]
+    """
+    parent: dict[int, int] = {}
+
+    def find(candidate_id: int) -> int:
+        root = parent.setdefault(candidate_id, candidate_id)
+        while root != parent[root]:
+            root = parent[root]
+        while parent[candidate_id] != root:
+            parent[candidate_id], candidate_id = root, parent[candidate_id]
+        return root
+
+    linked: list[tuple[DuplicateKey, int]] = []
+    for key, candidate_ids in blocks:
+        first = find(candidate_ids[0])
+        for candidate_id in candidate_ids[1:]:
+            root = find(candidate_id)
+            if root != first:
+                parent[root] = first
+        linked.append((key, candidate_ids[0]))
+
+    members: dict[int, list[int]] = {}
+    for candidate_id in parent:
+        members.setdefault(find(candidate_id), []).append(candidate_id)
+    reasons: dict[int, set[str]] = {}
+    for key, candidate_id in linked:
+        reasons.setdefault(find(candidate_id), set()).add(key)
+
+    clusters = [
+        {
+            "candidate_ids": sorted(candidate_ids),
+            "reasons": [key for key in DUPLICATE_KEYS if key in reasons[root]],
+        }
+        for root, candidate_ids in members.items()
+        if len(candidate_ids) >= min_size
+    ]
+    clusters.sort(key=lambda cluster: (-len(cluster["candidate_ids"]), cluster["candidate_ids"][0]))
+    return clusters
@@ -10,6 +10,10 @@ NomineeStatus = Literal[
     "KYHOPDONG"
 ]
 
+# Pipeline order of the statuses; TUCHOI is a terminal rejection reachable from any stage
+NOMINEE_FUNNEL_STAGES: tuple[NomineeStatus, ...] = ("DECU", "PHONGVAN", "THUONGLUONG", "THUVIEC", "KYHOPDONG")
+NOMINEE_REJECTED_STATUS: NomineeStatus = "TUCHOI"
+
 class Nominee:
     def __init__(
         self,
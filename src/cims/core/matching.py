@@ -0,0 +1,231 @@
+"""
+Candidate–project matching over an in-memory inverted index of candidate attributes.
+
+The index maps each attribute value (expertise, field, area, level, source) to
+the candidates that have it, so scoring a project only touches the candidates
+sharing at least one attribute with it. Those candidates are then scored
+together from NumPy columns of their attributes. Candidate profiles are
+loaded once and then refreshed per candidate: write paths mark the candidates
+they touched as stale after commit, and the next match reloads only those.
+A full rebuild every ``MATCHING_INDEX_MAX_AGE_SECONDS`` picks up writes made
+by other processes.
+"""
+from typing import Any, Callable, Iterable, Optional
+import threading
+import time
+
+import numpy as np
+
+from cims.config import settings
+
+# Share of the score each criterion contributes; a perfect match scores 1.0
+MATCH_WEIGHTS = {
+    "expertise": 0.35,
+    "level": 0.20,
+    "area": 0.15,
+    "field": 0.15,
+    "outcomes": 0.15,
+}
+# Share of the level weight for a candidate one level above or below; levels are ordered by ID
+ADJACENT_LEVEL_CREDIT = 0.5
+INDEXED_ATTRIBUTES = ("expertise_id", "field_id", "area_id", "level_id", "source")
+# Attributes compared against the project when scoring, kept as one array each
+SCORED_ATTRIBUTES = ("expertise_id", "field_id", "area_id", "level_id")
+
+ProfileLoader = Callable[[Optional[list[int]]], list[dict[str, Any]]]
+
+def outcome_score(nominations: int, advanced: int) -> float:
+    """Smoothed share of past nominations that got past screening; 0.5 without history."""
+    return (advanced + 1) / (nominations + 2)
+
+class CandidateIndex:
+    """
+    Inverted index of candidate attributes with per-candidate match profiles.
+
+    Every candidate occupies a slot in the attribute and outcome arrays; the
+    postings hold slots, and slots of removed candidates are reused.
+    """
+    def __init__(self) -> None:
+        self._postings: dict[str, dict[Any, set[int]]] = {attribute: {} for attribute in INDEXED_ATTRIBUTES}
+        self._profiles: dict[int, dict[str, Any]] = {}
+        self._slots: dict[int, int] = {}
+        self._free_slots: list[int] = []
+        self._candidate_ids = np.zeros(0, dtype=np.int64)
+        self._columns = {attribute: np.zeros(0, dtype=np.int64) for attribute in SCORED_ATTRIBUTES}
+        self._outcomes = np.zeros(0, dtype=np.float64)
+        self._stale: set[int] = set()
+        self._built_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def _allocate_slot(self) -> int:
+        if self._free_slots:
+            return self._free_slots.pop()
+        slot = len(self._slots)
+        if slot == len(self._candidate_ids):
+            capacity = max(1024, 2 * slot)
+            self._candidate_ids = np.resize(self._candidate_ids, capacity)
+            self._columns = {attribute: np.resize(column, capacity) for attribute, column in self._columns.items()}
+            self._outcomes = np.resize(self._outcomes, capacity)
+        return slot
+
+    def upsert(self, profile: dict[str, Any]) -> None:
+        with self._lock:
+            candidate_id = profile["candidate_id"]
+            self.remove(candidate_id)
+            slot = self._allocate_slot()
+            self._slots[candidate_id] = slot
+            self._profiles[candidate_id] = profile
+            self._candidate_ids[slot] = candidate_id
+            for attribute in SCORED_ATTRIBUTES:
+                self._columns[attribute][slot] = profile[attribute]
+            self._outcomes[slot] = outcome_score(profile["nominations"], profile["advanced"])
+            for attribute in INDEXED_ATTRIBUTES:
+                self._postings[attribute].setdefault(profile[attribute], set()).add(slot)
+
+    def remove(self, candidate_id: int) -> None:
+        with self._lock:
+            profile = self._profiles.pop(candidate_id, None)
+            if profile is None:
+                return
+            slot = self._slots.pop(candidate_id)
+            for attribute in INDEXED_ATTRIBUTES:
+                posting = self._postings[attribute][profile[attribute]]
+                posting.discard(slot)
+                if not posting:
+                    del self._postings[attribute][profile[attribute]]
+            self._free_slots.append(slot)
+
+    def postings(self, attribute: str, value: Any) -> set[int]:
+        """The IDs of the candidates with this attribute value."""
+        with self._lock:
+            return {int(self._candidate_ids[slot]) for slot in self._postings[attribute].get(value, ())}
+
+    def mark_stale(self, candidate_ids: Iterable[int]) -> None:
+        """Reload these candidates on the next refresh, e.g. after their row or nominees changed."""
+        with self._lock:
+            self._stale.update(candidate_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            for postings in self._postings.values():
+                postings.clear()
+            self._profiles.clear()
+            self._slots.clear()
+            self._free_slots.clear()
+            self._stale.clear()
+            self._built_at = None
+
+    def refresh(self, load_profiles: ProfileLoader, max_age_seconds: Optional[float] = None) -> None:
+        """
+        Bring the index up to date: a full build when missing or too old, otherwise reload stale candidates.
+
+        Profiles are loaded and a full build is done without holding the index
+        lock, so matches keep being served from the current index meanwhile;
+        the rebuilt index is swapped in at once. Refreshes run one at a time.
+
+        :param ProfileLoader load_profiles: Returns the profiles of the given candidate IDs, or of all candidates for None.
+        :param float max_age_seconds: Rebuild after this long; defaults to ``MATCHING_INDEX_MAX_AGE_SECONDS``.
+        """
+        max_age = settings.MATCHING_INDEX_MAX_AGE_SECONDS if max_age_seconds is None else max_age_seconds
+        with self._refresh_lock:
+            with self._lock:
+                rebuild = self._built_at is None or time.monotonic() - self._built_at >= max_age
+                # Candidates marked from here on were possibly loaded before their change and stay stale
+                stale, self._stale = sorted(self._stale), set()
+            if rebuild:
+                built = CandidateIndex()
+                for profile in load_profiles(None):
+                    built.upsert(profile)
+                with self._lock:
+                    for name in ("_postings", "_profiles", "_slots", "_free_slots", "_candidate_ids", "_columns", "_outcomes"):
+                        setattr(self, name, getattr(built, name))
+                    self._built_at = time.monotonic()
+                return
+
+            if not stale:
+                return
+            try:
+                profiles = {profile["candidate_id"]: profile for profile in load_profiles(stale)}
+            except Exception:
+                with self._lock:
+                    self._stale.update(stale)
+                raise
+            with self._lock:
+                for candidate_id in stale:
+                    if candidate_id in profiles:
+                        self.upsert(profiles[candidate_id])
+                    else:
+                        self.remove(candidate_id)
+
+    def _components(self, slots: np.ndarray, project: dict[str, Any]) -> dict[str, np.ndarray]:
+        """Weighted score components of the candidates in these slots."""
+        level_distance = np.abs(self._columns["level_id"][slots] - project["level_id"])
+        level_credit = np.where(level_distance == 0, 1.0, np.where(level_distance == 1, ADJACENT_LEVEL_CREDIT, 0.0))
+        return {
+            "expertise": MATCH_WEIGHTS["expertise"] * (self._columns["expertise_id"][slots] == project["expertise_id"]),
+            "level": MATCH_WEIGHTS["level"] * level_credit,
+            "area": MATCH_WEIGHTS["area"] * (self._columns["area_id"][slots] == project["area_id"]),
+            "field": MATCH_WEIGHTS["field"] * (self._columns["field_id"][slots] == project["field_id"]),
+            "outcomes": MATCH_WEIGHTS["outcomes"] * self._outcomes[slots],
+        }
+
+    def match(
+        self,
+        project: dict[str, Any],
+        limit: int = 20,
+        exclude: Iterable[int] = (),
+        source: Optional[str] = None
+    ) -> tuple[int, list[dict[str, Any]]]:
+        """
+        Score candidates against a project and return the best ones.
+
+        Only candidates in the postings of the project's expertise, area,
+        customer field or the exact and adjacent levels are scored, so
+        candidates sharing none of them are never visited. Ties are broken by
+        candidate ID.
+
+        :param dict[str, Any] project: The project's expertise_id, level_id, area_id and its customer's field_id.
+        :param int limit: The number of candidates to return.
+        :param Iterable[int] exclude: Candidate IDs to leave out, e.g. those already nominated.
+        :param str source: Only consider candidates from this source.
+        :return: The number of candidates scored, and the best matches with their score breakdown.
+        :rtype: tuple[int, list[dict[str, Any]]]
+        """
+        with self._lock:
+            level_id = project["level_id"]
+            slots = set().union(
+                *(self._postings[attribute].get(project[attribute], ()) for attribute in ("expertise_id", "area_id", "field_id")),
+                *(self._postings["level_id"].get(level, ()) for level in (level_id - 1, level_id, level_id + 1)),
+            )
+            if source is not None:
+                slots &= self._postings["source"].get(source, set())
+            slots.difference_update(self._slots[candidate_id] for candidate_id in exclude if candidate_id in self._slots)
+            if not slots or limit <= 0:
+                return len(slots), []
+
+            selected = np.fromiter(slots, dtype=np.int64, count=len(slots))
+            components = self._components(selected, project)
+            scores = sum(components.values())
+            if len(selected) > limit:
+                # Keep everything tied with the limit-th best score so ties are still broken by ID
+                threshold = -np.partition(-scores, limit - 1)[limit - 1]
+                candidates = np.flatnonzero(scores >= threshold)
+            else:
+                candidates = np.arange(len(selected))
+            best = candidates[np.lexsort((self._candidate_ids[selected[candidates]], -scores[candidates]))][:limit]
+
+            matches = []
+            for position in best.tolist():
+                profile = self._profiles[int(self._candidate_ids[selected[position]])]
+                matches.append({
+                    **profile,
+                    "score": round(float(scores[position]), 4),
+                    "components": {name: round(float(values[position]), 4) for name, values in components.items()},
+                })
+            return len(selected), matches
+
+candidate_index = CandidateIndex()
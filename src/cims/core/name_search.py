@@ -0,0 +1,297 @@
+"""
+Typo-tolerant name search over an in-memory index of accent-folded name words.
+
+Names are folded (see ``cims.core.text.fold_accents``) and split into words.
+The index has two levels: a trigram index over the vocabulary of distinct
+words, padded like PostgreSQL's pg_trgm, and per-word postings of the names
+containing each word. A query word matches every vocabulary word that contains
+at least ``NAME_SEARCH_MIN_SIMILARITY`` of its trigrams, so "Nguyen" finds
+"Nguyễn", "Nguyn" still finds it and "ngu" acts as a prefix. A name matches
+when it has a match for every query word, and names are ranked by how similar
+their words are to the query's, shorter names first on ties.
+
+The vocabulary is far smaller than the set of names, so the fuzzy step is
+cheap; the name side is a few vectorized NumPy operations over the postings of
+the matched words. Writes land in small delta postings that are merged into
+the arrays once they grow. As with the matching index, write paths mark the
+IDs they touched as stale after commit and the next search reloads only those,
+and a full rebuild every ``NAME_SEARCH_INDEX_MAX_AGE_SECONDS`` picks up writes
+made by other processes.
+"""
+from collections import Counter
+from typing import Callable, Iterable, Optional
+import math
+import threading
+import time
+
+import numpy as np
+
+from cims.config import settings
+from cims.core.text import name_tokens
+
+NameLoader = Callable[[Optional[list[int]]], list[tuple[int, str]]]
+
+# Delta postings merged into the arrays once they hold this many entries
+COMPACT_THRESHOLD = 20_000
+# Weight of a name's word count in the ranking; small enough to only break similarity ties
+WORD_COUNT_PENALTY = 1e-4
+
+# The attributes a full build replaces at once
+INDEX_STATE = (
+    "_slots", "_ids", "_alive", "_word_counts", "_used", "_words", "_vocabulary_postings", "_word_sizes",
+    "_postings", "_delta", "_delta_size",
+)
+
+def word_trigrams(word: str) -> frozenset[str]:
+    """The trigrams of a folded word padded with two leading and one trailing space."""
+    padded = f"  {word} "
+    return frozenset(padded[start:start + 3] for start in range(len(padded) - 2))
+
+class NameSearchIndex:
+    """Index of names keyed by entity ID, searched word by word."""
+    def __init__(self) -> None:
+        self._slots: dict[int, int] = {}
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._alive = np.zeros(0, dtype=bool)
+        self._word_counts = np.zeros(0, dtype=np.int32)
+        self._used = 0
+        # Vocabulary: word -> number, trigram -> word numbers, and trigram count per word number
+        self._words: dict[str, int] = {}
+        self._vocabulary_postings: dict[str, list[int]] = {}
+        self._word_sizes: list[int] = []
+        # Word number -> slots of the names containing it
+        self._postings: dict[int, np.ndarray] = {}
+        self._delta: dict[int, list[int]] = {}
+        self._delta_size = 0
+        self._stale: set[int] = set()
+        self._built_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _word_number(self, word: str) -> int:
+        number = self._words.get(word)
+        if number is None:
+            number = self._words[word] = len(self._word_sizes)
+            trigrams = word_trigrams(word)
+            self._word_sizes.append(len(trigrams))
+            for trigram in trigrams:
+                self._vocabulary_postings.setdefault(trigram, []).append(number)
+        return number
+
+    def _allocate_slot(self) -> int:
+        slot = self._used
+        if slot == len(self._ids):
+            capacity = max(1024, 2 * slot)
+            self._ids = np.resize(self._ids, capacity)
+            self._alive = np.resize(self._alive, capacity)
+            self._alive[slot:] = False
+            self._word_counts = np.resize(self._word_counts, capacity)
+        self._used += 1
+        return slot
+
+    def _add(self, entity_id: int, word_numbers: tuple[int, ...], postings: dict[int, list[int]]) -> None:
+        slot = self._allocate_slot()
+        self._slots[entity_id] = slot
+        self._ids[slot] = entity_id
+        self._alive[slot] = True
+        self._word_counts[slot] = len(word_numbers)
+        for number in word_numbers:
+            postings.setdefault(number, []).append(slot)
+
+    def _name_words(self, name: str) -> tuple[int, ...]:
+        return tuple({self._word_number(word): None for word in name_tokens(name)})
+
+    def upsert(self, entity_id: int, name: str) -> None:
+        with self._lock:
+            self.remove(entity_id)
+            word_numbers = self._name_words(name)
+            self._add(entity_id, word_numbers, self._delta)
+            self._delta_size += len(word_numbers)
+            if self._delta_size >= COMPACT_THRESHOLD:
+                self._compact()
+
+    def remove(self, entity_id: int) -> None:
+        """Drop an entity; its slot stays allocated until the next full build."""
+        with self._lock:
+            slot = self._slots.pop(entity_id, None)
+            if slot is not None:
+                self._alive[slot] = False
+
+    def _compact(self) -> None:
+        """Merge the delta postings into the arrays and drop dead slots from them."""
+        postings = {}
+        for number in self._postings.keys() | self._delta.keys():
+            merged = np.concatenate((
+                self._postings.get(number, np.zeros(0, dtype=np.int64)),
+                np.asarray(self._delta.get(number, ()), dtype=np.int64),
+            ))
+            merged = merged[self._alive[merged]]
+            if len(merged):
+                postings[number] = merged
+        self._postings = postings
+        self._delta = {}
+        self._delta_size = 0
+
+    def build(self, names: Iterable[tuple[int, str]]) -> None:
+        """Replace the index with these (ID, name) pairs, built aside and swapped in so searches are not held up."""
+        built = NameSearchIndex()
+        postings: dict[int, list[int]] = {}
+        # Names repeat a lot, so each distinct name is split into words once
+        words_of: dict[str, tuple[int, ...]] = {}
+        for entity_id, name in names:
+            word_numbers = words_of.get(name)
+            if word_numbers is None:
+                word_numbers = words_of[name] = built._name_words(name)
+            built._add(entity_id, word_numbers, postings)
+        built._postings = {number: np.asarray(slots, dtype=np.int64) for number, slots in postings.items()}
+        with self._lock:
+            for attribute in INDEX_STATE:
+                setattr(self, attribute, getattr(built, attribute))
+            self._built_at = time.monotonic()
+
+    def mark_stale(self, entity_ids: Iterable[int]) -> None:
+        """Reload these names on the next refresh, e.g. after they were written."""
+        with self._lock:
+            self._stale.update(entity_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slots.clear()
+            self._alive[:] = False
+            self._used = 0
+            self._words.clear()
+            self._vocabulary_postings.clear()
+            self._word_sizes.clear()
+            self._postings = {}
+            self._delta = {}
+            self._delta_size = 0
+            self._stale.clear()
+            self._built_at = None
+
+    def refresh(self, load_names: NameLoader, max_age_seconds: Optional[float] = None) -> None:
+        """
+        Bring the index up to date: a full build when missing or too old, otherwise reload stale names.
+
+        Names are loaded without holding the index lock, so searches keep using
+        the current index meanwhile. While another refresh of a built index is
+        running this returns at once rather than waiting for it.
+
+        :param NameLoader load_names: Returns the (ID, name) pairs of the given IDs, or of all entities for None.
+        :param float max_age_seconds: Rebuild after this long; defaults to ``NAME_SEARCH_INDEX_MAX_AGE_SECONDS``.
+        """
+        max_age = settings.NAME_SEARCH_INDEX_MAX_AGE_SECONDS if max_age_seconds is None else max_age_seconds
+        if not self._refresh_lock.acquire(blocking=self._built_at is None):
+            return
+        try:
+            with self._lock:
+                rebuild = self._built_at is None or time.monotonic() - self._built_at >= max_age
+                # IDs marked from here on were possibly loaded before their write and stay stale
+                stale, self._stale = sorted(self._stale), set()
+            if rebuild:
+                self.build(load_names(None))
+                return
+
+            if not stale:
+                return
+            try:
+                names = dict(load_names(stale))
+            except Exception:
+                with self._lock:
+                    self._stale.update(stale)
+                raise
+            with self._lock:
+                for entity_id in stale:
+                    if entity_id in names:
+                        self.upsert(entity_id, names[entity_id])
+                    else:
+                        self.remove(entity_id)
+        finally:
+            self._refresh_lock.release()
+
+    def _similar_words(self, word: str, min_similarity: float) -> list[tuple[int, float]]:
+        """
+        Vocabulary words containing enough of the word's trigrams, with their Dice similarity to it.
+
+        Containment decides the match, so a short query word also matches longer
+        words starting with it; the Dice coefficient ranks the exact word first.
+        """
+        trigrams = word_trigrams(word)
+        required = max(1, math.ceil(min_similarity * len(trigrams) - 1e-9))
+        shared: Counter[int] = Counter()
+        for trigram in trigrams:
+            shared.update(self._vocabulary_postings.get(trigram, ()))
+        return [
+            (number, 2 * count / (len(trigrams) + self._word_sizes[number]))
+            for number, count in shared.items()
+            if count >= required
+        ]
+
+    def search(
+        self,
+        query: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        restrict_to: Optional[Iterable[int]] = None,
+        min_similarity: Optional[float] = None
+    ) -> tuple[int, list[int]]:
+        """
+        Rank the names matching every word of a query.
+
+        Example:
+            ```python
+            total, ids = candidate_name_index.search("nguyen van an", limit=20)
+            ```
+            Returns the number of matching candidates and the IDs of the best
+            20: "Nguyễn Văn An" first, then e.g. "Nguyễn Văn Anh".
+
+        :param str query: The name or part of a name to look for.
+        :param int offset: The number of ranked matches to skip.
+        :param int limit: The number of IDs to return; all matches when None.
+        :param Iterable[int] restrict_to: Only consider these IDs, e.g. those passing other filters.
+        :param float min_similarity: Share of a query word's trigrams a name word must contain;
+            defaults to ``NAME_SEARCH_MIN_SIMILARITY``.
+        :return: The number of matches and the IDs of the requested page, best first; ties by ID.
+        :rtype: tuple[int, list[int]]
+        """
+        words = list(dict.fromkeys(name_tokens(query)))
+        if not words:
+            return 0, []
+        threshold = settings.NAME_SEARCH_MIN_SIMILARITY if min_similarity is None else min_similarity
+
+        with self._lock:
+            size = self._used
+            scores = np.zeros(size, dtype=np.float64)
+            matched = self._alive[:size].copy()
+            for word in words:
+                # Each name gets the similarity of its closest word to this query word
+                word_scores = np.zeros(size, dtype=np.float64)
+                for number, similarity in self._similar_words(word, threshold):
+                    for slots in (self._postings.get(number), self._delta.get(number)):
+                        if slots is not None and len(slots):
+                            word_scores[slots] = np.maximum(word_scores[slots], similarity)
+                matched &= word_scores > 0
+                scores += word_scores
+
+            if restrict_to is not None:
+                matched &= np.isin(self._ids[:size], np.fromiter(restrict_to, dtype=np.int64))
+            hits = np.flatnonzero(matched)
+            total = len(hits)
+            end = total if limit is None else min(total, offset + limit)
+            if offset >= end:
+                return total, []
+
+            ranking = scores[hits] - WORD_COUNT_PENALTY * self._word_counts[hits]
+            if end < total:
+                # Keep everything tied with the last requested score so ties are still broken by ID
+                last = -np.partition(-ranking, end - 1)[end - 1]
+                keep = ranking >= last
+                hits, ranking = hits[keep], ranking[keep]
+            ids = self._ids[hits]
+            order = np.lexsort((ids, -ranking))
+            return total, ids[order][offset:end].tolist()
+
+candidate_name_index = NameSearchIndex()
+customer_name_index = NameSearchIndex()
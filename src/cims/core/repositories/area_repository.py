@@ -1,6 +1,6 @@
 from cims.core.entities.area import Area
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Any
 
 class AreaRepository(ABC):
     @abstractmethod
@@ -14,6 +14,45 @@ class AreaRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def create_many(self, areas: list[Area], commit: bool = True) -> list[Area]:
+        """
+        Create several areas with multi-row inserts.
+
+        :param list[Area] areas: The area entities to be created.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The created area entities, in input order.
+        :rtype: list[Area]
+        """
+        pass
+
+    @abstractmethod
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        """
+        Patch several areas by ID.
+
+        Identical patches are applied with a single statement.
+
+        :param dict[int, dict[str, Any]] patches: Column values to set, keyed by area ID.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of areas updated.
+        :rtype: int
+        :raises ValueError: If a patch sets an unknown or read-only column.
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, area_ids: list[int], commit: bool = True) -> int:
+        """
+        Delete several areas by ID with a single statement.
+
+        :param list[int] area_ids: The IDs of the areas to delete.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of areas deleted.
+        :rtype: int
+        """
+        pass
+
     @abstractmethod
     def get_all_areas(self, limit: int = 100, offset: int = 0) -> list[Area]:
         """
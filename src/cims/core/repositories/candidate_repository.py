@@ -1,6 +1,6 @@
 from cims.core.entities.candidate import Candidate
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Any, Iterator
 
 class CandidateRepository(ABC):
     @abstractmethod
@@ -14,6 +14,103 @@ class CandidateRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def create_many(self, candidates: list[Candidate], commit: bool = True) -> list[Candidate]:
+        """
+        Create several candidates with multi-row inserts.
+
+        :param list[Candidate] candidates: The candidate entities to be created.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The created candidate entities, in input order.
+        :rtype: list[Candidate]
+        """
+        pass
+
+    @abstractmethod
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        """
+        Patch several candidates by ID.
+
+        Identical patches are applied with a single statement.
+
+        :param dict[int, dict[str, Any]] patches: Column values to set, keyed by candidate ID.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of candidates updated.
+        :rtype: int
+        :raises ValueError: If a patch sets an unknown or read-only column.
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, candidate_ids: list[int], commit: bool = True) -> int:
+        """
+        Delete several candidates by ID with a single statement.
+
+        :param list[int] candidate_ids: The IDs of the candidates to delete.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of candidates deleted.
+        :rtype: int
+        """
+        pass
+
+    @abstractmethod
+    def get_match_profiles(self, candidate_ids: Optional[list[int]] = None) -> list[dict[str, Any]]:
+        """
+        Retrieve the attributes candidates are matched on, with their nominee outcomes, in a single grouped query.
+
+        :param list[int] candidate_ids: The candidates to load; all candidates when None.
+        :return: Rows with candidate_id, name, headhunter_id, expertise_id, field_id, area_id, level_id,
+            source, nominations (nominees of the candidate) and advanced (nominees past the first stage).
+        :rtype: list[dict[str, Any]]
+        """
+        pass
+
+    @abstractmethod
+    def find_duplicates(self, candidate: Candidate, limit: int = 20) -> list[dict[str, Any]]:
+        """
+        Find existing candidates that share a normalized phone, email, or name and year of birth with a candidate.
+
+        :param Candidate candidate: The candidate to check; itself excluded when it has an ID.
+        :param int limit: The maximum number of candidates to return.
+        :return: Rows with candidate_id, name, phone, email and reasons (the shared keys),
+            phone or email matches first.
+        :rtype: list[dict[str, Any]]
+        """
+        pass
+
+    @abstractmethod
+    def find_duplicates_many(self, candidates: list[Candidate], limit: int = 20) -> list[list[dict[str, Any]]]:
+        """
+        Find the existing duplicates of several new candidates at once, e.g. the rows of an import.
+
+        :param list[Candidate] candidates: The candidates to check.
+        :param int limit: The maximum number of candidates to return per candidate.
+        :return: The duplicates of each candidate in input order, as find_duplicates returns them.
+        :rtype: list[list[dict[str, Any]]]
+        """
+        pass
+
+    @abstractmethod
+    def find_duplicate_clusters(self, strong_only: bool = False, min_size: int = 2) -> list[dict[str, Any]]:
+        """
+        Group all candidates into clusters of likely duplicates by blocking on their normalized keys.
+
+        :param bool strong_only: Only link candidates sharing a phone or email, not just a name and birth year.
+        :param int min_size: Leave out smaller clusters.
+        :return: Clusters with candidate_ids and reasons (the keys that linked them), largest first.
+        :rtype: list[dict[str, Any]]
+        """
+        pass
+
+    @abstractmethod
+    def refresh_duplicate_keys(self, commit: bool = True) -> None:
+        """
+        Recompute the duplicate keys of all candidates, e.g. after a bulk load or manual SQL.
+
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        """
+        pass
+
     @abstractmethod
     def count_all_candidates(self) -> int:
         """
@@ -50,7 +147,9 @@ class CandidateRepository(ABC):
     @abstractmethod
     def search_candidates_by_name(self, name_query: str, limit: int = 100, offset: int = 0) -> list[Candidate]:
         """
-        Search candidates by name using a partial match.
+        Search candidates by name, ranked by fuzzy match when ``NAME_SEARCH_INDEX`` is enabled.
+
+        The match ignores diacritics and tolerates typos; otherwise it is a case-insensitive partial match.
 
         :param str name_query: The name query to search for.
         :param int limit: The maximum number of candidates to return.
@@ -110,6 +209,67 @@ class CandidateRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_candidate_rows(
+        self,
+        fields: list[str],
+        name: Optional[str] = None,
+        expertise_id: Optional[int] = None,
+        field_id: Optional[int] = None,
+        area_id: Optional[int] = None,
+        level_id: Optional[int] = None,
+        headhunter_id: Optional[int] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> list[dict[str, Any]]:
+        """
+        Retrieve a column projection of candidates, optionally filtered.
+
+        Only the requested columns are loaded. Fields that are not stored
+        candidate columns are ignored.
+
+        :param list[str] fields: The candidate fields to load.
+        :param str name: The name to filter candidates by.
+        :param int expertise_id: The expertise ID to filter candidates by.
+        :param int field_id: The field ID to filter candidates by.
+        :param int area_id: The area ID to filter candidates by.
+        :param int level_id: The level ID to filter candidates by.
+        :param int headhunter_id: The headhunter ID to filter candidates by.
+        :param int limit: The maximum number of candidates to return.
+        :param int offset: The number of candidates to skip.
+        :return: A list of rows keyed by field name.
+        :rtype: list[dict[str, Any]]
+        """
+        pass
+
+    @abstractmethod
+    def iter_candidate_rows(
+        self,
+        name: Optional[str] = None,
+        expertise_id: Optional[int] = None,
+        field_id: Optional[int] = None,
+        area_id: Optional[int] = None,
+        level_id: Optional[int] = None,
+        headhunter_id: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Stream candidates matching the filters as plain rows, including reference names.
+
+        Rows are fetched lazily in batches so memory stays bounded for large exports.
+
+        :param str name: The name to filter candidates by.
+        :param int expertise_id: The expertise ID to filter candidates by.
+        :param int field_id: The field ID to filter candidates by.
+        :param int area_id: The area ID to filter candidates by.
+        :param int level_id: The level ID to filter candidates by.
+        :param int headhunter_id: The headhunter ID to filter candidates by.
+        :param int batch_size: The number of rows fetched from the database at a time.
+        :return: An iterator of rows keyed by field name, ordered by candidate ID.
+        :rtype: Iterator[dict[str, Any]]
+        """
+        pass
+
     @abstractmethod
     def get_candidates_by_ids(self, candidate_ids: list[int]) -> list[Candidate]:
         """
@@ -1,6 +1,6 @@
 from cims.core.entities.customer import Customer
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Any
 
 class CustomerRepository(ABC):
     @abstractmethod
@@ -14,6 +14,45 @@ class CustomerRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def create_many(self, customers: list[Customer], commit: bool = True) -> list[Customer]:
+        """
+        Create several customers with multi-row inserts.
+
+        :param list[Customer] customers: The customer entities to be created.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The created customer entities, in input order.
+        :rtype: list[Customer]
+        """
+        pass
+
+    @abstractmethod
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        """
+        Patch several customers by ID.
+
+        Identical patches are applied with a single statement.
+
+        :param dict[int, dict[str, Any]] patches: Column values to set, keyed by customer ID.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of customers updated.
+        :rtype: int
+        :raises ValueError: If a patch sets an unknown or read-only column.
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, customer_ids: list[int], commit: bool = True) -> int:
+        """
+        Delete several customers by ID with a single statement.
+
+        :param list[int] customer_ids: The IDs of the customers to delete.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of customers deleted.
+        :rtype: int
+        """
+        pass
+
     @abstractmethod
     def get_customer_id_by_name(self, customer_name: str) -> Optional[int]:
         """
@@ -86,7 +125,9 @@ class CustomerRepository(ABC):
     @abstractmethod
     def search_customers_by_name(self, name_query: str, limit: int = 100, offset: int = 0) -> list[Customer]:
         """
-        Search customers by name using a partial match.
+        Search customers by name, ranked by fuzzy match when ``NAME_SEARCH_INDEX`` is enabled.
+
+        The match ignores diacritics and tolerates typos; otherwise it is a case-insensitive partial match.
 
         :param str name_query: The name query to search for.
         :param int limit: The maximum number of customers to return.
@@ -94,4 +135,21 @@ class CustomerRepository(ABC):
         :return: A list of matching customer entities.
         :rtype: list[Customer]
         """
+        pass
+
+    @abstractmethod
+    def get_customer_rows(self, fields: list[str], name_query: Optional[str] = None, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
+        """
+        Retrieve a column projection of customers, optionally filtered by name.
+
+        Only the requested columns are loaded. Fields that are not stored
+        customer columns are ignored.
+
+        :param list[str] fields: The customer fields to load.
+        :param str name_query: The name query to search for.
+        :param int limit: The maximum number of customers to return.
+        :param int offset: The number of customers to skip.
+        :return: A list of rows keyed by field name.
+        :rtype: list[dict[str, Any]]
+        """
         pass
\ No newline at end of file
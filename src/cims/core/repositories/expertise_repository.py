@@ -1,6 +1,6 @@
 from cims.core.entities.expertise import Expertise
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Any
 
 class ExpertiseRepository(ABC):
     @abstractmethod
@@ -14,6 +14,45 @@ class ExpertiseRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def create_many(self, expertises: list[Expertise], commit: bool = True) -> list[Expertise]:
+        """
+        Create several expertises with multi-row inserts.
+
+        :param list[Expertise] expertises: The expertise entities to be created.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The created expertise entities, in input order.
+        :rtype: list[Expertise]
+        """
+        pass
+
+    @abstractmethod
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        """
+        Patch several expertises by ID.
+
+        Identical patches are applied with a single statement.
+
+        :param dict[int, dict[str, Any]] patches: Column values to set, keyed by expertise ID.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of expertises updated.
+        :rtype: int
+        :raises ValueError: If a patch sets an unknown or read-only column.
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, expertise_ids: list[int], commit: bool = True) -> int:
+        """
+        Delete several expertises by ID with a single statement.
+
+        :param list[int] expertise_ids: The IDs of the expertises to delete.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of expertises deleted.
+        :rtype: int
+        """
+        pass
+
     @abstractmethod
     def get_expertises_by_ids(self, expertise_ids: list[int]) -> list[Expertise]:
         """
@@ -1,6 +1,6 @@
 from cims.core.entities.field import Field
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Any
 
 class FieldRepository(ABC):
     @abstractmethod
@@ -14,6 +14,45 @@ class FieldRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def create_many(self, fields: list[Field], commit: bool = True) -> list[Field]:
+        """
+        Create several fields with multi-row inserts.
+
+        :param list[Field] fields: The field entities to be created.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The created field entities, in input order.
+        :rtype: list[Field]
+        """
+        pass
+
+    @abstractmethod
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        """
+        Patch several fields by ID.
+
+        Identical patches are applied with a single statement.
+
+        :param dict[int, dict[str, Any]] patches: Column values to set, keyed by field ID.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of fields updated.
+        :rtype: int
+        :raises ValueError: If a patch sets an unknown or read-only column.
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, field_ids: list[int], commit: bool = True) -> int:
+        """
+        Delete several fields by ID with a single statement.
+
+        :param list[int] field_ids: The IDs of the fields to delete.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of fields deleted.
+        :rtype: int
+        """
+        pass
+
     @abstractmethod
     def get_field_id_by_name(self, field_name: str) -> Optional[int]:
         """
@@ -1,6 +1,9 @@
 from cims.core.entities.headhunter import Headhunter
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Any, Literal
+import datetime
+
+StatsPeriod = Literal["week", "month", "quarter"]
 
 class HeadhunterRepository(ABC):
     @abstractmethod
@@ -14,6 +17,45 @@ class HeadhunterRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def create_many(self, headhunters: list[Headhunter], commit: bool = True) -> list[Headhunter]:
+        """
+        Create several headhunters with multi-row inserts.
+
+        :param list[Headhunter] headhunters: The headhunter entities to be created.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The created headhunter entities, in input order.
+        :rtype: list[Headhunter]
+        """
+        pass
+
+    @abstractmethod
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        """
+        Patch several headhunters by ID.
+
+        Identical patches are applied with a single statement.
+
+        :param dict[int, dict[str, Any]] patches: Column values to set, keyed by headhunter ID.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of headhunters updated.
+        :rtype: int
+        :raises ValueError: If a patch sets an unknown or read-only column.
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, headhunter_ids: list[int], commit: bool = True) -> int:
+        """
+        Delete several headhunters by ID with a single statement.
+
+        :param list[int] headhunter_ids: The IDs of the headhunters to delete.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of headhunters deleted.
+        :rtype: int
+        """
+        pass
+
     @abstractmethod
     def count_all_headhunters(self) -> int:
         """
@@ -104,4 +146,31 @@ class HeadhunterRepository(ABC):
         :return: A list of matching headhunter entities.
         :rtype: list[Headhunter]
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_period_stats(self, period: StatsPeriod, start: datetime.date, end: datetime.date) -> list[dict[str, Any]]:
+        """
+        Aggregate each headhunter's activity per week, month or quarter with grouped SQL.
+
+        Candidates count on the UTC day they were created; nominees count on the day
+        they were nominated, with their current status, so a nominee signed later
+        still counts towards the period it was nominated in.
+
+        :param StatsPeriod period: The bucket size; weeks start on Monday.
+        :param datetime.date start: First day included.
+        :param datetime.date end: Last day included.
+        :return: One row per headhunter and period with headhunter_id, headhunter_name,
+            period_start, candidates_sourced, nominees and stage_counts (nominees per status).
+        :rtype: list[dict[str, Any]]
+        """
+        pass
+
+    @abstractmethod
+    def refresh_daily_stats(self, commit: bool = True) -> None:
+        """
+        Rebuild the daily headhunter stats from candidates and nominees, e.g. after a bulk load that bypassed the repositories.
+
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        """
+        pass
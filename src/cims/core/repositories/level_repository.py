@@ -1,6 +1,6 @@
 from cims.core.entities.level import Level
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Any
 
 class LevelRepository(ABC):
     @abstractmethod
@@ -14,6 +14,45 @@ class LevelRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def create_many(self, levels: list[Level], commit: bool = True) -> list[Level]:
+        """
+        Create several levels with multi-row inserts.
+
+        :param list[Level] levels: The level entities to be created.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The created level entities, in input order.
+        :rtype: list[Level]
+        """
+        pass
+
+    @abstractmethod
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        """
+        Patch several levels by ID.
+
+        Identical patches are applied with a single statement.
+
+        :param dict[int, dict[str, Any]] patches: Column values to set, keyed by level ID.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of levels updated.
+        :rtype: int
+        :raises ValueError: If a patch sets an unknown or read-only column.
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, level_ids: list[int], commit: bool = True) -> int:
+        """
+        Delete several levels by ID with a single statement.
+
+        :param list[int] level_ids: The IDs of the levels to delete.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of levels deleted.
+        :rtype: int
+        """
+        pass
+
     @abstractmethod
     def get_levels_by_ids(self, level_ids: list[int]) -> list[Level]:
         """
@@ -1,6 +1,9 @@
 from cims.core.entities.nominee import Nominee
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Any, Iterator
+import datetime
+
+import numpy as np
 
 class NomineeRepository(ABC):
     @abstractmethod
@@ -14,6 +17,45 @@ class NomineeRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def create_many(self, nominees: list[Nominee], commit: bool = True) -> list[Nominee]:
+        """
+        Create several nominees with multi-row inserts.
+
+        :param list[Nominee] nominees: The nominee entities to be created.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The created nominee entities, in input order.
+        :rtype: list[Nominee]
+        """
+        pass
+
+    @abstractmethod
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        """
+        Patch several nominees by ID.
+
+        Identical patches are applied with a single statement.
+
+        :param dict[int, dict[str, Any]] patches: Column values to set, keyed by nominee ID.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of nominees updated.
+        :rtype: int
+        :raises ValueError: If a patch sets an unknown or read-only column.
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, nominee_ids: list[int], commit: bool = True) -> int:
+        """
+        Delete several nominees by ID with a single statement.
+
+        :param list[int] nominee_ids: The IDs of the nominees to delete.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of nominees deleted.
+        :rtype: int
+        """
+        pass
+
     @abstractmethod
     def get_nominees_by_ids(self, nominee_ids: list[int]) -> list[Nominee]:
         """
@@ -98,6 +140,28 @@ class NomineeRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_nominees_by_project_ids(self, project_ids: list[int]) -> list[Nominee]:
+        """
+        Retrieve all nominees belonging to any of the given projects.
+
+        :param list[int] project_ids: The project IDs to retrieve nominees for.
+        :return: A list of nominee entities.
+        :rtype: list[Nominee]
+        """
+        pass
+
+    @abstractmethod
+    def get_nominees_by_candidate_ids(self, candidate_ids: list[int]) -> list[Nominee]:
+        """
+        Retrieve all nominees belonging to any of the given candidates.
+
+        :param list[int] candidate_ids: The candidate IDs to retrieve nominees for.
+        :return: A list of nominee entities.
+        :rtype: list[Nominee]
+        """
+        pass
+
     @abstractmethod
     def search_nominees_by_campaign(self, campaign_query: str, limit: int = 100, offset: int = 0) -> list[Nominee]:
         """
@@ -124,6 +188,92 @@ class NomineeRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_nominee_rows(self, fields: list[str], status: Optional[str] = None, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
+        """
+        Retrieve a column projection of nominees, optionally filtered by status.
+
+        Only the requested columns are loaded. Fields that are not stored
+        nominee columns are ignored.
+
+        :param list[str] fields: The nominee fields to load.
+        :param str status: The status to filter nominees by.
+        :param int limit: The maximum number of nominees to return.
+        :param int offset: The number of nominees to skip.
+        :return: A list of rows keyed by field name.
+        :rtype: list[dict[str, Any]]
+        """
+        pass
+
+    @abstractmethod
+    def iter_nominee_rows(
+        self,
+        status: Optional[str] = None,
+        project_id: Optional[int] = None,
+        candidate_id: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Stream nominees matching the filters as plain rows, including candidate, project and headhunter names.
+
+        Rows are fetched lazily in batches so memory stays bounded for large exports.
+
+        :param str status: The status to filter nominees by.
+        :param int project_id: The project ID to filter nominees by.
+        :param int candidate_id: The candidate ID to filter nominees by.
+        :param int batch_size: The number of rows fetched from the database at a time.
+        :return: An iterator of rows keyed by field name, ordered by nominee ID.
+        :rtype: Iterator[dict[str, Any]]
+        """
+        pass
+
+    @abstractmethod
+    def count_nominees_by_status(
+        self,
+        project_id: Optional[int] = None,
+        customer_id: Optional[int] = None,
+        campaign: Optional[str] = None,
+        headhunter_id: Optional[int] = None,
+        created_from: Optional[datetime.date] = None,
+        created_to: Optional[datetime.date] = None
+    ) -> dict[str, int]:
+        """
+        Count nominees per status with a single grouped query, without loading nominees.
+
+        :param int project_id: Only count nominees of this project.
+        :param int customer_id: Only count nominees of this customer's projects.
+        :param str campaign: Only count nominees of this campaign (exact match).
+        :param int headhunter_id: Only count nominees whose candidate is owned by this headhunter.
+        :param datetime.date created_from: Only count nominees created on or after this day.
+        :param datetime.date created_to: Only count nominees created on or before this day.
+        :return: The number of matching nominees keyed by status; statuses without nominees are omitted.
+        :rtype: dict[str, int]
+        """
+        pass
+
+    @abstractmethod
+    def get_salary_columns(
+        self,
+        expertise_id: Optional[int] = None,
+        level_id: Optional[int] = None,
+        area_id: Optional[int] = None,
+        status: Optional[str] = None
+    ) -> dict[str, np.ndarray]:
+        """
+        Fetch the salary data of the matching nominees as columns, without building entities.
+
+        Expertise, level and area are those of the nominee's project.
+
+        :param int expertise_id: Only include nominees of projects with this expertise.
+        :param int level_id: Only include nominees of projects with this level.
+        :param int area_id: Only include nominees of projects in this area.
+        :param str status: Only include nominees with this status.
+        :return: Equal-length arrays keyed ``salary_expectation`` (float), ``years_of_experience``,
+            ``expertise_id``, ``level_id`` and ``area_id`` (int).
+        :rtype: dict[str, np.ndarray]
+        """
+        pass
+
     @abstractmethod
     def count_all_nominees(self) -> int:
         """
@@ -1,6 +1,15 @@
 from cims.core.entities.project import Project
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Literal, Optional, Any, Iterator
+
+# Orderings of project listings backed by the per-project pipeline summaries
+ProjectSort = Literal[
+    "most_behind",          # most required recruits still missing first
+    "lowest_fill_rate",     # smallest recruited / required share first
+    "most_active",          # most nominees still in the pipeline first
+    "least_active",
+    "recently_nominated",   # latest nomination first
+]
 
 class ProjectRepository(ABC):
     @abstractmethod
@@ -14,6 +23,45 @@ class ProjectRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def create_many(self, projects: list[Project], commit: bool = True) -> list[Project]:
+        """
+        Create several projects with multi-row inserts.
+
+        :param list[Project] projects: The project entities to be created.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The created project entities, in input order.
+        :rtype: list[Project]
+        """
+        pass
+
+    @abstractmethod
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        """
+        Patch several projects by ID.
+
+        Identical patches are applied with a single statement.
+
+        :param dict[int, dict[str, Any]] patches: Column values to set, keyed by project ID.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of projects updated.
+        :rtype: int
+        :raises ValueError: If a patch sets an unknown or read-only column.
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, project_ids: list[int], commit: bool = True) -> int:
+        """
+        Delete several projects by ID with a single statement.
+
+        :param list[int] project_ids: The IDs of the projects to delete.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of projects deleted.
+        :rtype: int
+        """
+        pass
+
     @abstractmethod
     def get_projects_by_ids(self, project_ids: list[int]) -> list[Project]:
         """
@@ -61,12 +109,13 @@ class ProjectRepository(ABC):
         pass
 
     @abstractmethod
-    def get_all_projects(self, limit: int = 100, offset: int = 0) -> list[Project]:
+    def get_all_projects(self, limit: int = 100, offset: int = 0, sort: Optional[ProjectSort] = None) -> list[Project]:
         """
         Retrieve all projects from the repository with pagination.
 
         :param int limit: The maximum number of projects to return.
         :param int offset: The number of projects to skip.
+        :param ProjectSort sort: Pipeline ordering; most recently updated first when None.
         :return: A list of project entities.
         :rtype: list[Project]
         """
@@ -98,6 +147,79 @@ class ProjectRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_project_rows(
+        self,
+        fields: list[str],
+        query: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        sort: Optional[ProjectSort] = None
+    ) -> list[dict[str, Any]]:
+        """
+        Retrieve a column projection of projects, optionally filtered by a comprehensive search query.
+
+        Only the requested columns are loaded. Fields that are not stored
+        project columns are ignored.
+
+        :param list[str] fields: The project fields to load.
+        :param str query: The query matched against project, customer and expertise names.
+        :param int limit: The maximum number of projects to return.
+        :param int offset: The number of projects to skip.
+        :param ProjectSort sort: Pipeline ordering; most recently updated first when None.
+        :return: A list of rows keyed by field name.
+        :rtype: list[dict[str, Any]]
+        """
+        pass
+
+    @abstractmethod
+    def iter_project_rows(self, query: Optional[str] = None, customer_id: Optional[int] = None, batch_size: int = 1000) -> Iterator[dict[str, Any]]:
+        """
+        Stream projects matching the filters as plain rows, including reference names.
+
+        Rows are fetched lazily in batches so memory stays bounded for large exports.
+
+        :param str query: The query matched against project, customer and expertise names.
+        :param int customer_id: The customer ID to filter projects by.
+        :param int batch_size: The number of rows fetched from the database at a time.
+        :return: An iterator of rows keyed by field name, ordered by project ID.
+        :rtype: Iterator[dict[str, Any]]
+        """
+        pass
+
+    @abstractmethod
+    def get_pipeline_summaries(
+        self,
+        sort: Optional[ProjectSort] = None,
+        customer_id: Optional[int] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> list[dict[str, Any]]:
+        """
+        Retrieve projects with their precomputed pipeline summary in a single query.
+
+        Rows carry the project's recruitment targets, fill rate, nominee counts
+        per pipeline state, last nomination time and time to fill.
+
+        :param ProjectSort sort: Pipeline ordering; by project ID when None.
+        :param int customer_id: Only include this customer's projects.
+        :param int limit: The maximum number of projects to return.
+        :param int offset: The number of projects to skip.
+        :return: A list of summary rows keyed by field name.
+        :rtype: list[dict[str, Any]]
+        """
+        pass
+
+    @abstractmethod
+    def refresh_pipeline_summaries(self, project_ids: Optional[list[int]] = None, commit: bool = True) -> None:
+        """
+        Recompute pipeline summaries from the nominees, e.g. after a bulk load that bypassed the repositories.
+
+        :param list[int] project_ids: The projects to refresh; all projects when None.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        """
+        pass
+
     @abstractmethod
     def count_all_projects(self) -> int:
         """
@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from types import TracebackType
+from typing import Optional
+
+class UnitOfWork(ABC):
+    """
+    Groups repository writes made with ``commit=False`` into one transaction.
+
+    Used as a context manager, the transaction is committed on success and
+    rolled back if the block raises.
+    """
+    @abstractmethod
+    def commit(self) -> None:
+        """
+        Commit all pending writes.
+        """
+        pass
+
+    @abstractmethod
+    def rollback(self) -> None:
+        """
+        Discard all pending writes.
+        """
+        pass
+
+    def __enter__(self) -> "UnitOfWork":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
@@ -0,0 +1,192 @@
+"""
+Salary expectation statistics computed with NumPy over columnar nominee data.
+
+The repositories return one array per column (see
+``NomineeRepository.get_salary_columns``). Groups are formed once with
+``np.unique`` and every statistic is computed for all groups at the same time
+with sorted segments and ``np.bincount``, so the cost does not grow with a
+Python loop over nominees or groups.
+"""
+from typing import Any, Hashable, Literal, Optional
+import threading
+import time
+
+import numpy as np
+
+from cims.config import settings
+
+SalaryDimension = Literal["expertise", "level", "area"]
+SALARY_DIMENSIONS: tuple[SalaryDimension, ...] = ("expertise", "level", "area")
+PERCENTILES = (10, 25, 50, 75, 90)
+
+def _group(columns: dict[str, np.ndarray], group_by: list[SalaryDimension]) -> tuple[np.ndarray, np.ndarray]:
+    """Return the distinct key rows and the group index of every sample."""
+    size = len(columns["salary_expectation"])
+    if not group_by:
+        return np.empty((1, 0), dtype=np.int64), np.zeros(size, dtype=np.int64)
+
+    # Rank each dimension densely and combine the ranks into one integer key, so
+    # grouping is a 1-D unique instead of the much slower row-wise np.unique(axis=0)
+    values, ranks = zip(*(np.unique(columns[f"{dimension}_id"], return_inverse=True) for dimension in group_by))
+    if np.prod([float(len(distinct)) for distinct in values]) >= 2 ** 62:
+        keys = np.column_stack([columns[f"{dimension}_id"] for dimension in group_by])
+        unique_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+        return unique_keys, inverse.ravel()
+
+    combined = np.zeros(size, dtype=np.int64)
+    for distinct, rank in zip(values, ranks):
+        combined = combined * len(distinct) + rank.ravel()
+    unique_combined, inverse = np.unique(combined, return_inverse=True)
+
+    digits = []
+    for distinct in reversed(values):
+        digits.append(distinct[unique_combined % len(distinct)])
+        unique_combined = unique_combined // len(distinct)
+    return np.column_stack(digits[::-1]), inverse.ravel()
+
+def _segment_percentiles(sorted_values: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """Linear-interpolated percentile of each contiguous sorted segment, like ``np.percentile``."""
+    position = starts + (counts - 1) * (q / 100)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, starts + counts - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def compute_salary_stats(
+    columns: dict[str, np.ndarray],
+    group_by: list[SalaryDimension],
+    bins: int = 10,
+    min_samples: int = 1
+) -> list[dict[str, Any]]:
+    """
+    Describe salary expectations per group: spread, histogram and experience regression.
+
+    Example:
+        ```python
+        compute_salary_stats(nominee_repo.get_salary_columns(area_id=1), ["expertise", "level"])
+        ```
+        Returns one entry per expertise and level combination among the nominees
+        of projects in area 1.
+
+    :param dict[str, np.ndarray] columns: Equal-length ``salary_expectation``, ``years_of_experience``
+        and ``<dimension>_id`` arrays.
+    :param list[SalaryDimension] group_by: Dimensions to group by; one overall group when empty.
+    :param int bins: Number of equal-width histogram bins between each group's minimum and maximum.
+    :param int min_samples: Leave out groups with fewer samples.
+    :return: Groups ordered by their key, with count, mean, std, min, max, percentiles,
+        histogram and the least-squares fit of salary on years of experience.
+    :rtype: list[dict[str, Any]]
+    """
+    salaries = columns["salary_expectation"].astype(np.float64, copy=False)
+    years = columns["years_of_experience"].astype(np.float64, copy=False)
+    if salaries.size == 0:
+        return []
+
+    keys, inverse = _group(columns, group_by)
+    group_count = len(keys)
+    counts = np.bincount(inverse, minlength=group_count)
+
+    # Sort by group, then salary: each group becomes a contiguous sorted segment
+    order = np.lexsort((salaries, inverse))
+    sorted_salaries = salaries[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    minimum = sorted_salaries[starts]
+    maximum = sorted_salaries[starts + counts - 1]
+    percentiles = {q: _segment_percentiles(sorted_salaries, starts, counts, q) for q in PERCENTILES}
+
+    mean_salary = np.bincount(inverse, weights=salaries, minlength=group_count) / counts
+    mean_years = np.bincount(inverse, weights=years, minlength=group_count) / counts
+    salary_deviation = salaries - mean_salary[inverse]
+    years_deviation = years - mean_years[inverse]
+    sum_squares_salary = np.bincount(inverse, weights=salary_deviation ** 2, minlength=group_count)
+    sum_squares_years = np.bincount(inverse, weights=years_deviation ** 2, minlength=group_count)
+    sum_products = np.bincount(inverse, weights=salary_deviation * years_deviation, minlength=group_count)
+    std = np.sqrt(sum_squares_salary / counts)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = sum_products / sum_squares_years
+        r_squared = sum_products ** 2 / (sum_squares_years * sum_squares_salary)
+    intercept = mean_salary - slope * mean_years
+
+    width = (maximum - minimum) / bins
+    safe_width = np.where(width > 0, width, 1.0)
+    bin_index = np.clip(((salaries - minimum[inverse]) / safe_width[inverse]).astype(np.int64), 0, bins - 1)
+    histograms = np.bincount(inverse * bins + bin_index, minlength=group_count * bins).reshape(group_count, bins)
+    edges = minimum[:, None] + width[:, None] * np.arange(bins + 1)
+
+    results = []
+    for index in np.flatnonzero(counts >= min_samples):
+        key = dict(zip(group_by, keys[index].tolist()))
+        has_fit = sum_squares_years[index] > 0
+        results.append({
+            **{f"{dimension}_id": key.get(dimension) for dimension in SALARY_DIMENSIONS},
+            "count": int(counts[index]),
+            "mean": round(float(mean_salary[index]), 2),
+            "std": round(float(std[index]), 2),
+            "min": round(float(minimum[index]), 2),
+            "max": round(float(maximum[index]), 2),
+            "percentiles": {f"p{q}": round(float(values[index]), 2) for q, values in percentiles.items()},
+            "histogram": {
+                "edges": np.round(edges[index], 2).tolist(),
+                "counts": histograms[index].tolist(),
+            },
+            "regression": {
+                "slope": round(float(slope[index]), 2),
+                "intercept": round(float(intercept[index]), 2),
+                "r_squared": round(float(r_squared[index]), 4) if sum_squares_salary[index] > 0 else None,
+            } if has_fit else None,
+        })
+    return results
+
+def percentile_rank(salaries: np.ndarray, value: float) -> Optional[float]:
+    """Share of the salaries at or below the value; None without salaries."""
+    if salaries.size == 0:
+        return None
+    return round(float(np.count_nonzero(salaries <= value)) / salaries.size, 4)
+
+class SalaryStatsCache:
+    """
+    Computed statistics keyed by request parameters.
+
+    Entries are dropped when nominees change (see ``invalidate``) and expire
+    after ``ttl_seconds``, which bounds staleness from writes made by other
+    processes. A result computed while a write committed is not stored: callers
+    read ``generation`` before fetching and pass it to ``put``.
+    """
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: int = 256) -> None:
+        self._ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._ttl_seconds if self._ttl_seconds is not None else settings.SALARY_STATS_CACHE_SECONDS
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] >= self.ttl_seconds:
+                return None
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any, generation: int) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic(), value)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+salary_stats_cache = SalaryStatsCache()
@@ -1,4 +1,4 @@
-from cims.core.entities.nominee import Nominee
+from cims.core.entities.nominee import Nominee, NomineeStatus
 from typing import Optional
 
 from cims.core.repositories.nominee_repository import NomineeRepository
@@ -17,6 +17,21 @@ class NomineeService:
         """
         return self.nominee_repository.create_nominee(nominee=nominee)
 
+    def update_nominee_statuses(self, nominee_ids: list[int], status: NomineeStatus, commit: bool = True) -> int:
+        """
+        Move several nominees to the same status with a single statement.
+
+        :param list[int] nominee_ids: The IDs of the nominees to update.
+        :param NomineeStatus status: The new status.
+        :param bool commit: Commit immediately; pass False to leave the transaction to a unit of work.
+        :return: The number of nominees updated.
+        :rtype: int
+        """
+        return self.nominee_repository.update_many(
+            patches={nominee_id: {"status": status} for nominee_id in nominee_ids},
+            commit=commit
+        )
+
     def get_nominees_by_ids(self, nominee_ids: list[int]) -> list[Nominee]:
         """
         Retrieve nominees by their IDs.
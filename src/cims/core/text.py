@@ -0,0 +1,23 @@
+"""
+Text normalization shared by duplicate detection and name search.
+"""
+import re
+import unicodedata
+
+# Letters that carry no combining mark and so survive NFKD decomposition
+_FOLDED_LETTERS = str.maketrans({"đ": "d", "Đ": "D"})
+_NON_ALPHANUMERIC = re.compile(r"[^0-9a-z]+")
+
+def fold_accents(text: str) -> str:
+    """
+    Lowercase text and strip diacritics, e.g. "Nguyễn Đức" -> "nguyen duc".
+
+    Vietnamese names are often typed without tone marks, so the folded form is
+    what two spellings of the same name have in common.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.translate(_FOLDED_LETTERS))
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+def name_tokens(text: str) -> list[str]:
+    """The accent-folded alphanumeric words of a name."""
+    return [token for token in _NON_ALPHANUMERIC.split(fold_accents(text)) if token]
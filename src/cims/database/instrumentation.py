@@ -0,0 +1,67 @@
+"""
+Per-request SQL statement counting and timing based on SQLAlchemy engine events.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from typing import Any, Iterator, Optional
+import time
+
+class QueryStats:
+    """Number of statements executed and total time spent in the database."""
+    def __init__(self, label: Optional[str] = None) -> None:
+        self.label = label
+        self.count = 0
+        self.duration = 0.0
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("cims_query_stats", default=None)
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+
+def install_query_instrumentation() -> None:
+    """
+    Register the statement listeners on every engine. Safe to call more than once.
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+@contextmanager
+def track_queries(label: Optional[str] = None) -> Iterator[QueryStats]:
+    """
+    Collect statement count and database time for everything executed in the block.
+
+    The stats object is shared with tasks and threads spawned from the block,
+    since they inherit a copy of the current context.
+
+    :param str label: Describes the unit of work, e.g. the request method and path.
+    """
+    stats = QueryStats(label)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+def current_query_stats() -> Optional[QueryStats]:
+    """
+    Return the stats being collected for the current request, if any.
+    """
+    return _current_stats.get()
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, VARCHAR, String, DateTime, Date, Float, ForeignKey
+from sqlalchemy import Integer, VARCHAR, String, Text, DateTime, Date, Float, ForeignKey, Index
 from sqlalchemy.orm import declarative_base, Mapped, mapped_column, relationship
 import datetime
 
@@ -6,6 +6,9 @@ Base = declarative_base()
 
 class CandidateDB(Base):
     __tablename__ = 'candidates'
+    __table_args__ = (
+        Index("ix_candidates_headhunter_id_created_at", "headhunter_id", "created_at"),
+    )
     
     candidate_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(40), nullable=False)
@@ -75,6 +78,12 @@ class ProjectDB(Base):
 
 class NomineeDB(Base):
     __tablename__ = 'nominees'
+    __table_args__ = (
+        # Grouped funnel counts per project and status are answered from the index alone
+        Index("ix_nominees_project_id_status", "project_id", "status"),
+        Index("ix_nominees_candidate_id", "candidate_id"),
+        Index("ix_nominees_created_at", "created_at"),
+    )
 
     nominee_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     campaign: Mapped[str] = mapped_column(String(40), nullable=False)
@@ -98,6 +107,105 @@ class NomineeDB(Base):
     candidate = relationship("CandidateDB", back_populates="nominees")
     project = relationship("ProjectDB", back_populates="nominees")
 
+class ProjectPipelineSummaryDB(Base):
+    """
+    Nominee counts per project, kept in step with nominee writes by the repositories.
+
+    Rebuilt from the nominees table with ``refresh_project_summaries`` after bulk loads.
+    """
+    __tablename__ = 'project_pipeline_summaries'
+
+    project_id: Mapped[int] = mapped_column(Integer, ForeignKey("projects.project_id", ondelete="CASCADE"), primary_key=True)
+    total_nominees: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    active_nominees: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    hired: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rejected: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_nominated_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    filled_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    refreshed_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.datetime.now(datetime.timezone.utc)
+    )
+
+class HeadhunterDailyStatsDB(Base):
+    """
+    Candidates sourced and nominees by current status per headhunter and UTC day.
+
+    Nominees are bucketed by the day they were created, so each row describes
+    how that day's nominations have progressed so far. Kept in step with
+    candidate and nominee writes when ``HEADHUNTER_DAILY_STATS`` is enabled and
+    rebuilt with ``refresh_headhunter_daily_stats``.
+    """
+    __tablename__ = 'headhunter_daily_stats'
+
+    headhunter_id: Mapped[int] = mapped_column(Integer, ForeignKey("headhunters.headhunter_id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    candidates_sourced: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    nominees: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    nominees_decu: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    nominees_phongvan: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    nominees_thuongluong: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    nominees_thuviec: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    nominees_kyhopdong: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    nominees_tuchoi: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+class CandidateDuplicateKeysDB(Base):
+    """
+    Normalized phone, email and name keys of each candidate, for duplicate lookups.
+
+    Kept in step with candidate writes by the repository and rebuilt with
+    ``refresh_candidate_duplicate_keys``; see ``cims.core.dedup`` for the keys.
+    """
+    __tablename__ = 'candidate_duplicate_keys'
+
+    candidate_id: Mapped[int] = mapped_column(Integer, ForeignKey("candidates.candidate_id", ondelete="CASCADE"), primary_key=True)
+    phone_key: Mapped[str | None] = mapped_column(VARCHAR(20), nullable=True, index=True)
+    email_key: Mapped[str | None] = mapped_column(VARCHAR(60), nullable=True, index=True)
+    name_key: Mapped[str | None] = mapped_column(String(80), nullable=True, index=True)
+
+class OutboxMessageDB(Base):
+    """
+    Work to run once a write has committed, inserted in the write's transaction.
+
+    Claimed, retried and marked processed by the outbox worker; see
+    ``cims.integrations.sqlalchemy.outbox``.
+    """
+    __tablename__ = 'outbox_messages'
+    __table_args__ = (
+        # Due messages are found by scanning pending rows in availability order
+        Index("ix_outbox_messages_pending", "processed_at", "failed_at", "available_at"),
+    )
+
+    message_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    topic: Mapped[str] = mapped_column(String(60), nullable=False)
+    message_key: Mapped[str] = mapped_column(String(120), nullable=False, unique=True)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    available_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    locked_by: Mapped[str | None] = mapped_column(String(60), nullable=True)
+    locked_until: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    processed_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    failed_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+class ScheduledJobDB(Base):
+    """
+    The last run of each periodic job, shared by all scheduler processes.
+
+    Written under the job's lock, so a job runs once per interval however many
+    processes schedule it; see ``cims.integrations.sqlalchemy.scheduler``.
+    """
+    __tablename__ = 'scheduled_jobs'
+
+    job_name: Mapped[str] = mapped_column(String(60), primary_key=True)
+    last_started_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_finished_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_status: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    last_duration_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    runner: Mapped[str | None] = mapped_column(String(60), nullable=True)
+
 class CustomerDB(Base):
     __tablename__ = 'customers'
 
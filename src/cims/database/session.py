@@ -1,7 +1,165 @@
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, Engine
+from sqlalchemy.pool import QueuePool, ConnectionPoolEntry
+from collections import deque
+from typing import Any, Optional
+import datetime
+import re
+import sys
+import threading
+import time
 import urllib.parse
 
+from cims.config import CLogger
+from cims.database.instrumentation import current_query_stats
+from cims.tracing import current_trace_id
+from cims.metrics import DB_POOL_CHECKED_OUT, DB_POOL_OVERFLOW, DB_POOL_SIZE, DB_POOL_WAIT
+
+logger = CLogger(__name__).get_logger()
+
+# Bound parameter names whose values never leave the process
+SENSITIVE_PARAMETER_PATTERN = re.compile(r"password|secret|token|email|phone", re.IGNORECASE)
+MAX_PARAMETER_LENGTH = 200
+MAX_PARAMETER_SETS = 5
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits for a free connection."""
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - start)
+
+class SlowQueryRecorder:
+    """
+    Keeps the most recent statements slower than a threshold in a ring buffer.
+
+    Each record carries redacted bound parameters, the request that issued the
+    statement, the repository method it came from and, for SELECTs on Postgres,
+    the EXPLAIN plan. Fast statements cost two clock reads.
+    """
+    def __init__(self, threshold_ms: float, capacity: int = 200, explain: bool = True) -> None:
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self._records: deque[dict[str, Any]] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def install(self, engine: Engine) -> None:
+        if not event.contains(engine, "before_cursor_execute", self._before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def records(self, limit: Optional[int] = None) -> list[dict[str, Any]]:
+        """Return recorded slow queries, most recent first."""
+        with self._lock:
+            records = list(reversed(self._records))
+        return records[:limit] if limit else records
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+    def _before_cursor_execute(self, conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        conn.info.setdefault("slow_query_start_time", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        start_times = conn.info.get("slow_query_start_time")
+        if not start_times:
+            return
+        duration_ms = (time.perf_counter() - start_times.pop()) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        stats = current_query_stats()
+        record = {
+            "recorded_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "duration_ms": round(duration_ms, 2),
+            "statement": statement,
+            "parameters": _redact_parameters(context, parameters, executemany),
+            "route": stats.label if stats else None,
+            "request_id": current_trace_id(),
+            "repository_method": _repository_method(),
+            "plan": None,
+        }
+        if self.explain and not executemany and conn.dialect.name == "postgresql" and _is_select(statement):
+            record["plan"] = _explain(conn, statement, parameters)
+
+        with self._lock:
+            self._records.append(record)
+
+        logger.warning(
+            f"Slow query {record['duration_ms']}ms route={record['route']} "
+            f"repository={record['repository_method']}: {statement[:500]}"
+        )
+
+def _redact_value(name: str, value: Any) -> Any:
+    if SENSITIVE_PARAMETER_PATTERN.search(name):
+        return "<redacted>"
+    if isinstance(value, (bytes, bytearray)):
+        return f"<{len(value)} bytes>"
+    if isinstance(value, str) and len(value) > MAX_PARAMETER_LENGTH:
+        return value[:MAX_PARAMETER_LENGTH] + "..."
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+def _redact_parameters(context: Any, parameters: Any, executemany: bool) -> Any:
+    """
+    Redact bound parameters by name; only the first few parameter sets of an executemany are kept.
+    """
+    compiled_parameters = getattr(context, "compiled_parameters", None) if getattr(context, "compiled", None) is not None else None
+    if compiled_parameters:
+        return [
+            {name: _redact_value(name, value) for name, value in parameter_set.items()}
+            for parameter_set in compiled_parameters[:MAX_PARAMETER_SETS]
+        ]
+    # Driver-level SQL without names: keep only the shape
+    if isinstance(parameters, dict):
+        return [{name: _redact_value(name, value) for name, value in parameters.items()}]
+    if parameters:
+        return f"<{len(parameters)} parameter{'s' if executemany else ''}>"
+    return None
+
+def _repository_method() -> Optional[str]:
+    """
+    Find the outermost repository method on the stack, e.g. ``SQLAlchemyProjectRepository.count_projects_comprehensive``.
+    """
+    found = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_globals.get("__name__", "").startswith("cims.integrations.sqlalchemy"):
+            found = frame.f_code.co_qualname
+        elif found:
+            break
+        frame = frame.f_back
+    return found
+
+def _is_select(statement: str) -> bool:
+    return statement.lstrip().upper().startswith(("SELECT", "WITH"))
+
+def _explain(conn: Any, statement: str, parameters: Any) -> Optional[list[str]]:
+    """
+    Run EXPLAIN on the same connection inside a savepoint, so a failure cannot abort the caller's transaction.
+    """
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT cims_slow_query_explain")
+        try:
+            cursor.execute("EXPLAIN " + statement, parameters)
+            plan = [row[0] for row in cursor.fetchall()]
+            cursor.execute("RELEASE SAVEPOINT cims_slow_query_explain")
+            return plan
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT cims_slow_query_explain")
+            logger.debug(f"EXPLAIN failed for slow query: {e}")
+            return None
+    except Exception as e:
+        logger.debug(f"Could not capture plan for slow query: {e}")
+        return None
+    finally:
+        cursor.close()
+
 class PostgresSessionFactory:
     def __init__(
         self,
@@ -9,13 +167,25 @@ class PostgresSessionFactory:
         port: int,
         name: str,
         user: str,
-        password: str
+        password: str,
+        pool_size: int = 10,
+        max_overflow: int = 20
     ) -> None:
         encoded_password = urllib.parse.quote_plus(password)
         self._database_url = f"postgresql://{user}:{encoded_password}@{host}:{port}/{name}"
-        self._engine = create_engine(self._database_url, pool_pre_ping=True, pool_size=10, max_overflow=20)
+        self._engine = create_engine(
+            self._database_url,
+            poolclass=TimedQueuePool,
+            pool_pre_ping=True,
+            pool_size=pool_size,
+            max_overflow=max_overflow
+        )
         self._Session = sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
 
+    @property
+    def engine(self) -> Engine:
+        return self._engine
+
     def create_tables(self) -> None:
         """
         Create all tables in the database.
@@ -26,4 +196,55 @@ class PostgresSessionFactory:
 
     def get_session(self) -> Session:
         return self._Session()
-    
+
+    def collect_pool_metrics(self) -> None:
+        """
+        Refresh the connection pool gauges; registered as a metrics collector.
+        """
+        pool = self._engine.pool
+        if isinstance(pool, QueuePool):
+            DB_POOL_CHECKED_OUT.set(pool.checkedout())
+            DB_POOL_OVERFLOW.set(pool.overflow())
+            DB_POOL_SIZE.set(pool.size())
+
+_session_factory: Optional[PostgresSessionFactory] = None
+_session_factory_lock = threading.Lock()
+_slow_query_recorder: Optional[SlowQueryRecorder] = None
+
+def get_session_factory() -> PostgresSessionFactory:
+    """
+    Return the process-wide session factory, creating it on first use.
+
+    All sessions share its engine, so requests reuse one connection pool
+    instead of opening a new engine per request.
+    """
+    global _session_factory, _slow_query_recorder
+    if _session_factory is None:
+        with _session_factory_lock:
+            if _session_factory is None:
+                from cims.config import settings
+                factory = PostgresSessionFactory(
+                    host=settings.POSTGRES_HOST,
+                    port=settings.POSTGRES_PORT,
+                    name=settings.POSTGRES_DB,
+                    user=settings.POSTGRES_USER,
+                    password=settings.POSTGRES_PASSWORD,
+                    pool_size=settings.DB_POOL_SIZE,
+                    max_overflow=settings.DB_POOL_MAX_OVERFLOW
+                )
+                if settings.SLOW_QUERY_THRESHOLD_MS is not None:
+                    _slow_query_recorder = SlowQueryRecorder(
+                        threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+                        capacity=settings.SLOW_QUERY_BUFFER_SIZE,
+                        explain=settings.SLOW_QUERY_EXPLAIN
+                    )
+                    _slow_query_recorder.install(factory.engine)
+                _session_factory = factory
+    return _session_factory
+
+def get_slow_query_recorder() -> Optional[SlowQueryRecorder]:
+    """
+    Return the slow-query recorder of the shared engine, or None when SLOW_QUERY_THRESHOLD_MS is unset.
+    """
+    get_session_factory()
+    return _slow_query_recorder
@@ -1,7 +1,8 @@
-from cims.database.session import PostgresSessionFactory
-from cims.auth import Authenticator
+from cims.database.session import get_session_factory
+from cims.auth import Authenticator, oauth2_scheme
 from cims.config import settings
-from fastapi import Depends
+from fastapi import Depends, HTTPException
+from sqlalchemy import Engine
 from sqlalchemy.orm import Session
 from contextlib import contextmanager
 
@@ -15,6 +16,8 @@ from cims.core.repositories.level_repository import LevelRepository
 from cims.core.repositories.expertise_repository import ExpertiseRepository
 from cims.core.repositories.field_repository import FieldRepository
 from cims.core.repositories.nominee_repository import NomineeRepository
+from cims.core.repositories.unit_of_work import UnitOfWork
+from cims.core.entities.headhunter import Headhunter
 
 # SQLAlchemy implementations
 from cims.integrations.sqlalchemy import (
@@ -26,19 +29,16 @@ from cims.integrations.sqlalchemy import (
     SQLAlchemyLevelRepository,
     SQLAlchemyExpertiseRepository,
     SQLAlchemyFieldRepository,
-    SQLAlchemyNomineeRepository
+    SQLAlchemyNomineeRepository,
+    SQLAlchemyUnitOfWork
 )
 
-def get_db_session(): 
-    factory = PostgresSessionFactory(
-        host=settings.POSTGRES_HOST,
-        port=settings.POSTGRES_PORT,
-        name=settings.POSTGRES_DB,
-        user=settings.POSTGRES_USER,
-        password=settings.POSTGRES_PASSWORD
-    )
+def get_db_engine() -> Engine:
+    """The shared engine behind every request session."""
+    return get_session_factory().engine
 
-    session = factory.get_session()
+def get_db_session(): 
+    session = get_session_factory().get_session()
     try:
         yield session
     finally:
@@ -49,14 +49,7 @@ def create_db_session() -> Session:
     Create a database session for use outside of FastAPI dependency injection.
     Remember to close the session when done.
     """
-    factory = PostgresSessionFactory(
-        host=settings.POSTGRES_HOST,
-        port=settings.POSTGRES_PORT,
-        name=settings.POSTGRES_DB,
-        user=settings.POSTGRES_USER,
-        password=settings.POSTGRES_PASSWORD
-    )
-    return factory.get_session()
+    return get_session_factory().get_session()
 
 def get_headhunter_repository(db_session: Session = Depends(get_db_session)) -> HeadhunterRepository:
     return SQLAlchemyHeadhunterRepository(db_session)
@@ -85,6 +78,10 @@ def get_field_repository(db_session: Session = Depends(get_db_session)) -> Field
 def get_nominee_repository(db_session: Session = Depends(get_db_session)) -> NomineeRepository:
     return SQLAlchemyNomineeRepository(db_session)
 
+def get_unit_of_work(db_session: Session = Depends(get_db_session)) -> UnitOfWork:
+    """Unit of work over the request session shared by the injected repositories."""
+    return SQLAlchemyUnitOfWork(db_session)
+
 def get_authenticator(headhunter_repository: HeadhunterRepository = Depends(get_headhunter_repository)) -> Authenticator:
     return Authenticator(
         secret_key=settings.SECRET_KEY,
@@ -93,6 +90,21 @@ def get_authenticator(headhunter_repository: HeadhunterRepository = Depends(get_
         headhunter_repository=headhunter_repository
     )
 
+ADMIN_ROLE = "admin"
+
+def get_current_headhunter(
+    token: str = Depends(oauth2_scheme),
+    authenticator: Authenticator = Depends(get_authenticator)
+) -> Headhunter:
+    """The headhunter identified by the bearer token; 401 when the token is missing or invalid."""
+    return authenticator.get_current_user(token)
+
+def require_admin(headhunter: Headhunter = Depends(get_current_headhunter)) -> Headhunter:
+    """Restrict an endpoint to headhunters with the admin role."""
+    if headhunter.role != ADMIN_ROLE:
+        raise HTTPException(status_code=403, detail="Admin role required")
+    return headhunter
+
 # Utility functions for creating repositories outside of FastAPI DI
 def create_headhunter_repository() -> HeadhunterRepository:
     session = create_db_session()
@@ -7,6 +7,7 @@ from .headhunter_repository import SQLAlchemyHeadhunterRepository
 from .level_repository import SQLAlchemyLevelRepository
 from .nominee_repository import SQLAlchemyNomineeRepository
 from .project_repository import SQLAlchemyProjectRepository
+from .unit_of_work import SQLAlchemyUnitOfWork
 
 __all__ = [
     "SQLAlchemyAreaRepository",
@@ -18,4 +19,5 @@ __all__ = [
     "SQLAlchemyLevelRepository",
     "SQLAlchemyNomineeRepository",
     "SQLAlchemyProjectRepository",
+    "SQLAlchemyUnitOfWork",
 ]
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+Callbacks deferred until a session's transaction commits.
+
+In-process caches and indexes must only see a write once it is committed:
+invalidating them earlier lets a concurrent reader reload the old rows, and
+a rolled back write must not touch them at all.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+_CALLBACKS_KEY = "after_commit_callbacks"
+
+T = TypeVar("T")
+
+def run_after_commit(db_session: Session, callback: Callable[[], None], key: Optional[Hashable] = None) -> None:
+    """
+    Run the callback once the session's current transaction commits; drop it on rollback.
+
+    :param Session db_session: The session whose transaction the callback waits for.
+    :param Callable callback: Called without arguments after the commit.
+    :param Hashable key: Callbacks registered under the same key run once per transaction.
+    """
+    callbacks = db_session.info.setdefault(_CALLBACKS_KEY, {})
+    callbacks[key if key is not None else object()] = callback
+
+class _Collected(Generic[T]):
+    def __init__(self, callback: Callable[[list[T]], None]) -> None:
+        self.items: list[T] = []
+        self.callback = callback
+
+    def __call__(self) -> None:
+        if self.items:
+            self.callback(self.items)
+
+def collect_after_commit(db_session: Session, key: Hashable, callback: Callable[[list[T]], None]) -> list[T]:
+    """
+    A list handed to the callback once the session's current transaction commits; dropped on rollback.
+
+    Every caller using the same key in a transaction gets the same list, so
+    items gathered by several writes are handed over together and in order.
+
+    :param Session db_session: The session whose transaction the items wait for.
+    :param Hashable key: Identifies the list within the transaction.
+    :param Callable callback: Called with the items after the commit, unless there are none.
+    :return: The list to append items to.
+    :rtype: list
+    """
+    callbacks = db_session.info.setdefault(_CALLBACKS_KEY, {})
+    collected = callbacks.get(key)
+    if not isinstance(collected, _Collected):
+        collected = callbacks[key] = _Collected(callback)
+    return collected.items
+
+@event.listens_for(Session, "after_commit")
+def _run_callbacks(db_session: Session) -> None:
+    for callback in db_session.info.pop(_CALLBACKS_KEY, {}).values():
+        callback()
+
+@event.listens_for(Session, "after_rollback")
+def _drop_callbacks(db_session: Session) -> None:
+    db_session.info.pop(_CALLBACKS_KEY, None)
@@ -3,9 +3,10 @@ from cims.core.repositories.area_repository import AreaRepository
 from cims.core.exceptions import NotFoundError
 from cims.database.models import AreaDB
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Any
+from cims.integrations.sqlalchemy.bulk import SQLAlchemyBulkMixin
 
-class SQLAlchemyAreaRepository(AreaRepository):
+class SQLAlchemyAreaRepository(SQLAlchemyBulkMixin, AreaRepository):
     def __init__(self, db_session: Session) -> None:
         self.db_session = db_session
 
@@ -23,6 +24,15 @@ class SQLAlchemyAreaRepository(AreaRepository):
         self.db_session.commit()
         self.db_session.refresh(new_area)
         return self._to_domain_entity(new_area)
+
+    def create_many(self, areas: list[Area], commit: bool = True) -> list[Area]:
+        return self._bulk_create(AreaDB, areas, self._to_domain_entity, commit)
+
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        return self._bulk_update(AreaDB, patches, commit)
+
+    def delete_many(self, area_ids: list[int], commit: bool = True) -> int:
+        return self._bulk_delete(AreaDB, area_ids, commit)
     
     def get_all_areas(self, limit: int = 100, offset: int = 0) -> list[Area]:
         db_areas = self.db_session.query(AreaDB).offset(offset).limit(limit).all()
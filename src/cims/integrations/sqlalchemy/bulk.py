@@ -0,0 +1,123 @@
+"""
+Bulk write helpers shared by the SQLAlchemy repositories.
+"""
+from sqlalchemy import bindparam, delete, insert, update
+from sqlalchemy.orm import Session
+from typing import Any, Callable, TypeVar
+
+from cims.database.models import Base
+
+EntityT = TypeVar("EntityT")
+
+# Columns managed by the database or column defaults, never written by bulk helpers
+MANAGED_COLUMNS = ("created_at", "updated_at")
+
+class SQLAlchemyBulkMixin:
+    """
+    Implements create_many/update_many/delete_many for a repository over one mapped model.
+
+    With ``commit=False`` the statements are executed in the session's current
+    transaction and left for a unit of work to commit or roll back.
+    """
+    db_session: Session
+
+    def _writable_columns(self, model: type[Base]) -> set[str]:
+        primary_key = model.__mapper__.primary_key[0].key
+        return {
+            column.key for column in model.__table__.columns
+            if column.key != primary_key and column.key not in MANAGED_COLUMNS
+        }
+
+    def _finish(self, commit: bool) -> None:
+        if commit:
+            self.db_session.commit()
+
+    def _bulk_create(
+        self,
+        model: type[Base],
+        entities: list[Any],
+        to_domain: Callable[[Any], EntityT],
+        commit: bool
+    ) -> list[EntityT]:
+        if not entities:
+            return []
+
+        writable = self._writable_columns(model)
+        values = [
+            {key: value for key, value in entity.to_dict().items() if key in writable}
+            for entity in entities
+        ]
+
+        try:
+            # Batched into multi-row INSERT ... RETURNING statements by the dialect
+            db_objs = self.db_session.scalars(
+                insert(model).returning(model, sort_by_parameter_order=True),
+                values
+            ).all()
+            # Convert before commit so expired attributes are not reloaded row by row
+            created = [to_domain(db_obj) for db_obj in db_objs]
+            self._finish(commit)
+        except Exception:
+            if commit:
+                self.db_session.rollback()
+            raise
+
+        return created
+
+    def _bulk_update(self, model: type[Base], patches: dict[int, dict[str, Any]], commit: bool) -> int:
+        patches = {entity_id: values for entity_id, values in patches.items() if values}
+        if not patches:
+            return 0
+
+        writable = self._writable_columns(model)
+        unknown = {key for values in patches.values() for key in values} - writable
+        if unknown:
+            raise ValueError(f"Cannot bulk update columns: {', '.join(sorted(unknown))}")
+
+        table = model.__table__
+        primary_key = model.__mapper__.primary_key[0]
+
+        try:
+            distinct_patches = {tuple(sorted(values.items())) for values in patches.values()}
+            if len(distinct_patches) == 1:
+                # The same patch for every row is a single UPDATE ... WHERE id IN (...)
+                statement = (
+                    update(table)
+                    .where(table.c[primary_key.key].in_(list(patches)))
+                    .values(next(iter(patches.values())))
+                )
+                updated = self.db_session.execute(statement).rowcount
+            else:
+                # Rows sharing the same set of columns are sent as one executemany
+                groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+                for entity_id, values in patches.items():
+                    groups.setdefault(tuple(sorted(values)), []).append({"_entity_id": entity_id, **values})
+
+                statement = update(table).where(table.c[primary_key.key] == bindparam("_entity_id"))
+                updated = sum(self.db_session.execute(statement, params).rowcount for params in groups.values())
+            self._finish(commit)
+        except Exception:
+            if commit:
+                self.db_session.rollback()
+            raise
+
+        return updated
+
+    def _bulk_delete(self, model: type[Base], entity_ids: list[int], commit: bool) -> int:
+        if not entity_ids:
+            return 0
+
+        table = model.__table__
+        primary_key = model.__mapper__.primary_key[0]
+
+        try:
+            deleted = self.db_session.execute(
+                delete(table).where(table.c[primary_key.key].in_(entity_ids))
+            ).rowcount
+            self._finish(commit)
+        except Exception:
+            if commit:
+                self.db_session.rollback()
+            raise
+
+        return deleted
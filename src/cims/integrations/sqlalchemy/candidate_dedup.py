@@ -0,0 +1,171 @@
+"""
+Maintenance of the candidate duplicate keys and the lookups built on them.
+"""
+from sqlalchemy import delete, func, insert, or_, select
+from sqlalchemy.orm import Session
+from typing import Any, Iterable, Iterator, Optional
+
+from cims.core.dedup import DUPLICATE_KEYS, DuplicateKey, cluster_blocks, duplicate_keys, is_strong_match
+from cims.database.models import CandidateDB, CandidateDuplicateKeysDB
+
+KEY_SOURCE_COLUMNS = (CandidateDB.candidate_id, CandidateDB.name, CandidateDB.phone, CandidateDB.email, CandidateDB.year_of_birth)
+# Columns whose changes alter a candidate's keys
+KEY_SOURCE_FIELDS = frozenset(("name", "phone", "email", "year_of_birth"))
+REFRESH_BATCH_SIZE = 5000
+# New candidates whose keys are looked up by one query; three IN lists of this size stay well within bind parameter limits
+DUPLICATE_LOOKUP_CHUNK_SIZE = 1000
+
+def _key_rows(rows: Iterable[Any]) -> Iterator[dict[str, Any]]:
+    for candidate_id, name, phone, email, year_of_birth in rows:
+        yield {"candidate_id": candidate_id, **duplicate_keys(name, phone, email, year_of_birth)}
+
+def refresh_candidate_duplicate_keys(db_session: Session, candidate_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Recompute the duplicate keys of the given candidates, or of every candidate.
+
+    The keys are normalized in Python, so they are deleted and inserted again in
+    batches in the session's current transaction; keys of deleted candidates
+    are dropped.
+
+    :param Session db_session: The session whose transaction the refresh joins.
+    :param Iterable[int] candidate_ids: The candidates to refresh; all candidates when None.
+    """
+    ids = sorted({candidate_id for candidate_id in candidate_ids if candidate_id}) if candidate_ids is not None else None
+    if ids == []:
+        return
+
+    table = CandidateDuplicateKeysDB.__table__
+    statement = select(*KEY_SOURCE_COLUMNS)
+    if ids is None:
+        db_session.execute(delete(table))
+    else:
+        db_session.execute(delete(table).where(table.c.candidate_id.in_(ids)))
+        statement = statement.where(CandidateDB.candidate_id.in_(ids))
+
+    # Every batch is keyed before the first insert, so reads and writes do not interleave on the connection
+    result = db_session.execute(statement).partitions(REFRESH_BATCH_SIZE)
+    for key_rows in [list(_key_rows(rows)) for rows in result]:
+        db_session.execute(insert(table), key_rows)
+
+def _duplicate_lookup(conditions: list[Any]) -> Any:
+    table = CandidateDuplicateKeysDB.__table__
+    return (
+        select(CandidateDB.candidate_id, CandidateDB.name, CandidateDB.phone, CandidateDB.email, *[table.c[key] for key in DUPLICATE_KEYS])
+        .join(table, table.c.candidate_id == CandidateDB.candidate_id)
+        .where(or_(*conditions))
+    )
+
+def _split_keys(row: Any) -> tuple[dict[str, Any], dict[DuplicateKey, Optional[str]]]:
+    """A looked up row without its keys, and the keys."""
+    data = row._asdict()
+    return data, {key: data.pop(key) for key in DUPLICATE_KEYS}
+
+def _ranked_duplicates(
+    matches: Iterable[tuple[dict[str, Any], dict[DuplicateKey, Optional[str]]]],
+    keys: dict[DuplicateKey, Optional[str]],
+    limit: int
+) -> list[dict[str, Any]]:
+    """Candidates with the keys they share with the given ones as reasons, strongest matches first."""
+    duplicates = []
+    for data, shared in matches:
+        reasons = [key for key in DUPLICATE_KEYS if keys.get(key) and shared[key] == keys[key]]
+        if reasons:
+            duplicates.append({**data, "reasons": reasons})
+    duplicates.sort(key=lambda duplicate: (not is_strong_match(duplicate["reasons"]), -len(duplicate["reasons"]), duplicate["candidate_id"]))
+    return duplicates[:limit]
+
+def find_duplicate_candidates(
+    db_session: Session,
+    keys: dict[DuplicateKey, Optional[str]],
+    exclude_id: Optional[int] = None,
+    limit: int = 20
+) -> list[dict[str, Any]]:
+    """
+    Existing candidates sharing any of the keys, strongest matches first.
+
+    :param dict keys: The phone, email and name keys to look up, see ``cims.core.dedup.duplicate_keys``.
+    :param int exclude_id: A candidate to leave out, e.g. the one the keys belong to.
+    :param int limit: The maximum number of candidates to return.
+    :return: Rows with candidate_id, name, phone, email and the keys they share as reasons.
+    :rtype: list[dict[str, Any]]
+    """
+    table = CandidateDuplicateKeysDB.__table__
+    conditions = [table.c[key] == value for key, value in keys.items() if value]
+    if not conditions:
+        return []
+
+    statement = _duplicate_lookup(conditions)
+    if exclude_id:
+        statement = statement.where(CandidateDB.candidate_id != exclude_id)
+    return _ranked_duplicates((_split_keys(row) for row in db_session.execute(statement)), keys, limit)
+
+def find_duplicates_of_many(
+    db_session: Session,
+    keys_list: list[dict[DuplicateKey, Optional[str]]],
+    limit: int = 20
+) -> list[list[dict[str, Any]]]:
+    """
+    Existing candidates sharing keys with each of several new candidates.
+
+    The keys are looked up in chunks of ``DUPLICATE_LOOKUP_CHUNK_SIZE`` with one
+    query each, instead of one query per candidate.
+
+    :param list keys_list: The keys of each new candidate, see ``cims.core.dedup.duplicate_keys``.
+    :param int limit: The maximum number of candidates to return per new candidate.
+    :return: The duplicates of each new candidate in input order, as ``find_duplicate_candidates`` returns them.
+    :rtype: list[list[dict[str, Any]]]
+    """
+    table = CandidateDuplicateKeysDB.__table__
+    duplicates: list[list[dict[str, Any]]] = []
+    for start in range(0, len(keys_list), DUPLICATE_LOOKUP_CHUNK_SIZE):
+        chunk = keys_list[start:start + DUPLICATE_LOOKUP_CHUNK_SIZE]
+        values = {key: sorted({keys[key] for keys in chunk if keys.get(key)}) for key in DUPLICATE_KEYS}
+        conditions = [table.c[key].in_(key_values) for key, key_values in values.items() if key_values]
+        matches = [_split_keys(row) for row in db_session.execute(_duplicate_lookup(conditions))] if conditions else []
+
+        # Key value -> the matches having it, so each candidate only ranks the matches sharing one of its keys
+        by_value: dict[tuple[DuplicateKey, str], list[int]] = {}
+        for position, (_, shared) in enumerate(matches):
+            for key in DUPLICATE_KEYS:
+                if shared[key]:
+                    by_value.setdefault((key, shared[key]), []).append(position)
+        for keys in chunk:
+            positions = sorted({position for key in DUPLICATE_KEYS if keys.get(key) for position in by_value.get((key, keys[key]), ())})
+            duplicates.append(_ranked_duplicates((matches[position] for position in positions), keys, limit))
+    return duplicates
+
+def _key_blocks(db_session: Session, key: DuplicateKey) -> Iterator[tuple[DuplicateKey, list[int]]]:
+    """The candidates of every value of a key that more than one candidate shares, from one indexed query."""
+    column = CandidateDuplicateKeysDB.__table__.c[key]
+    shared = select(column).where(column.isnot(None)).group_by(column).having(func.count() > 1)
+    rows = db_session.execute(
+        select(column, CandidateDuplicateKeysDB.candidate_id)
+        .where(column.in_(shared))
+        .order_by(column, CandidateDuplicateKeysDB.candidate_id)
+    )
+    block_value, block = None, []
+    for value, candidate_id in rows:
+        if value != block_value and block:
+            yield key, block
+            block = []
+        block_value = value
+        block.append(candidate_id)
+    if block:
+        yield key, block
+
+def find_duplicate_clusters(db_session: Session, keys: Iterable[DuplicateKey] = DUPLICATE_KEYS, min_size: int = 2) -> list[dict[str, Any]]:
+    """
+    Group all candidates into clusters of likely duplicates.
+
+    Each key is a blocking pass: the database groups candidates by key value
+    and only values shared by several candidates come back, so the cost is a
+    scan of the key indexes plus the size of the blocks, not a comparison of
+    every pair of candidates.
+
+    :param Iterable[DuplicateKey] keys: The keys that link candidates.
+    :param int min_size: Leave out smaller clusters.
+    :return: Clusters with their candidate IDs and linking keys, largest first.
+    :rtype: list[dict[str, Any]]
+    """
+    blocks = [block for key in keys for block in _key_blocks(db_session, key)]
+    return cluster_blocks(blocks, min_size=min_size)
@@ -1,11 +1,25 @@
 from cims.core.entities.candidate import Candidate
 from cims.core.repositories.candidate_repository import CandidateRepository
 from cims.core.exceptions import NotFoundError
-from cims.database.models import CandidateDB
-from sqlalchemy.orm import Session
-from typing import Optional
+from cims.database.models import CandidateDB, ExpertiseDB, FieldDB, AreaDB, LevelDB, HeadhunterDB
+from sqlalchemy.orm import Session, Query
+from typing import Optional, Any, Iterator
+from cims.integrations.sqlalchemy.bulk import SQLAlchemyBulkMixin
+from cims.integrations.sqlalchemy.headhunter_stats import refresh_headhunter_daily_stats, stats_keys_for_candidates
+from cims.integrations.sqlalchemy.matching import fetch_match_profiles, mark_candidates_stale
+from cims.integrations.sqlalchemy.candidate_dedup import (
+    KEY_SOURCE_FIELDS,
+    find_duplicate_candidates,
+    find_duplicates_of_many,
+    find_duplicate_clusters,
+    refresh_candidate_duplicate_keys,
+)
+from cims.core.dedup import DUPLICATE_KEYS, STRONG_KEYS, duplicate_keys
+from cims.core.name_search import candidate_name_index
+from cims.integrations.sqlalchemy.name_search import in_id_order, mark_names_stale, name_search_enabled, refresh_name_index
+from cims.integrations.sqlalchemy.change_events import changed_fields, existing_ids, publish_changes
 
-class SQLAlchemyCandidateRepository(CandidateRepository):
+class SQLAlchemyCandidateRepository(SQLAlchemyBulkMixin, CandidateRepository):
     def __init__(self, db_session: Session) -> None:
         self.db_session = db_session
 
@@ -30,13 +44,138 @@ class SQLAlchemyCandidateRepository(CandidateRepository):
             updated_at=db_obj.updated_at
         )
 
+    def _apply_filters(
+        self,
+        query: Query[Any],
+        name: Optional[str] = None,
+        expertise_id: Optional[int] = None,
+        field_id: Optional[int] = None,
+        area_id: Optional[int] = None,
+        level_id: Optional[int] = None,
+        headhunter_id: Optional[int] = None,
+    ) -> Query[Any]:
+        if name:
+            query = query.filter(CandidateDB.name.ilike(f"%{name}%"))
+        if expertise_id:
+            query = query.filter(CandidateDB.expertise_id == expertise_id)
+        if field_id:
+            query = query.filter(CandidateDB.field_id == field_id)
+        if area_id:
+            query = query.filter(CandidateDB.area_id == area_id)
+        if level_id:
+            query = query.filter(CandidateDB.level_id == level_id)
+        if headhunter_id:
+            query = query.filter(CandidateDB.headhunter_id == headhunter_id)
+        return query
+
+    def _search_names(self, name: str, limit: Optional[int] = None, offset: int = 0, **filters: Any) -> tuple[int, list[int]]:
+        """Rank candidates by fuzzy name match among those passing the other filters."""
+        index = refresh_name_index(self.db_session, candidate_name_index, CandidateDB.candidate_id, CandidateDB.name)
+        restrict_to = None
+        if any(filters.values()):
+            query = self._apply_filters(self.db_session.query(CandidateDB.candidate_id), **filters)
+            restrict_to = [candidate_id for (candidate_id,) in query]
+        return index.search(name, offset=offset, limit=limit, restrict_to=restrict_to)
+
     def create_candidate(self, candidate: Candidate) -> Candidate:
         new_candidate = CandidateDB(**candidate.to_dict())
         self.db_session.add(new_candidate)
+        self.db_session.flush()
+        refresh_headhunter_daily_stats(self.db_session, stats_keys_for_candidates(self.db_session, [new_candidate.candidate_id]))
+        refresh_candidate_duplicate_keys(self.db_session, [new_candidate.candidate_id])
+        mark_candidates_stale(self.db_session, [new_candidate.candidate_id])
+        mark_names_stale(self.db_session, candidate_name_index, [new_candidate.candidate_id])
+        publish_changes(self.db_session, "candidate", "created", [new_candidate.candidate_id])
         self.db_session.commit()
         self.db_session.refresh(new_candidate)
         return self._to_domain_entity(new_candidate)
-    
+
+    def create_many(self, candidates: list[Candidate], commit: bool = True) -> list[Candidate]:
+        try:
+            created = self._bulk_create(CandidateDB, candidates, self._to_domain_entity, commit=False)
+            stats_keys = stats_keys_for_candidates(self.db_session, [candidate.candidate_id for candidate in created])
+            refresh_headhunter_daily_stats(self.db_session, stats_keys)
+            refresh_candidate_duplicate_keys(self.db_session, [candidate.candidate_id for candidate in created])
+            mark_candidates_stale(self.db_session, [candidate.candidate_id for candidate in created])
+            mark_names_stale(self.db_session, candidate_name_index, [candidate.candidate_id for candidate in created])
+            publish_changes(self.db_session, "candidate", "created", [candidate.candidate_id for candidate in created])
+            self._finish(commit)
+        except Exception:
+            if commit:
+                self.db_session.rollback()
+            raise
+        return created
+
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        mark_candidates_stale(self.db_session, patches)
+        mark_names_stale(self.db_session, candidate_name_index, [candidate_id for candidate_id, values in patches.items() if "name" in values])
+        patched_ids = existing_ids(self.db_session, "candidate", [candidate_id for candidate_id, values in patches.items() if values])
+        publish_changes(self.db_session, "candidate", "updated", patched_ids, fields=patches)
+        rekeyed = [candidate_id for candidate_id, values in patches.items() if KEY_SOURCE_FIELDS.intersection(values)]
+        reassigned = any("headhunter_id" in values for values in patches.values())
+        if not rekeyed and not reassigned:
+            return self._bulk_update(CandidateDB, patches, commit)
+
+        try:
+            # Candidates handed to another headhunter move their nominees' counts along
+            stats_keys = stats_keys_for_candidates(self.db_session, list(patches)) if reassigned else set()
+            updated = self._bulk_update(CandidateDB, patches, commit=False)
+            if reassigned:
+                stats_keys |= stats_keys_for_candidates(self.db_session, list(patches))
+                refresh_headhunter_daily_stats(self.db_session, stats_keys)
+            refresh_candidate_duplicate_keys(self.db_session, rekeyed)
+            self._finish(commit)
+        except Exception:
+            if commit:
+                self.db_session.rollback()
+            raise
+        return updated
+
+    def delete_many(self, candidate_ids: list[int], commit: bool = True) -> int:
+        if not candidate_ids:
+            return 0
+
+        try:
+            stats_keys = stats_keys_for_candidates(self.db_session, candidate_ids)
+            publish_changes(self.db_session, "candidate", "deleted", existing_ids(self.db_session, "candidate", candidate_ids))
+            deleted = self._bulk_delete(CandidateDB, candidate_ids, commit=False)
+            refresh_headhunter_daily_stats(self.db_session, stats_keys)
+            refresh_candidate_duplicate_keys(self.db_session, candidate_ids)
+            mark_candidates_stale(self.db_session, candidate_ids)
+            mark_names_stale(self.db_session, candidate_name_index, candidate_ids)
+            self._finish(commit)
+        except Exception:
+            if commit:
+                self.db_session.rollback()
+            raise
+        return deleted
+
+    def get_match_profiles(self, candidate_ids: Optional[list[int]] = None) -> list[dict[str, Any]]:
+        return fetch_match_profiles(self.db_session, candidate_ids)
+
+    def find_duplicates(self, candidate: Candidate, limit: int = 20) -> list[dict[str, Any]]:
+        keys = duplicate_keys(candidate.name, candidate.phone, candidate.email, candidate.year_of_birth)
+        return find_duplicate_candidates(self.db_session, keys, exclude_id=candidate.candidate_id, limit=limit)
+
+    def find_duplicates_many(self, candidates: list[Candidate], limit: int = 20) -> list[list[dict[str, Any]]]:
+        keys_list = [
+            duplicate_keys(candidate.name, candidate.phone, candidate.email, candidate.year_of_birth)
+            for candidate in candidates
+        ]
+        return find_duplicates_of_many(self.db_session, keys_list, limit=limit)
+
+    def find_duplicate_clusters(self, strong_only: bool = False, min_size: int = 2) -> list[dict[str, Any]]:
+        return find_duplicate_clusters(self.db_session, STRONG_KEYS if strong_only else DUPLICATE_KEYS, min_size=min_size)
+
+    def refresh_duplicate_keys(self, commit: bool = True) -> None:
+        try:
+            refresh_candidate_duplicate_keys(self.db_session)
+            self._finish(commit)
+        except Exception:
+            if commit:
+                self.db_session.rollback()
+            raise
+
     def count_all_candidates(self) -> int:
         return self.db_session.query(CandidateDB).count()
     
@@ -49,6 +188,10 @@ class SQLAlchemyCandidateRepository(CandidateRepository):
         return db_obj.candidate_id if db_obj else None
 
     def search_candidates_by_name(self, name_query: str, limit: int = 100, offset: int = 0) -> list[Candidate]:
+        if name_search_enabled():
+            _, candidate_ids = self._search_names(name_query, limit=limit, offset=offset)
+            return in_id_order(self.get_candidates_by_ids(candidate_ids), candidate_ids, lambda candidate: candidate.candidate_id)
+
         db_candidates = (
             self.db_session.query(CandidateDB)
             .filter(CandidateDB.name.ilike(f"%{name_query}%"))
@@ -69,20 +212,22 @@ class SQLAlchemyCandidateRepository(CandidateRepository):
         limit: int = 100,
         offset: int = 0
     ) -> list[Candidate]:
-        query = self.db_session.query(CandidateDB)
-        
-        if name:
-            query = query.filter(CandidateDB.name.ilike(f"%{name}%"))
-        if expertise_id:
-            query = query.filter(CandidateDB.expertise_id == expertise_id)
-        if field_id:
-            query = query.filter(CandidateDB.field_id == field_id)
-        if area_id:
-            query = query.filter(CandidateDB.area_id == area_id)
-        if level_id:
-            query = query.filter(CandidateDB.level_id == level_id)
-        if headhunter_id:
-            query = query.filter(CandidateDB.headhunter_id == headhunter_id)
+        if name and name_search_enabled():
+            _, candidate_ids = self._search_names(
+                name, limit=limit, offset=offset,
+                expertise_id=expertise_id, field_id=field_id, area_id=area_id, level_id=level_id, headhunter_id=headhunter_id,
+            )
+            return in_id_order(self.get_candidates_by_ids(candidate_ids), candidate_ids, lambda candidate: candidate.candidate_id)
+
+        query = self._apply_filters(
+            self.db_session.query(CandidateDB),
+            name=name,
+            expertise_id=expertise_id,
+            field_id=field_id,
+            area_id=area_id,
+            level_id=level_id,
+            headhunter_id=headhunter_id,
+        )
 
         db_candidates = query.offset(offset).limit(limit).all()
         return [self._to_domain_entity(candidate) for candidate in db_candidates]
@@ -95,21 +240,97 @@ class SQLAlchemyCandidateRepository(CandidateRepository):
         area_id: Optional[int] = None,
         level_id: Optional[int] = None,
     ) -> int:
-        query = self.db_session.query(CandidateDB)
-        
-        if name:
-            query = query.filter(CandidateDB.name.ilike(f"%{name}%"))
-        if expertise_id:
-            query = query.filter(CandidateDB.expertise_id == expertise_id)
-        if field_id:
-            query = query.filter(CandidateDB.field_id == field_id)
-        if area_id:
-            query = query.filter(CandidateDB.area_id == area_id)
-        if level_id:
-            query = query.filter(CandidateDB.level_id == level_id)
+        if name and name_search_enabled():
+            total, _ = self._search_names(name, limit=0, expertise_id=expertise_id, field_id=field_id, area_id=area_id, level_id=level_id)
+            return total
+
+        query = self._apply_filters(
+            self.db_session.query(CandidateDB),
+            name=name,
+            expertise_id=expertise_id,
+            field_id=field_id,
+            area_id=area_id,
+            level_id=level_id,
+        )
 
         return query.count()
+
+    def get_candidate_rows(
+        self,
+        fields: list[str],
+        name: Optional[str] = None,
+        expertise_id: Optional[int] = None,
+        field_id: Optional[int] = None,
+        area_id: Optional[int] = None,
+        level_id: Optional[int] = None,
+        headhunter_id: Optional[int] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> list[dict[str, Any]]:
+        table_columns = CandidateDB.__table__.columns
+        columns = [table_columns[column_name] for column_name in fields if column_name in table_columns] or [CandidateDB.candidate_id]
+
+        if name and name_search_enabled():
+            _, candidate_ids = self._search_names(
+                name, limit=limit, offset=offset,
+                expertise_id=expertise_id, field_id=field_id, area_id=area_id, level_id=level_id, headhunter_id=headhunter_id,
+            )
+            rows = self.db_session.query(CandidateDB.candidate_id.label("_ranked_id"), *columns).filter(CandidateDB.candidate_id.in_(candidate_ids))
+            ranked = in_id_order([row._asdict() for row in rows], candidate_ids, lambda row: row["_ranked_id"])
+            return [{key: value for key, value in row.items() if key != "_ranked_id"} for row in ranked]
+
+        query = self._apply_filters(
+            self.db_session.query(*columns),
+            name=name,
+            expertise_id=expertise_id,
+            field_id=field_id,
+            area_id=area_id,
+            level_id=level_id,
+            headhunter_id=headhunter_id,
+        )
+
+        return [row._asdict() for row in query.offset(offset).limit(limit).all()]
     
+    def iter_candidate_rows(
+        self,
+        name: Optional[str] = None,
+        expertise_id: Optional[int] = None,
+        field_id: Optional[int] = None,
+        area_id: Optional[int] = None,
+        level_id: Optional[int] = None,
+        headhunter_id: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> Iterator[dict[str, Any]]:
+        query = (
+            self.db_session.query(
+                *CandidateDB.__table__.columns,
+                ExpertiseDB.name.label("expertise_name"),
+                FieldDB.name.label("field_name"),
+                AreaDB.name.label("area_name"),
+                LevelDB.name.label("level_name"),
+                HeadhunterDB.name.label("headhunter_name"),
+            )
+            .select_from(CandidateDB)
+            .outerjoin(ExpertiseDB, CandidateDB.expertise_id == ExpertiseDB.expertise_id)
+            .outerjoin(FieldDB, CandidateDB.field_id == FieldDB.field_id)
+            .outerjoin(AreaDB, CandidateDB.area_id == AreaDB.area_id)
+            .outerjoin(LevelDB, CandidateDB.level_id == LevelDB.level_id)
+            .outerjoin(HeadhunterDB, CandidateDB.headhunter_id == HeadhunterDB.headhunter_id)
+        )
+        query = self._apply_filters(
+            query,
+            name=name,
+            expertise_id=expertise_id,
+            field_id=field_id,
+            area_id=area_id,
+            level_id=level_id,
+            headhunter_id=headhunter_id,
+        )
+
+        # yield_per enables stream_results, i.e. a server-side cursor on Postgres
+        for row in query.order_by(CandidateDB.candidate_id).yield_per(batch_size):
+            yield row._asdict()
+
     def get_candidates_by_ids(self, candidate_ids: list[int]) -> list[Candidate]:
         if not candidate_ids:
             return []
@@ -134,9 +355,21 @@ class SQLAlchemyCandidateRepository(CandidateRepository):
         if not db_obj:
             raise NotFoundError(entity="Candidate", identifier=candidate.candidate_id)
         
-        for key, value in candidate.to_dict().items():
+        previous_headhunter_id = db_obj.headhunter_id
+        values = candidate.to_dict()
+        publish_changes(self.db_session, "candidate", "updated", [db_obj.candidate_id], fields={db_obj.candidate_id: changed_fields(db_obj, values)})
+        for key, value in values.items():
             setattr(db_obj, key, value)
 
+        self.db_session.flush()
+        if previous_headhunter_id != db_obj.headhunter_id:
+            # The same rows are recomputed under the old and the new headhunter
+            stats_keys = stats_keys_for_candidates(self.db_session, [db_obj.candidate_id])
+            stats_keys |= {(previous_headhunter_id, day) for _, day in stats_keys}
+            refresh_headhunter_daily_stats(self.db_session, stats_keys)
+        refresh_candidate_duplicate_keys(self.db_session, [db_obj.candidate_id])
+        mark_candidates_stale(self.db_session, [db_obj.candidate_id])
+        mark_names_stale(self.db_session, candidate_name_index, [db_obj.candidate_id])
         self.db_session.commit()
         self.db_session.refresh(db_obj)
         return self._to_domain_entity(db_obj)
@@ -149,6 +382,13 @@ class SQLAlchemyCandidateRepository(CandidateRepository):
         if not db_obj:
             raise NotFoundError(entity="Candidate", identifier=candidate_id)
 
+        stats_keys = stats_keys_for_candidates(self.db_session, [candidate_id])
         self.db_session.delete(db_obj)
+        self.db_session.flush()
+        refresh_headhunter_daily_stats(self.db_session, stats_keys)
+        refresh_candidate_duplicate_keys(self.db_session, [candidate_id])
+        mark_candidates_stale(self.db_session, [candidate_id])
+        mark_names_stale(self.db_session, candidate_name_index, [candidate_id])
+        publish_changes(self.db_session, "candidate", "deleted", [candidate_id])
         self.db_session.commit()
         return True
@@ -0,0 +1,104 @@
+"""
+Publication of repository writes to the change event bus once they commit.
+"""
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import Any, Iterable, Optional
+
+from cims.config import settings
+from cims.core.change_events import ChangeAction, ChangeEntityType, ChangeEvent, change_event_bus
+from cims.database.models import CandidateDB, CustomerDB, NomineeDB, ProjectDB
+from cims.integrations.sqlalchemy.after_commit import collect_after_commit
+from cims.integrations.sqlalchemy.bulk import MANAGED_COLUMNS
+
+# The project and customer IDs an entity's events are tagged with
+Scope = tuple[frozenset[int], frozenset[int]]
+
+_MODELS: dict[ChangeEntityType, Any] = {"candidate": CandidateDB, "customer": CustomerDB, "project": ProjectDB, "nominee": NomineeDB}
+
+def change_events_enabled() -> bool:
+    return settings.CHANGE_EVENTS_ENABLED
+
+def changed_fields(db_obj: Any, values: dict[str, Any]) -> list[str]:
+    """The columns an update is about to change, compared before the values are set."""
+    return [key for key, value in values.items() if key not in MANAGED_COLUMNS and getattr(db_obj, key) != value]
+
+def existing_ids(db_session: Session, entity_type: ChangeEntityType, entity_ids: Iterable[int]) -> list[int]:
+    """
+    The given entities that have a row, so bulk writes publish events only for
+    the rows they hit; empty when change events are disabled.
+    """
+    ids = [entity_id for entity_id in dict.fromkeys(entity_ids) if entity_id]
+    if not ids or not change_events_enabled():
+        return []
+
+    primary_key = _MODELS[entity_type].__mapper__.primary_key[0]
+    found = set(db_session.scalars(select(primary_key).where(primary_key.in_(ids))))
+    return [entity_id for entity_id in ids if entity_id in found]
+
+def load_scopes(db_session: Session, entity_type: ChangeEntityType, entity_ids: Iterable[int]) -> dict[int, Scope]:
+    """
+    The projects and customers each entity currently belongs to.
+
+    Nominees belong to their project and its customer, projects to themselves
+    and their customer, customers to themselves; candidates to none.
+    """
+    ids = sorted({entity_id for entity_id in entity_ids if entity_id})
+    if not ids or not change_events_enabled():
+        return {}
+
+    if entity_type == "customer":
+        return {customer_id: (frozenset(), frozenset((customer_id,))) for customer_id in ids}
+    if entity_type == "project":
+        rows = db_session.execute(select(ProjectDB.project_id, ProjectDB.project_id, ProjectDB.customer_id).where(ProjectDB.project_id.in_(ids)))
+    elif entity_type == "nominee":
+        rows = db_session.execute(
+            select(NomineeDB.nominee_id, NomineeDB.project_id, ProjectDB.customer_id)
+            .join(ProjectDB, NomineeDB.project_id == ProjectDB.project_id)
+            .where(NomineeDB.nominee_id.in_(ids))
+        )
+    else:
+        return {}
+    return {entity_id: (frozenset((project_id,)), frozenset((customer_id,))) for entity_id, project_id, customer_id in rows}
+
+def publish_changes(
+    db_session: Session,
+    entity_type: ChangeEntityType,
+    action: ChangeAction,
+    entity_ids: Iterable[int],
+    fields: Optional[dict[int, Iterable[str]]] = None,
+    previous_scopes: Optional[dict[int, Scope]] = None
+) -> None:
+    """
+    Publish one event per entity once the session's current transaction commits.
+
+    Scopes are looked up when this is called, so deletes publish before their
+    statement runs; nothing is published if the transaction rolls back.
+
+    :param Session db_session: The session whose transaction the write belongs to.
+    :param ChangeEntityType entity_type: The type of the written entities.
+    :param ChangeAction action: What happened to them.
+    :param Iterable[int] entity_ids: The written entities.
+    :param dict fields: The columns written per entity, for updates.
+    :param dict previous_scopes: Scopes from before an update, so entities moved to
+        another project or customer are also announced to the old one.
+    """
+    if not change_events_enabled():
+        return
+
+    ids = [entity_id for entity_id in dict.fromkeys(entity_ids) if entity_id]
+    scopes = load_scopes(db_session, entity_type, ids)
+    previous_scopes = previous_scopes or {}
+    empty: Scope = (frozenset(), frozenset())
+    events = collect_after_commit(db_session, "change_events", change_event_bus.publish)
+    for entity_id in ids:
+        project_ids, customer_ids = scopes.get(entity_id, empty)
+        previous_project_ids, previous_customer_ids = previous_scopes.get(entity_id, empty)
+        events.append(ChangeEvent(
+            entity_type,
+            action,
+            entity_id,
+            project_ids | previous_project_ids,
+            customer_ids | previous_customer_ids,
+            fields.get(entity_id, ()) if fields is not None else None,
+        ))
@@ -3,9 +3,13 @@ from cims.core.repositories.customer_repository import CustomerRepository
 from cims.core.exceptions import NotFoundError
 from cims.database.models import CustomerDB
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Any
+from cims.integrations.sqlalchemy.bulk import SQLAlchemyBulkMixin
+from cims.core.name_search import customer_name_index
+from cims.integrations.sqlalchemy.name_search import in_id_order, mark_names_stale, name_search_enabled, refresh_name_index
+from cims.integrations.sqlalchemy.change_events import changed_fields, existing_ids, publish_changes
 
-class SQLAlchemyCustomerRepository(CustomerRepository):
+class SQLAlchemyCustomerRepository(SQLAlchemyBulkMixin, CustomerRepository):
     def __init__(self, db_session: Session) -> None:
         self.db_session = db_session
 
@@ -22,12 +26,44 @@ class SQLAlchemyCustomerRepository(CustomerRepository):
             updated_at=db_obj.updated_at
         )
 
+    def _search_names(self, name_query: str, limit: Optional[int] = None, offset: int = 0) -> list[int]:
+        """IDs of the customers best matching a fuzzy name query."""
+        index = refresh_name_index(self.db_session, customer_name_index, CustomerDB.customer_id, CustomerDB.name)
+        _, customer_ids = index.search(name_query, offset=offset, limit=limit)
+        return customer_ids
+
     def create_customer(self, customer: Customer) -> Customer:
         new_customer = CustomerDB(**customer.to_dict())
         self.db_session.add(new_customer)
+        self.db_session.flush()
+        mark_names_stale(self.db_session, customer_name_index, [new_customer.customer_id])
+        publish_changes(self.db_session, "customer", "created", [new_customer.customer_id])
         self.db_session.commit()
         self.db_session.refresh(new_customer)
         return self._to_domain_entity(new_customer)
+
+    def create_many(self, customers: list[Customer], commit: bool = True) -> list[Customer]:
+        try:
+            created = self._bulk_create(CustomerDB, customers, self._to_domain_entity, commit=False)
+            mark_names_stale(self.db_session, customer_name_index, [customer.customer_id for customer in created])
+            publish_changes(self.db_session, "customer", "created", [customer.customer_id for customer in created])
+            self._finish(commit)
+        except Exception:
+            if commit:
+                self.db_session.rollback()
+            raise
+        return created
+
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        mark_names_stale(self.db_session, customer_name_index, [customer_id for customer_id, values in patches.items() if "name" in values])
+        patched_ids = existing_ids(self.db_session, "customer", [customer_id for customer_id, values in patches.items() if values])
+        publish_changes(self.db_session, "customer", "updated", patched_ids, fields=patches)
+        return self._bulk_update(CustomerDB, patches, commit)
+
+    def delete_many(self, customer_ids: list[int], commit: bool = True) -> int:
+        mark_names_stale(self.db_session, customer_name_index, customer_ids)
+        publish_changes(self.db_session, "customer", "deleted", existing_ids(self.db_session, "customer", customer_ids))
+        return self._bulk_delete(CustomerDB, customer_ids, commit)
     
     def get_customers_by_ids(self, customer_ids: list[int]) -> list[Customer]:
         if not customer_ids:
@@ -53,9 +89,12 @@ class SQLAlchemyCustomerRepository(CustomerRepository):
         if not db_obj:
             raise NotFoundError(entity="Customer", identifier=customer.customer_id)
         
-        for key, value in customer.to_dict().items():
+        values = customer.to_dict()
+        publish_changes(self.db_session, "customer", "updated", [db_obj.customer_id], fields={db_obj.customer_id: changed_fields(db_obj, values)})
+        for key, value in values.items():
             setattr(db_obj, key, value)
 
+        mark_names_stale(self.db_session, customer_name_index, [db_obj.customer_id])
         self.db_session.commit()
         self.db_session.refresh(db_obj)
         return self._to_domain_entity(db_obj)
@@ -69,6 +108,8 @@ class SQLAlchemyCustomerRepository(CustomerRepository):
             raise NotFoundError(entity="Customer", identifier=customer_id)
 
         self.db_session.delete(db_obj)
+        mark_names_stale(self.db_session, customer_name_index, [customer_id])
+        publish_changes(self.db_session, "customer", "deleted", [customer_id])
         self.db_session.commit()
         return True
 
@@ -84,6 +125,10 @@ class SQLAlchemyCustomerRepository(CustomerRepository):
         return [self._to_domain_entity(customer) for customer in db_customers]
 
     def search_customers_by_name(self, name_query: str, limit: int = 100, offset: int = 0) -> list[Customer]:
+        if name_search_enabled():
+            customer_ids = self._search_names(name_query, limit=limit, offset=offset)
+            return in_id_order(self.get_customers_by_ids(customer_ids), customer_ids, lambda customer: customer.customer_id)
+
         db_customers = (
             self.db_session.query(CustomerDB)
             .filter(CustomerDB.name.ilike(f"%{name_query}%"))
@@ -91,4 +136,20 @@ class SQLAlchemyCustomerRepository(CustomerRepository):
             .limit(limit)
             .all()
         )
-        return [self._to_domain_entity(customer) for customer in db_customers]
\ No newline at end of file
+        return [self._to_domain_entity(customer) for customer in db_customers]
+
+    def get_customer_rows(self, fields: list[str], name_query: Optional[str] = None, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
+        table_columns = CustomerDB.__table__.columns
+        columns = [table_columns[column_name] for column_name in fields if column_name in table_columns] or [CustomerDB.customer_id]
+
+        if name_query and name_search_enabled():
+            customer_ids = self._search_names(name_query, limit=limit, offset=offset)
+            rows = self.db_session.query(CustomerDB.customer_id.label("_ranked_id"), *columns).filter(CustomerDB.customer_id.in_(customer_ids))
+            ranked = in_id_order([row._asdict() for row in rows], customer_ids, lambda row: row["_ranked_id"])
+            return [{key: value for key, value in row.items() if key != "_ranked_id"} for row in ranked]
+
+        query = self.db_session.query(*columns)
+        if name_query:
+            query = query.filter(CustomerDB.name.ilike(f"%{name_query}%"))
+
+        return [row._asdict() for row in query.offset(offset).limit(limit).all()]
\ No newline at end of file
@@ -3,9 +3,10 @@ from cims.core.repositories.expertise_repository import ExpertiseRepository
 from cims.database.models import ExpertiseDB
 from sqlalchemy.orm import Session
 from cims.core.exceptions import NotFoundError
-from typing import Optional
+from typing import Optional, Any
+from cims.integrations.sqlalchemy.bulk import SQLAlchemyBulkMixin
 
-class SQLAlchemyExpertiseRepository(ExpertiseRepository):
+class SQLAlchemyExpertiseRepository(SQLAlchemyBulkMixin, ExpertiseRepository):
     def __init__(self, db_session: Session):
         self.db_session = db_session
 
@@ -23,6 +24,15 @@ class SQLAlchemyExpertiseRepository(ExpertiseRepository):
         self.db_session.commit()
         self.db_session.refresh(db_obj)
         return self._to_domain_entity(db_obj)
+
+    def create_many(self, expertises: list[Expertise], commit: bool = True) -> list[Expertise]:
+        return self._bulk_create(ExpertiseDB, expertises, self._to_domain_entity, commit)
+
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        return self._bulk_update(ExpertiseDB, patches, commit)
+
+    def delete_many(self, expertise_ids: list[int], commit: bool = True) -> int:
+        return self._bulk_delete(ExpertiseDB, expertise_ids, commit)
     
     def get_expertises_by_ids(self, expertise_ids: list[int]) -> list[Expertise]:
         if not expertise_ids:
@@ -3,9 +3,10 @@ from cims.core.repositories.field_repository import FieldRepository
 from cims.database.models import FieldDB
 from sqlalchemy.orm import Session
 from cims.core.exceptions import NotFoundError
-from typing import Optional
+from typing import Optional, Any
+from cims.integrations.sqlalchemy.bulk import SQLAlchemyBulkMixin
 
-class SQLAlchemyFieldRepository(FieldRepository):
+class SQLAlchemyFieldRepository(SQLAlchemyBulkMixin, FieldRepository):
     def __init__(self, db_session: Session):
         self.db_session = db_session
 
@@ -23,6 +24,15 @@ class SQLAlchemyFieldRepository(FieldRepository):
         self.db_session.commit()
         self.db_session.refresh(db_obj)
         return self._to_domain_entity(db_obj)
+
+    def create_many(self, fields: list[Field], commit: bool = True) -> list[Field]:
+        return self._bulk_create(FieldDB, fields, self._to_domain_entity, commit)
+
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        return self._bulk_update(FieldDB, patches, commit)
+
+    def delete_many(self, field_ids: list[int], commit: bool = True) -> int:
+        return self._bulk_delete(FieldDB, field_ids, commit)
     
     def get_fields_by_ids(self, field_ids: list[int]) -> list[Field]:
         if not field_ids:
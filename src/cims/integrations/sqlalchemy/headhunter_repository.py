@@ -1,11 +1,14 @@
 from cims.core.entities.headhunter import Headhunter
-from cims.core.repositories.headhunter_repository import HeadhunterRepository
+from cims.core.repositories.headhunter_repository import HeadhunterRepository, StatsPeriod
 from cims.database.models import HeadhunterDB
 from sqlalchemy.orm import Session
 from cims.core.exceptions import NotFoundError
-from typing import Optional
+from typing import Optional, Any
+import datetime
+from cims.integrations.sqlalchemy.bulk import SQLAlchemyBulkMixin
+from cims.integrations.sqlalchemy.headhunter_stats import headhunter_period_stats, refresh_headhunter_daily_stats
 
-class SQLAlchemyHeadhunterRepository(HeadhunterRepository):
+class SQLAlchemyHeadhunterRepository(SQLAlchemyBulkMixin, HeadhunterRepository):
     def __init__(self, db_session: Session):
         self.db_session = db_session
 
@@ -34,6 +37,15 @@ class SQLAlchemyHeadhunterRepository(HeadhunterRepository):
         self.db_session.commit()
         self.db_session.refresh(db_obj)
         return self._to_domain_entity(db_obj)
+
+    def create_many(self, headhunters: list[Headhunter], commit: bool = True) -> list[Headhunter]:
+        return self._bulk_create(HeadhunterDB, headhunters, self._to_domain_entity, commit)
+
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        return self._bulk_update(HeadhunterDB, patches, commit)
+
+    def delete_many(self, headhunter_ids: list[int], commit: bool = True) -> int:
+        return self._bulk_delete(HeadhunterDB, headhunter_ids, commit)
     
     def count_all_headhunters(self) -> int:
         return self.db_session.query(HeadhunterDB).count()
@@ -105,4 +117,16 @@ class SQLAlchemyHeadhunterRepository(HeadhunterRepository):
         db_objs = self.db_session.query(HeadhunterDB).filter(
             HeadhunterDB.name.ilike(f"%{name_query}%")
         ).offset(offset).limit(limit).all()
-        return [self._to_domain_entity(db_obj) for db_obj in db_objs]
\ No newline at end of file
+        return [self._to_domain_entity(db_obj) for db_obj in db_objs]
+
+    def get_period_stats(self, period: StatsPeriod, start: datetime.date, end: datetime.date) -> list[dict[str, Any]]:
+        return headhunter_period_stats(self.db_session, period, start, end)
+
+    def refresh_daily_stats(self, commit: bool = True) -> None:
+        try:
+            refresh_headhunter_daily_stats(self.db_session)
+            self._finish(commit)
+        except Exception:
+            if commit:
+                self.db_session.rollback()
+            raise
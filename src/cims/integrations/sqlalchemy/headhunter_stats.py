@@ -0,0 +1,249 @@
+"""
+Per-headhunter daily activity aggregates and their bucketing into weeks, months and quarters.
+"""
+from sqlalchemy import ColumnElement, Date, Integer, Select, case, cast, delete, func, literal, select, true, tuple_, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from typing import Any, Iterable, Optional
+import datetime
+
+from cims.config import settings
+from cims.core.entities.nominee import NomineeStatus
+from cims.core.repositories.headhunter_repository import StatsPeriod
+from cims.database.models import CandidateDB, HeadhunterDB, HeadhunterDailyStatsDB, NomineeDB
+from cims.integrations.sqlalchemy.outbox import OutboxMessage, enqueue_outbox, outbox_handler
+
+StatsKey = tuple[int, datetime.date]
+
+REFRESH_TOPIC = "headhunter_stats.refresh"
+
+# Count column of the daily stats table for each nominee status
+STATUS_COLUMNS: dict[str, str] = {status: f"nominees_{status.lower()}" for status in NomineeStatus.__args__}
+COUNT_COLUMNS = ("candidates_sourced", "nominees", *STATUS_COLUMNS.values())
+
+def daily_stats_enabled() -> bool:
+    return settings.HEADHUNTER_DAILY_STATS
+
+def utc_day(value: datetime.datetime) -> datetime.date:
+    """The UTC calendar day of a timestamp; naive timestamps are taken as UTC."""
+    return (value.astimezone(datetime.timezone.utc) if value.tzinfo else value).date()
+
+def _day_expression(column: Any, dialect: str) -> ColumnElement[Any]:
+    if dialect == "postgresql":
+        return cast(func.timezone("UTC", column), Date)
+    return func.date(column, type_=Date)
+
+def _period_expression(day: Any, period: StatsPeriod, dialect: str) -> ColumnElement[Any]:
+    if dialect == "postgresql":
+        return cast(func.date_trunc(period, day), Date)
+    if period == "week":
+        return func.date(day, "weekday 0", "-6 days", type_=Date)
+    if period == "month":
+        return func.date(day, "start of month", type_=Date)
+    months_into_quarter = (cast(func.strftime("%m", day), Integer) - 1) % 3
+    return func.date(day, "start of month", func.printf("-%d months", months_into_quarter), type_=Date)
+
+def _daily_counts(
+    dialect: str,
+    headhunter_ids: Optional[set[int]] = None,
+    created_from: Optional[datetime.datetime] = None,
+    created_to: Optional[datetime.datetime] = None
+) -> Select[Any]:
+    """
+    Aggregate candidates and nominees into one row per headhunter and day.
+
+    Both sides are grouped before they are combined, so the outer aggregation
+    only sees one row per headhunter, day and side.
+    """
+    def window(column: Any) -> ColumnElement[bool]:
+        condition: ColumnElement[bool] = true()
+        if headhunter_ids is not None:
+            condition = condition & CandidateDB.headhunter_id.in_(sorted(headhunter_ids))
+        if created_from is not None:
+            condition = condition & (column >= created_from)
+        if created_to is not None:
+            condition = condition & (column < created_to)
+        return condition
+
+    zero = literal(0)
+    candidate_day = _day_expression(CandidateDB.created_at, dialect)
+    candidates = (
+        select(
+            CandidateDB.headhunter_id.label("headhunter_id"),
+            candidate_day.label("day"),
+            func.count().label("candidates_sourced"),
+            zero.label("nominees"),
+            *[zero.label(column) for column in STATUS_COLUMNS.values()],
+        )
+        .where(window(CandidateDB.created_at))
+        .group_by(CandidateDB.headhunter_id, candidate_day)
+    )
+
+    nominee_day = _day_expression(NomineeDB.created_at, dialect)
+    nominees = (
+        select(
+            CandidateDB.headhunter_id,
+            nominee_day,
+            zero,
+            func.count(),
+            *[func.count(case((NomineeDB.status == status, 1))) for status in STATUS_COLUMNS],
+        )
+        .select_from(NomineeDB)
+        .join(CandidateDB, NomineeDB.candidate_id == CandidateDB.candidate_id)
+        .where(window(NomineeDB.created_at))
+        .group_by(CandidateDB.headhunter_id, nominee_day)
+    )
+
+    combined = union_all(candidates, nominees).subquery()
+    return (
+        select(
+            combined.c.headhunter_id,
+            combined.c.day,
+            *[func.sum(combined.c[column]).label(column) for column in COUNT_COLUMNS],
+        )
+        .group_by(combined.c.headhunter_id, combined.c.day)
+    )
+
+def _day_start(day: datetime.date) -> datetime.datetime:
+    return datetime.datetime.combine(day, datetime.time.min, datetime.timezone.utc)
+
+def refresh_headhunter_daily_stats(
+    db_session: Session,
+    keys: Optional[Iterable[StatsKey]] = None,
+    defer: Optional[bool] = None
+) -> None:
+    """
+    Recompute daily stats rows, for the given (headhunter, day) keys or for everything.
+
+    The keys are deleted and the covering headhunters and days recomputed with
+    one upsert in the session's current transaction, so keys that lost their
+    last candidate or nominee disappear and the rest commit together with the
+    write that touched them. With ``AGGREGATE_REFRESH_MODE`` set to
+    ``"outbox"`` the refresh of given keys is recorded in the outbox instead.
+
+    :param Session db_session: The session whose transaction the refresh joins.
+    :param Iterable[StatsKey] keys: The (headhunter ID, UTC day) rows to refresh; all rows when None.
+    :param bool defer: Whether to leave the refresh to the outbox worker; follows ``AGGREGATE_REFRESH_MODE`` when None.
+    """
+    table = HeadhunterDailyStatsDB.__table__
+    dialect = db_session.get_bind().dialect.name
+
+    if keys is None:
+        db_session.execute(delete(table))
+        source = _daily_counts(dialect)
+    else:
+        keys = {(headhunter_id, day) for headhunter_id, day in keys if headhunter_id}
+        if not keys:
+            return
+        if defer is None:
+            defer = settings.AGGREGATE_REFRESH_MODE == "outbox"
+        if defer:
+            enqueue_outbox(db_session, REFRESH_TOPIC, {"keys": [[headhunter_id, day.isoformat()] for headhunter_id, day in sorted(keys)]})
+            return
+        days = [day for _, day in keys]
+        db_session.execute(delete(table).where(tuple_(table.c.headhunter_id, table.c.day).in_(sorted(keys))))
+        source = _daily_counts(
+            dialect,
+            headhunter_ids={headhunter_id for headhunter_id, _ in keys},
+            created_from=_day_start(min(days)),
+            created_to=_day_start(max(days) + datetime.timedelta(days=1)),
+        )
+
+    columns = ("headhunter_id", "day", *COUNT_COLUMNS)
+    dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    statement = dialect_insert(table).from_select(columns, source)
+    # Keys outside the deleted set that share a headhunter and day range are recomputed as well
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.headhunter_id, table.c.day],
+        set_={column: statement.excluded[column] for column in COUNT_COLUMNS},
+    )
+    db_session.execute(statement)
+
+@outbox_handler(REFRESH_TOPIC)
+def _refresh_deferred_stats(db_session: Session, messages: list[OutboxMessage]) -> None:
+    """Refresh the keys of a batch of deferred refreshes at once."""
+    refresh_headhunter_daily_stats(
+        db_session,
+        {(headhunter_id, datetime.date.fromisoformat(day)) for message in messages for headhunter_id, day in message.payload["keys"]},
+        defer=False
+    )
+
+def stats_keys_for_candidates(db_session: Session, candidate_ids: Iterable[int]) -> set[StatsKey]:
+    """
+    The daily stats rows that count the given candidates or their nominees.
+
+    Empty when daily stats are disabled, which makes the following refresh a no-op.
+    """
+    candidate_ids = sorted(set(candidate_ids))
+    if not daily_stats_enabled() or not candidate_ids:
+        return set()
+    rows = db_session.execute(union_all(
+        select(CandidateDB.headhunter_id, CandidateDB.created_at).where(CandidateDB.candidate_id.in_(candidate_ids)),
+        select(CandidateDB.headhunter_id, NomineeDB.created_at)
+        .select_from(NomineeDB)
+        .join(CandidateDB, NomineeDB.candidate_id == CandidateDB.candidate_id)
+        .where(NomineeDB.candidate_id.in_(candidate_ids)),
+    )).all()
+    return {(headhunter_id, utc_day(created_at)) for headhunter_id, created_at in rows}
+
+def stats_keys_for_nominees(db_session: Session, nominee_ids: Iterable[int]) -> set[StatsKey]:
+    """
+    The daily stats rows that count the given nominees.
+
+    Empty when daily stats are disabled, which makes the following refresh a no-op.
+    """
+    nominee_ids = sorted(set(nominee_ids))
+    if not daily_stats_enabled() or not nominee_ids:
+        return set()
+    rows = db_session.execute(
+        select(CandidateDB.headhunter_id, NomineeDB.created_at)
+        .select_from(NomineeDB)
+        .join(CandidateDB, NomineeDB.candidate_id == CandidateDB.candidate_id)
+        .where(NomineeDB.nominee_id.in_(nominee_ids))
+    ).all()
+    return {(headhunter_id, utc_day(created_at)) for headhunter_id, created_at in rows}
+
+def headhunter_period_stats(
+    db_session: Session,
+    period: StatsPeriod,
+    start: datetime.date,
+    end: datetime.date,
+    use_daily_stats: Optional[bool] = None
+) -> list[dict[str, Any]]:
+    """
+    Sum the activity of each headhunter per period between start and end (inclusive).
+
+    Reads the daily stats table when it is maintained, otherwise aggregates the
+    candidates and nominees of the window directly.
+    """
+    if use_daily_stats is None:
+        use_daily_stats = daily_stats_enabled()
+    dialect = db_session.get_bind().dialect.name
+
+    if use_daily_stats:
+        table = HeadhunterDailyStatsDB.__table__
+        source = select(table).where(table.c.day >= start, table.c.day <= end).subquery()
+    else:
+        source = _daily_counts(dialect, created_from=_day_start(start), created_to=_day_start(end + datetime.timedelta(days=1))).subquery()
+
+    bucket = _period_expression(source.c.day, period, dialect)
+    rows = db_session.execute(
+        select(
+            source.c.headhunter_id,
+            HeadhunterDB.name.label("headhunter_name"),
+            bucket.label("period_start"),
+            *[func.sum(source.c[column]).label(column) for column in COUNT_COLUMNS],
+        )
+        .join(HeadhunterDB, HeadhunterDB.headhunter_id == source.c.headhunter_id)
+        .group_by(source.c.headhunter_id, HeadhunterDB.name, bucket)
+        .order_by(bucket, source.c.headhunter_id)
+    ).all()
+
+    results = []
+    for row in rows:
+        data = row._asdict()
+        data["stage_counts"] = {status: int(data.pop(column)) for status, column in STATUS_COLUMNS.items()}
+        data["candidates_sourced"] = int(data["candidates_sourced"])
+        data["nominees"] = int(data["nominees"])
+        results.append(data)
+    return results
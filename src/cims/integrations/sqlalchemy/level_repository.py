@@ -3,9 +3,10 @@ from cims.core.repositories.level_repository import LevelRepository
 from cims.database.models import LevelDB
 from sqlalchemy.orm import Session
 from cims.core.exceptions import NotFoundError
-from typing import Optional
+from typing import Optional, Any
+from cims.integrations.sqlalchemy.bulk import SQLAlchemyBulkMixin
 
-class SQLAlchemyLevelRepository(LevelRepository):
+class SQLAlchemyLevelRepository(SQLAlchemyBulkMixin, LevelRepository):
     def __init__(self, db_session: Session):
         self.db_session = db_session
 
@@ -23,6 +24,15 @@ class SQLAlchemyLevelRepository(LevelRepository):
         self.db_session.commit()
         self.db_session.refresh(db_obj)
         return self._to_domain_entity(db_obj)
+
+    def create_many(self, levels: list[Level], commit: bool = True) -> list[Level]:
+        return self._bulk_create(LevelDB, levels, self._to_domain_entity, commit)
+
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        return self._bulk_update(LevelDB, patches, commit)
+
+    def delete_many(self, level_ids: list[int], commit: bool = True) -> int:
+        return self._bulk_delete(LevelDB, level_ids, commit)
     
     def get_levels_by_ids(self, level_ids: list[int]) -> list[Level]:
         if not level_ids:
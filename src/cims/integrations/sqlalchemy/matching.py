@@ -0,0 +1,43 @@
+"""
+Candidate match profiles for the matching index and their invalidation on writes.
+"""
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+from typing import Any, Iterable, Optional
+
+from cims.core.entities.nominee import NOMINEE_FUNNEL_STAGES
+from cims.core.matching import candidate_index
+from cims.database.models import CandidateDB, NomineeDB
+from cims.integrations.sqlalchemy.after_commit import run_after_commit
+
+# Nominees at these statuses got past the first screening
+ADVANCED_STATUSES = NOMINEE_FUNNEL_STAGES[1:]
+
+def fetch_match_profiles(db_session: Session, candidate_ids: Optional[list[int]] = None) -> list[dict[str, Any]]:
+    """Select the indexed attributes and nominee outcome counts of the given candidates, or of all candidates."""
+    statement = (
+        select(
+            CandidateDB.candidate_id,
+            CandidateDB.name,
+            CandidateDB.headhunter_id,
+            CandidateDB.expertise_id,
+            CandidateDB.field_id,
+            CandidateDB.area_id,
+            CandidateDB.level_id,
+            CandidateDB.source,
+            func.count(NomineeDB.nominee_id).label("nominations"),
+            func.count(case((NomineeDB.status.in_(ADVANCED_STATUSES), 1))).label("advanced"),
+        )
+        .select_from(CandidateDB)
+        .outerjoin(NomineeDB, NomineeDB.candidate_id == CandidateDB.candidate_id)
+        .group_by(CandidateDB.candidate_id)
+    )
+    if candidate_ids is not None:
+        statement = statement.where(CandidateDB.candidate_id.in_(candidate_ids))
+    return [row._asdict() for row in db_session.execute(statement)]
+
+def mark_candidates_stale(db_session: Session, candidate_ids: Iterable[Optional[int]]) -> None:
+    """Reload these candidates into the matching index once the session's current transaction commits."""
+    stale = {candidate_id for candidate_id in candidate_ids if candidate_id}
+    if stale:
+        run_after_commit(db_session, lambda: candidate_index.mark_stale(stale))
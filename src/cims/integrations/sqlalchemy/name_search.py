@@ -0,0 +1,48 @@
+"""
+Name loaders for the in-memory name search indexes and their invalidation on writes.
+"""
+from sqlalchemy import select
+from sqlalchemy.orm import InstrumentedAttribute, Session
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+from cims.config import settings
+from cims.core.name_search import NameSearchIndex
+from cims.integrations.sqlalchemy.after_commit import run_after_commit
+
+T = TypeVar("T")
+
+def name_search_enabled() -> bool:
+    return settings.NAME_SEARCH_INDEX
+
+def fetch_names(
+    db_session: Session,
+    id_column: InstrumentedAttribute[Any],
+    name_column: InstrumentedAttribute[Any],
+    entity_ids: Optional[list[int]] = None
+) -> list[tuple[int, str]]:
+    """Select the (ID, name) pairs of the given entities, or of all of them."""
+    statement = select(id_column, name_column)
+    if entity_ids is not None:
+        statement = statement.where(id_column.in_(entity_ids))
+    return [(entity_id, name) for entity_id, name in db_session.execute(statement)]
+
+def refresh_name_index(
+    db_session: Session,
+    index: NameSearchIndex,
+    id_column: InstrumentedAttribute[Any],
+    name_column: InstrumentedAttribute[Any]
+) -> NameSearchIndex:
+    """Bring a name index up to date from the session's database and return it."""
+    index.refresh(lambda entity_ids: fetch_names(db_session, id_column, name_column, entity_ids))
+    return index
+
+def mark_names_stale(db_session: Session, index: NameSearchIndex, entity_ids: Iterable[Optional[int]]) -> None:
+    """Reload these names into the index once the session's current transaction commits."""
+    stale = {entity_id for entity_id in entity_ids if entity_id}
+    if stale:
+        run_after_commit(db_session, lambda: index.mark_stale(stale))
+
+def in_id_order(items: Iterable[T], entity_ids: list[int], key: Callable[[T], Any]) -> list[T]:
+    """Put items loaded by ID back into the ranked order of the IDs."""
+    position = {entity_id: index for index, entity_id in enumerate(entity_ids)}
+    return sorted((item for item in items if key(item) in position), key=lambda item: position[key(item)])
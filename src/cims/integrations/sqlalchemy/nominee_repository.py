@@ -1,11 +1,25 @@
 from cims.core.entities.nominee import Nominee
 from cims.core.repositories.nominee_repository import NomineeRepository
 from cims.core.exceptions import NotFoundError
-from cims.database.models import NomineeDB
+from cims.database.models import NomineeDB, CandidateDB, ProjectDB, HeadhunterDB
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Any, Iterator
+import datetime
+from cims.integrations.sqlalchemy.bulk import SQLAlchemyBulkMixin
+from cims.integrations.sqlalchemy.project_summary import refresh_project_summaries
+from cims.integrations.sqlalchemy.headhunter_stats import StatsKey, refresh_headhunter_daily_stats, stats_keys_for_nominees
+from cims.integrations.sqlalchemy.salary_stats import NOMINEE_SALARY_SOURCES, fetch_salary_columns, mark_salary_stats_stale
+from cims.integrations.sqlalchemy.matching import mark_candidates_stale
+from cims.integrations.sqlalchemy.change_events import changed_fields, existing_ids, load_scopes, publish_changes
+import numpy as np
 
-class SQLAlchemyNomineeRepository(NomineeRepository):
+# Nominee columns the project pipeline summaries are computed from
+SUMMARY_COLUMNS = {"status", "project_id"}
+# Nominee columns the headhunter daily stats are computed from
+STATS_COLUMNS = {"status", "candidate_id"}
+
+class SQLAlchemyNomineeRepository(SQLAlchemyBulkMixin, NomineeRepository):
     def __init__(self, db_session: Session) -> None:
         self.db_session = db_session
 
@@ -24,12 +38,99 @@ class SQLAlchemyNomineeRepository(NomineeRepository):
             updated_at=db_obj.updated_at
         )
 
+    def _project_ids_of(self, nominee_ids: list[int]) -> set[int]:
+        rows = self.db_session.query(NomineeDB.project_id).filter(NomineeDB.nominee_id.in_(nominee_ids)).distinct()
+        return {project_id for project_id, in rows}
+
+    def _candidate_ids_of(self, nominee_ids: list[int]) -> set[int]:
+        rows = self.db_session.query(NomineeDB.candidate_id).filter(NomineeDB.nominee_id.in_(nominee_ids)).distinct()
+        return {candidate_id for candidate_id, in rows}
+
     def create_nominee(self, nominee: Nominee) -> Nominee:
         new_nominee = NomineeDB(**nominee.to_dict())
         self.db_session.add(new_nominee)
+        self.db_session.flush()
+        refresh_project_summaries(self.db_session, [new_nominee.project_id])
+        refresh_headhunter_daily_stats(self.db_session, stats_keys_for_nominees(self.db_session, [new_nominee.nominee_id]))
+        mark_salary_stats_stale(self.db_session)
+        mark_candidates_stale(self.db_session, [new_nominee.candidate_id])
+        publish_changes(self.db_session, "nominee", "created", [new_nominee.nominee_id])
         self.db_session.commit()
         self.db_session.refresh(new_nominee)
         return self._to_domain_entity(new_nominee)
+
+    def create_many(self, nominees: list[Nominee], commit: bool = True) -> list[Nominee]:
+        try:
+            created = self._bulk_create(NomineeDB, nominees, self._to_domain_entity, commit=False)
+            refresh_project_summaries(self.db_session, {nominee.project_id for nominee in created})
+            refresh_headhunter_daily_stats(self.db_session, stats_keys_for_nominees(self.db_session, [nominee.nominee_id for nominee in created]))
+            mark_salary_stats_stale(self.db_session)
+            mark_candidates_stale(self.db_session, {nominee.candidate_id for nominee in created})
+            publish_changes(self.db_session, "nominee", "created", [nominee.nominee_id for nominee in created])
+            self._finish(commit)
+        except Exception:
+            if commit:
+                self.db_session.rollback()
+            raise
+        return created
+
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        patched_columns = {column for values in patches.values() for column in values}
+        patched_ids = existing_ids(self.db_session, "nominee", [nominee_id for nominee_id, values in patches.items() if values])
+        if not (SUMMARY_COLUMNS | STATS_COLUMNS | NOMINEE_SALARY_SOURCES) & patched_columns:
+            publish_changes(self.db_session, "nominee", "updated", patched_ids, fields=patches)
+            return self._bulk_update(NomineeDB, patches, commit)
+
+        try:
+            # Nominees moved to another project are announced to the old one too
+            previous_scopes = load_scopes(self.db_session, "nominee", patched_ids) if "project_id" in patched_columns else {}
+            # Nominees moved to another project or candidate leave the old rows stale too
+            project_ids: set[int] = set()
+            stats_keys: set[StatsKey] = set()
+            if SUMMARY_COLUMNS & patched_columns:
+                project_ids = self._project_ids_of(list(patches))
+                project_ids.update(values["project_id"] for values in patches.values() if "project_id" in values)
+            if STATS_COLUMNS & patched_columns:
+                stats_keys = stats_keys_for_nominees(self.db_session, list(patches))
+                # Candidates gaining or losing a nominee outcome are rescored by the matching index
+                candidate_ids = self._candidate_ids_of(list(patches))
+                candidate_ids.update(values["candidate_id"] for values in patches.values() if "candidate_id" in values)
+                mark_candidates_stale(self.db_session, candidate_ids)
+            updated = self._bulk_update(NomineeDB, patches, commit=False)
+            refresh_project_summaries(self.db_session, project_ids)
+            if STATS_COLUMNS & patched_columns:
+                stats_keys |= stats_keys_for_nominees(self.db_session, list(patches))
+                refresh_headhunter_daily_stats(self.db_session, stats_keys)
+            if updated and NOMINEE_SALARY_SOURCES & patched_columns:
+                mark_salary_stats_stale(self.db_session)
+            publish_changes(self.db_session, "nominee", "updated", patched_ids, fields=patches, previous_scopes=previous_scopes)
+            self._finish(commit)
+        except Exception:
+            if commit:
+                self.db_session.rollback()
+            raise
+        return updated
+
+    def delete_many(self, nominee_ids: list[int], commit: bool = True) -> int:
+        if not nominee_ids:
+            return 0
+
+        try:
+            project_ids = self._project_ids_of(nominee_ids)
+            stats_keys = stats_keys_for_nominees(self.db_session, nominee_ids)
+            mark_candidates_stale(self.db_session, self._candidate_ids_of(nominee_ids))
+            publish_changes(self.db_session, "nominee", "deleted", existing_ids(self.db_session, "nominee", nominee_ids))
+            deleted = self._bulk_delete(NomineeDB, nominee_ids, commit=False)
+            refresh_project_summaries(self.db_session, project_ids)
+            refresh_headhunter_daily_stats(self.db_session, stats_keys)
+            if deleted:
+                mark_salary_stats_stale(self.db_session)
+            self._finish(commit)
+        except Exception:
+            if commit:
+                self.db_session.rollback()
+            raise
+        return deleted
     
     def get_nominees_by_ids(self, nominee_ids: list[int]) -> list[Nominee]:
         if not nominee_ids:
@@ -55,9 +156,23 @@ class SQLAlchemyNomineeRepository(NomineeRepository):
         if not db_obj:
             raise NotFoundError(entity="Nominee", identifier=nominee.nominee_id)
         
-        for key, value in nominee.to_dict().items():
+        previous = (db_obj.project_id, db_obj.status, db_obj.candidate_id)
+        stats_keys = stats_keys_for_nominees(self.db_session, [db_obj.nominee_id])
+        values = nominee.to_dict()
+        fields = changed_fields(db_obj, values)
+        previous_scopes = load_scopes(self.db_session, "nominee", [db_obj.nominee_id])
+        for key, value in values.items():
             setattr(db_obj, key, value)
 
+        self.db_session.flush()
+        if previous[:2] != (db_obj.project_id, db_obj.status):
+            refresh_project_summaries(self.db_session, {previous[0], db_obj.project_id})
+        if previous[1:] != (db_obj.status, db_obj.candidate_id):
+            refresh_headhunter_daily_stats(self.db_session, stats_keys | stats_keys_for_nominees(self.db_session, [db_obj.nominee_id]))
+            mark_candidates_stale(self.db_session, {previous[2], db_obj.candidate_id})
+        if NOMINEE_SALARY_SOURCES.intersection(fields):
+            mark_salary_stats_stale(self.db_session)
+        publish_changes(self.db_session, "nominee", "updated", [db_obj.nominee_id], fields={db_obj.nominee_id: fields}, previous_scopes=previous_scopes)
         self.db_session.commit()
         self.db_session.refresh(db_obj)
         return self._to_domain_entity(db_obj)
@@ -70,7 +185,14 @@ class SQLAlchemyNomineeRepository(NomineeRepository):
         if not db_obj:
             raise NotFoundError(entity="Nominee", identifier=nominee_id)
 
+        stats_keys = stats_keys_for_nominees(self.db_session, [nominee_id])
+        publish_changes(self.db_session, "nominee", "deleted", [nominee_id])
         self.db_session.delete(db_obj)
+        self.db_session.flush()
+        refresh_project_summaries(self.db_session, [db_obj.project_id])
+        refresh_headhunter_daily_stats(self.db_session, stats_keys)
+        mark_salary_stats_stale(self.db_session)
+        mark_candidates_stale(self.db_session, [db_obj.candidate_id])
         self.db_session.commit()
         return True
 
@@ -98,6 +220,20 @@ class SQLAlchemyNomineeRepository(NomineeRepository):
         )
         return [self._to_domain_entity(nominee) for nominee in db_nominees]
 
+    def get_nominees_by_project_ids(self, project_ids: list[int]) -> list[Nominee]:
+        if not project_ids:
+            return []
+
+        db_nominees = self.db_session.query(NomineeDB).filter(NomineeDB.project_id.in_(project_ids)).all()
+        return [self._to_domain_entity(nominee) for nominee in db_nominees]
+
+    def get_nominees_by_candidate_ids(self, candidate_ids: list[int]) -> list[Nominee]:
+        if not candidate_ids:
+            return []
+
+        db_nominees = self.db_session.query(NomineeDB).filter(NomineeDB.candidate_id.in_(candidate_ids)).all()
+        return [self._to_domain_entity(nominee) for nominee in db_nominees]
+
     def search_nominees_by_campaign(self, campaign_query: str, limit: int = 100, offset: int = 0) -> list[Nominee]:
         db_nominees = (
             self.db_session.query(NomineeDB)
@@ -118,5 +254,79 @@ class SQLAlchemyNomineeRepository(NomineeRepository):
         )
         return [self._to_domain_entity(nominee) for nominee in db_nominees]
 
+    def iter_nominee_rows(
+        self,
+        status: Optional[str] = None,
+        project_id: Optional[int] = None,
+        candidate_id: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> Iterator[dict[str, Any]]:
+        query = (
+            self.db_session.query(
+                *NomineeDB.__table__.columns,
+                CandidateDB.name.label("nominee_name"),
+                ProjectDB.name.label("project_name"),
+                HeadhunterDB.name.label("headhunter_name"),
+            )
+            .select_from(NomineeDB)
+            .outerjoin(CandidateDB, NomineeDB.candidate_id == CandidateDB.candidate_id)
+            .outerjoin(ProjectDB, NomineeDB.project_id == ProjectDB.project_id)
+            .outerjoin(HeadhunterDB, CandidateDB.headhunter_id == HeadhunterDB.headhunter_id)
+        )
+        if status:
+            query = query.filter(NomineeDB.status == status)
+        if project_id:
+            query = query.filter(NomineeDB.project_id == project_id)
+        if candidate_id:
+            query = query.filter(NomineeDB.candidate_id == candidate_id)
+
+        for row in query.order_by(NomineeDB.nominee_id).yield_per(batch_size):
+            yield row._asdict()
+
+    def count_nominees_by_status(
+        self,
+        project_id: Optional[int] = None,
+        customer_id: Optional[int] = None,
+        campaign: Optional[str] = None,
+        headhunter_id: Optional[int] = None,
+        created_from: Optional[datetime.date] = None,
+        created_to: Optional[datetime.date] = None
+    ) -> dict[str, int]:
+        query = self.db_session.query(NomineeDB.status, func.count()).select_from(NomineeDB)
+        # Join only for the filters that need it so the unfiltered funnel stays a single-table scan
+        if customer_id:
+            query = query.join(ProjectDB, NomineeDB.project_id == ProjectDB.project_id).filter(ProjectDB.customer_id == customer_id)
+        if headhunter_id:
+            query = query.join(CandidateDB, NomineeDB.candidate_id == CandidateDB.candidate_id).filter(CandidateDB.headhunter_id == headhunter_id)
+        if project_id:
+            query = query.filter(NomineeDB.project_id == project_id)
+        if campaign:
+            query = query.filter(NomineeDB.campaign == campaign)
+        if created_from:
+            query = query.filter(NomineeDB.created_at >= datetime.datetime.combine(created_from, datetime.time.min, datetime.timezone.utc))
+        if created_to:
+            query = query.filter(NomineeDB.created_at < datetime.datetime.combine(created_to + datetime.timedelta(days=1), datetime.time.min, datetime.timezone.utc))
+
+        return {status: count for status, count in query.group_by(NomineeDB.status).all()}
+
+    def get_salary_columns(
+        self,
+        expertise_id: Optional[int] = None,
+        level_id: Optional[int] = None,
+        area_id: Optional[int] = None,
+        status: Optional[str] = None
+    ) -> dict[str, np.ndarray]:
+        return fetch_salary_columns(self.db_session, expertise_id=expertise_id, level_id=level_id, area_id=area_id, status=status)
+
     def count_all_nominees(self) -> int:
-        return self.db_session.query(NomineeDB).count()
\ No newline at end of file
+        return self.db_session.query(NomineeDB).count()
+
+    def get_nominee_rows(self, fields: list[str], status: Optional[str] = None, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
+        table_columns = NomineeDB.__table__.columns
+        columns = [table_columns[column_name] for column_name in fields if column_name in table_columns] or [NomineeDB.nominee_id]
+
+        query = self.db_session.query(*columns)
+        if status:
+            query = query.filter(NomineeDB.status == status)
+
+        return [row._asdict() for row in query.offset(offset).limit(limit).all()]
\ No newline at end of file
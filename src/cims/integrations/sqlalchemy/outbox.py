@@ -0,0 +1,269 @@
+"""
+Transactional outbox: follow-up work recorded in a write's transaction and run by a worker after it commits.
+
+A write that wants work done off the request path calls ``enqueue_outbox`` in
+its transaction, so the message exists exactly when the write does. The worker
+(``drain_outbox``, run by ``OutboxWorker`` or ``python -m cims.worker``) claims
+a batch of due messages under a lease and hands all the batch's payloads of a
+topic to that topic's handler at once, so e.g. many nominee writes to one
+project cost one summary refresh. Messages are marked processed in the
+handler's own transaction: work done in the database happens exactly once, and
+a worker dying before its commit leaves the messages to be claimed again when
+the lease expires. A failing batch is retried message by message with
+exponential backoff and a message is given up on after ``OUTBOX_MAX_ATTEMPTS``.
+Handlers with effects outside the database get each message's key to
+deduplicate on.
+"""
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Optional
+import asyncio
+import datetime
+import json
+import os
+import socket
+import uuid
+
+from cims.config import CLogger, settings
+from cims.database.models import OutboxMessageDB
+from cims.metrics import OUTBOX_HANDLER_DURATION, OUTBOX_MESSAGES
+
+logger = CLogger(__name__).get_logger()
+
+class OutboxMessage:
+    """A claimed message as handed to its topic's handler."""
+    __slots__ = ("message_id", "topic", "message_key", "payload", "attempts")
+
+    def __init__(self, message_id: int, topic: str, message_key: str, payload: dict[str, Any], attempts: int) -> None:
+        self.message_id = message_id
+        self.topic = topic
+        self.message_key = message_key
+        self.payload = payload
+        self.attempts = attempts
+
+OutboxHandler = Callable[[Session, list[OutboxMessage]], None]
+
+_HANDLERS: dict[str, OutboxHandler] = {}
+
+def outbox_handler(topic: str) -> Callable[[OutboxHandler], OutboxHandler]:
+    """
+    Register the function handling a topic's messages.
+
+    The handler runs in the session's transaction, which commits together with
+    the messages being marked processed; it must not commit itself.
+    """
+    def register(handler: OutboxHandler) -> OutboxHandler:
+        _HANDLERS[topic] = handler
+        return handler
+    return register
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+def outbox_worker_enabled() -> bool:
+    """
+    Whether the API processes drain the outbox.
+
+    By default only when writes defer their refreshes to it; set
+    ``OUTBOX_WORKER_ENABLED`` to drain messages left from an earlier mode.
+    """
+    if settings.OUTBOX_WORKER_ENABLED is not None:
+        return settings.OUTBOX_WORKER_ENABLED
+    return settings.AGGREGATE_REFRESH_MODE == "outbox"
+
+def enqueue_outbox(db_session: Session, topic: str, payload: dict[str, Any], message_key: Optional[str] = None) -> None:
+    """
+    Record a message in the session's current transaction.
+
+    :param Session db_session: The session whose write the message belongs to.
+    :param str topic: Selects the handler.
+    :param dict payload: JSON-serializable data for the handler.
+    :param str message_key: Unique key handlers can deduplicate external effects on; random when None.
+    """
+    now = _now()
+    db_session.execute(insert(OutboxMessageDB.__table__).values(
+        topic=topic,
+        message_key=message_key or uuid.uuid4().hex,
+        payload=json.dumps(payload),
+        attempts=0,
+        available_at=now,
+        created_at=now,
+    ))
+
+def retry_delay(attempts: int) -> float:
+    """Seconds to wait before retrying a message that has failed this many times."""
+    return min(settings.OUTBOX_RETRY_MAX_SECONDS, settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0))
+
+def default_worker_id() -> str:
+    # Host names are cut short to fit the locked_by column
+    return f"{socket.gethostname()[:40]}:{os.getpid()}"
+
+def _claim(db_session: Session, worker_id: str, batch_size: int, lease_seconds: float) -> list[OutboxMessage]:
+    """Lease due messages to this worker and commit, so other workers skip them."""
+    table = OutboxMessageDB.__table__
+    now = _now()
+    due = (
+        table.c.processed_at.is_(None),
+        table.c.failed_at.is_(None),
+        table.c.available_at <= now,
+        or_(table.c.locked_until.is_(None), table.c.locked_until < now),
+    )
+    candidates = select(table.c.message_id).where(*due).order_by(table.c.message_id).limit(batch_size)
+    if db_session.get_bind().dialect.name == "postgresql":
+        candidates = candidates.with_for_update(skip_locked=True)
+    message_ids = list(db_session.scalars(candidates))
+    if not message_ids:
+        db_session.commit()
+        return []
+
+    locked_until = now + datetime.timedelta(seconds=lease_seconds)
+    # The due conditions are checked again, so a message claimed meanwhile by another worker is left to it
+    db_session.execute(
+        update(table)
+        .where(table.c.message_id.in_(message_ids), *due)
+        .values(locked_by=worker_id, locked_until=locked_until)
+    )
+    rows = db_session.execute(
+        select(table.c.message_id, table.c.topic, table.c.message_key, table.c.payload, table.c.attempts)
+        .where(table.c.message_id.in_(message_ids), table.c.locked_by == worker_id, table.c.locked_until == locked_until)
+        .order_by(table.c.message_id)
+    ).all()
+    db_session.commit()
+    return [
+        OutboxMessage(message_id, topic, message_key, json.loads(payload), attempts)
+        for message_id, topic, message_key, payload, attempts in rows
+    ]
+
+def _handle(db_session: Session, worker_id: str, topic: str, messages: list[OutboxMessage]) -> bool:
+    """Run the handler and mark the messages processed in one transaction; False when it failed."""
+    table = OutboxMessageDB.__table__
+    message_ids = [message.message_id for message in messages]
+    try:
+        handler = _HANDLERS.get(topic)
+        if handler is None:
+            raise LookupError(f"No outbox handler for topic {topic!r}")
+        with OUTBOX_HANDLER_DURATION.time(topic=topic):
+            handler(db_session, messages)
+        marked = db_session.execute(
+            update(table)
+            .where(table.c.message_id.in_(message_ids), table.c.locked_by == worker_id, table.c.processed_at.is_(None))
+            .values(processed_at=_now(), locked_until=None, last_error=None)
+        ).rowcount
+        if marked != len(messages):
+            # The lease ran out and another worker took over; its run is the one that counts
+            db_session.rollback()
+            OUTBOX_MESSAGES.inc(len(messages), topic=topic, outcome="lease_lost")
+            return True
+        db_session.commit()
+        OUTBOX_MESSAGES.inc(len(messages), topic=topic, outcome="processed")
+        return True
+    except Exception as e:
+        db_session.rollback()
+        if len(messages) == 1:
+            _fail(db_session, worker_id, messages[0], e)
+        return False
+
+def _fail(db_session: Session, worker_id: str, message: OutboxMessage, error: Exception) -> None:
+    table = OutboxMessageDB.__table__
+    attempts = message.attempts + 1
+    now = _now()
+    gave_up = attempts >= settings.OUTBOX_MAX_ATTEMPTS
+    db_session.execute(
+        update(table)
+        .where(table.c.message_id == message.message_id, table.c.locked_by == worker_id)
+        .values(
+            attempts=attempts,
+            last_error=f"{type(error).__name__}: {error}"[:2000],
+            locked_until=None,
+            available_at=now + datetime.timedelta(seconds=retry_delay(attempts)),
+            failed_at=now if gave_up else None,
+        )
+    )
+    db_session.commit()
+    OUTBOX_MESSAGES.inc(topic=message.topic, outcome="failed" if gave_up else "retried")
+    log = logger.error if gave_up else logger.warning
+    log(f"Outbox message {message.message_id} ({message.topic}) failed on attempt {attempts}: {error}")
+
+def drain_outbox(
+    db_session: Session,
+    worker_id: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    lease_seconds: Optional[float] = None
+) -> int:
+    """
+    Claim one batch of due messages and run their handlers.
+
+    :param Session db_session: A session of its own; the drain commits and rolls it back.
+    :param str worker_id: Identifies the leases of this worker; host and process ID when None.
+    :param int batch_size: Messages claimed at once; defaults to ``OUTBOX_BATCH_SIZE``.
+    :param float lease_seconds: How long the claim lasts; defaults to ``OUTBOX_LEASE_SECONDS``.
+    :return: The number of messages claimed, 0 when none were due.
+    :rtype: int
+    """
+    worker_id = worker_id or default_worker_id()
+    messages = _claim(
+        db_session,
+        worker_id,
+        batch_size or settings.OUTBOX_BATCH_SIZE,
+        settings.OUTBOX_LEASE_SECONDS if lease_seconds is None else lease_seconds
+    )
+
+    by_topic: dict[str, list[OutboxMessage]] = {}
+    for message in messages:
+        by_topic.setdefault(message.topic, []).append(message)
+    for topic, topic_messages in by_topic.items():
+        # A failing batch is retried message by message so one bad message does not hold back the rest
+        if not _handle(db_session, worker_id, topic, topic_messages) and len(topic_messages) > 1:
+            for message in topic_messages:
+                _handle(db_session, worker_id, topic, [message])
+    return len(messages)
+
+def purge_outbox(db_session: Session, retention_hours: Optional[float] = None) -> int:
+    """Delete messages processed longer ago than the retention; failed messages are kept for inspection."""
+    hours = settings.OUTBOX_RETENTION_HOURS if retention_hours is None else retention_hours
+    table = OutboxMessageDB.__table__
+    deleted = db_session.execute(
+        delete(table).where(table.c.processed_at < _now() - datetime.timedelta(hours=hours))
+    ).rowcount
+    db_session.commit()
+    return deleted
+
+class OutboxWorker:
+    """
+    Drains the outbox in a loop on a thread, so the event loop never waits on the database.
+
+    Batches follow each other without pause while messages are due; an empty
+    outbox is polled every ``OUTBOX_POLL_SECONDS``. Processed messages are
+    purged by the ``outbox_purge`` job of the scheduler.
+    """
+    def __init__(self, session_factory: Callable[[], Session], worker_id: Optional[str] = None, poll_seconds: Optional[float] = None) -> None:
+        self.session_factory = session_factory
+        self.worker_id = worker_id or default_worker_id()
+        self.poll_seconds = settings.OUTBOX_POLL_SECONDS if poll_seconds is None else poll_seconds
+        self._stopping = asyncio.Event()
+
+    def run_once(self) -> int:
+        """Drain one batch; returns the number of messages claimed."""
+        db_session = self.session_factory()
+        try:
+            return drain_outbox(db_session, self.worker_id)
+        finally:
+            db_session.close()
+
+    async def run(self) -> None:
+        logger.info(f"Outbox worker {self.worker_id} started")
+        while not self._stopping.is_set():
+            try:
+                claimed = await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                logger.error(f"Outbox worker {self.worker_id} failed to drain: {e}")
+                claimed = 0
+            if not claimed:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+        logger.info(f"Outbox worker {self.worker_id} stopped")
+
+    def stop(self) -> None:
+        self._stopping.set()
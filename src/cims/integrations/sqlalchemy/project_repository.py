@@ -1,11 +1,16 @@
 from cims.core.entities.project import Project
-from cims.core.repositories.project_repository import ProjectRepository
+from cims.core.repositories.project_repository import ProjectRepository, ProjectSort
 from cims.core.exceptions import NotFoundError
-from cims.database.models import CustomerDB, ExpertiseDB, ProjectDB
+from cims.database.models import CustomerDB, ExpertiseDB, AreaDB, LevelDB, ProjectDB, ProjectPipelineSummaryDB
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Any, Iterator
+from cims.integrations.sqlalchemy.bulk import SQLAlchemyBulkMixin
+from cims.integrations.sqlalchemy.project_summary import apply_project_sort, fill_rate_expression, refresh_project_summaries
+from cims.integrations.sqlalchemy.salary_stats import PROJECT_SALARY_SOURCES, mark_salary_stats_stale
+from cims.integrations.sqlalchemy.change_events import changed_fields, existing_ids, load_scopes, publish_changes
 
-class SQLAlchemyProjectRepository(ProjectRepository):
+class SQLAlchemyProjectRepository(SQLAlchemyBulkMixin, ProjectRepository):
     def __init__(self, db_session: Session) -> None:
         self.db_session = db_session
 
@@ -34,9 +39,54 @@ class SQLAlchemyProjectRepository(ProjectRepository):
     def create_project(self, project: Project) -> Project:
         new_project = ProjectDB(**project.to_dict())
         self.db_session.add(new_project)
+        self.db_session.flush()
+        publish_changes(self.db_session, "project", "created", [new_project.project_id])
         self.db_session.commit()
         self.db_session.refresh(new_project)
         return self._to_domain_entity(new_project)
+
+    def create_many(self, projects: list[Project], commit: bool = True) -> list[Project]:
+        try:
+            created = self._bulk_create(ProjectDB, projects, self._to_domain_entity, commit=False)
+            publish_changes(self.db_session, "project", "created", [project.project_id for project in created])
+            self._finish(commit)
+        except Exception:
+            if commit:
+                self.db_session.rollback()
+            raise
+        return created
+
+    def update_many(self, patches: dict[int, dict[str, Any]], commit: bool = True) -> int:
+        # A new recruitment target can fill or unfill a project
+        retargeted = [project_id for project_id, values in patches.items() if "required_recruits" in values]
+        # Projects handed to another customer are announced to the old one too
+        moved = [project_id for project_id, values in patches.items() if "customer_id" in values]
+        try:
+            patched_ids = existing_ids(self.db_session, "project", [project_id for project_id, values in patches.items() if values])
+            previous_scopes = load_scopes(self.db_session, "project", moved)
+            updated = self._bulk_update(ProjectDB, patches, commit=False)
+            refresh_project_summaries(self.db_session, retargeted)
+            # Nominee salaries are grouped by their project's expertise, level and area
+            if updated and any(PROJECT_SALARY_SOURCES.intersection(values) for values in patches.values()):
+                mark_salary_stats_stale(self.db_session)
+            publish_changes(self.db_session, "project", "updated", patched_ids, fields=patches, previous_scopes=previous_scopes)
+            self._finish(commit)
+        except Exception:
+            if commit:
+                self.db_session.rollback()
+            raise
+        return updated
+
+    def delete_many(self, project_ids: list[int], commit: bool = True) -> int:
+        try:
+            publish_changes(self.db_session, "project", "deleted", existing_ids(self.db_session, "project", project_ids))
+            deleted = self._bulk_delete(ProjectDB, project_ids, commit=False)
+            self._finish(commit)
+        except Exception:
+            if commit:
+                self.db_session.rollback()
+            raise
+        return deleted
     
     def get_projects_by_ids(self, project_ids: list[int]) -> list[Project]:
         if not project_ids:
@@ -62,9 +112,19 @@ class SQLAlchemyProjectRepository(ProjectRepository):
         if not db_obj:
             raise NotFoundError(entity="Project", identifier=project.project_id)
         
-        for key, value in project.to_dict().items():
+        retargeted = db_obj.required_recruits != project.required_recruits
+        values = project.to_dict()
+        fields = changed_fields(db_obj, values)
+        previous_scopes = load_scopes(self.db_session, "project", [db_obj.project_id])
+        for key, value in values.items():
             setattr(db_obj, key, value)
 
+        self.db_session.flush()
+        if retargeted:
+            refresh_project_summaries(self.db_session, [project.project_id])
+        if PROJECT_SALARY_SOURCES.intersection(fields):
+            mark_salary_stats_stale(self.db_session)
+        publish_changes(self.db_session, "project", "updated", [db_obj.project_id], fields={db_obj.project_id: fields}, previous_scopes=previous_scopes)
         self.db_session.commit()
         self.db_session.refresh(db_obj)
         return self._to_domain_entity(db_obj)
@@ -77,18 +137,19 @@ class SQLAlchemyProjectRepository(ProjectRepository):
         if not db_obj:
             raise NotFoundError(entity="Project", identifier=project_id)
 
+        publish_changes(self.db_session, "project", "deleted", [project_id])
         self.db_session.delete(db_obj)
         self.db_session.commit()
         return True
 
-    def get_all_projects(self, limit: int = 100, offset: int = 0) -> list[Project]:
-        db_projects = (
-            self.db_session.query(ProjectDB)
-            .order_by(ProjectDB.updated_at.desc(), ProjectDB.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
-        )
+    def get_all_projects(self, limit: int = 100, offset: int = 0, sort: Optional[ProjectSort] = None) -> list[Project]:
+        db_query = self.db_session.query(ProjectDB)
+        if sort:
+            db_query = apply_project_sort(db_query, sort)
+        else:
+            db_query = db_query.order_by(ProjectDB.updated_at.desc(), ProjectDB.created_at.desc())
+
+        db_projects = db_query.offset(offset).limit(limit).all()
         return [self._to_domain_entity(project) for project in db_projects]
 
     def search_projects_by_name(self, name_query: str, limit: int = 100, offset: int = 0) -> list[Project]:
@@ -123,6 +184,118 @@ class SQLAlchemyProjectRepository(ProjectRepository):
         )
         return [self._to_domain_entity(project) for project in db_projects]
 
+    def get_project_rows(
+        self,
+        fields: list[str],
+        query: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        sort: Optional[ProjectSort] = None
+    ) -> list[dict[str, Any]]:
+        """Retrieve only the requested project columns, optionally filtered by a comprehensive search query."""
+        table_columns = ProjectDB.__table__.columns
+        columns = [table_columns[column_name] for column_name in fields if column_name in table_columns] or [ProjectDB.project_id]
+
+        db_query = self.db_session.query(*columns).select_from(ProjectDB)
+        if query:
+            db_query = (
+                db_query
+                .join(CustomerDB, ProjectDB.customer_id == CustomerDB.customer_id)
+                .join(ExpertiseDB, ProjectDB.expertise_id == ExpertiseDB.expertise_id)
+                .filter(
+                    ProjectDB.name.ilike(f"%{query}%") |
+                    CustomerDB.name.ilike(f"%{query}%") |
+                    ExpertiseDB.name.ilike(f"%{query}%")
+                )
+            )
+
+        if sort:
+            db_query = apply_project_sort(db_query, sort)
+        else:
+            db_query = db_query.order_by(ProjectDB.updated_at.desc(), ProjectDB.created_at.desc())
+
+        rows = db_query.offset(offset).limit(limit).all()
+        return [row._asdict() for row in rows]
+
+    def get_pipeline_summaries(
+        self,
+        sort: Optional[ProjectSort] = None,
+        customer_id: Optional[int] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> list[dict[str, Any]]:
+        summary = ProjectPipelineSummaryDB
+        db_query = (
+            self.db_session.query(
+                ProjectDB.project_id,
+                ProjectDB.name,
+                ProjectDB.customer_id,
+                ProjectDB.status,
+                ProjectDB.start_date,
+                ProjectDB.end_date,
+                ProjectDB.required_recruits,
+                ProjectDB.recruited,
+                fill_rate_expression().label("fill_rate"),
+                func.coalesce(summary.total_nominees, 0).label("total_nominees"),
+                func.coalesce(summary.active_nominees, 0).label("active_nominees"),
+                func.coalesce(summary.hired, 0).label("hired"),
+                func.coalesce(summary.rejected, 0).label("rejected"),
+                summary.last_nominated_at,
+                summary.filled_at,
+            )
+            .select_from(ProjectDB)
+            .outerjoin(summary, summary.project_id == ProjectDB.project_id)
+        )
+        if customer_id:
+            db_query = db_query.filter(ProjectDB.customer_id == customer_id)
+        # The summary is already joined for the select list, so sort on it directly
+        db_query = apply_project_sort(db_query, sort, summary_joined=True) if sort else db_query.order_by(ProjectDB.project_id)
+
+        rows = []
+        for row in db_query.offset(offset).limit(limit).all():
+            data = row._asdict()
+            data["remaining_recruits"] = max(data["required_recruits"] - data["recruited"], 0)
+            data["time_to_fill_days"] = (data["filled_at"].date() - data["start_date"]).days if data["filled_at"] else None
+            rows.append(data)
+        return rows
+
+    def refresh_pipeline_summaries(self, project_ids: Optional[list[int]] = None, commit: bool = True) -> None:
+        try:
+            refresh_project_summaries(self.db_session, project_ids)
+            self._finish(commit)
+        except Exception:
+            if commit:
+                self.db_session.rollback()
+            raise
+
+    def iter_project_rows(self, query: Optional[str] = None, customer_id: Optional[int] = None, batch_size: int = 1000) -> Iterator[dict[str, Any]]:
+        """Stream projects with their reference names through a server-side cursor."""
+        db_query = (
+            self.db_session.query(
+                *ProjectDB.__table__.columns,
+                CustomerDB.name.label("customer_name"),
+                ExpertiseDB.name.label("expertise_name"),
+                AreaDB.name.label("area_name"),
+                LevelDB.name.label("level_name"),
+            )
+            .select_from(ProjectDB)
+            .outerjoin(CustomerDB, ProjectDB.customer_id == CustomerDB.customer_id)
+            .outerjoin(ExpertiseDB, ProjectDB.expertise_id == ExpertiseDB.expertise_id)
+            .outerjoin(AreaDB, ProjectDB.area_id == AreaDB.area_id)
+            .outerjoin(LevelDB, ProjectDB.level_id == LevelDB.level_id)
+        )
+        if query:
+            db_query = db_query.filter(
+                ProjectDB.name.ilike(f"%{query}%") |
+                CustomerDB.name.ilike(f"%{query}%") |
+                ExpertiseDB.name.ilike(f"%{query}%")
+            )
+        if customer_id:
+            db_query = db_query.filter(ProjectDB.customer_id == customer_id)
+
+        for row in db_query.order_by(ProjectDB.project_id).yield_per(batch_size):
+            yield row._asdict()
+
     def count_all_projects(self) -> int:
         """Count the total number of projects."""
         return self.db_session.query(ProjectDB).count()
@@ -0,0 +1,134 @@
+"""
+Maintenance of the per-project pipeline summaries and the project sort keys built on them.
+"""
+from sqlalchemy import Float, DateTime, Select, and_, case, cast, delete, func, insert, literal, null, select, true
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Query, Session
+from typing import Any, Iterable, Optional, TypeVar
+import datetime
+
+from cims.config import settings
+from cims.core.entities.nominee import NOMINEE_FUNNEL_STAGES, NOMINEE_REJECTED_STATUS
+from cims.core.repositories.project_repository import ProjectSort
+from cims.database.models import NomineeDB, ProjectDB, ProjectPipelineSummaryDB
+from cims.integrations.sqlalchemy.outbox import OutboxMessage, enqueue_outbox, outbox_handler
+
+QueryT = TypeVar("QueryT", Query[Any], Select[Any])
+
+HIRED_STATUS = NOMINEE_FUNNEL_STAGES[-1]
+ACTIVE_STATUSES = NOMINEE_FUNNEL_STAGES[:-1]
+
+REFRESH_TOPIC = "project_summaries.refresh"
+
+SUMMARY_COLUMNS = ("project_id", "total_nominees", "active_nominees", "hired", "rejected", "last_nominated_at", "filled_at", "refreshed_at")
+
+def _summary_source(project_ids: Optional[list[int]], now: datetime.datetime) -> Select[Any]:
+    """Aggregate the nominees of the given projects into summary rows, zero rows included."""
+    hired = func.count(case((NomineeDB.status == HIRED_STATUS, 1)))
+    timestamp = literal(now, DateTime(timezone=True))
+    return (
+        select(
+            ProjectDB.project_id,
+            func.count(NomineeDB.nominee_id),
+            func.count(case((NomineeDB.status.in_(ACTIVE_STATUSES), 1))),
+            hired,
+            func.count(case((NomineeDB.status == NOMINEE_REJECTED_STATUS, 1))),
+            func.max(NomineeDB.created_at),
+            case((and_(ProjectDB.required_recruits > 0, hired >= ProjectDB.required_recruits), timestamp), else_=null()),
+            timestamp,
+        )
+        .select_from(ProjectDB)
+        .outerjoin(NomineeDB, NomineeDB.project_id == ProjectDB.project_id)
+        # An explicit WHERE also keeps SQLite from parsing ON CONFLICT as part of the join
+        .where(ProjectDB.project_id.in_(project_ids) if project_ids is not None else true())
+        .group_by(ProjectDB.project_id, ProjectDB.required_recruits)
+    )
+
+def refresh_project_summaries(
+    db_session: Session,
+    project_ids: Optional[Iterable[int]] = None,
+    defer: Optional[bool] = None
+) -> None:
+    """
+    Recompute the pipeline summaries of the given projects, or of every project.
+
+    The counts are aggregated and upserted with a single ``INSERT ... SELECT``
+    in the session's current transaction, so they commit or roll back together
+    with the nominee writes that triggered them. ``filled_at`` keeps the time a
+    project first had as many hired nominees as required recruits.
+
+    With ``AGGREGATE_REFRESH_MODE`` set to ``"outbox"`` the refresh of given
+    projects is instead recorded in the outbox in the same transaction and run
+    by the outbox worker shortly after the commit.
+
+    :param Session db_session: The session whose transaction the refresh joins.
+    :param Iterable[int] project_ids: The projects to refresh; all projects when None.
+    :param bool defer: Whether to leave the refresh to the outbox worker; follows ``AGGREGATE_REFRESH_MODE`` when None.
+    """
+    ids = sorted({project_id for project_id in project_ids if project_id}) if project_ids is not None else None
+    if ids == []:
+        return
+    if defer is None:
+        defer = settings.AGGREGATE_REFRESH_MODE == "outbox"
+    if defer and ids is not None:
+        enqueue_outbox(db_session, REFRESH_TOPIC, {"project_ids": ids})
+        return
+
+    table = ProjectPipelineSummaryDB.__table__
+    source = _summary_source(ids, datetime.datetime.now(datetime.timezone.utc))
+    dialect = db_session.get_bind().dialect.name
+
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = dialect_insert(table).from_select(SUMMARY_COLUMNS, source)
+        excluded = statement.excluded
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.project_id],
+            set_={
+                **{column: excluded[column] for column in SUMMARY_COLUMNS if column not in ("project_id", "filled_at")},
+                "filled_at": case((excluded.filled_at.is_(None), null()), else_=func.coalesce(table.c.filled_at, excluded.filled_at)),
+            },
+        )
+        db_session.execute(statement)
+        return
+
+    # Other dialects: replace the rows; filled_at restarts from the refresh time
+    scope = table.c.project_id.in_(ids) if ids is not None else true()
+    db_session.execute(delete(table).where(scope))
+    db_session.execute(insert(table).from_select(SUMMARY_COLUMNS, source))
+
+@outbox_handler(REFRESH_TOPIC)
+def _refresh_deferred_summaries(db_session: Session, messages: list[OutboxMessage]) -> None:
+    """Refresh the projects of a batch of deferred refreshes at once."""
+    refresh_project_summaries(
+        db_session,
+        {project_id for message in messages for project_id in message.payload["project_ids"]},
+        defer=False
+    )
+
+def fill_rate_expression() -> Any:
+    """Share of the required recruits already recruited; NULL when nothing is required."""
+    return cast(ProjectDB.recruited, Float) / func.nullif(ProjectDB.required_recruits, 0)
+
+def apply_project_sort(query: QueryT, sort: Optional[ProjectSort], summary_joined: bool = False) -> QueryT:
+    """
+    Order a query over projects by one of the pipeline sort keys.
+
+    The summary table is outer-joined only when the key needs it and the query
+    does not join it already. Ties are broken by project ID so pagination is stable.
+    """
+    if sort is None:
+        return query
+
+    summary = ProjectPipelineSummaryDB
+    if not summary_joined and sort in ("most_active", "least_active", "recently_nominated"):
+        query = query.outerjoin(summary, summary.project_id == ProjectDB.project_id)
+
+    order_by = {
+        "most_behind": (ProjectDB.required_recruits - ProjectDB.recruited).desc(),
+        "lowest_fill_rate": fill_rate_expression().asc().nulls_last(),
+        "most_active": func.coalesce(summary.active_nominees, 0).desc(),
+        "least_active": func.coalesce(summary.active_nominees, 0).asc(),
+        "recently_nominated": summary.last_nominated_at.desc().nulls_last(),
+    }[sort]
+    return query.order_by(order_by, ProjectDB.project_id)
@@ -0,0 +1,63 @@
+"""
+Columnar fetch of nominee salary data and invalidation of the salary statistics cache.
+"""
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import Optional
+
+import numpy as np
+
+from cims.core.salary_stats import salary_stats_cache
+from cims.database.models import NomineeDB, ProjectDB
+from cims.integrations.sqlalchemy.after_commit import run_after_commit
+
+SALARY_COLUMNS = ("salary_expectation", "years_of_experience", "expertise_id", "level_id", "area_id")
+SALARY_DTYPE = np.dtype([("salary_expectation", np.float64), *[(name, np.int64) for name in SALARY_COLUMNS[1:]]])
+# Nominee and project columns the statistics are computed from; writes to others leave the cache valid
+NOMINEE_SALARY_SOURCES = {"salary_expectation", "years_of_experience", "status", "project_id"}
+PROJECT_SALARY_SOURCES = {"expertise_id", "level_id", "area_id"}
+# Rows are converted to arrays per batch so only one batch of row objects is alive at a time
+FETCH_BATCH_SIZE = 50_000
+
+def fetch_salary_columns(
+    db_session: Session,
+    expertise_id: Optional[int] = None,
+    level_id: Optional[int] = None,
+    area_id: Optional[int] = None,
+    status: Optional[str] = None
+) -> dict[str, np.ndarray]:
+    """
+    Select the salary columns of the matching nominees as one array per column.
+
+    Expertise, level and area are those of the nominee's project, the position
+    the salary was asked for.
+    """
+    statement = (
+        select(
+            NomineeDB.salary_expectation,
+            NomineeDB.years_of_experience,
+            ProjectDB.expertise_id,
+            ProjectDB.level_id,
+            ProjectDB.area_id,
+        )
+        .select_from(NomineeDB)
+        .join(ProjectDB, NomineeDB.project_id == ProjectDB.project_id)
+    )
+    if expertise_id:
+        statement = statement.where(ProjectDB.expertise_id == expertise_id)
+    if level_id:
+        statement = statement.where(ProjectDB.level_id == level_id)
+    if area_id:
+        statement = statement.where(ProjectDB.area_id == area_id)
+    if status:
+        statement = statement.where(NomineeDB.status == status)
+
+    result = db_session.execute(statement.execution_options(yield_per=FETCH_BATCH_SIZE))
+    # np.array on Row objects takes a slow generic path; plain tuples fill a record array directly
+    chunks = [np.fromiter(map(tuple, rows), dtype=SALARY_DTYPE, count=len(rows)) for rows in result.partitions()]
+    records = np.concatenate(chunks) if chunks else np.empty(0, dtype=SALARY_DTYPE)
+    return {name: np.ascontiguousarray(records[name]) for name in SALARY_COLUMNS}
+
+def mark_salary_stats_stale(db_session: Session) -> None:
+    """Drop cached salary statistics once the session's current transaction commits."""
+    run_after_commit(db_session, salary_stats_cache.invalidate, key="salary_stats")
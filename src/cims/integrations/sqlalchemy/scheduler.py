@@ -0,0 +1,248 @@
+"""
+Periodic jobs with jitter, one runner across processes and per-job timing metrics.
+
+Every API process (and ``python -m cims.worker``) runs a ``JobScheduler``.
+Jobs that maintain shared state, e.g. rebuilding aggregate tables, are
+exclusive: a run takes the job's lock, a Postgres advisory lock or a file lock
+on other databases, and checks the job's ``scheduled_jobs`` row, so it is
+skipped when another process holds the lock or ran the job less than an
+interval ago. The job then runs once per interval however many processes
+schedule it, and a process that skipped aligns its next attempt with the run
+it found. Jobs warming per-process state, like the in-memory search indexes,
+are not exclusive and run in every process.
+
+Run times are spread by ``SCHEDULER_JITTER`` of the interval, so processes
+started together do not all reach for the lock, and the database, at once.
+"""
+from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager, contextmanager
+from sqlalchemy import Engine, text
+from sqlalchemy.orm import Session
+from typing import Callable, Iterator, Optional
+import asyncio
+import datetime
+import hashlib
+import os
+import random
+import socket
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+from cims.config import CLogger, settings
+from cims.database.models import ScheduledJobDB
+from cims.metrics import JOB_DURATION, JOB_LAST_SUCCESS, JOB_RUNS
+
+logger = CLogger(__name__).get_logger()
+
+JobFunction = Callable[[Session], None]
+
+class ScheduledJob:
+    """A function run every ``interval_seconds`` with a session of its own."""
+    __slots__ = ("name", "interval_seconds", "run", "exclusive")
+
+    def __init__(self, name: str, interval_seconds: float, run: JobFunction, exclusive: bool = True) -> None:
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.run = run
+        self.exclusive = exclusive
+
+def advisory_lock_key(name: str) -> int:
+    """A stable signed 64-bit key for a job name, as taken by ``pg_try_advisory_lock``."""
+    return int.from_bytes(hashlib.blake2b(f"cims.job.{name}".encode(), digest_size=8).digest(), "big", signed=True)
+
+class JobLock(ABC):
+    """Lets one process at a time run a job."""
+
+    @abstractmethod
+    def hold(self, name: str) -> AbstractContextManager[bool]:
+        """Try to take the job's lock without waiting; a context manager yielding whether it was taken."""
+        pass
+
+class AdvisoryJobLock(JobLock):
+    """Postgres session-level advisory lock, held on a connection of its own while the job runs."""
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+
+    @contextmanager
+    def hold(self, name: str) -> Iterator[bool]:
+        key = advisory_lock_key(name)
+        with self.engine.connect() as connection:
+            acquired = bool(connection.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}))
+            connection.commit()
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                    connection.commit()
+
+class FileJobLock(JobLock):
+    """
+    ``flock`` on a file per job, for SQLite and other databases without advisory locks.
+
+    Only excludes processes on the same host, which is where SQLite's other
+    users are; without ``fcntl`` it excludes nothing.
+    """
+
+    def __init__(self, directory: str, prefix: str = "cims") -> None:
+        self.directory = directory
+        self.prefix = prefix
+
+    @contextmanager
+    def hold(self, name: str) -> Iterator[bool]:
+        if fcntl is None:
+            yield True
+            return
+        with open(os.path.join(self.directory, f"{self.prefix}-job-{name}.lock"), "a") as lock_file:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                acquired = False
+            else:
+                acquired = True
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+def job_lock_for(engine: Engine) -> JobLock:
+    """An advisory lock on Postgres, otherwise a file lock named after the database."""
+    if engine.dialect.name == "postgresql":
+        return AdvisoryJobLock(engine)
+    database = hashlib.blake2b(str(engine.url).encode(), digest_size=4).hexdigest()
+    return FileJobLock(settings.SCHEDULER_LOCK_DIR or tempfile.gettempdir(), prefix=f"cims-{database}")
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+def _as_utc(value: datetime.datetime) -> datetime.datetime:
+    # SQLite hands back naive timestamps
+    return value if value.tzinfo else value.replace(tzinfo=datetime.timezone.utc)
+
+class JobScheduler:
+    """
+    Runs its jobs one after another on a thread, each when due.
+
+    :param session_factory: Creates the sessions jobs and their bookkeeping run in.
+    :param Engine engine: The database the locks are taken for.
+    :param list[ScheduledJob] jobs: The jobs to run; those with an interval of 0 or less are left out.
+    :param JobLock lock: Overrides the lock chosen for the engine.
+    :param str runner_id: Recorded with the runs of this scheduler.
+    :param float jitter: Overrides ``SCHEDULER_JITTER``.
+    """
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        engine: Engine,
+        jobs: list[ScheduledJob],
+        lock: Optional[JobLock] = None,
+        runner_id: Optional[str] = None,
+        jitter: Optional[float] = None
+    ) -> None:
+        self.session_factory = session_factory
+        self.jobs = [job for job in jobs if job.interval_seconds > 0]
+        self.lock = lock or job_lock_for(engine)
+        self.runner_id = runner_id or f"{socket.gethostname()[:40]}:{os.getpid()}"
+        self.jitter = settings.SCHEDULER_JITTER if jitter is None else jitter
+        self._stopping = asyncio.Event()
+
+    def _spread(self, seconds: float) -> float:
+        return max(seconds + seconds * random.uniform(-self.jitter, self.jitter), 0.0)
+
+    def _execute(self, job: ScheduledJob) -> Optional[str]:
+        """Run the job in a session of its own, recording its metrics; the error when it failed."""
+        db_session = self.session_factory()
+        start = time.perf_counter()
+        try:
+            job.run(db_session)
+            db_session.commit()
+        except Exception as e:
+            db_session.rollback()
+            JOB_RUNS.inc(job=job.name, outcome="failed")
+            logger.error(f"Job {job.name} failed after {time.perf_counter() - start:.3f}s: {e}")
+            return f"{type(e).__name__}: {e}"[:2000]
+        finally:
+            JOB_DURATION.observe(time.perf_counter() - start, job=job.name)
+            db_session.close()
+        JOB_RUNS.inc(job=job.name, outcome="succeeded")
+        JOB_LAST_SUCCESS.set(time.time(), job=job.name)
+        logger.info(f"Job {job.name} finished in {time.perf_counter() - start:.3f}s")
+        return None
+
+    def run_job(self, job: ScheduledJob) -> float:
+        """
+        Run the job unless another process holds it or ran it recently.
+
+        :return: Seconds until the job is due again.
+        :rtype: float
+        """
+        if not job.exclusive:
+            self._execute(job)
+            return self._spread(job.interval_seconds)
+
+        with self.lock.hold(job.name) as acquired:
+            if not acquired:
+                JOB_RUNS.inc(job=job.name, outcome="skipped")
+                return self._spread(job.interval_seconds)
+
+            db_session = self.session_factory()
+            try:
+                state = db_session.get(ScheduledJobDB, job.name) or ScheduledJobDB(job_name=job.name)
+                started_at = _now()
+                if state.last_started_at is not None:
+                    elapsed = (started_at - _as_utc(state.last_started_at)).total_seconds()
+                    if 0 <= elapsed < job.interval_seconds * (1 - self.jitter):
+                        # Ran elsewhere; follow that run's schedule
+                        JOB_RUNS.inc(job=job.name, outcome="skipped")
+                        return job.interval_seconds - elapsed + job.interval_seconds * random.uniform(0, self.jitter)
+
+                state.last_started_at = started_at
+                state.runner = self.runner_id
+                db_session.add(state)
+                db_session.commit()
+
+                start = time.perf_counter()
+                error = self._execute(job)
+                state.last_finished_at = _now()
+                state.last_duration_seconds = time.perf_counter() - start
+                state.last_status = "failed" if error else "succeeded"
+                state.last_error = error
+                db_session.commit()
+            except Exception:
+                db_session.rollback()
+                raise
+            finally:
+                db_session.close()
+        return self._spread(job.interval_seconds)
+
+    async def run(self) -> None:
+        """Run due jobs until stopped; the first run of each job falls within its jitter after the start."""
+        loop = asyncio.get_running_loop()
+        due = {job.name: loop.time() + job.interval_seconds * random.uniform(0, self.jitter) for job in self.jobs}
+        logger.info(f"Job scheduler {self.runner_id} started with {', '.join(due) or 'no jobs'}")
+        while not self._stopping.is_set():
+            job = min(self.jobs, key=lambda job: due[job.name], default=None)
+            delay = due[job.name] - loop.time() if job else None
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                next_in = await asyncio.to_thread(self.run_job, job)
+            except Exception as e:
+                logger.error(f"Job scheduler {self.runner_id} could not run {job.name}: {e}")
+                next_in = self._spread(job.interval_seconds)
+            due[job.name] = loop.time() + next_in
+        logger.info(f"Job scheduler {self.runner_id} stopped")
+
+    def stop(self) -> None:
+        self._stopping.set()
@@ -0,0 +1,12 @@
+from cims.core.repositories.unit_of_work import UnitOfWork
+from sqlalchemy.orm import Session
+
+class SQLAlchemyUnitOfWork(UnitOfWork):
+    def __init__(self, db_session: Session) -> None:
+        self.db_session = db_session
+
+    def commit(self) -> None:
+        self.db_session.commit()
+
+    def rollback(self) -> None:
+        self.db_session.rollback()
@@ -0,0 +1,59 @@
+"""
+The periodic jobs of CIMS, run by ``cims.integrations.sqlalchemy.scheduler``.
+
+The aggregate rebuilds reconcile tables that writes keep up to date
+incrementally, catching drift from bulk loads, manual SQL or a deferred
+refresh given up on; the warmup keeps rebuilding the in-memory search indexes
+off the request path.
+"""
+from sqlalchemy.orm import Session
+
+from cims.config import settings
+from cims.core.matching import candidate_index
+from cims.core.name_search import candidate_name_index, customer_name_index
+from cims.database.models import CandidateDB, CustomerDB
+from cims.integrations.sqlalchemy.candidate_repository import SQLAlchemyCandidateRepository
+from cims.integrations.sqlalchemy.headhunter_repository import SQLAlchemyHeadhunterRepository
+from cims.integrations.sqlalchemy.headhunter_stats import daily_stats_enabled
+from cims.integrations.sqlalchemy.name_search import name_search_enabled, refresh_name_index
+from cims.integrations.sqlalchemy.outbox import purge_outbox
+from cims.integrations.sqlalchemy.project_repository import SQLAlchemyProjectRepository
+from cims.integrations.sqlalchemy.scheduler import ScheduledJob
+
+def refresh_project_summaries(db_session: Session) -> None:
+    SQLAlchemyProjectRepository(db_session).refresh_pipeline_summaries()
+
+def refresh_headhunter_stats(db_session: Session) -> None:
+    SQLAlchemyHeadhunterRepository(db_session).refresh_daily_stats()
+
+def refresh_duplicate_keys(db_session: Session) -> None:
+    SQLAlchemyCandidateRepository(db_session).refresh_duplicate_keys()
+
+def warm_search_indexes(db_session: Session) -> None:
+    """Rebuild this process's search indexes once they are old, or load their stale entries."""
+    candidate_index.refresh(SQLAlchemyCandidateRepository(db_session).get_match_profiles)
+    if name_search_enabled():
+        refresh_name_index(db_session, candidate_name_index, CandidateDB.candidate_id, CandidateDB.name)
+        refresh_name_index(db_session, customer_name_index, CustomerDB.customer_id, CustomerDB.name)
+
+def purge_processed_outbox(db_session: Session) -> None:
+    purge_outbox(db_session)
+
+def default_jobs(include_local: bool = True) -> list[ScheduledJob]:
+    """
+    The jobs to schedule, as configured.
+
+    :param bool include_local: Include the jobs warming state of this process, pointless in a process serving no requests.
+    :return: The jobs; those disabled by an interval of 0 are left to the scheduler to skip.
+    :rtype: list[ScheduledJob]
+    """
+    jobs = [
+        ScheduledJob("project_summaries", settings.JOB_PROJECT_SUMMARIES_SECONDS, refresh_project_summaries),
+        ScheduledJob("duplicate_keys", settings.JOB_DUPLICATE_KEYS_SECONDS, refresh_duplicate_keys),
+        ScheduledJob("outbox_purge", settings.JOB_OUTBOX_PURGE_SECONDS, purge_processed_outbox),
+    ]
+    if daily_stats_enabled():
+        jobs.append(ScheduledJob("headhunter_stats", settings.JOB_HEADHUNTER_STATS_SECONDS, refresh_headhunter_stats))
+    if include_local:
+        jobs.append(ScheduledJob("index_warmup", settings.JOB_INDEX_WARMUP_SECONDS, warm_search_indexes, exclusive=False))
+    return jobs
@@ -1,6 +1,7 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 from cims.api.v1.auth import router as auth_router
 from cims.api.v1.candidate import router as candidate_router
 from cims.api.v1.headhunter import router as headhunter_router
@@ -11,8 +12,21 @@ from cims.api.v1.level import router as level_router
 from cims.api.v1.expertise import router as expertise_router
 from cims.api.v1.field import router as field_router
 from cims.api.v1.nominee import router as nominee_router
+from cims.api.v1.admin import router as admin_router
+from cims.api.v1.analytics import router as analytics_router
+from cims.api.v1.events import router as events_router
+from cims.api.health import router as health_router
+from cims.api.metrics import router as metrics_router
+from cims.api.middleware import count_in_flight, instrument_request, trace_request
+from cims.api.profiling import profile_request
 from cims.config import CLogger, settings
-from cims.database.session import PostgresSessionFactory
+from cims.database.instrumentation import install_query_instrumentation
+from cims.tracing import install_sql_tracing
+from cims.database.session import get_session_factory
+from cims.integrations.sqlalchemy.outbox import OutboxWorker, outbox_worker_enabled
+from cims.integrations.sqlalchemy.scheduler import JobScheduler
+from cims.jobs import default_jobs
+from cims.metrics import REGISTRY
 
 logger = CLogger(__name__).get_logger()
 
@@ -21,22 +35,46 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting CIMS API...")
     logger.info("Creating database tables...")
-    factory = PostgresSessionFactory(
-        host=settings.POSTGRES_HOST,
-        port=settings.POSTGRES_PORT,
-        name=settings.POSTGRES_DB,
-        user=settings.POSTGRES_USER,
-        password=settings.POSTGRES_PASSWORD
-    )
+    factory = get_session_factory()
     factory.create_tables()
     logger.info("Database tables created successfully")
+    REGISTRY.add_collector(factory.collect_pool_metrics)
+
+    # Run deferred aggregate refreshes recorded in the outbox (see cims.integrations.sqlalchemy.outbox)
+    outbox_worker = OutboxWorker(factory.get_session) if outbox_worker_enabled() else None
+    outbox_task = asyncio.create_task(outbox_worker.run()) if outbox_worker else None
+    # Periodic aggregate rebuilds, index warmups and cleanup (see cims.jobs)
+    scheduler = JobScheduler(factory.get_session, factory.engine, default_jobs()) if settings.SCHEDULER_ENABLED else None
+    scheduler_task = asyncio.create_task(scheduler.run()) if scheduler else None
     
     yield
     
     # Shutdown
     logger.info("Shutting down CIMS API...")
+    if outbox_worker and outbox_task:
+        outbox_worker.stop()
+        await outbox_task
+    if scheduler and scheduler_task:
+        scheduler.stop()
+        await scheduler_task
+
+# Requests in flight per route (see cims.api.middleware.count_in_flight)
+app = FastAPI(lifespan=lifespan, dependencies=[Depends(count_in_flight)])
+
+# Count SQL statements and DB time per request (Server-Timing / X-DB-Queries headers)
+install_query_instrumentation()
+app.middleware("http")(instrument_request)
 
-app = FastAPI(lifespan=lifespan)
+# Accept or generate a correlation ID per request and tag its SQL (see cims.tracing).
+# Registered after instrument_request so it wraps it and the request log line carries the ID.
+if settings.TRACING_ENABLED:
+    install_sql_tracing()
+    app.middleware("http")(trace_request)
+
+# Sample stacks of requests signed for profiling (see cims.api.profiling)
+if settings.PROFILING_ENABLED:
+    logger.warning("Request profiling is enabled")
+    app.middleware("http")(profile_request)
 
 # Add cache-busting middleware for development
 @app.middleware("http")
@@ -78,6 +116,10 @@ async def health_check():
     """
     return {"status": "ok"}
 
+# Liveness/readiness probes and metrics in Prometheus text format
+app.include_router(health_router)
+app.include_router(metrics_router)
+
 # Include the authentication router
 app.include_router(auth_router, prefix="/api/v1", tags=["auth"])
 
@@ -91,6 +133,9 @@ app.include_router(level_router, prefix="/api/v1")
 app.include_router(expertise_router, prefix="/api/v1")
 app.include_router(field_router, prefix="/api/v1")
 app.include_router(nominee_router, prefix="/api/v1")
+app.include_router(admin_router, prefix="/api/v1")
+app.include_router(analytics_router, prefix="/api/v1")
+app.include_router(events_router, prefix="/api/v1")
 
 if __name__ == "__main__":
     import uvicorn
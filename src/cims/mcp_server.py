@@ -6,8 +6,16 @@ from cims.tools.candidate import CandidateToolset
 from cims.tools.customer import CustomerToolset
 from cims.tools.project import ProjectToolset
 from cims.config import settings
+from cims.metrics import MCP_TOOL_DURATION, REGISTRY
+from cims.schemas import ErrorResponse
+from cims.tracing import start_span
 
 from mcp.server.fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from typing import Any, Awaitable, Callable
+import functools
+import time
 
 mcp = FastMCP(
     name="CIMS (Candidate Information Management System) MCP Toolkit",
@@ -15,56 +23,86 @@ mcp = FastMCP(
     port=settings.MCP_PORT,
 )
 
+def timed_tool(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    Record the latency of each tool call; tools report failures as ErrorResponse values.
+
+    Each call starts a trace whose ID the toolsets forward to the backend, so the
+    backend requests and SQL statements of one agent action share a correlation ID.
+    functools.wraps keeps the signature and docstring FastMCP uses to describe the tool.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        outcome = "exception"
+        try:
+            with start_span(f"tool {fn.__name__}", "mcp.tool") as span:
+                result = await fn(*args, **kwargs)
+                outcome = "error" if isinstance(result, ErrorResponse) else "ok"
+                if span is not None and outcome == "error":
+                    span.status = "error"
+            return result
+        finally:
+            MCP_TOOL_DURATION.observe(time.perf_counter() - start, tool=fn.__name__, outcome=outcome)
+
+    return wrapper
+
+# Traces of tool calls hold request URLs with search terms, so they are not served here without
+# authentication; set TRACE_EXPORT_FILE to collect them, and read backend traces from /api/v1/admin/traces
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 mcp.add_tool(
-    fn=AreaToolset.get_areas,
+    fn=timed_tool(AreaToolset.get_areas),
 )
 
 mcp.add_tool(
-    fn=FieldToolset.get_fields,
+    fn=timed_tool(FieldToolset.get_fields),
 )
 
 mcp.add_tool(
-    fn=LevelToolset.get_levels,
+    fn=timed_tool(LevelToolset.get_levels),
 )
 
 mcp.add_tool(
-    fn=ExpertiseToolset.get_expertises,
+    fn=timed_tool(ExpertiseToolset.get_expertises),
 )
 
 mcp.add_tool(
-    fn=CandidateToolset.get_candidates,
+    fn=timed_tool(CandidateToolset.get_candidates),
 )
 
 mcp.add_tool(
-    fn=CandidateToolset.get_candidate,
+    fn=timed_tool(CandidateToolset.get_candidate),
 )
 
 mcp.add_tool(
-    fn=CustomerToolset.get_customers,
+    fn=timed_tool(CustomerToolset.get_customers),
 )
 
 mcp.add_tool(
-    fn=CustomerToolset.get_customer,
+    fn=timed_tool(CustomerToolset.get_customer),
 )
 
 mcp.add_tool(
-    fn=ProjectToolset.get_projects,
+    fn=timed_tool(ProjectToolset.get_projects),
 )
 
 mcp.add_tool(
-    fn=ProjectToolset.get_project,
+    fn=timed_tool(ProjectToolset.get_project),
 )
 
 mcp.add_tool(
-    fn=CandidateToolset.search_candidates,
+    fn=timed_tool(CandidateToolset.search_candidates),
 )
 
 mcp.add_tool(
-    fn=CustomerToolset.search_customers,
+    fn=timed_tool(CustomerToolset.search_customers),
 )
 
 mcp.add_tool(
-    fn=ProjectToolset.search_projects,
+    fn=timed_tool(ProjectToolset.search_projects),
 )
 
 if __name__ == "__main__":
@@ -36,6 +36,13 @@ from .candidate import (
     CandidateResponse,
     CandidateDetailResponse,
     CandidateListResponse,
+    CandidateImportRowResult,
+    CandidateImportSummary,
+    CandidateImportResponse,
+    DuplicateCandidate,
+    CandidateCreateResponse,
+    DuplicateCluster,
+    DuplicateClusterListResponse,
 )
 
 from .headhunter import (
@@ -53,6 +60,11 @@ from .project import (
     ProjectResponse,
     ProjectDetailResponse,
     ProjectListResponse,
+    ProjectPipelineSummary,
+    ProjectPipelineListResponse,
+    CandidateMatch,
+    ProjectMatches,
+    ProjectMatchResponse,
 )
 
 from .customer import (
@@ -101,6 +113,38 @@ from .nominee import (
     NomineeResponse,
     NomineeDetailResponse,
     NomineeListResponse,
+    NomineeBulkStatusUpdate,
+    NomineeBulkStatusResult,
+    NomineeBulkStatusResponse,
+)
+
+# Admin schemas
+from .admin import (
+    SlowQueryRecord,
+    SlowQueryListResponse,
+    TraceSpan,
+    TraceKindBreakdown,
+    TraceSummary,
+    TraceListResponse,
+    TraceResponse,
+)
+
+# Analytics schemas
+from .analytics import (
+    FunnelStage,
+    FunnelSummary,
+    FunnelResponse,
+    LeaderboardEntry,
+    LeaderboardPeriod,
+    LeaderboardSummary,
+    LeaderboardResponse,
+    SalaryHistogram,
+    SalaryRegression,
+    SalaryGroupStats,
+    SalaryStatsSummary,
+    SalaryStatsResponse,
+    BudgetCheck,
+    BudgetCheckResponse,
 )
 
 __all__ = [
@@ -129,6 +173,13 @@ __all__ = [
     "CandidateResponse",
     "CandidateDetailResponse",
     "CandidateListResponse",
+    "CandidateImportRowResult",
+    "CandidateImportSummary",
+    "CandidateImportResponse",
+    "DuplicateCandidate",
+    "CandidateCreateResponse",
+    "DuplicateCluster",
+    "DuplicateClusterListResponse",
     
     # Headhunter schemas
     "HeadhunterCreate",
@@ -144,6 +195,11 @@ __all__ = [
     "ProjectResponse",
     "ProjectDetailResponse",
     "ProjectListResponse",
+    "ProjectPipelineSummary",
+    "ProjectPipelineListResponse",
+    "CandidateMatch",
+    "ProjectMatches",
+    "ProjectMatchResponse",
     
     # Customer schemas
     "CustomerCreate",
@@ -186,4 +242,32 @@ __all__ = [
     "NomineeResponse",
     "NomineeDetailResponse",
     "NomineeListResponse",
+    "NomineeBulkStatusUpdate",
+    "NomineeBulkStatusResult",
+    "NomineeBulkStatusResponse",
+
+    # Admin schemas
+    "SlowQueryRecord",
+    "SlowQueryListResponse",
+    "TraceSpan",
+    "TraceKindBreakdown",
+    "TraceSummary",
+    "TraceListResponse",
+    "TraceResponse",
+
+    # Analytics schemas
+    "FunnelStage",
+    "FunnelSummary",
+    "FunnelResponse",
+    "LeaderboardEntry",
+    "LeaderboardPeriod",
+    "LeaderboardSummary",
+    "LeaderboardResponse",
+    "SalaryHistogram",
+    "SalaryRegression",
+    "SalaryGroupStats",
+    "SalaryStatsSummary",
+    "SalaryStatsResponse",
+    "BudgetCheck",
+    "BudgetCheckResponse",
 ]
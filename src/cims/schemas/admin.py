@@ -0,0 +1,56 @@
+"""
+Admin API schemas for operational diagnostics.
+"""
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from cims.schemas.base import DataResponse
+
+class SlowQueryRecord(BaseModel):
+    """A statement that exceeded the slow-query threshold."""
+    recorded_at: str = Field(..., description="UTC timestamp when the statement finished")
+    duration_ms: float = Field(..., description="Execution time in milliseconds")
+    statement: str = Field(..., description="SQL statement with placeholders")
+    parameters: Optional[Any] = Field(None, description="Bound parameters with sensitive values redacted")
+    route: Optional[str] = Field(None, description="Request that issued the statement")
+    request_id: Optional[str] = Field(None, description="Correlation ID of the request that issued the statement")
+    repository_method: Optional[str] = Field(None, description="Repository method that issued the statement")
+    plan: Optional[List[str]] = Field(None, description="EXPLAIN output, captured for SELECT statements on PostgreSQL")
+
+class SlowQueryListResponse(DataResponse[List[SlowQueryRecord]]):
+    """Response schema for recorded slow queries, most recent first."""
+    pass
+
+class TraceSpan(BaseModel):
+    """A timed operation within a trace."""
+    trace_id: str = Field(..., description="Correlation ID shared by all spans of the trace")
+    span_id: str = Field(..., description="Span identifier")
+    parent_id: Optional[str] = Field(None, description="Parent span, possibly recorded by another service")
+    name: str = Field(..., description="Operation name, e.g. the route or SQL verb")
+    kind: str = Field(..., description="Span kind: http.server, http.client, db, mcp.tool or internal")
+    start_time: float = Field(..., description="Unix timestamp when the span started")
+    duration_ms: Optional[float] = Field(None, description="Duration in milliseconds")
+    status: str = Field(..., description="ok or error")
+    attributes: Dict[str, Any] = Field(default_factory=dict, description="Span details such as status code or statement")
+
+class TraceKindBreakdown(BaseModel):
+    """Time spent in spans of one kind."""
+    count: int = Field(..., description="Number of spans")
+    duration_ms: float = Field(..., description="Total duration in milliseconds")
+
+class TraceSummary(BaseModel):
+    """A recorded trace with its time breakdown."""
+    trace_id: str = Field(..., description="Correlation ID")
+    name: str = Field(..., description="Name of the root span recorded by this service")
+    start_time: float = Field(..., description="Unix timestamp when the trace started")
+    duration_ms: Optional[float] = Field(None, description="Duration of the root span in milliseconds")
+    status: str = Field(..., description="error if any span failed, otherwise ok")
+    breakdown: Dict[str, TraceKindBreakdown] = Field(..., description="Span count and time per span kind")
+    spans: List[TraceSpan] = Field(..., description="Spans ordered by start time")
+
+class TraceListResponse(DataResponse[List[TraceSummary]]):
+    """Response schema for recent traces, most recent first."""
+    pass
+
+class TraceResponse(DataResponse[TraceSummary]):
+    """Response schema for a single trace."""
+    pass
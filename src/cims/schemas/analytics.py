@@ -0,0 +1,111 @@
+"""
+Analytics API schemas for aggregate reporting.
+"""
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional
+import datetime
+from cims.core.entities.nominee import NomineeStatus
+from cims.core.repositories.headhunter_repository import StatsPeriod
+from cims.core.salary_stats import SalaryDimension
+from cims.schemas.base import DataResponse
+
+class FunnelStage(BaseModel):
+    """A stage of the recruitment funnel."""
+    status: NomineeStatus = Field(..., description="Nominee status of the stage")
+    current: int = Field(..., description="Nominees currently at this stage")
+    reached: int = Field(..., description="Nominees at this stage or a later one")
+    conversion_from_previous: Optional[float] = Field(None, description="Share of the previous stage that reached this one")
+    conversion_from_start: Optional[float] = Field(None, description="Share of all nominees that reached this stage")
+
+class FunnelSummary(BaseModel):
+    """Recruitment funnel for the nominees matching the filters."""
+    total: int = Field(..., description="Number of nominees")
+    rejected: int = Field(..., description="Nominees with status TUCHOI")
+    hired: int = Field(..., description="Nominees with status KYHOPDONG")
+    rejection_rate: Optional[float] = Field(None, description="Share of nominees rejected")
+    overall_conversion: Optional[float] = Field(None, description="Share of nominees hired")
+    stages: List[FunnelStage] = Field(..., description="Stages in pipeline order")
+
+class FunnelResponse(DataResponse[FunnelSummary]):
+    """Response for the recruitment funnel."""
+    pass
+
+class LeaderboardEntry(BaseModel):
+    """A headhunter's activity and rank within a period."""
+    rank: int = Field(..., description="Rank within the period; tied headhunters share a rank")
+    headhunter_id: int = Field(..., description="Headhunter ID")
+    headhunter_name: str = Field(..., description="Headhunter name")
+    candidates_sourced: int = Field(..., description="Candidates created in the period")
+    nominees: int = Field(..., description="Nominees created in the period")
+    contracts_signed: int = Field(..., description="Nominees created in the period that are now KYHOPDONG")
+    contract_rate: Optional[float] = Field(None, description="Share of the period's nominees that signed")
+    stage_counts: Dict[NomineeStatus, int] = Field(..., description="Nominees created in the period per current status")
+
+class LeaderboardPeriod(BaseModel):
+    """Ranked headhunters for one week, month or quarter."""
+    period_start: datetime.date = Field(..., description="First day of the period")
+    period_end: datetime.date = Field(..., description="Last day of the period")
+    headhunters: int = Field(..., description="Number of headhunters with activity in the period")
+    entries: List[LeaderboardEntry] = Field(..., description="Top headhunters by rank")
+
+class LeaderboardSummary(BaseModel):
+    """Headhunter leaderboard over a date window."""
+    period: StatsPeriod = Field(..., description="Bucket size")
+    rank_by: Literal["contracts_signed", "nominees", "candidates_sourced"] = Field(..., description="Count the ranking is based on")
+    start: datetime.date = Field(..., description="First day covered")
+    end: datetime.date = Field(..., description="Last day covered")
+    periods: List[LeaderboardPeriod] = Field(..., description="Periods in chronological order")
+
+class LeaderboardResponse(DataResponse[LeaderboardSummary]):
+    """Response for the headhunter leaderboard."""
+    pass
+
+class SalaryHistogram(BaseModel):
+    """Equal-width histogram of salary expectations."""
+    edges: List[float] = Field(..., description="Bin edges, one more than the counts")
+    counts: List[int] = Field(..., description="Nominees per bin; the last bin includes its upper edge")
+
+class SalaryRegression(BaseModel):
+    """Least-squares fit of salary expectation on years of experience."""
+    slope: float = Field(..., description="Salary increase per year of experience")
+    intercept: float = Field(..., description="Fitted salary at zero years of experience")
+    r_squared: Optional[float] = Field(None, description="Share of the salary variance explained by experience")
+
+class SalaryGroupStats(BaseModel):
+    """Salary expectation statistics of one expertise, level and area group."""
+    expertise_id: Optional[int] = Field(None, description="Project expertise of the group; null when not grouped by expertise")
+    level_id: Optional[int] = Field(None, description="Project level of the group; null when not grouped by level")
+    area_id: Optional[int] = Field(None, description="Project area of the group; null when not grouped by area")
+    count: int = Field(..., description="Number of nominees")
+    mean: float = Field(..., description="Mean salary expectation")
+    std: float = Field(..., description="Population standard deviation")
+    min: float = Field(..., description="Lowest salary expectation")
+    max: float = Field(..., description="Highest salary expectation")
+    percentiles: Dict[str, float] = Field(..., description="Salary expectation percentiles keyed p10, p25, p50, p75 and p90")
+    histogram: SalaryHistogram = Field(..., description="Distribution between min and max")
+    regression: Optional[SalaryRegression] = Field(None, description="Experience fit; null when all nominees have the same experience")
+
+class SalaryStatsSummary(BaseModel):
+    """Salary expectation statistics per group."""
+    group_by: List[SalaryDimension] = Field(..., description="Dimensions the nominees are grouped by")
+    total: int = Field(..., description="Number of nominees in the reported groups")
+    groups: List[SalaryGroupStats] = Field(..., description="Groups ordered by their key")
+
+class SalaryStatsResponse(DataResponse[SalaryStatsSummary]):
+    """Response for salary expectation statistics."""
+    pass
+
+class BudgetCheck(BaseModel):
+    """A project's budget compared with the salary expectations for the same expertise, level and area."""
+    project_id: int = Field(..., description="Project ID")
+    budget: float = Field(..., description="Project budget")
+    budget_currency: str = Field(..., description="Currency of the budget; salary expectations are assumed to share it")
+    required_recruits: int = Field(..., description="Recruits the budget covers")
+    budget_per_recruit: float = Field(..., description="Budget divided by the required recruits (at least one)")
+    percentile_rank: Optional[float] = Field(None, description="Share of comparable salary expectations at or below the budget per recruit")
+    assessment: Optional[Literal["low", "typical", "high"]] = Field(None, description="Below p25, between p25 and p75, or above p75; null without comparable nominees")
+    stats: Optional[SalaryGroupStats] = Field(None, description="Statistics of the comparable nominees")
+
+class BudgetCheckResponse(DataResponse[BudgetCheck]):
+    """Response for a project budget check."""
+    pass
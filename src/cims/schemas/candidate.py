@@ -2,8 +2,9 @@
 Candidate API schemas for requests and responses.
 """
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
+from cims.core.dedup import DuplicateKey
 from cims.core.entities.candidate import Gender
 from cims.schemas.base import DataResponse, ListResponse
 
@@ -64,3 +65,44 @@ class CandidateDetailResponse(DataResponse[CandidateResponse]):
 class CandidateListResponse(ListResponse[CandidateResponse]):
     """Response for candidate list operations."""
     pass
+
+class DuplicateCandidate(BaseModel):
+    """An existing candidate that shares normalized keys with another one."""
+    candidate_id: int = Field(..., description="ID of the existing candidate")
+    name: str = Field(..., description="Name of the existing candidate")
+    phone: str = Field(..., description="Phone number of the existing candidate")
+    email: str = Field(..., description="Email address of the existing candidate")
+    reasons: List[DuplicateKey] = Field(..., description="Normalized keys both candidates share")
+
+class CandidateImportRowResult(BaseModel):
+    """Outcome of importing a single candidate row."""
+    row: int = Field(..., ge=1, description="1-based row number in the uploaded data")
+    success: bool = Field(..., description="Whether the row was valid and, unless dry run, inserted")
+    candidate_id: Optional[int] = Field(None, description="ID of the created candidate")
+    errors: List[str] = Field(default_factory=list, description="Validation, duplicate or insert errors for the row")
+    duplicates: List[DuplicateCandidate] = Field(default_factory=list, description="Existing candidates that may be the same person")
+
+class CandidateImportSummary(BaseModel):
+    """Summary of a bulk candidate import."""
+    total: int = Field(..., description="Number of rows received")
+    succeeded: int = Field(..., description="Number of rows imported, or that would be imported in dry run")
+    failed: int = Field(..., description="Number of rows rejected")
+    dry_run: bool = Field(..., description="Whether the import only validated rows")
+    results: List[CandidateImportRowResult] = Field(..., description="Per-row results in input order")
+
+class CandidateImportResponse(DataResponse[CandidateImportSummary]):
+    """Response for bulk candidate imports."""
+    pass
+
+class CandidateCreateResponse(CandidateDetailResponse):
+    """Response for candidate creation, with possible duplicates of the new candidate."""
+    duplicates: List[DuplicateCandidate] = Field(default_factory=list, description="Existing candidates that may be the same person")
+
+class DuplicateCluster(BaseModel):
+    """Candidates linked by shared normalized keys."""
+    candidate_ids: List[int] = Field(..., description="IDs of the candidates in the cluster")
+    reasons: List[DuplicateKey] = Field(..., description="Keys that linked candidates of the cluster")
+
+class DuplicateClusterListResponse(DataResponse[List[DuplicateCluster]]):
+    """Response for duplicate cluster scans."""
+    pass
@@ -2,7 +2,7 @@
 Nominee API schemas for requests and responses.
 """
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 from cims.core.entities.nominee import NomineeStatus
 from cims.schemas.base import DataResponse, ListResponse
@@ -50,3 +50,17 @@ class NomineeDetailResponse(DataResponse[NomineeResponse]):
 class NomineeListResponse(ListResponse[NomineeResponse]):
     """Response for nominee list operations."""
     pass
+
+class NomineeBulkStatusUpdate(BaseModel):
+    """Schema for moving several nominees to the same status."""
+    nominee_ids: List[int] = Field(..., min_length=1, max_length=5000, description="IDs of the nominees to update")
+    status: NomineeStatus = Field(..., description="New nominee status")
+
+class NomineeBulkStatusResult(BaseModel):
+    """Result of a bulk nominee status update."""
+    requested: int = Field(..., description="Number of distinct nominee IDs requested")
+    updated: int = Field(..., description="Number of nominees updated")
+
+class NomineeBulkStatusResponse(DataResponse[NomineeBulkStatusResult]):
+    """Response for bulk nominee status updates."""
+    pass
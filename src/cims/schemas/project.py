@@ -2,7 +2,7 @@
 Project API schemas for requests and responses.
 """
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime, date
 from cims.schemas.base import DataResponse, ListResponse
 from cims.core.entities.project import ProjectType, ProjectStatus
@@ -64,3 +64,52 @@ class ProjectDetailResponse(DataResponse[ProjectResponse]):
 class ProjectListResponse(ListResponse[ProjectResponse]):
     """Response for project list operations."""
     pass
+
+class ProjectPipelineSummary(BaseModel):
+    """Recruitment progress of a project, read from the precomputed pipeline summary."""
+    project_id: int = Field(..., description="Unique project ID")
+    name: str = Field(..., description="Project name")
+    customer_id: int = Field(..., description="Customer ID")
+    status: ProjectStatus = Field(..., description="Project status")
+    start_date: date = Field(..., description="Project start date")
+    end_date: date = Field(..., description="Project end date")
+    required_recruits: int = Field(..., description="Number of required recruits")
+    recruited: int = Field(..., description="Number of recruited candidates")
+    remaining_recruits: int = Field(..., description="Required recruits still missing")
+    fill_rate: Optional[float] = Field(None, description="Share of required recruits already recruited")
+    total_nominees: int = Field(..., description="Nominees for the project")
+    active_nominees: int = Field(..., description="Nominees still in the pipeline")
+    hired: int = Field(..., description="Nominees with status KYHOPDONG")
+    rejected: int = Field(..., description="Nominees with status TUCHOI")
+    last_nominated_at: Optional[datetime] = Field(None, description="When the latest nominee was created")
+    filled_at: Optional[datetime] = Field(None, description="When hired nominees first covered the required recruits")
+    time_to_fill_days: Optional[int] = Field(None, description="Days from the project start to filled_at")
+
+class ProjectPipelineListResponse(ListResponse[ProjectPipelineSummary]):
+    """Response for project pipeline summaries."""
+    pass
+
+class CandidateMatch(BaseModel):
+    """A candidate scored against a project."""
+    candidate_id: int = Field(..., description="Candidate ID")
+    name: str = Field(..., description="Candidate name")
+    headhunter_id: int = Field(..., description="Headhunter owning the candidate")
+    expertise_id: int = Field(..., description="Candidate expertise")
+    field_id: int = Field(..., description="Candidate field")
+    area_id: int = Field(..., description="Candidate area")
+    level_id: int = Field(..., description="Candidate level")
+    source: str = Field(..., description="Where the candidate was sourced")
+    nominations: int = Field(..., description="Past nominations of the candidate")
+    advanced: int = Field(..., description="Past nominations that got past the first stage")
+    score: float = Field(..., description="Match score between 0 and 1")
+    components: Dict[str, float] = Field(..., description="Score contributed by expertise, level, area, field and outcomes")
+
+class ProjectMatches(BaseModel):
+    """Best candidates for a project."""
+    project_id: int = Field(..., description="Project ID")
+    candidates_scored: int = Field(..., description="Candidates sharing at least one attribute with the project")
+    matches: List[CandidateMatch] = Field(..., description="Candidates by descending score")
+
+class ProjectMatchResponse(DataResponse[ProjectMatches]):
+    """Response for project candidate matches."""
+    pass
@@ -1,8 +1,11 @@
 """
 Utility functions for schema operations and API helpers.
 """
-from typing import List, TypeVar, Any, Type
+from typing import List, TypeVar, Any, Type, Optional, Mapping, Callable
 from math import ceil
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
 from cims.schemas.base import PaginationMeta, ListResponse
 
 T = TypeVar('T')
@@ -122,3 +125,138 @@ def entity_to_response_model(entity: Any, response_class: Type[ResponseType]) ->
         entity_dict = entity.__dict__
     
     return response_class(**entity_dict)
+
+def parse_fields_param(
+    fields: Optional[str],
+    response_class: Type[BaseModel],
+    always_include: tuple[str, ...] = ()
+) -> Optional[List[str]]:
+    """
+    Parse a comma-separated sparse fieldset parameter.
+    
+    Args:
+        fields: Raw ``fields`` query value, e.g. ``"name,level_name"``
+        response_class: Pydantic response model the fields are validated against
+        always_include: Fields returned even when not requested (e.g. the primary key)
+        
+    Returns:
+        Requested field names in response model order, or None if no fieldset was requested
+        
+    Raises:
+        ValueError: If a requested field does not exist on the response model
+    """
+    if fields is None or not fields.strip():
+        return None
+    
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(response_class.model_fields)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    
+    requested.update(always_include)
+    return [name for name in response_class.model_fields if name in requested]
+
+def sparse_columns(selected: List[str], lookups: Mapping[str, str]) -> List[str]:
+    """
+    Compute the columns to load for a sparse fieldset.
+    
+    Args:
+        selected: Requested response fields
+        lookups: Mapping of enriched name fields to the ID column they are resolved from
+        
+    Returns:
+        Requested fields plus the ID columns needed to resolve requested name fields
+    """
+    columns = list(selected)
+    for name_field, id_field in lookups.items():
+        if name_field in selected and id_field not in columns:
+            columns.append(id_field)
+    return columns
+
+def create_sparse_list_response(
+    data: List[dict[str, Any]],
+    selected: List[str],
+    total: int,
+    page: int,
+    page_size: int,
+    message: str = "Data retrieved successfully"
+) -> JSONResponse:
+    """
+    Create a paginated list response whose items only carry the selected fields.
+    
+    The response is returned as a JSONResponse so the endpoint's full
+    response model is not enforced on the partial items.
+    
+    Args:
+        data: Rows to return, possibly carrying extra helper columns
+        selected: Fields to keep on each row
+        total: Total number of items available
+        page: Current page number
+        page_size: Number of items per page
+        message: Success message
+        
+    Returns:
+        JSONResponse with data and pagination metadata
+    """
+    items = [{name: row.get(name) for name in selected} for row in data]
+    response = create_list_response(
+        data=items,
+        total=total,
+        page=page,
+        page_size=page_size,
+        message=message
+    )
+    return JSONResponse(content=jsonable_encoder(response))
+
+def parse_include_param(include: Optional[str], allowed: set[str]) -> set[str]:
+    """
+    Parse a comma-separated include parameter naming related entities to embed.
+    
+    Nested paths such as ``project.customer`` also include their parent path.
+    
+    Args:
+        include: Raw ``include`` query value, e.g. ``"candidate,project.customer"``
+        allowed: Include paths supported by the endpoint
+        
+    Returns:
+        Set of include paths, empty if nothing was requested
+        
+    Raises:
+        ValueError: If a requested path is not supported by the endpoint
+    """
+    if include is None or not include.strip():
+        return set()
+    
+    requested = {path.strip() for path in include.split(",") if path.strip()}
+    unknown = requested - allowed
+    if unknown:
+        raise ValueError(
+            f"Unsupported include: {', '.join(sorted(unknown))}. "
+            f"Allowed values: {', '.join(sorted(allowed))}"
+        )
+    
+    paths: set[str] = set()
+    for path in requested:
+        parts = path.split(".")
+        for depth in range(1, len(parts) + 1):
+            paths.add(".".join(parts[:depth]))
+    return paths
+
+def create_included_response(
+    response: BaseModel,
+    embed: Callable[[List[dict[str, Any]]], None]
+) -> JSONResponse:
+    """
+    Serialize a data or list response and embed related entities into its items.
+    
+    Args:
+        response: DataResponse or ListResponse to serialize
+        embed: Callback that adds related entities to the serialized items in place
+        
+    Returns:
+        JSONResponse carrying the response with embedded entities
+    """
+    payload = response.model_dump()
+    data = payload["data"]
+    embed(data if isinstance(data, list) else [data])
+    return JSONResponse(content=jsonable_encoder(payload))
@@ -1,4 +1,5 @@
 import httpx
+from cims.tracing import traced_async_client
 from cims.config import settings
 from cims.schemas import (
     ErrorResponse,
@@ -19,7 +20,7 @@ class CandidateToolset:
         :return: A paginated list of candidates matching the criteria.
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with traced_async_client() as client:
                 response = await client.get(
                     f"http://backend:8000/api/v1/candidates/",
                     params={
@@ -49,7 +50,7 @@ class CandidateToolset:
         :return: The details of the candidate with the specified ID.
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with traced_async_client() as client:
                 response = await client.get(
                     f"http://backend:8000/api/v1/candidates/{candidate_id}"
                 )
@@ -109,7 +110,7 @@ class CandidateToolset:
             if headhunter_id is not None:
                 params["headhunter_id"] = headhunter_id
             
-            async with httpx.AsyncClient() as client:
+            async with traced_async_client() as client:
                 response = await client.get(
                     f"http://backend:8000/api/v1/candidates/search",
                     params=params
@@ -131,7 +132,7 @@ class CandidateToolset:
         Helper method to get available options for error messages.
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with traced_async_client() as client:
                 # Get available expertises
                 expertise_response = await client.get("http://backend:8000/api/v1/expertises/")
                 expertises = expertise_response.json().get("expertises", []) if expertise_response.status_code == 200 else []
@@ -1,4 +1,5 @@
 import httpx
+from cims.tracing import traced_async_client
 from cims.schemas import ErrorResponse
 
 class ExpertiseToolset:
@@ -10,7 +11,7 @@ class ExpertiseToolset:
         :return: A list of all expertises.
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with traced_async_client() as client:
                 response = await client.get(
                     "http://backend:8000/api/v1/expertises/",
                     params={
@@ -1,4 +1,5 @@
 import httpx
+from cims.tracing import traced_async_client
 from cims.schemas import ErrorResponse
 
 class ProjectToolset:
@@ -15,7 +16,7 @@ class ProjectToolset:
         :return: A paginated list of projects.
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with traced_async_client() as client:
                 response = await client.get(
                     "http://backend:8000/api/v1/projects/",
                     params={
@@ -45,7 +46,7 @@ class ProjectToolset:
         :return: The details of the project with the specified ID.
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with traced_async_client() as client:
                 response = await client.get(
                     f"http://backend:8000/api/v1/projects/{project_id}"
                 )
@@ -77,7 +78,7 @@ class ProjectToolset:
         :return: A paginated list of projects matching the search criteria.
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with traced_async_client() as client:
                 response = await client.get(
                     "http://backend:8000/api/v1/projects/search",
                     params={
@@ -0,0 +1,317 @@
+"""
+Lightweight request tracing with correlation IDs.
+
+A trace starts at an MCP tool call or at an incoming HTTP request and is
+carried in a ContextVar, so SQL statements, outgoing backend calls and log
+lines can be tied to it. Trace context crosses process boundaries in the
+``X-Request-ID`` and W3C ``traceparent`` headers and is appended to SQL as a
+sqlcommenter-style comment, so it also shows up in ``pg_stat_activity`` and
+database logs.
+
+Finished spans go to in-process exporters: a bounded in-memory buffer grouped
+by trace (served by the admin endpoints) and, optionally, a JSON-lines file.
+"""
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Mapping, Optional, Protocol
+import json
+import re
+import secrets
+import threading
+import time
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from cims.config import settings
+
+REQUEST_ID_HEADER = "X-Request-ID"
+TRACEPARENT_HEADER = "traceparent"
+
+# IDs taken from headers end up in SQL comments and logs, so only a safe alphabet is accepted
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+_TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+_TRACE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+class Span:
+    """A timed operation within a trace."""
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "attributes", "status", "start_time", "_start", "duration_ms")
+
+    def __init__(self, trace_id: str, name: str, kind: str, parent_id: Optional[str] = None, attributes: Optional[dict[str, Any]] = None) -> None:
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.status = "ok"
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+
+    def finish(self) -> None:
+        self.duration_ms = round((time.perf_counter() - self._start) * 1000, 3)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+class InMemoryTraceExporter:
+    """Keeps the spans of the most recent traces, oldest traces evicted first."""
+    def __init__(self, max_traces: int = 1000, max_spans_per_trace: int = 500) -> None:
+        self.max_traces = max_traces
+        self.max_spans_per_trace = max_spans_per_trace
+        self._traces: "OrderedDict[str, list[dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            spans = self._traces.get(span.trace_id)
+            if spans is None:
+                spans = self._traces[span.trace_id] = []
+                while len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+            if len(spans) < self.max_spans_per_trace:
+                spans.append(span.to_dict())
+
+    def get_trace(self, trace_id: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            spans = list(self._traces.get(trace_id, ()))
+        return summarize_trace(trace_id, spans) if spans else None
+
+    def traces(self, limit: int = 50) -> list[dict[str, Any]]:
+        """Summaries of the most recent traces, newest first."""
+        with self._lock:
+            recent = [(trace_id, list(spans)) for trace_id, spans in reversed(self._traces.items())][:limit]
+        return [summarize_trace(trace_id, spans) for trace_id, spans in recent]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._traces.clear()
+
+class FileTraceExporter:
+    """Appends finished spans as JSON lines, e.g. for offline analysis across processes."""
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+def summarize_trace(trace_id: str, spans: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Describe a trace with its root span and time spent per span kind.
+
+    The breakdown sums span durations per kind, e.g. how much of an agent action
+    went to SQL versus backend HTTP calls.
+    """
+    span_ids = {span["span_id"] for span in spans}
+    roots = [span for span in spans if span["parent_id"] not in span_ids]
+    root = min(roots or spans, key=lambda span: span["start_time"])
+    breakdown: dict[str, dict[str, float]] = {}
+    for span in spans:
+        entry = breakdown.setdefault(span["kind"], {"count": 0, "duration_ms": 0.0})
+        entry["count"] += 1
+        entry["duration_ms"] = round(entry["duration_ms"] + (span["duration_ms"] or 0.0), 3)
+    return {
+        "trace_id": trace_id,
+        "name": root["name"],
+        "start_time": root["start_time"],
+        "duration_ms": root["duration_ms"],
+        "status": "error" if any(span["status"] == "error" for span in spans) else "ok",
+        "breakdown": breakdown,
+        "spans": sorted(spans, key=lambda span: span["start_time"]),
+    }
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("cims_current_span", default=None)
+_exporters: list[SpanExporter] = []
+_memory_exporter: Optional[InMemoryTraceExporter] = None
+_exporters_lock = threading.Lock()
+
+def configure_exporters() -> None:
+    """Create the exporters from settings; called lazily on the first finished span."""
+    global _memory_exporter
+    with _exporters_lock:
+        if _exporters:
+            return
+        _memory_exporter = InMemoryTraceExporter(settings.TRACE_BUFFER_SIZE)
+        _exporters.append(_memory_exporter)
+        if settings.TRACE_EXPORT_FILE:
+            _exporters.append(FileTraceExporter(settings.TRACE_EXPORT_FILE))
+
+def get_trace_exporter() -> Optional[InMemoryTraceExporter]:
+    """The in-memory exporter, or None when tracing is disabled."""
+    if not settings.TRACING_ENABLED:
+        return None
+    configure_exporters()
+    return _memory_exporter
+
+def _export(span: Span) -> None:
+    if not _exporters:
+        configure_exporters()
+    for exporter in _exporters:
+        exporter.export(span)
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+def current_trace_id() -> Optional[str]:
+    """The correlation ID of the current request or tool call, if any."""
+    span = _current_span.get()
+    return span.trace_id if span else None
+
+def parse_trace_headers(headers: Mapping[str, str]) -> tuple[Optional[str], Optional[str]]:
+    """
+    Return (trace ID, parent span ID) from incoming headers; invalid values are ignored.
+    """
+    match = _TRACEPARENT_PATTERN.match(headers.get(TRACEPARENT_HEADER, ""))
+    if match:
+        return match.group(1), match.group(2)
+    request_id = headers.get(REQUEST_ID_HEADER, "")
+    if _REQUEST_ID_PATTERN.match(request_id):
+        return request_id, None
+    return None, None
+
+@contextmanager
+def start_span(
+    name: str,
+    kind: str = "internal",
+    attributes: Optional[dict[str, Any]] = None,
+    trace_id: Optional[str] = None,
+    parent_id: Optional[str] = None,
+) -> Iterator[Optional[Span]]:
+    """
+    Time the block as a span, child of the current span unless trace_id is given.
+
+    Yields None when tracing is disabled.
+    """
+    if not settings.TRACING_ENABLED:
+        yield None
+        return
+
+    parent = _current_span.get()
+    if trace_id is None and parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    span = Span(trace_id or secrets.token_hex(16), name, kind, parent_id, attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException:
+        span.status = "error"
+        raise
+    finally:
+        _current_span.reset(token)
+        span.finish()
+        _export(span)
+
+def trace_headers(span: Optional[Span] = None) -> dict[str, str]:
+    """
+    Headers that continue the given (default: current) span's trace in a downstream service.
+
+    ``traceparent`` is only sent when the trace ID has the W3C form; caller-chosen
+    request IDs are forwarded in ``X-Request-ID`` alone.
+    """
+    span = span or _current_span.get()
+    if span is None:
+        return {}
+    headers = {REQUEST_ID_HEADER: span.trace_id}
+    if _TRACE_ID_PATTERN.match(span.trace_id):
+        headers[TRACEPARENT_HEADER] = f"00-{span.trace_id}-{span.span_id}-01"
+    return headers
+
+# Outgoing HTTP calls, e.g. from the MCP tools to the backend
+
+class _TracedAsyncClient(httpx.AsyncClient):
+    """
+    Records a client span around each call under the current span.
+
+    The span is finished around ``send`` rather than in event hooks, so calls
+    failing without a response (timeouts, refused connections) are exported too.
+    """
+    async def send(self, request: httpx.Request, **kwargs: Any) -> httpx.Response:
+        parent = _current_span.get()
+        if parent is None or not settings.TRACING_ENABLED:
+            return await super().send(request, **kwargs)
+
+        span = Span(parent.trace_id, f"{request.method} {request.url.path}", "http.client", parent.span_id, {"url": str(request.url)})
+        request.headers.update(trace_headers(span))
+        try:
+            response = await super().send(request, **kwargs)
+        except BaseException as e:
+            span.status = "error"
+            span.attributes["error"] = type(e).__name__
+            raise
+        else:
+            span.attributes["status_code"] = response.status_code
+            if response.status_code >= 500:
+                span.status = "error"
+            return response
+        finally:
+            span.finish()
+            _export(span)
+
+def traced_async_client(**kwargs: Any) -> httpx.AsyncClient:
+    """
+    An httpx client that forwards the current trace and records a span per call.
+    """
+    return _TracedAsyncClient(**kwargs)
+
+# SQL statements
+
+def _sql_comment(span: Span) -> str:
+    return f" /*request_id='{span.trace_id}',span_id='{span.span_id}'*/"
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> tuple[str, Any]:
+    span = _current_span.get()
+    if span is None:
+        return statement, parameters
+
+    conn.info.setdefault("trace_spans", []).append(
+        Span(span.trace_id, statement.split(None, 1)[0].upper() if statement else "SQL", "db", span.span_id,
+             {"statement": statement[:300], "executemany": executemany})
+    )
+    if settings.TRACE_SQL_COMMENTS:
+        statement += _sql_comment(span)
+    return statement, parameters
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    spans = conn.info.get("trace_spans")
+    if not spans or _current_span.get() is None:
+        return
+    span = spans.pop()
+    span.finish()
+    _export(span)
+
+def _handle_error(exception_context: Any) -> None:
+    connection = exception_context.connection
+    spans = connection.info.get("trace_spans") if connection is not None else None
+    if spans:
+        span = spans.pop()
+        span.status = "error"
+        span.finish()
+        _export(span)
+
+def install_sql_tracing() -> None:
+    """
+    Record a span per statement and tag statements with the request ID on every engine. Safe to call more than once.
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute, retval=True)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
@@ -0,0 +1,43 @@
+"""
+Standalone worker, for running deferred and periodic work outside the API processes.
+
+Run with ``python -m cims.worker``. It runs the shared periodic jobs and, with
+``AGGREGATE_REFRESH_MODE=outbox`` or ``OUTBOX_WORKER_ENABLED=true``, drains the
+outbox; set ``OUTBOX_WORKER_ENABLED=false`` and ``SCHEDULER_ENABLED=false`` for
+the API processes if they should leave both to it. Any number of workers
+can run side by side, as outbox claims are leased per message and each job
+takes a lock.
+"""
+import asyncio
+import signal
+
+from cims.config import CLogger, settings
+from cims.database.session import get_session_factory
+from cims.integrations.sqlalchemy.outbox import OutboxWorker
+from cims.integrations.sqlalchemy.scheduler import JobScheduler
+# Also imports the modules registering the outbox handlers
+from cims.jobs import default_jobs
+
+logger = CLogger(__name__).get_logger()
+
+async def main() -> None:
+    factory = get_session_factory()
+    factory.create_tables()
+    # Unlike the API processes, drains the outbox in outbox mode even when the shared settings turn their workers off
+    drain = settings.OUTBOX_WORKER_ENABLED or settings.AGGREGATE_REFRESH_MODE == "outbox"
+    outbox_worker = OutboxWorker(factory.get_session) if drain else None
+    # The in-memory indexes of this process serve no requests
+    scheduler = JobScheduler(factory.get_session, factory.engine, default_jobs(include_local=False))
+
+    def stop() -> None:
+        if outbox_worker:
+            outbox_worker.stop()
+        scheduler.stop()
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop)
+    await asyncio.gather(*([outbox_worker.run()] if outbox_worker else []), scheduler.run())
+
+if __name__ == "__main__":
+    asyncio.run(main())
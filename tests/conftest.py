@@ -13,14 +13,24 @@ sys.path.insert(0, str(backend_dir))
 
 import pytest
 from fastapi.testclient import TestClient
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterator
 
 # Import after adding to path
 from cims.database.models import Base
-from cims.deps import get_db_session
+from cims.core.matching import candidate_index
+from cims.core.name_search import candidate_name_index, customer_name_index
+from cims.deps import get_db_session, get_db_engine
+from cims.database.session import get_slow_query_recorder
+from cims.api.middleware import count_in_flight, instrument_request, trace_request
+from cims.api.metrics import router as metrics_router
+from cims.api.health import router as health_router
+from cims.database.instrumentation import install_query_instrumentation
+from cims.tracing import install_sql_tracing
 
 # Create a test app without the lifespan events
 from cims.api.v1.auth import router as auth_router
@@ -33,6 +43,9 @@ from cims.api.v1.level import router as level_router
 from cims.api.v1.expertise import router as expertise_router
 from cims.api.v1.field import router as field_router
 from cims.api.v1.nominee import router as nominee_router
+from cims.api.v1.admin import router as admin_router
+from cims.api.v1.analytics import router as analytics_router
+from cims.api.v1.events import router as events_router
 
 # Test settings
 TEST_SECRET_KEY: str = "test-secret-key"
@@ -70,11 +83,49 @@ def db_session(db_engine: Engine) -> Generator[Session, None, None]:
     session.close()
     transaction.rollback()
     connection.close()
+    # In-process indexes would otherwise keep rows the rollback removed
+    for index in (candidate_index, candidate_name_index, customer_name_index):
+        index.clear()
+
+@pytest.fixture(scope="function")
+def assert_max_queries(db_engine: Engine) -> Callable[[int], ContextManager[list[str]]]:
+    """
+    Assert that the code in a ``with`` block issues at most the given number of SQL statements.
+
+    Example:
+        ```python
+        with assert_max_queries(3):
+            client.get("/api/v1/nominees/by-project/1")
+        ```
+    """
+    @contextmanager
+    def _assert_max_queries(max_queries: int) -> Iterator[list[str]]:
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+            statements.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(db_engine, "before_cursor_execute", record)
+
+        assert len(statements) <= max_queries, (
+            f"Expected at most {max_queries} queries, got {len(statements)}:\n" + "\n".join(statements)
+        )
+
+    return _assert_max_queries
 
 @pytest.fixture(scope="function")
 def test_app():
     """Create a test FastAPI app without lifespan events."""
-    app = FastAPI(title="CIMS Test API")
+    app = FastAPI(title="CIMS Test API", dependencies=[Depends(count_in_flight)])
+    
+    install_query_instrumentation()
+    install_sql_tracing()
+    app.middleware("http")(instrument_request)
+    app.middleware("http")(trace_request)
     
     # Add CORS middleware
     app.add_middleware(
@@ -86,6 +137,8 @@ def test_app():
     )
     
     # Include routers
+    app.include_router(metrics_router)
+    app.include_router(health_router)
     app.include_router(auth_router, prefix="/api/v1", tags=["Authentication"])
     app.include_router(candidate_router, prefix="/api/v1", tags=["Candidates"])
     app.include_router(headhunter_router, prefix="/api/v1", tags=["Headhunters"])
@@ -96,11 +149,14 @@ def test_app():
     app.include_router(expertise_router, prefix="/api/v1", tags=["Expertise"])
     app.include_router(field_router, prefix="/api/v1", tags=["Fields"])
     app.include_router(nominee_router, prefix="/api/v1", tags=["Nominees"])
+    app.include_router(admin_router, prefix="/api/v1", tags=["Admin"])
+    app.include_router(analytics_router, prefix="/api/v1", tags=["Analytics"])
+    app.include_router(events_router, prefix="/api/v1", tags=["Events"])
     
     return app
 
 @pytest.fixture(scope="function")
-def client(test_app: FastAPI, db_session: Session) -> Generator[TestClient, None, None]:
+def client(test_app: FastAPI, db_session: Session, db_engine: Engine) -> Generator[TestClient, None, None]:
     """Create a test client with dependency override."""
     def override_get_db() -> Generator[Session, None, None]:
         try:
@@ -109,6 +165,8 @@ def client(test_app: FastAPI, db_session: Session) -> Generator[TestClient, None
             pass
     
     test_app.dependency_overrides[get_db_session] = override_get_db
+    test_app.dependency_overrides[get_db_engine] = lambda: db_engine
+    test_app.dependency_overrides[get_slow_query_recorder] = lambda: None
     with TestClient(test_app) as test_client:
         yield test_client
     test_app.dependency_overrides.clear()
@@ -0,0 +1,116 @@
+"""
+Test cases for the admin diagnostics endpoints and the slow-query recorder
+"""
+from typing import Any
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from cims.database.models import Base
+from cims.database.session import SlowQueryRecorder, get_slow_query_recorder
+from cims.integrations.sqlalchemy import SQLAlchemyHeadhunterRepository
+
+
+def _auth_headers(client: TestClient, email: str, role: str) -> dict[str, str]:
+    client.post("/api/v1/auth/register", json={
+        "name": "Admin Test User",
+        "phone": "1234567890",
+        "email": email,
+        "area_id": 1,
+        "role": role,
+        "password": "adminpassword123"
+    })
+    response = client.post("/api/v1/auth/login", data={"username": email, "password": "adminpassword123"})
+    return {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+
+class TestSlowQueryRecorder:
+    """Test suite for recording slow statements."""
+
+    def test_records_redacted_parameters_and_repository_method(self) -> None:
+        """Test records carry the calling repository method and never the raw email."""
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        recorder = SlowQueryRecorder(threshold_ms=0, capacity=2)
+        recorder.install(engine)
+
+        with sessionmaker(bind=engine)() as session:
+            repository = SQLAlchemyHeadhunterRepository(session)
+            repository.get_headhunter_by_email("secret.person@example.com")
+            repository.count_all_headhunters()
+            repository.get_headhunter_by_id(1)
+
+        records = recorder.records()
+        assert len(records) == 2  # bounded by capacity
+        assert records[0]["repository_method"] == "SQLAlchemyHeadhunterRepository.get_headhunter_by_id"
+        assert records[1]["repository_method"] == "SQLAlchemyHeadhunterRepository.count_all_headhunters"
+        assert "secret.person@example.com" not in str(records)
+
+        recorder.clear()
+        assert recorder.records() == []
+
+    def test_redacts_sensitive_parameter_names(self) -> None:
+        """Test parameters bound to sensitive columns are replaced."""
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        recorder = SlowQueryRecorder(threshold_ms=0)
+        recorder.install(engine)
+
+        with sessionmaker(bind=engine)() as session:
+            SQLAlchemyHeadhunterRepository(session).get_headhunter_by_email("someone@example.com")
+
+        parameters = recorder.records()[0]["parameters"]
+        assert list(parameters[0].values())[0] == "<redacted>"
+
+
+class TestAdminAPI:
+    """Test suite for admin-only endpoints."""
+
+    def test_slow_queries_requires_authentication(self, client: TestClient) -> None:
+        """Test anonymous requests are rejected."""
+        response = client.get("/api/v1/admin/slow-queries")
+
+        assert response.status_code == 401
+
+    def test_slow_queries_requires_admin_role(self, client: TestClient) -> None:
+        """Test headhunters without the admin role are forbidden."""
+        headers = _auth_headers(client, "plain@test.com", "headhunter")
+
+        response = client.get("/api/v1/admin/slow-queries", headers=headers)
+
+        assert response.status_code == 403
+
+    def test_slow_queries_disabled(self, client: TestClient) -> None:
+        """Test 404 when no threshold is configured."""
+        headers = _auth_headers(client, "admin@test.com", "admin")
+
+        response = client.get("/api/v1/admin/slow-queries", headers=headers)
+
+        assert response.status_code == 404
+
+    def test_list_and_clear_slow_queries(self, client: TestClient) -> None:
+        """Test admins can read and clear recorded statements."""
+        headers = _auth_headers(client, "admin@test.com", "admin")
+        recorder = SlowQueryRecorder(threshold_ms=0)
+        recorder._records.append({
+            "recorded_at": "2025-01-01T00:00:00+00:00",
+            "duration_ms": 512.5,
+            "statement": "SELECT 1",
+            "parameters": None,
+            "route": "GET /api/v1/projects/",
+            "repository_method": "SQLAlchemyProjectRepository.get_all_projects",
+            "plan": None,
+        })
+        client.app.dependency_overrides[get_slow_query_recorder] = lambda: recorder  # type: ignore[attr-defined]
+
+        response = client.get("/api/v1/admin/slow-queries", headers=headers)
+
+        assert response.status_code == 200
+        data: dict[str, Any] = response.json()
+        assert data["data"][0]["repository_method"] == "SQLAlchemyProjectRepository.get_all_projects"
+
+        response = client.delete("/api/v1/admin/slow-queries", headers=headers)
+
+        assert response.status_code == 200
+        assert recorder.records() == []
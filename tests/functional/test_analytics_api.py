@@ -0,0 +1,306 @@
+"""
+Test cases for the analytics endpoints
+"""
+from typing import Any
+import datetime
+
+import pytest # type: ignore
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from cims.core.entities.nominee import Nominee
+from cims.core.salary_stats import salary_stats_cache
+from cims.database.models import CandidateDB, HeadhunterDB, HeadhunterDailyStatsDB, NomineeDB, ProjectDB
+from cims.integrations.sqlalchemy.candidate_repository import SQLAlchemyCandidateRepository
+from cims.integrations.sqlalchemy.headhunter_stats import headhunter_period_stats, refresh_headhunter_daily_stats
+from cims.integrations.sqlalchemy.nominee_repository import SQLAlchemyNomineeRepository
+from tests.functional.test_admin_api import _auth_headers
+
+
+def _candidate(candidate_id: int, headhunter_id: int) -> CandidateDB:
+    return CandidateDB(
+        candidate_id=candidate_id, name=f"Candidate {candidate_id}", phone="0900000000",
+        email=f"c{candidate_id}@test.com", year_of_birth=1990, gender="Nam", education="BSc",
+        source="LinkedIn", expertise_id=1, field_id=1, area_id=1, level_id=1, headhunter_id=headhunter_id,
+    )
+
+def _project(project_id: int, customer_id: int) -> ProjectDB:
+    return ProjectDB(
+        project_id=project_id, name=f"Project {project_id}", start_date=datetime.date(2025, 1, 1),
+        end_date=datetime.date(2025, 12, 31), budget=1000.0, budget_currency="USD", type="CODINH",
+        required_recruits=3, recruited=0, status="TIMKIEMUNGVIEN", customer_id=customer_id,
+        expertise_id=1, area_id=1, level_id=1,
+    )
+
+def _nominee(candidate_id: int, project_id: int, status: str, campaign: str = "Spring", day: int = 10) -> NomineeDB:
+    return NomineeDB(
+        campaign=campaign, status=status, years_of_experience=3, salary_expectation=1000.0, notice_period=30,
+        candidate_id=candidate_id, project_id=project_id,
+        created_at=datetime.datetime(2025, 3, day, 12, tzinfo=datetime.timezone.utc),
+    )
+
+
+class TestFunnelAPI:
+    """Test suite for the recruitment funnel endpoint."""
+
+    @pytest.fixture
+    def nominees(self, db_session: Session) -> None:
+        db_session.add_all([_candidate(1, headhunter_id=1), _candidate(2, headhunter_id=2)])
+        db_session.add_all([_project(1, customer_id=1), _project(2, customer_id=2)])
+        db_session.add_all([
+            _nominee(1, 1, "DECU"),
+            _nominee(1, 1, "PHONGVAN"),
+            _nominee(1, 1, "KYHOPDONG", day=20),
+            _nominee(1, 2, "TUCHOI", campaign="Summer"),
+            _nominee(2, 2, "THUVIEC", day=1),
+        ])
+        db_session.commit()
+
+    def test_funnel_all_nominees(self, client: TestClient, nominees: None) -> None:
+        """Test stage counts are cumulative and conversion rates are derived from them."""
+        response = client.get("/api/v1/analytics/funnel")
+
+        assert response.status_code == 200
+        data: dict[str, Any] = response.json()["data"]
+        assert data["total"] == 5
+        assert data["rejected"] == 1
+        assert data["hired"] == 1
+        assert data["rejection_rate"] == 0.2
+        assert [stage["reached"] for stage in data["stages"]] == [5, 3, 2, 2, 1]
+        assert data["stages"][1]["conversion_from_previous"] == 0.6
+        assert data["stages"][4]["conversion_from_previous"] == 0.5
+
+    @pytest.mark.parametrize("params, total", [
+        ({"project_id": 1}, 3),
+        ({"customer_id": 2}, 2),
+        ({"headhunter_id": 2}, 1),
+        ({"campaign": "Summer"}, 1),
+        ({"created_from": "2025-03-05", "created_to": "2025-03-10"}, 3),
+        ({"customer_id": 1, "headhunter_id": 1, "created_from": "2025-03-15"}, 1),
+    ])
+    def test_funnel_filters(self, client: TestClient, nominees: None, params: dict[str, Any], total: int) -> None:
+        """Test each filter narrows the counted nominees."""
+        response = client.get("/api/v1/analytics/funnel", params=params)
+
+        assert response.status_code == 200
+        assert response.json()["data"]["total"] == total
+
+    def test_funnel_single_query(self, client: TestClient, nominees: None, assert_max_queries: Any) -> None:
+        """Test the funnel is one grouped statement regardless of the number of nominees."""
+        with assert_max_queries(1):
+            response = client.get("/api/v1/analytics/funnel", params={"customer_id": 1, "headhunter_id": 1})
+
+        assert response.status_code == 200
+
+    def test_funnel_empty(self, client: TestClient) -> None:
+        """Test rates are null when no nominee matches."""
+        response = client.get("/api/v1/analytics/funnel", params={"project_id": 999})
+
+        data = response.json()["data"]
+        assert data["total"] == 0
+        assert data["overall_conversion"] is None
+
+    def test_funnel_invalid_window(self, client: TestClient) -> None:
+        """Test an inverted date window is rejected."""
+        response = client.get("/api/v1/analytics/funnel", params={"created_from": "2025-04-01", "created_to": "2025-03-01"})
+
+        assert response.status_code == 400
+
+
+def _headhunter(headhunter_id: int) -> HeadhunterDB:
+    return HeadhunterDB(
+        headhunter_id=headhunter_id, name=f"Headhunter {headhunter_id}", phone="0900000000",
+        email=f"h{headhunter_id}@test.com", hashed_password="x", role="headhunter", area_id=1,
+    )
+
+def _daily_stats(db_session: Session) -> list[tuple[Any, ...]]:
+    return sorted(tuple(row) for row in db_session.execute(select(HeadhunterDailyStatsDB.__table__)).all())
+
+
+class TestLeaderboardAPI:
+    """Test suite for the headhunter leaderboard and its daily aggregates."""
+
+    @pytest.fixture
+    def activity(self, db_session: Session) -> None:
+        db_session.add_all([_headhunter(1), _headhunter(2), _headhunter(3)])
+        db_session.add_all([_candidate(1, headhunter_id=1), _candidate(2, headhunter_id=2), _candidate(3, headhunter_id=3)])
+        db_session.add_all([_project(1, customer_id=1)])
+        db_session.add_all([
+            _nominee(1, 1, "KYHOPDONG", day=3),
+            _nominee(1, 1, "KYHOPDONG", day=4),
+            _nominee(1, 1, "TUCHOI", day=12),
+            _nominee(2, 1, "KYHOPDONG", day=12),
+            _nominee(2, 1, "PHONGVAN", day=12),
+            _nominee(3, 1, "KYHOPDONG", day=13),
+        ])
+        db_session.flush()
+        refresh_headhunter_daily_stats(db_session)
+        db_session.commit()
+
+    def test_leaderboard_month(self, client: TestClient, activity: None) -> None:
+        """Test headhunters are ranked by contracts and tied headhunters share a rank."""
+        response = client.get("/api/v1/analytics/leaderboard", params={"period": "month", "start": "2025-03-01", "end": "2025-03-31"})
+
+        assert response.status_code == 200
+        periods = response.json()["data"]["periods"]
+        assert len(periods) == 1
+        assert periods[0]["period_start"] == "2025-03-01"
+        assert periods[0]["period_end"] == "2025-03-31"
+        entries = periods[0]["entries"]
+        assert [(entry["headhunter_id"], entry["rank"]) for entry in entries] == [(1, 1), (2, 2), (3, 2)]
+        assert entries[0]["contracts_signed"] == 2
+        assert entries[0]["nominees"] == 3
+        assert entries[0]["contract_rate"] == 0.6667
+        assert entries[0]["stage_counts"]["TUCHOI"] == 1
+
+    def test_leaderboard_weeks(self, client: TestClient, activity: None) -> None:
+        """Test nominees are bucketed into the Monday-based week they were created in."""
+        response = client.get("/api/v1/analytics/leaderboard", params={
+            "period": "week", "start": "2025-03-01", "end": "2025-03-31", "rank_by": "nominees", "limit": 1,
+        })
+
+        periods = response.json()["data"]["periods"]
+        # Candidates are created "now", so only the nominee weeks fall in March 2025
+        assert [period["period_start"] for period in periods] == ["2025-03-03", "2025-03-10"]
+        assert periods[1]["headhunters"] == 3
+        assert [entry["headhunter_id"] for entry in periods[1]["entries"]] == [2]
+
+    @pytest.mark.parametrize("period", ["week", "month", "quarter"])
+    def test_daily_table_matches_live_aggregation(self, db_session: Session, activity: None, period: str) -> None:
+        """Test the daily table and the direct aggregation give the same buckets."""
+        start, end = datetime.date(2024, 1, 1), datetime.date(2030, 12, 31)
+
+        assert headhunter_period_stats(db_session, period, start, end, use_daily_stats=True) == \
+            headhunter_period_stats(db_session, period, start, end, use_daily_stats=False)
+
+    def test_write_paths_maintain_daily_stats(self, db_session: Session, activity: None) -> None:
+        """Test candidate and nominee writes leave the daily table equal to a full rebuild."""
+        candidate_repo = SQLAlchemyCandidateRepository(db_session)
+        nominee_repo = SQLAlchemyNomineeRepository(db_session)
+
+        def assert_consistent() -> None:
+            maintained = _daily_stats(db_session)
+            refresh_headhunter_daily_stats(db_session)
+            assert _daily_stats(db_session) == maintained
+
+        nominee = nominee_repo.get_nominee_by_id(1)
+        assert nominee is not None
+        nominee_repo.update_nominee(Nominee(**{**nominee.to_dict(), "status": "THUVIEC"}))
+        assert_consistent()
+
+        nominee_repo.update_many({2: {"candidate_id": 2}, 3: {"status": "DECU"}})
+        assert_consistent()
+
+        candidate_repo.update_many({2: {"headhunter_id": 3}})
+        assert_consistent()
+
+        nominee_repo.delete_many([4, 5])
+        assert_consistent()
+
+        nominee_repo.delete_nominee(6)
+        candidate_repo.delete_candidate(3)
+        assert_consistent()
+        assert sum(row.candidates_sourced for row in db_session.query(HeadhunterDailyStatsDB)) == 2
+
+    def test_admin_rebuild(self, client: TestClient, db_session: Session, activity: None) -> None:
+        """Test admins can rebuild the daily table after writes that bypassed the repositories."""
+        headers = _auth_headers(client, "admin@test.com", "admin")
+        db_session.query(HeadhunterDailyStatsDB).delete()
+        db_session.commit()
+
+        response = client.post("/api/v1/admin/headhunter-stats/refresh", headers=headers)
+
+        assert response.status_code == 200
+        assert len(_daily_stats(db_session)) > 0
+
+    def test_leaderboard_invalid_window(self, client: TestClient) -> None:
+        """Test an inverted date window is rejected."""
+        response = client.get("/api/v1/analytics/leaderboard", params={"start": "2025-04-01", "end": "2025-03-01"})
+
+        assert response.status_code == 400
+
+
+class TestSalaryStatsAPI:
+    """Test suite for the salary expectation statistics endpoints."""
+
+    @pytest.fixture
+    def salaries(self, db_session: Session) -> None:
+        salary_stats_cache.invalidate()
+        db_session.add_all([_candidate(1, headhunter_id=1)])
+        # Project 1: expertise 1, level 1, area 1; project 2 differs in level only
+        db_session.add_all([_project(1, customer_id=1), _project(2, customer_id=1)])
+        db_session.flush()
+        db_session.get(ProjectDB, 2).level_id = 2
+        db_session.add_all([
+            NomineeDB(campaign="Spring", status="DECU", years_of_experience=years, salary_expectation=salary,
+                      notice_period=30, candidate_id=1, project_id=1)
+            for years, salary in [(1, 200.0), (2, 300.0), (3, 400.0), (4, 500.0)]
+        ])
+        db_session.add(NomineeDB(campaign="Spring", status="TUCHOI", years_of_experience=5, salary_expectation=900.0,
+                                 notice_period=30, candidate_id=1, project_id=2))
+        db_session.commit()
+        yield
+        salary_stats_cache.invalidate()
+
+    def test_grouped_stats(self, client: TestClient, salaries: None) -> None:
+        """Test nominees are grouped by their project's dimensions with a fitted experience slope."""
+        response = client.get("/api/v1/analytics/salaries", params={"group_by": ["level", "expertise"], "bins": 2})
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["group_by"] == ["expertise", "level"]
+        assert data["total"] == 5
+        first = data["groups"][0]
+        assert (first["expertise_id"], first["level_id"], first["area_id"]) == (1, 1, None)
+        assert first["percentiles"]["p50"] == 350.0
+        assert first["histogram"] == {"edges": [200.0, 350.0, 500.0], "counts": [2, 2]}
+        assert first["regression"] == {"slope": 100.0, "intercept": 100.0, "r_squared": 1.0}
+        assert data["groups"][1]["regression"] is None
+
+    def test_filters(self, client: TestClient, salaries: None) -> None:
+        """Test status and dimension filters narrow the nominees."""
+        response = client.get("/api/v1/analytics/salaries", params={"status": "TUCHOI"})
+        assert response.json()["data"]["total"] == 1
+
+        response = client.get("/api/v1/analytics/salaries", params={"level_id": 1, "min_samples": 5})
+        assert response.json()["data"]["groups"] == []
+
+    def test_cache_invalidated_by_nominee_writes(self, client: TestClient, db_session: Session, salaries: None, assert_max_queries: Any) -> None:
+        """Test repeated requests are served from the cache until a nominee is written."""
+        client.get("/api/v1/analytics/salaries")
+        with assert_max_queries(0):
+            cached = client.get("/api/v1/analytics/salaries")
+        assert cached.json()["data"]["total"] == 5
+
+        SQLAlchemyNomineeRepository(db_session).delete_nominee(1)
+
+        assert client.get("/api/v1/analytics/salaries").json()["data"]["total"] == 4
+
+    def test_cache_kept_by_unrelated_writes(self, db_session: Session, salaries: None) -> None:
+        """Test bulk updates only invalidate when they change rows and columns the statistics read."""
+        repo = SQLAlchemyNomineeRepository(db_session)
+        generation = salary_stats_cache.generation
+
+        assert repo.update_many({999: {"salary_expectation": 1.0}}) == 0
+        assert repo.update_many({1: {"campaign": "Autumn", "notice_period": 60}}) == 1
+        assert salary_stats_cache.generation == generation
+
+        assert repo.update_many({1: {"salary_expectation": 250.0}}) == 1
+        assert salary_stats_cache.generation > generation
+
+    def test_budget_check(self, client: TestClient, salaries: None) -> None:
+        """Test the budget per recruit is ranked among the same expertise, level and area."""
+        response = client.get("/api/v1/analytics/salaries/budget-check/1")
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        # A budget of 1000 over 3 recruits is 333.33 per recruit
+        assert data["budget_per_recruit"] == 333.33
+        assert data["percentile_rank"] == 0.5
+        assert data["assessment"] == "typical"
+        assert data["stats"]["count"] == 4
+
+    def test_budget_check_unknown_project(self, client: TestClient) -> None:
+        """Test an unknown project is a 404."""
+        assert client.get("/api/v1/analytics/salaries/budget-check/999").status_code == 404
@@ -2,9 +2,17 @@
 Test cases for Candidate API endpoints
 """
 from typing import Any
+import csv
+import io
+import json
 
+import pytest # type: ignore
 from fastapi.testclient import TestClient
 
+from cims.config import settings
+from cims.core.entities.candidate import Candidate
+from cims.integrations.sqlalchemy.candidate_repository import SQLAlchemyCandidateRepository
+
 
 class TestCandidateAPI:
     """Test class for candidate-related endpoints."""
@@ -254,3 +262,410 @@ class TestCandidateAPI:
         data: dict[str, Any] = response.json()
         assert "detail" in data
         assert data["detail"] == "Candidate not found"
+
+    def test_get_candidates_sparse_fields(self, client: TestClient) -> None:
+        """Test getting candidates with a sparse fieldset."""
+        candidate_data: dict[str, Any] = {
+            "name": "Sparse Candidate",
+            "phone": "1234567890",
+            "email": "sparse@email.com",
+            "year_of_birth": 1990,
+            "gender": "NAM",
+            "education": "Bachelor",
+            "source": "Test",
+            "expertise_id": 1,
+            "field_id": 1,
+            "area_id": 1,
+            "level_id": 1,
+            "headhunter_id": 1
+        }
+        client.post("/api/v1/candidates/", json=candidate_data)
+        
+        response = client.get("/api/v1/candidates/?fields=name,level_name,headhunter_name")
+        
+        assert response.status_code == 200
+        data: dict[str, Any] = response.json()
+        assert data["success"] is True
+        assert "pagination" in data
+        assert len(data["data"]) >= 1
+        for item in data["data"]:
+            assert set(item) == {"name", "candidate_id", "level_name", "headhunter_name"}
+
+    def test_search_candidates_sparse_fields(self, client: TestClient) -> None:
+        """Test searching candidates with a sparse fieldset."""
+        candidate_data: dict[str, Any] = {
+            "name": "Sparse Searchable",
+            "phone": "1234567890",
+            "email": "sparse.search@email.com",
+            "year_of_birth": 1990,
+            "gender": "NU",
+            "education": "Bachelor",
+            "source": "Test",
+            "expertise_id": 1,
+            "field_id": 1,
+            "area_id": 1,
+            "level_id": 1,
+            "headhunter_id": 1
+        }
+        client.post("/api/v1/candidates/", json=candidate_data)
+        
+        response = client.get("/api/v1/candidates/search?query=Sparse Searchable&fields=email")
+        
+        assert response.status_code == 200
+        data: dict[str, Any] = response.json()
+        assert data["data"] == [{"candidate_id": data["data"][0]["candidate_id"], "email": "sparse.search@email.com"}]
+
+    def test_get_candidates_unknown_field(self, client: TestClient) -> None:
+        """Test requesting an unknown field is rejected."""
+        response = client.get("/api/v1/candidates/?fields=name,salary")
+        
+        assert response.status_code == 400
+        assert "salary" in response.json()["detail"]
+
+    def test_get_candidate_with_include(self, client: TestClient) -> None:
+        """Test embedding nominees into a candidate."""
+        candidate_data: dict[str, Any] = {
+            "name": "Candidate With Nominees",
+            "phone": "1234567890",
+            "email": "nominees@email.com",
+            "year_of_birth": 1990,
+            "gender": "NAM",
+            "education": "Bachelor",
+            "source": "Test",
+            "expertise_id": 1,
+            "field_id": 1,
+            "area_id": 1,
+            "level_id": 1,
+            "headhunter_id": 1
+        }
+        candidate_id = client.post("/api/v1/candidates/", json=candidate_data).json()["data"]["candidate_id"]
+        client.post("/api/v1/nominees/", json={
+            "candidate_id": candidate_id,
+            "project_id": 1,
+            "status": "DECU",
+            "campaign": "Include Campaign",
+            "years_of_experience": 3,
+            "salary_expectation": 50000.0,
+            "notice_period": 30
+        })
+        
+        response = client.get(f"/api/v1/candidates/{candidate_id}?include=nominees")
+        
+        assert response.status_code == 200
+        data: dict[str, Any] = response.json()
+        assert len(data["data"]["nominees"]) == 1
+        assert data["data"]["nominees"][0]["nominee_name"] == "Candidate With Nominees"
+
+    def test_export_candidates_ndjson(self, client: TestClient, setup_test_data: dict) -> None:
+        """Test streaming a filtered candidate export as NDJSON."""
+        for index in range(3):
+            client.post("/api/v1/candidates/", json={
+                "name": f"Export Candidate {index}",
+                "phone": "1234567890",
+                "email": f"export{index}@email.com",
+                "year_of_birth": 1990,
+                "gender": "NAM",
+                "education": "Bachelor",
+                "source": "Test",
+                "expertise_id": 1,
+                "field_id": 1,
+                "area_id": 1,
+                "level_id": 1,
+                "headhunter_id": 1
+            })
+
+        response = client.get("/api/v1/candidates/export?query=Export Candidate")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert 'filename="candidates.ndjson"' in response.headers["content-disposition"]
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["name"] for row in rows] == [f"Export Candidate {index}" for index in range(3)]
+        assert rows[0]["level_name"] == "Test Level"
+
+    def test_export_candidates_csv(self, client: TestClient) -> None:
+        """Test streaming a candidate export as CSV."""
+        client.post("/api/v1/candidates/", json={
+            "name": "Csv Candidate",
+            "phone": "1234567890",
+            "email": "csv@email.com",
+            "year_of_birth": 1990,
+            "gender": "NU",
+            "education": "Master",
+            "source": "Test",
+            "expertise_id": 1,
+            "field_id": 1,
+            "area_id": 1,
+            "level_id": 1,
+            "headhunter_id": 1
+        })
+
+        response = client.get("/api/v1/candidates/export?format=csv&query=Csv")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert rows[0]["name"] == "Csv Candidate"
+        assert rows[0]["gender"] == "NU"
+        assert "candidate_id" in rows[0]
+
+    def test_bulk_import_candidates_json(self, client: TestClient) -> None:
+        """Test bulk importing candidates from JSON with per-row results."""
+        rows: list[dict[str, Any]] = [
+            {
+                "name": f"Bulk Candidate {index}",
+                "phone": "1234567890",
+                "email": f"bulk{index}@email.com",
+                "year_of_birth": 1990,
+                "gender": "NAM",
+                "education": "Bachelor",
+                "source": "Import",
+                "expertise_id": 1,
+                "field_id": 1,
+                "area_id": 1,
+                "level_id": 1,
+                "headhunter_id": 1
+            }
+            for index in range(5)
+        ]
+        rows[2]["email"] = "not-an-email"
+        
+        response = client.post("/api/v1/candidates/bulk?batch_size=2", json=rows)
+        
+        assert response.status_code == 200
+        data: dict[str, Any] = response.json()
+        assert data["success"] is False
+        summary = data["data"]
+        assert summary["total"] == 5
+        assert summary["succeeded"] == 4
+        assert summary["failed"] == 1
+        assert summary["results"][2]["success"] is False
+        assert summary["results"][2]["errors"][0].startswith("email")
+        created_ids = [result["candidate_id"] for result in summary["results"] if result["success"]]
+        assert len(created_ids) == 4
+        
+        get_response = client.get(f"/api/v1/candidates/{created_ids[-1]}")
+        assert get_response.json()["data"]["name"] == "Bulk Candidate 4"
+
+    def test_bulk_import_failed_batch_retried_by_row(self, client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a batch failing on insert is retried row by row, so only the bad row is reported."""
+        create_many = SQLAlchemyCandidateRepository.create_many
+
+        def failing_create_many(self: SQLAlchemyCandidateRepository, candidates: list[Candidate], commit: bool = True) -> list[Candidate]:
+            if any(candidate.name == "Unsavable Candidate" for candidate in candidates):
+                raise ValueError("cannot store row")
+            return create_many(self, candidates, commit)
+
+        monkeypatch.setattr(SQLAlchemyCandidateRepository, "create_many", failing_create_many)
+        rows = [self.bulk_row(f"Retried Candidate {index}", f"retried{index}@email.com") for index in range(3)]
+        rows[1]["name"] = "Unsavable Candidate"
+
+        response = client.post("/api/v1/candidates/bulk?batch_size=3", json=rows)
+
+        results = response.json()["data"]["results"]
+        assert [result["success"] for result in results] == [True, False, True]
+        assert results[1]["errors"] == ["Insert failed: cannot store row"]
+        assert all(results[index]["candidate_id"] for index in (0, 2))
+
+    @staticmethod
+    def bulk_row(name: str, email: str) -> dict[str, Any]:
+        return {
+            "name": name,
+            "phone": "1234567890",
+            "email": email,
+            "year_of_birth": 1990,
+            "gender": "NAM",
+            "education": "Bachelor",
+            "source": "Import",
+            "expertise_id": 1,
+            "field_id": 1,
+            "area_id": 1,
+            "level_id": 1,
+            "headhunter_id": 1
+        }
+
+    def test_bulk_import_candidates_csv_dry_run(self, client: TestClient) -> None:
+        """Test validating a CSV upload without inserting candidates."""
+        content = (
+            "name,phone,email,year_of_birth,gender,education,source,expertise_id,field_id,area_id,level_id,headhunter_id,note\n"
+            "Dry Run Candidate,1234567890,dryrun@email.com,1991,NU,Master,Import,1,1,1,1,1,\n"
+            "Dry Run Invalid,1234567890,dryrun2@email.com,1850,NU,Master,Import,1,1,1,1,1,Too old\n"
+        )
+        
+        response = client.post(
+            "/api/v1/candidates/bulk?dry_run=true",
+            files={"file": ("candidates.csv", content, "text/csv")}
+        )
+        
+        assert response.status_code == 200
+        summary = response.json()["data"]
+        assert summary["dry_run"] is True
+        assert [result["success"] for result in summary["results"]] == [True, False]
+        assert summary["results"][0]["candidate_id"] is None
+        
+        search_response = client.get("/api/v1/candidates/search?query=Dry Run")
+        assert search_response.json()["pagination"]["total"] == 0
+
+    def test_bulk_import_candidates_invalid_body(self, client: TestClient) -> None:
+        """Test bulk import rejects a body that is not an array."""
+        response = client.post("/api/v1/candidates/bulk", json={"name": "Not a list"})
+        
+        assert response.status_code == 400
+
+
+class TestCandidateDuplicates:
+    """Test duplicate detection on candidate creation and the duplicate scan."""
+
+    @staticmethod
+    def _candidate(name: str, phone: str, email: str, year_of_birth: int = 1992) -> dict[str, Any]:
+        return {
+            "name": name, "phone": phone, "email": email, "year_of_birth": year_of_birth, "gender": "NU",
+            "education": "Bachelor", "source": "LinkedIn", "expertise_id": 1, "field_id": 1,
+            "area_id": 1, "level_id": 1, "headhunter_id": 1,
+        }
+
+    def test_create_reports_duplicates(self, client: TestClient) -> None:
+        """Test a candidate sharing a normalized phone is created and reported, strongest match first."""
+        first = client.post("/api/v1/candidates/", json=self._candidate("Trần Thị Mai", "+84 912 345 678", "mai.tran@gmail.com"))
+        namesake = client.post("/api/v1/candidates/", json=self._candidate("Mai Tran Thi", "0987654321", "other@email.com"))
+        assert first.json()["duplicates"] == []
+        assert [d["reasons"] for d in namesake.json()["duplicates"]] == [["name_key"]]
+
+        response = client.post("/api/v1/candidates/", json=self._candidate("Tran Thi Mai", "0912345678", "MaiTran+cv@gmail.com"))
+
+        assert response.status_code == 201
+        data: dict[str, Any] = response.json()
+        assert [(d["candidate_id"], d["reasons"]) for d in data["duplicates"]] == [
+            (first.json()["data"]["candidate_id"], ["phone_key", "email_key", "name_key"]),
+            (namesake.json()["data"]["candidate_id"], ["name_key"]),
+        ]
+        assert "possible duplicate" in data["message"]
+
+    def test_reject_policy(self, client: TestClient, monkeypatch: Any) -> None:
+        """Test the reject policy fails shared emails with 409 unless overridden, but not shared names."""
+        monkeypatch.setattr(settings, "DUPLICATE_CANDIDATE_POLICY", "reject")
+        client.post("/api/v1/candidates/", json=self._candidate("Le Van Hung", "0901111111", "hung.le@company.vn"))
+
+        rejected = client.post("/api/v1/candidates/", json=self._candidate("Hung Le", "0902222222", "hung.le+2@company.vn"))
+        namesake = client.post("/api/v1/candidates/", json=self._candidate("Lê Văn Hùng", "0903333333", "hung@other.vn"))
+        forced = client.post(
+            "/api/v1/candidates/?allow_duplicate=true",
+            json=self._candidate("Hung Le", "0902222222", "hung.le+2@company.vn")
+        )
+
+        assert rejected.status_code == 409
+        assert namesake.status_code == 201
+        assert forced.status_code == 201
+
+    def test_bulk_import_reports_duplicates(self, client: TestClient) -> None:
+        """Test imported rows report existing duplicates and are still imported under the warn policy."""
+        existing = client.post("/api/v1/candidates/", json=self._candidate("Ngo Bao Chau", "0911111111", "chau@one.vn"))
+
+        response = client.post("/api/v1/candidates/bulk", json=[
+            self._candidate("Chau Ngo", "+84 911 111 111", "chau.ngo@two.vn"),
+            self._candidate("Dinh Cong Son", "0912222222", "son@one.vn"),
+        ])
+
+        summary = response.json()["data"]
+        assert summary["succeeded"] == 2
+        assert [[(d["candidate_id"], d["reasons"]) for d in result["duplicates"]] for result in summary["results"]] == [
+            [(existing.json()["data"]["candidate_id"], ["phone_key"])],
+            [],
+        ]
+        assert "1 possible duplicates" in response.json()["message"]
+
+    def test_bulk_import_reject_policy(self, client: TestClient, monkeypatch: Any) -> None:
+        """Test the reject policy fails rows sharing a phone or email with a candidate or an earlier row."""
+        monkeypatch.setattr(settings, "DUPLICATE_CANDIDATE_POLICY", "reject")
+        client.post("/api/v1/candidates/", json=self._candidate("Ly Thu Ha", "0913333333", "ha@one.vn"))
+        rows = [
+            self._candidate("Ha Ly", "0914444444", "HA@one.vn"),
+            self._candidate("Mac Van Khoa", "0915555555", "khoa@one.vn"),
+            self._candidate("Khoa Mac", "0915555555", "khoa@two.vn"),
+            self._candidate("Lý Thu Hà", "0916666666", "ha@other.vn"),
+        ]
+
+        rejected = client.post("/api/v1/candidates/bulk?dry_run=true", json=rows).json()["data"]
+        forced = client.post("/api/v1/candidates/bulk?allow_duplicate=true", json=rows).json()["data"]
+
+        assert [result["success"] for result in rejected["results"]] == [False, True, False, True]
+        assert rejected["results"][0]["errors"][0].startswith("Candidate already exists with the same phone or email")
+        assert rejected["results"][2]["errors"] == ["Same phone or email as row 2"]
+        assert [d["reasons"] for d in rejected["results"][3]["duplicates"]] == [["name_key"]]
+        assert forced["succeeded"] == 4
+
+    def test_duplicate_keys_follow_updates(self, client: TestClient) -> None:
+        """Test a changed phone is matched on its new value only."""
+        created = client.post("/api/v1/candidates/", json=self._candidate("Pham Quoc Bao", "0904444444", "bao@one.vn"))
+        candidate_id = created.json()["data"]["candidate_id"]
+        client.put(f"/api/v1/candidates/{candidate_id}", json={"phone": "0905555555"})
+
+        old_phone = client.post("/api/v1/candidates/", json=self._candidate("Someone Else", "0904444444", "x@two.vn"))
+        new_phone = client.post("/api/v1/candidates/", json=self._candidate("Another One", "+84905555555", "y@three.vn"))
+
+        assert old_phone.json()["duplicates"] == []
+        assert [d["candidate_id"] for d in new_phone.json()["duplicates"]] == [candidate_id]
+
+    def test_admin_duplicate_scan(self, client: TestClient) -> None:
+        """Test the scan clusters candidates linked through different keys."""
+        ids = [
+            client.post("/api/v1/candidates/", json=candidate).json()["data"]["candidate_id"]
+            for candidate in [
+                self._candidate("Vo Minh Khoa", "0906666666", "khoa@one.vn"),
+                self._candidate("Khoa Vo", "0906666666", "khoa.vo@two.vn"),
+                self._candidate("K. Vo", "0907777777", "khoa.vo@two.vn"),
+                self._candidate("Do Thanh Tam", "0908888888", "tam@one.vn", 1980),
+                self._candidate("Tam Do Thanh", "0909999999", "tam@two.vn", 1980),
+            ]
+        ]
+        client.post("/api/v1/auth/register", json={
+            "name": "Dedup Admin", "phone": "1234567890", "email": "dedup-admin@test.com",
+            "area_id": 1, "role": "admin", "password": "adminpassword123"
+        })
+        token = client.post("/api/v1/auth/login", data={"username": "dedup-admin@test.com", "password": "adminpassword123"})
+        headers = {"Authorization": f"Bearer {token.json()['data']['access_token']}"}
+
+        response = client.get("/api/v1/admin/candidate-duplicates", headers=headers)
+        strong = client.get("/api/v1/admin/candidate-duplicates?strong_only=true", headers=headers)
+
+        assert response.status_code == 200
+        clusters = {tuple(cluster["candidate_ids"]): cluster["reasons"] for cluster in response.json()["data"]}
+        assert clusters[tuple(ids[:3])] == ["phone_key", "email_key"]
+        assert clusters[tuple(ids[3:])] == ["name_key"]
+        assert tuple(ids[3:]) not in {tuple(cluster["candidate_ids"]) for cluster in strong.json()["data"]}
+
+
+class TestCandidateNameSearch:
+    """Test accent-insensitive, typo-tolerant candidate search."""
+
+    def test_search_ignores_diacritics_and_typos(self, client: TestClient) -> None:
+        """Test names are found without tone marks or with a typo, best match first."""
+        ids = [
+            client.post("/api/v1/candidates/", json=TestCandidateDuplicates._candidate(name, f"09{index:08d}", f"s{index}@x.vn")).json()["data"]["candidate_id"]
+            for index, name in enumerate(["Nguyễn Văn Đạt", "Nguyễn Văn Đạo", "Trần Minh Đạt"])
+        ]
+
+        exact = client.get("/api/v1/candidates/search", params={"query": "nguyen van dat"}).json()
+        typo = client.get("/api/v1/candidates/search", params={"query": "Nguyn"}).json()
+        filtered = client.get("/api/v1/candidates/search", params={"query": "dat", "level_id": 2}).json()
+        sparse = client.get("/api/v1/candidates/search", params={"query": "tran minh dat", "fields": "name"}).json()
+
+        assert [c["candidate_id"] for c in exact["data"]][:2] == ids[:2]
+        assert exact["pagination"]["total"] == 2
+        assert {c["candidate_id"] for c in typo["data"]} >= set(ids[:2])
+        assert filtered["pagination"]["total"] == 0
+        assert sparse["data"][0] == {"candidate_id": ids[2], "name": "Trần Minh Đạt"}
+
+    def test_search_follows_renames(self, client: TestClient) -> None:
+        """Test the index picks up a renamed candidate."""
+        client.get("/api/v1/candidates/search", params={"query": "anything"})
+        created = client.post("/api/v1/candidates/", json=TestCandidateDuplicates._candidate("Hoàng Thu Hằng", "0911000000", "h@x.vn"))
+        candidate_id = created.json()["data"]["candidate_id"]
+        client.put(f"/api/v1/candidates/{candidate_id}", json={"name": "Lý Quốc Bảo"})
+
+        old = client.get("/api/v1/candidates/search", params={"query": "hoang thu hang"}).json()
+        new = client.get("/api/v1/candidates/search", params={"query": "ly quoc bao"}).json()
+
+        assert candidate_id not in [c["candidate_id"] for c in old["data"]]
+        assert [c["candidate_id"] for c in new["data"]] == [candidate_id]
@@ -80,6 +80,23 @@ class TestCustomerAPI:
         assert data["success"] is True
         assert "data" in data
 
+    def test_search_customers_ignores_diacritics(self, client: TestClient) -> None:
+        """Test customer names are found without tone marks, best match first."""
+        for name in ["Công ty Cổ phần Đông Á", "Công ty TNHH Đông Hải"]:
+            client.post("/api/v1/customers/", json={
+                "name": name,
+                "field_id": 1,
+                "representative_name": "Contact",
+                "representative_phone": "1234567890",
+                "representative_email": "contact@test.com",
+                "representative_role": "Manager"
+            })
+
+        response = client.get("/api/v1/customers/search?query=dong a")
+
+        assert response.status_code == 200
+        assert [customer["name"] for customer in response.json()["data"]][:1] == ["Công ty Cổ phần Đông Á"]
+
     def test_get_customer_by_id_success(self, client: TestClient) -> None:
         """Test getting customer by ID."""
         # First create a customer
@@ -172,3 +189,23 @@ class TestCustomerAPI:
         data: dict[str, Any] = response.json()
         assert "detail" in data
         assert data["detail"] == "Customer not found"
+
+    def test_get_customers_sparse_fields(self, client: TestClient) -> None:
+        """Test getting customers with a sparse fieldset."""
+        customer_data: dict[str, Any] = {
+            "name": "Sparse Customer",
+            "field_id": 1,
+            "representative_name": "Sparse Contact",
+            "representative_phone": "1234567890",
+            "representative_email": "sparse@test.com",
+            "representative_role": "Manager"
+        }
+        client.post("/api/v1/customers/", json=customer_data)
+        
+        response = client.get("/api/v1/customers/search?query=Sparse&fields=name,field_name")
+        
+        assert response.status_code == 200
+        data: dict[str, Any] = response.json()
+        assert len(data["data"]) == 1
+        assert set(data["data"][0]) == {"customer_id", "name", "field_name"}
+        assert data["data"][0]["name"] == "Sparse Customer"
@@ -0,0 +1,128 @@
+"""
+Test cases for the change event stream
+"""
+from typing import Any
+import asyncio
+import json
+
+import pytest # type: ignore
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from cims.api.v1.events import stream_changes
+from cims.config import settings
+from cims.core.change_events import change_event_bus
+from cims.integrations.sqlalchemy.candidate_repository import SQLAlchemyCandidateRepository
+from cims.integrations.sqlalchemy.customer_repository import SQLAlchemyCustomerRepository
+from cims.integrations.sqlalchemy.nominee_repository import SQLAlchemyNomineeRepository
+from cims.integrations.sqlalchemy.project_repository import SQLAlchemyProjectRepository
+from tests.functional import test_project_api
+
+pipeline_api = test_project_api.TestProjectPipelineAPI
+
+
+class TestChangeEventStreamAPI:
+    """Test suite for the server-sent change events."""
+
+    @pytest.fixture(autouse=True)
+    def short_streams(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # Streams end on their own so the test client can read the whole response
+        monkeypatch.setattr(settings, "CHANGE_EVENT_STREAM_MAX_SECONDS", 0.2)
+        monkeypatch.setattr(settings, "CHANGE_EVENT_HEARTBEAT_SECONDS", 0.05)
+
+    @staticmethod
+    def stream(client: TestClient, last_event_id: str, **params: Any) -> list[tuple[str, dict[str, Any]]]:
+        response = client.get("/api/v1/events/stream", params=params, headers={"Last-Event-ID": last_event_id})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+
+        events = []
+        for block in response.text.split("\n\n"):
+            fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":") and ": " in line)
+            if "data" in fields:
+                events.append((fields["event"], json.loads(fields["data"])))
+        return events
+
+    def test_replays_changes_of_a_project(self, client: TestClient, setup_test_data: dict) -> None:
+        """Test a reconnecting client gets the project's missed changes, with changed fields and scopes."""
+        cursor = change_event_bus.last_event_id
+        project_id = pipeline_api.create_project(client, setup_test_data, required=1, recruited=0)
+        other_project_id = pipeline_api.create_project(client, setup_test_data, required=1, recruited=0)
+        nominee_id = pipeline_api.create_nominee(client, project_id, "DECU")
+        pipeline_api.create_nominee(client, other_project_id, "DECU")
+        client.patch("/api/v1/nominees/status", json={"nominee_ids": [nominee_id], "status": "PHONGVAN"})
+
+        events = self.stream(client, cursor, project_id=project_id)
+
+        assert [(event["entity_type"], event["action"], event["entity_id"]) for _, event in events] == [
+            ("project", "created", project_id),
+            ("nominee", "created", nominee_id),
+            ("nominee", "updated", nominee_id),
+        ]
+        assert {name for name, _ in events} == {"change"}
+        assert events[2][1]["fields"] == ["status"]
+        assert all(event["customer_ids"] == [setup_test_data["customer"]["customer_id"]] for _, event in events)
+
+    def test_filters_by_entity_type(self, client: TestClient, setup_test_data: dict) -> None:
+        """Test only the requested entity types are streamed."""
+        cursor = change_event_bus.last_event_id
+        project_id = pipeline_api.create_project(client, setup_test_data, required=1, recruited=0)
+        client.put(f"/api/v1/projects/{project_id}", json={"required_recruits": 4})
+        pipeline_api.create_nominee(client, project_id, "DECU")
+
+        events = self.stream(client, cursor, entity_type="project")
+
+        assert [(event["action"], event["fields"]) for _, event in events] == [("created", None), ("updated", ["required_recruits"])]
+
+    def test_bulk_writes_announce_only_rows_hit(self, client: TestClient, db_session: Session, setup_test_data: dict) -> None:
+        """Test bulk writes publish nothing for missing rows or empty patches."""
+        customer_id = setup_test_data["customer"]["customer_id"]
+        cursor = change_event_bus.last_event_id
+
+        assert SQLAlchemyCustomerRepository(db_session).update_many({999: {"name": "Nobody"}, customer_id: {"name": "Renamed"}}) == 1
+        assert SQLAlchemyCustomerRepository(db_session).delete_many([12345]) == 0
+        assert SQLAlchemyCandidateRepository(db_session).update_many({12345: {"email": "nobody@example.com"}}) == 0
+        assert SQLAlchemyCandidateRepository(db_session).delete_many([12345]) == 0
+        assert SQLAlchemyProjectRepository(db_session).update_many({12345: {"required_recruits": 2}}) == 0
+        assert SQLAlchemyProjectRepository(db_session).delete_many([12345]) == 0
+        assert SQLAlchemyNomineeRepository(db_session).update_many({777: {"status": "PHONGVAN"}}) == 0
+        assert SQLAlchemyNomineeRepository(db_session).update_many({777: {"notice_period": 30}}) == 0
+        assert SQLAlchemyNomineeRepository(db_session).delete_many([777]) == 0
+        assert SQLAlchemyCustomerRepository(db_session).update_many({customer_id: {}}) == 0
+
+        events = self.stream(client, cursor)
+
+        assert [(event["entity_type"], event["action"], event["entity_id"], event["fields"]) for _, event in events] == [
+            ("customer", "updated", customer_id, ["name"]),
+        ]
+
+    def test_unknown_cursor_resets(self, client: TestClient) -> None:
+        """Test a cursor from another process or restart asks the client to reload."""
+        events = self.stream(client, "0000-12")
+
+        assert events == [("reset", {"last_event_id": change_event_bus.last_event_id})]
+
+    def test_invalid_filter_or_cursor_is_rejected(self, client: TestClient) -> None:
+        """Test a malformed cursor or a non-positive ID is a client error and subscribes nothing."""
+        subscribers = change_event_bus.subscriber_count()
+
+        malformed = client.get("/api/v1/events/stream", headers={"Last-Event-ID": "not-an-id"})
+        bad_project = client.get("/api/v1/events/stream", params={"project_id": 0})
+
+        assert malformed.status_code == 400
+        assert "not a valid event ID" in malformed.json()["detail"]
+        assert bad_project.status_code == 400
+        assert "project_id" in bad_project.json()["detail"]
+        assert change_event_bus.subscriber_count() == subscribers
+
+    def test_subscribes_only_while_streaming(self, client: TestClient) -> None:
+        """Test a stream that never starts leaves no subscription and a finished one removes its own."""
+        subscribers = change_event_bus.subscriber_count()
+
+        response = asyncio.run(stream_changes(None, None, None, None, None))
+        assert isinstance(response, StreamingResponse)
+        assert change_event_bus.subscriber_count() == subscribers
+
+        self.stream(client, change_event_bus.last_event_id)
+        assert change_event_bus.subscriber_count() == subscribers
@@ -0,0 +1,61 @@
+"""
+Test cases for the health check endpoints
+"""
+from typing import Any
+
+import pytest # type: ignore
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from cims.api.health import pool_status
+from cims.config import settings
+from cims.deps import get_db_engine
+
+
+class TestHealthAPI:
+    """Test suite for liveness and readiness probes."""
+
+    def test_liveness(self, client: TestClient) -> None:
+        """Test liveness does not depend on the database."""
+        response = client.get("/health/live")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+    def test_readiness_probes_database_and_caches(self, client: TestClient) -> None:
+        """Test readiness runs a query, reports the pool and reuses the result briefly."""
+        first = client.get("/health/ready")
+        second = client.get("/health/ready")
+
+        assert first.status_code == 200
+        data: dict[str, Any] = first.json()
+        assert data["status"] == "ready"
+        assert data["database"]["status"] == "ok"
+        assert second.json()["cached"] is True
+
+    def test_readiness_unavailable_database(self, client: TestClient) -> None:
+        """Test readiness returns 503 when the database cannot be reached."""
+        broken_engine = create_engine("sqlite:////nonexistent-dir/cims.db")
+        client.app.dependency_overrides[get_db_engine] = lambda: broken_engine  # type: ignore[attr-defined]
+
+        response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["database"]["status"] == "error"
+
+    def test_pool_saturation_uses_configured_overflow(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test saturation counts the configured overflow connections into the pool's capacity."""
+        monkeypatch.setattr(settings, "DB_POOL_MAX_OVERFLOW", 2)
+        engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=2, max_overflow=2)
+        connections = [engine.connect() for _ in range(3)]
+        try:
+            status = pool_status(engine)
+        finally:
+            for connection in connections:
+                connection.close()
+            engine.dispose()
+
+        assert status is not None
+        assert (status["size"], status["max_overflow"], status["checked_out"], status["overflow"]) == (2, 2, 3, 1)
+        assert status["saturation"] == 0.75
@@ -0,0 +1,30 @@
+"""
+Test cases for the metrics endpoint
+"""
+from fastapi.testclient import TestClient
+
+
+class TestMetricsAPI:
+    """Test suite for the metrics endpoint."""
+
+    def test_metrics_include_route_latency(self, client: TestClient) -> None:
+        """Test request latency is recorded per route template."""
+        client.get("/api/v1/candidates/12345")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        count_lines = [line for line in response.text.splitlines() if line.startswith("cims_http_request_duration_seconds_count")]
+        assert any('/candidates/{candidate_id}",status="404"}' in line for line in count_lines)
+        assert "# TYPE cims_http_requests_in_flight gauge" in response.text
+
+    def test_in_flight_requests_per_route(self, client: TestClient) -> None:
+        """Test in-flight requests are counted under their route template while they run."""
+        client.get("/api/v1/candidates/12345")
+
+        response = client.get("/metrics")
+
+        assert 'cims_http_requests_in_flight{method="GET",route="/metrics"} 1' in response.text
+        gauge_lines = [line for line in response.text.splitlines() if line.startswith("cims_http_requests_in_flight{")]
+        assert any(line.endswith('/candidates/{candidate_id}"} 0') for line in gauge_lines)
@@ -1,10 +1,17 @@
 """
 Test cases for Nominee API endpoints
 """
-from typing import Any
+from typing import Any, Callable, ContextManager
+import json
 
 import pytest # type: ignore
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from cims.core.entities.nominee import Nominee
+from cims.database.models import Base
+from cims.integrations.sqlalchemy import SQLAlchemyNomineeRepository, SQLAlchemyUnitOfWork
 
 
 class TestNomineeAPI:
@@ -185,3 +192,203 @@ class TestNomineeAPI:
             assert response.status_code == 201
             data: dict[str, Any] = response.json()
             assert data["data"]["status"] == status
+
+    def test_get_nominees_sparse_fields(self, client: TestClient) -> None:
+        """Test getting nominees with a sparse fieldset."""
+        client.post("/api/v1/nominees/", json=self.get_valid_nominee_data())
+
+        response = client.get("/api/v1/nominees/?fields=status,project_name")
+
+        assert response.status_code == 200
+        data: dict[str, Any] = response.json()
+        assert len(data["data"]) >= 1
+        for item in data["data"]:
+            assert set(item) == {"nominee_id", "status", "project_name"}
+
+    def test_search_nominees_sparse_fields(self, client: TestClient) -> None:
+        """Test searching nominees by status with a sparse fieldset."""
+        nominee_data = self.get_valid_nominee_data()
+        nominee_data["status"] = "THUVIEC"
+        client.post("/api/v1/nominees/", json=nominee_data)
+
+        response = client.get("/api/v1/nominees/search?query=THUVIEC&fields=status,campaign")
+
+        assert response.status_code == 200
+        data: dict[str, Any] = response.json()
+        assert len(data["data"]) >= 1
+        for item in data["data"]:
+            assert set(item) == {"nominee_id", "status", "campaign"}
+            assert item["status"] == "THUVIEC"
+
+    def test_get_nominees_by_project_with_include(self, client: TestClient, setup_test_data: dict) -> None:
+        """Test embedding candidates and project customers into nominees by project."""
+        project_response = client.post("/api/v1/projects/", json={
+            "status": "TIMKIEMUNGVIEN",
+            "start_date": "2024-01-01",
+            "end_date": "2024-12-31",
+            "budget": 100000.0,
+            "budget_currency": "USD",
+            "type": "CODINH",
+            "required_recruits": 2,
+            "recruited": 0,
+            "customer_id": setup_test_data["customer"]["customer_id"],
+            "expertise_id": setup_test_data["expertise"]["expertise_id"],
+            "area_id": setup_test_data["area"]["area_id"],
+            "level_id": setup_test_data["level"]["level_id"],
+        })
+        project_id = project_response.json()["data"]["project_id"]
+        candidate_response = client.post("/api/v1/candidates/", json={
+            "name": "Included Candidate",
+            "phone": "1234567890",
+            "email": "included@email.com",
+            "year_of_birth": 1990,
+            "gender": "NAM",
+            "education": "Bachelor",
+            "source": "Test",
+            "expertise_id": 1,
+            "field_id": 1,
+            "area_id": 1,
+            "level_id": 1,
+            "headhunter_id": 1
+        })
+        candidate_id = candidate_response.json()["data"]["candidate_id"]
+
+        nominee_data = self.get_valid_nominee_data()
+        nominee_data["candidate_id"] = candidate_id
+        nominee_data["project_id"] = project_id
+        client.post("/api/v1/nominees/", json=nominee_data)
+
+        response = client.get(f"/api/v1/nominees/by-project/{project_id}?include=candidate,project.customer")
+
+        assert response.status_code == 200
+        data: dict[str, Any] = response.json()
+        assert len(data["data"]) == 1
+        nominee = data["data"][0]
+        assert nominee["candidate"]["name"] == "Included Candidate"
+        assert nominee["project"]["project_id"] == project_id
+        assert nominee["project"]["customer"]["name"] == "Test Customer"
+
+    def test_get_nominee_unsupported_include(self, client: TestClient) -> None:
+        """Test requesting an unsupported include is rejected."""
+        response = client.get("/api/v1/nominees/1?include=headhunter")
+
+        assert response.status_code == 400
+
+    def test_export_nominees_ndjson(self, client: TestClient) -> None:
+        """Test streaming nominees filtered by status as NDJSON."""
+        for status in ["DECU", "PHONGVAN", "PHONGVAN"]:
+            nominee_data = self.get_valid_nominee_data()
+            nominee_data["status"] = status
+            client.post("/api/v1/nominees/", json=nominee_data)
+
+        response = client.get("/api/v1/nominees/export?status=PHONGVAN")
+
+        assert response.status_code == 200
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) >= 2
+        assert all(row["status"] == "PHONGVAN" for row in rows)
+        assert rows == sorted(rows, key=lambda row: row["nominee_id"])
+        assert set(rows[0]) >= {"nominee_id", "nominee_name", "project_name", "headhunter_name"}
+
+    def test_update_nominee_statuses(self, client: TestClient) -> None:
+        """Test moving several nominees to a new status at once."""
+        nominee_ids = [
+            client.post("/api/v1/nominees/", json=self.get_valid_nominee_data()).json()["data"]["nominee_id"]
+            for _ in range(3)
+        ]
+        
+        response = client.patch("/api/v1/nominees/status", json={
+            "nominee_ids": nominee_ids[:2] + [999999],
+            "status": "PHONGVAN"
+        })
+        
+        assert response.status_code == 200
+        data: dict[str, Any] = response.json()
+        assert data["data"] == {"requested": 3, "updated": 2}
+        statuses = [client.get(f"/api/v1/nominees/{nominee_id}").json()["data"]["status"] for nominee_id in nominee_ids]
+        assert statuses == ["PHONGVAN", "PHONGVAN", "DECU"]
+
+    def test_bulk_writes_unit_of_work_rollback(self) -> None:
+        """Test bulk writes made without committing are discarded when the unit of work fails."""
+        # A private in-memory database, since the shared test session cannot really commit
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        session = Session(bind=engine)
+        try:
+            nominee_repo = SQLAlchemyNomineeRepository(session)
+            created = nominee_repo.create_many([
+                Nominee(**self.get_valid_nominee_data()),
+                Nominee(**{**self.get_valid_nominee_data(), "campaign": "Second Campaign"})
+            ])
+            assert [nominee.campaign for nominee in created] == ["Q1 2024 Campaign", "Second Campaign"]
+            nominee_ids = [nominee.nominee_id for nominee in created]
+            
+            with pytest.raises(RuntimeError):
+                with SQLAlchemyUnitOfWork(session):
+                    patches = {nominee_ids[0]: {"notice_period": 60}, nominee_ids[1]: {"notice_period": 90}}
+                    assert nominee_repo.update_many(patches, commit=False) == 2
+                    assert nominee_repo.delete_many([nominee_ids[1]], commit=False) == 1
+                    raise RuntimeError("abort")
+            
+            remaining = nominee_repo.get_nominees_by_ids(nominee_ids)
+            assert sorted(nominee.notice_period for nominee in remaining) == [30, 30]
+            
+            with SQLAlchemyUnitOfWork(session):
+                nominee_repo.update_many({nominee_id: {"status": "TUCHOI"} for nominee_id in nominee_ids}, commit=False)
+            
+            assert {nominee.status for nominee in nominee_repo.get_nominees_by_ids(nominee_ids)} == {"TUCHOI"}
+            
+            with pytest.raises(ValueError):
+                nominee_repo.update_many({nominee_ids[0]: {"nominee_id": 5}})
+        finally:
+            session.close()
+            engine.dispose()
+
+    def test_get_nominees_by_project_query_count(
+        self,
+        client: TestClient,
+        setup_test_data: dict,
+        assert_max_queries: Callable[[int], ContextManager[list[str]]]
+    ) -> None:
+        """Test nominees by project issues a constant number of queries regardless of nominee count."""
+        project_id = client.post("/api/v1/projects/", json={
+            "status": "TIMKIEMUNGVIEN",
+            "start_date": "2024-01-01",
+            "end_date": "2024-12-31",
+            "budget": 100000.0,
+            "budget_currency": "USD",
+            "type": "CODINH",
+            "required_recruits": 5,
+            "recruited": 0,
+            "customer_id": setup_test_data["customer"]["customer_id"],
+            "expertise_id": setup_test_data["expertise"]["expertise_id"],
+            "area_id": setup_test_data["area"]["area_id"],
+            "level_id": setup_test_data["level"]["level_id"],
+        }).json()["data"]["project_id"]
+        for index in range(5):
+            candidate_id = client.post("/api/v1/candidates/", json={
+                "name": f"Counted Candidate {index}",
+                "phone": "1234567890",
+                "email": f"counted{index}@email.com",
+                "year_of_birth": 1990,
+                "gender": "NAM",
+                "education": "Bachelor",
+                "source": "Test",
+                "expertise_id": 1,
+                "field_id": 1,
+                "area_id": 1,
+                "level_id": 1,
+                "headhunter_id": 1
+            }).json()["data"]["candidate_id"]
+            nominee_data = self.get_valid_nominee_data()
+            nominee_data["candidate_id"] = candidate_id
+            nominee_data["project_id"] = project_id
+            client.post("/api/v1/nominees/", json=nominee_data)
+
+        with assert_max_queries(4):
+            response = client.get(f"/api/v1/nominees/by-project/{project_id}")
+
+        assert response.status_code == 200
+        assert len(response.json()["data"]) == 5
+        assert 1 <= int(response.headers["X-DB-Queries"]) <= 4
+        assert response.headers["Server-Timing"].startswith("db;dur=")
@@ -0,0 +1,111 @@
+"""
+Test cases for the transactional outbox and the aggregate refreshes deferred to it
+"""
+import datetime
+
+import pytest # type: ignore
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from cims.config import settings
+from cims.database.models import OutboxMessageDB, ProjectPipelineSummaryDB
+from cims.integrations.sqlalchemy import outbox
+from cims.integrations.sqlalchemy.outbox import OutboxMessage, drain_outbox, enqueue_outbox, outbox_worker_enabled, retry_delay
+from tests.functional import test_project_api
+
+pipeline_api = test_project_api.TestProjectPipelineAPI
+
+
+class TestOutbox:
+    """Test suite for deferred refreshes, retries and giving up."""
+
+    @pytest.fixture
+    def outbox_mode(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "AGGREGATE_REFRESH_MODE", "outbox")
+
+    @staticmethod
+    def messages(db_session: Session) -> list[OutboxMessageDB]:
+        db_session.expire_all()
+        return list(db_session.scalars(select(OutboxMessageDB).order_by(OutboxMessageDB.message_id)))
+
+    @staticmethod
+    def make_due(db_session: Session) -> None:
+        db_session.execute(update(OutboxMessageDB).values(available_at=datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=1)))
+        db_session.commit()
+
+    def test_summary_refreshed_by_worker(self, client: TestClient, setup_test_data: dict, db_session: Session, outbox_mode: None) -> None:
+        """Test nominee writes leave the summary to the worker, which refreshes it once and only once."""
+        project_id = pipeline_api.create_project(client, setup_test_data, required=2, recruited=0)
+        pipeline_api.create_nominee(client, project_id, "DECU")
+        pipeline_api.create_nominee(client, project_id, "KYHOPDONG")
+
+        assert db_session.get(ProjectPipelineSummaryDB, project_id) is None
+        pending = [message for message in self.messages(db_session) if message.topic == "project_summaries.refresh"]
+        assert len(pending) == 2
+
+        assert drain_outbox(db_session, worker_id="test") == 2
+        db_session.expire_all()
+        summary = db_session.get(ProjectPipelineSummaryDB, project_id)
+        assert (summary.total_nominees, summary.active_nominees, summary.hired) == (2, 1, 1)
+        assert all(message.processed_at is not None for message in self.messages(db_session))
+
+        assert drain_outbox(db_session, worker_id="test") == 0
+
+    def test_failing_message_retried_then_given_up(self, db_session: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a failing message backs off without holding back its batch and is given up on after the last attempt."""
+        def handler(db_session: Session, messages: list[OutboxMessage]) -> None:
+            if any(message.payload["fail"] for message in messages):
+                raise ValueError("broken")
+
+        monkeypatch.setitem(outbox._HANDLERS, "test.topic", handler)
+        monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 2)
+        enqueue_outbox(db_session, "test.topic", {"fail": True}, message_key="bad")
+        enqueue_outbox(db_session, "test.topic", {"fail": False}, message_key="good")
+        db_session.commit()
+
+        assert drain_outbox(db_session, worker_id="test") == 2
+        bad, good = self.messages(db_session)
+        assert good.processed_at is not None
+        assert (bad.attempts, bad.processed_at, bad.failed_at, bad.locked_until) == (1, None, None, None)
+        assert bad.last_error == "ValueError: broken"
+        # Backing off
+        assert drain_outbox(db_session, worker_id="test") == 0
+
+        self.make_due(db_session)
+        assert drain_outbox(db_session, worker_id="test") == 1
+        bad, _ = self.messages(db_session)
+        assert bad.attempts == 2
+        assert bad.failed_at is not None
+
+        self.make_due(db_session)
+        assert drain_outbox(db_session, worker_id="test") == 0
+
+    def test_unknown_topic_fails(self, db_session: Session) -> None:
+        """Test a message nobody handles is retried like a failure."""
+        enqueue_outbox(db_session, "test.unhandled", {})
+        db_session.commit()
+
+        assert drain_outbox(db_session, worker_id="test") == 1
+        message, = self.messages(db_session)
+        assert message.attempts == 1
+        assert message.last_error.startswith("LookupError")
+
+    def test_retry_delay(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the delay doubles per attempt up to the maximum."""
+        monkeypatch.setattr(settings, "OUTBOX_RETRY_BASE_SECONDS", 2.0)
+        monkeypatch.setattr(settings, "OUTBOX_RETRY_MAX_SECONDS", 10.0)
+
+        assert [retry_delay(attempts) for attempts in range(1, 6)] == [2.0, 4.0, 8.0, 10.0, 10.0]
+
+    def test_worker_follows_refresh_mode(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test API processes only drain the outbox when writes use it, unless told otherwise."""
+        monkeypatch.setattr(settings, "OUTBOX_WORKER_ENABLED", None)
+        monkeypatch.setattr(settings, "AGGREGATE_REFRESH_MODE", "inline")
+        assert not outbox_worker_enabled()
+
+        monkeypatch.setattr(settings, "AGGREGATE_REFRESH_MODE", "outbox")
+        assert outbox_worker_enabled()
+
+        monkeypatch.setattr(settings, "OUTBOX_WORKER_ENABLED", False)
+        assert not outbox_worker_enabled()
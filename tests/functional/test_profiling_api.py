@@ -0,0 +1,73 @@
+"""
+Test cases for the on-demand request profiler
+"""
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from cims.api.profiling import PROFILE_HEADER, profile_request, sign_profile_request
+from cims.config import settings
+
+
+def _busy_loop() -> int:
+    total = 0
+    for i in range(400_000):
+        total += i % 7
+    return total
+
+
+@pytest.fixture
+def profiled_client() -> TestClient:
+    app = FastAPI()
+    app.middleware("http")(profile_request)
+
+    @app.get("/work")
+    def work() -> dict[str, int]:
+        return {"total": _busy_loop()}
+
+    return TestClient(app)
+
+
+class TestProfiling:
+    """Test suite for signed request profiling."""
+
+    def test_unsigned_request_is_not_profiled(self, profiled_client: TestClient) -> None:
+        """Test requests without a signature pass through."""
+        response = profiled_client.get("/work")
+
+        assert response.status_code == 200
+        assert "total" in response.json()
+
+    def test_invalid_signature_is_ignored(self, profiled_client: TestClient) -> None:
+        """Test a signature for another endpoint does not enable profiling."""
+        response = profiled_client.get("/work", headers={PROFILE_HEADER: sign_profile_request("GET", "/other")})
+
+        assert response.status_code == 200
+        assert "total" in response.json()
+
+    def test_signed_request_returns_collapsed_stacks(self, profiled_client: TestClient) -> None:
+        """Test a signed header returns folded stacks that include the endpoint code."""
+        response = profiled_client.get("/work", headers={PROFILE_HEADER: sign_profile_request("GET", "/work")})
+
+        assert response.status_code == 200
+        assert response.headers["X-Profiled-Status"] == "200"
+        lines = response.text.splitlines()
+        assert lines
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        assert "_busy_loop" in response.text
+
+    def test_signed_query_flag_stores_profile(
+        self, profiled_client: TestClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test profiles are written to the output directory when configured."""
+        monkeypatch.setattr(settings, "PROFILING_OUTPUT_DIR", str(tmp_path))
+
+        response = profiled_client.get("/work", params={"profile": sign_profile_request("GET", "/work")})
+
+        assert response.status_code == 200
+        assert "total" in response.json()
+        stored = Path(response.headers["X-Profile-File"])
+        assert stored.parent == tmp_path
+        assert "_busy_loop" in stored.read_text()
@@ -6,6 +6,10 @@ import pytest # type: ignore
 from typing import Any
 from fastapi.testclient import TestClient
 from datetime import date # type: ignore
+import csv
+import io
+
+from cims.integrations.sqlalchemy import SQLAlchemyProjectRepository
 
 class TestProjectAPI:
     """Test suite for Project API endpoints."""
@@ -219,3 +223,304 @@ class TestProjectAPI:
         data: dict[str, Any] = response.json()
         assert "detail" in data
         assert data["detail"] == "Project not found"
+
+    def test_get_projects_sparse_fields(self, client: TestClient, setup_test_data: dict) -> None:
+        """Test getting projects with a sparse fieldset."""
+        project_data: dict[str, Any] = {
+            "status": "TIMKIEMUNGVIEN",
+            "start_date": "2024-01-01",
+            "end_date": "2024-12-31",
+            "budget": 100000.0,
+            "budget_currency": "USD",
+            "type": "CODINH",
+            "required_recruits": 3,
+            "recruited": 1,
+            "customer_id": setup_test_data["customer"]["customer_id"],
+            "expertise_id": setup_test_data["expertise"]["expertise_id"],
+            "area_id": setup_test_data["area"]["area_id"],
+            "level_id": setup_test_data["level"]["level_id"],
+        }
+        client.post("/api/v1/projects/", json=project_data)
+        
+        response = client.get("/api/v1/projects/?fields=name,customer_name,required_recruits")
+        
+        assert response.status_code == 200
+        data: dict[str, Any] = response.json()
+        assert len(data["data"]) >= 1
+        project = data["data"][0]
+        assert set(project) == {"project_id", "name", "customer_name", "required_recruits"}
+        assert project["customer_name"] == "Test Customer"
+        
+        search_response = client.get("/api/v1/projects/search?query=Test Customer&fields=level_name")
+        
+        assert search_response.status_code == 200
+        search_data: dict[str, Any] = search_response.json()
+        assert search_data["data"][0]["level_name"] == "Test Level"
+        assert set(search_data["data"][0]) == {"project_id", "level_name"}
+
+    def test_get_project_with_include(self, client: TestClient, setup_test_data: dict) -> None:
+        """Test embedding the customer and nominees into a project."""
+        project_data: dict[str, Any] = {
+            "status": "TIMKIEMUNGVIEN",
+            "start_date": "2024-01-01",
+            "end_date": "2024-12-31",
+            "budget": 100000.0,
+            "budget_currency": "USD",
+            "type": "CODINH",
+            "required_recruits": 2,
+            "recruited": 0,
+            "customer_id": setup_test_data["customer"]["customer_id"],
+            "expertise_id": setup_test_data["expertise"]["expertise_id"],
+            "area_id": setup_test_data["area"]["area_id"],
+            "level_id": setup_test_data["level"]["level_id"],
+        }
+        project_id = client.post("/api/v1/projects/", json=project_data).json()["data"]["project_id"]
+        for status in ["DECU", "PHONGVAN"]:
+            client.post("/api/v1/nominees/", json={
+                "candidate_id": 1,
+                "project_id": project_id,
+                "status": status,
+                "campaign": "Include Campaign",
+                "years_of_experience": 3,
+                "salary_expectation": 50000.0,
+                "notice_period": 30
+            })
+        
+        response = client.get(f"/api/v1/projects/{project_id}?include=customer,nominees")
+        
+        assert response.status_code == 200
+        data: dict[str, Any] = response.json()
+        assert data["data"]["customer"]["name"] == "Test Customer"
+        assert sorted(n["status"] for n in data["data"]["nominees"]) == ["DECU", "PHONGVAN"]
+        
+        plain_response = client.get(f"/api/v1/projects/{project_id}")
+        assert "nominees" not in plain_response.json()["data"]
+
+    def test_export_projects_csv(self, client: TestClient, setup_test_data: dict) -> None:
+        """Test streaming a project export as CSV with reference names."""
+        project_data: dict[str, Any] = {
+            "name": "Export Project",
+            "status": "TIMKIEMUNGVIEN",
+            "start_date": "2024-01-01",
+            "end_date": "2024-12-31",
+            "budget": 100000.0,
+            "budget_currency": "USD",
+            "type": "CODINH",
+            "required_recruits": 2,
+            "recruited": 0,
+            "customer_id": setup_test_data["customer"]["customer_id"],
+            "expertise_id": setup_test_data["expertise"]["expertise_id"],
+            "area_id": setup_test_data["area"]["area_id"],
+            "level_id": setup_test_data["level"]["level_id"],
+        }
+        client.post("/api/v1/projects/", json=project_data)
+        
+        response = client.get(f"/api/v1/projects/export?format=csv&customer_id={setup_test_data['customer']['customer_id']}")
+        
+        assert response.status_code == 200
+        assert 'filename="projects.csv"' in response.headers["content-disposition"]
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) >= 1
+        assert all(row["customer_name"] == "Test Customer" for row in rows)
+        assert all(row["level_name"] == "Test Level" for row in rows)
+
+
+class TestProjectPipelineAPI:
+    """Test suite for the precomputed project pipeline summaries."""
+
+    @staticmethod
+    def create_project(client: TestClient, setup_test_data: dict, required: int, recruited: int) -> int:
+        response = client.post("/api/v1/projects/", json={
+            "status": "TIMKIEMUNGVIEN",
+            "start_date": "2024-01-01",
+            "end_date": "2024-12-31",
+            "budget": 1000.0,
+            "budget_currency": "USD",
+            "type": "CODINH",
+            "required_recruits": required,
+            "recruited": recruited,
+            "customer_id": setup_test_data["customer"]["customer_id"],
+            "expertise_id": setup_test_data["expertise"]["expertise_id"],
+            "area_id": setup_test_data["area"]["area_id"],
+            "level_id": setup_test_data["level"]["level_id"],
+        })
+        return response.json()["data"]["project_id"]
+
+    @staticmethod
+    def create_nominee(client: TestClient, project_id: int, status: str) -> int:
+        response = client.post("/api/v1/nominees/", json={
+            "candidate_id": 1,
+            "project_id": project_id,
+            "status": status,
+            "campaign": "Pipeline",
+            "years_of_experience": 2,
+            "salary_expectation": 1000.0,
+            "notice_period": 30,
+        })
+        return response.json()["data"]["nominee_id"]
+
+    @staticmethod
+    def pipelines(client: TestClient, **params: Any) -> dict[int, dict[str, Any]]:
+        response = client.get("/api/v1/projects/pipeline", params=params)
+        assert response.status_code == 200
+        return {row["project_id"]: row for row in response.json()["data"]}
+
+    def test_summaries_follow_nominee_writes(self, client: TestClient, setup_test_data: dict) -> None:
+        """Test creates, status changes and deletes keep the summary in step."""
+        project_id = self.create_project(client, setup_test_data, required=2, recruited=0)
+        first = self.create_nominee(client, project_id, "DECU")
+        second = self.create_nominee(client, project_id, "PHONGVAN")
+        self.create_nominee(client, project_id, "TUCHOI")
+
+        summary = self.pipelines(client)[project_id]
+        assert (summary["total_nominees"], summary["active_nominees"], summary["rejected"]) == (3, 2, 1)
+        assert summary["filled_at"] is None
+
+        client.patch("/api/v1/nominees/status", json={"nominee_ids": [first, second], "status": "KYHOPDONG"})
+        summary = self.pipelines(client)[project_id]
+        assert (summary["active_nominees"], summary["hired"]) == (0, 2)
+        assert summary["filled_at"] is not None
+        assert summary["time_to_fill_days"] >= 0
+
+        client.delete(f"/api/v1/nominees/{first}")
+        summary = self.pipelines(client)[project_id]
+        assert (summary["total_nominees"], summary["hired"]) == (2, 1)
+        assert summary["filled_at"] is None
+
+    def test_summaries_follow_single_nominee_update(self, client: TestClient, setup_test_data: dict) -> None:
+        """Test a status change through the single-nominee update is counted."""
+        project_id = self.create_project(client, setup_test_data, required=1, recruited=0)
+        nominee_id = self.create_nominee(client, project_id, "DECU")
+
+        client.put(f"/api/v1/nominees/{nominee_id}", json={"status": "KYHOPDONG"})
+        summary = self.pipelines(client)[project_id]
+        assert (summary["active_nominees"], summary["hired"]) == (0, 1)
+        assert summary["filled_at"] is not None
+
+    def test_sort_most_behind(self, client: TestClient, setup_test_data: dict) -> None:
+        """Test projects missing the most recruits come first in both listings."""
+        on_track = self.create_project(client, setup_test_data, required=1, recruited=1)
+        far_behind = self.create_project(client, setup_test_data, required=5, recruited=0)
+        behind = self.create_project(client, setup_test_data, required=3, recruited=2)
+
+        pipelines = list(self.pipelines(client, sort="most_behind"))
+        assert pipelines == [far_behind, behind, on_track]
+        summary = self.pipelines(client)[behind]
+        assert summary["remaining_recruits"] == 1
+        assert summary["fill_rate"] == pytest.approx(2 / 3)
+
+        response = client.get("/api/v1/projects/", params={"sort": "most_behind"})
+        assert [project["project_id"] for project in response.json()["data"]] == [far_behind, behind, on_track]
+
+    def test_sort_most_active(self, client: TestClient, setup_test_data: dict) -> None:
+        """Test ordering by nominees still in the pipeline, projects without nominees last."""
+        quiet = self.create_project(client, setup_test_data, required=1, recruited=0)
+        busy = self.create_project(client, setup_test_data, required=1, recruited=0)
+        self.create_nominee(client, busy, "DECU")
+        self.create_nominee(client, busy, "THUVIEC")
+
+        response = client.get("/api/v1/projects/", params={"sort": "most_active", "fields": "project_id"})
+
+        assert [row["project_id"] for row in response.json()["data"]] == [busy, quiet]
+
+    def test_rebuild_matches_incremental(self, client: TestClient, setup_test_data: dict, db_session: Any) -> None:
+        """Test a full rebuild yields the counts maintained by the writes."""
+        project_id = self.create_project(client, setup_test_data, required=1, recruited=0)
+        for status in ("DECU", "THUONGLUONG", "KYHOPDONG", "TUCHOI"):
+            self.create_nominee(client, project_id, status)
+        incremental = self.pipelines(client)[project_id]
+
+        SQLAlchemyProjectRepository(db_session).refresh_pipeline_summaries()
+
+        rebuilt = self.pipelines(client)[project_id]
+        assert rebuilt == incremental
+
+    def test_invalid_sort(self, client: TestClient) -> None:
+        """Test unknown sort keys are rejected."""
+        response = client.get("/api/v1/projects/pipeline", params={"sort": "alphabetical"})
+
+        assert response.status_code == 422
+
+
+class TestProjectMatchesAPI:
+    """Test suite for matching candidates to a project."""
+
+    @staticmethod
+    def create_candidate(client: TestClient, name: str, expertise_id: int, field_id: int, area_id: int, level_id: int, source: str = "LinkedIn") -> int:
+        response = client.post("/api/v1/candidates/", json={
+            "name": name,
+            "phone": "1234567890",
+            "email": f"{name.lower()}@test.com",
+            "year_of_birth": 1990,
+            "gender": "NAM",
+            "education": "BSc",
+            "source": source,
+            "expertise_id": expertise_id,
+            "field_id": field_id,
+            "area_id": area_id,
+            "level_id": level_id,
+            "headhunter_id": 1,
+        })
+        assert response.status_code == 201
+        return response.json()["data"]["candidate_id"]
+
+    @staticmethod
+    def matches(client: TestClient, project_id: int, **params: Any) -> dict[str, Any]:
+        response = client.get(f"/api/v1/projects/{project_id}/matches", params=params)
+        assert response.status_code == 200
+        return response.json()["data"]
+
+    def test_ranks_candidates(self, client: TestClient, setup_test_data: dict) -> None:
+        """Test exact matches outrank adjacent levels and unrelated candidates are not scored."""
+        project_id = TestProjectPipelineAPI.create_project(client, setup_test_data, required=1, recruited=0)
+        best = self.create_candidate(client, "Best", expertise_id=1, field_id=1, area_id=1, level_id=1)
+        adjacent = self.create_candidate(client, "Adjacent", expertise_id=1, field_id=2, area_id=1, level_id=2, source="Referral")
+        self.create_candidate(client, "Unrelated", expertise_id=2, field_id=2, area_id=2, level_id=5)
+
+        data = self.matches(client, project_id)
+
+        assert data["candidates_scored"] == 2
+        assert [match["candidate_id"] for match in data["matches"]] == [best, adjacent]
+        assert data["matches"][0]["score"] == 0.925
+        assert data["matches"][1]["components"] == {"expertise": 0.35, "level": 0.1, "area": 0.15, "field": 0.0, "outcomes": 0.075}
+
+        referral = self.matches(client, project_id, source="Referral")
+        assert [match["candidate_id"] for match in referral["matches"]] == [adjacent]
+
+    def test_index_follows_writes(self, client: TestClient, setup_test_data: dict) -> None:
+        """Test candidate and nominee writes are reflected without rebuilding the index."""
+        project_id = TestProjectPipelineAPI.create_project(client, setup_test_data, required=1, recruited=0)
+        other_project_id = TestProjectPipelineAPI.create_project(client, setup_test_data, required=1, recruited=0)
+        first = self.create_candidate(client, "First", expertise_id=1, field_id=1, area_id=1, level_id=2)
+        self.matches(client, project_id)
+
+        second = self.create_candidate(client, "Second", expertise_id=1, field_id=1, area_id=1, level_id=1)
+        assert [match["candidate_id"] for match in self.matches(client, project_id)["matches"]] == [second, first]
+
+        client.put(f"/api/v1/candidates/{first}", json={"level_id": 1})
+        client.post("/api/v1/nominees/", json={
+            "candidate_id": first, "project_id": other_project_id, "status": "KYHOPDONG", "campaign": "Match",
+            "years_of_experience": 2, "salary_expectation": 1000.0, "notice_period": 30,
+        })
+        top = self.matches(client, project_id)["matches"][0]
+        assert top["candidate_id"] == first
+        assert (top["nominations"], top["advanced"]) == (1, 1)
+
+        client.delete(f"/api/v1/candidates/{second}")
+        assert [match["candidate_id"] for match in self.matches(client, project_id)["matches"]] == [first]
+
+    def test_excludes_nominated_candidates(self, client: TestClient, setup_test_data: dict) -> None:
+        """Test candidates already nominated for the project are left out unless asked for."""
+        project_id = TestProjectPipelineAPI.create_project(client, setup_test_data, required=1, recruited=0)
+        candidate_id = self.create_candidate(client, "Nominated", expertise_id=1, field_id=1, area_id=1, level_id=1)
+        client.post("/api/v1/nominees/", json={
+            "candidate_id": candidate_id, "project_id": project_id, "status": "DECU", "campaign": "Match",
+            "years_of_experience": 2, "salary_expectation": 1000.0, "notice_period": 30,
+        })
+
+        assert self.matches(client, project_id)["matches"] == []
+        assert len(self.matches(client, project_id, include_nominated=True)["matches"]) == 1
+
+    def test_unknown_project(self, client: TestClient) -> None:
+        """Test matching an unknown project is a 404."""
+        assert client.get("/api/v1/projects/99999/matches").status_code == 404
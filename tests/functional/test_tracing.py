@@ -0,0 +1,163 @@
+"""
+Test cases for correlation IDs across requests, outgoing calls and SQL
+"""
+from typing import Any
+import asyncio
+import json
+
+import httpx
+import pytest # type: ignore
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from cims.config import settings
+from cims.tracing import (
+    FileTraceExporter,
+    REQUEST_ID_HEADER,
+    Span,
+    get_trace_exporter,
+    parse_trace_headers,
+    start_span,
+    traced_async_client,
+)
+from tests.functional.test_admin_api import _auth_headers
+
+
+@pytest.fixture(autouse=True)
+def tracing_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tracing is opt-in; turn it on for these tests."""
+    monkeypatch.setattr(settings, "TRACING_ENABLED", True)
+    monkeypatch.setattr(settings, "TRACE_SQL_COMMENTS", True)
+
+
+class TestTraceContext:
+    """Test suite for parsing and propagating trace context."""
+
+    def test_parse_trace_headers(self) -> None:
+        """Test traceparent wins, request IDs are accepted and unsafe values dropped."""
+        trace_id, span_id = "0af7651916cd43dd8448eb211c80319c", "b7ad6b7169203331"
+
+        assert parse_trace_headers({"traceparent": f"00-{trace_id}-{span_id}-01", REQUEST_ID_HEADER: "other"}) == (trace_id, span_id)
+        assert parse_trace_headers({REQUEST_ID_HEADER: "agent-run.42"}) == ("agent-run.42", None)
+        assert parse_trace_headers({REQUEST_ID_HEADER: "x*/ DROP TABLE candidates; --"}) == (None, None)
+        assert parse_trace_headers({}) == (None, None)
+
+    def test_nested_spans_share_trace(self) -> None:
+        """Test child spans inherit the trace and point at their parent."""
+        with start_span("outer") as outer:
+            with start_span("inner", "db") as inner:
+                pass
+
+        assert outer is not None and inner is not None
+        assert inner.trace_id == outer.trace_id
+        assert inner.parent_id == outer.span_id
+        trace = get_trace_exporter().get_trace(outer.trace_id)
+        assert trace["name"] == "outer"
+        assert trace["breakdown"]["db"]["count"] == 1
+
+    def test_client_forwards_trace_headers(self) -> None:
+        """Test outgoing calls carry the trace and are recorded as client spans."""
+        seen: dict[str, str] = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.update(request.headers)
+            return httpx.Response(200, json={"success": True})
+
+        async def call() -> Span:
+            with start_span("tool get_areas", "mcp.tool") as span:
+                async with traced_async_client(transport=httpx.MockTransport(handler)) as client:
+                    await client.get("http://backend:8000/api/v1/areas/")
+            return span
+
+        span = asyncio.run(call())
+
+        assert seen[REQUEST_ID_HEADER.lower()] == span.trace_id
+        assert seen["traceparent"].startswith(f"00-{span.trace_id}-")
+        breakdown = get_trace_exporter().get_trace(span.trace_id)["breakdown"]
+        assert breakdown["http.client"]["count"] == 1
+
+    def test_failed_client_call_recorded(self) -> None:
+        """Test calls failing without a response still export their span, marked as errors."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("connection refused", request=request)
+
+        async def call() -> Span:
+            with start_span("tool get_areas", "mcp.tool") as span:
+                async with traced_async_client(transport=httpx.MockTransport(handler)) as client:
+                    with pytest.raises(httpx.ConnectError):
+                        await client.get("http://backend:8000/api/v1/areas/")
+            return span
+
+        span = asyncio.run(call())
+
+        client_spans = [child for child in get_trace_exporter().get_trace(span.trace_id)["spans"] if child["kind"] == "http.client"]
+        assert len(client_spans) == 1
+        assert client_spans[0]["status"] == "error"
+        assert client_spans[0]["attributes"]["error"] == "ConnectError"
+
+    def test_file_exporter_writes_json_lines(self, tmp_path: Any) -> None:
+        """Test spans are appended one JSON object per line."""
+        exporter = FileTraceExporter(str(tmp_path / "spans.jsonl"))
+        span = Span("abc", "GET /", "http.server")
+        span.finish()
+
+        exporter.export(span)
+        exporter.export(span)
+
+        lines = (tmp_path / "spans.jsonl").read_text().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[0])["trace_id"] == "abc"
+
+
+class TestRequestTracing:
+    """Test suite for the tracing middleware and SQL tagging."""
+
+    def test_generates_request_id(self, client: TestClient) -> None:
+        """Test a correlation ID is returned when the caller sends none."""
+        response = client.get("/api/v1/areas/")
+
+        assert len(response.headers[REQUEST_ID_HEADER]) == 32
+
+    def test_echoes_and_tags_sql(self, client: TestClient) -> None:
+        """Test the caller's ID is kept and attached to every statement of the request."""
+        statements: list[str] = []
+
+        def capture(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+            statements.append(statement)
+
+        event.listen(Engine, "after_cursor_execute", capture)
+        try:
+            response = client.get("/api/v1/areas/", headers={REQUEST_ID_HEADER: "agent-run-7"})
+        finally:
+            event.remove(Engine, "after_cursor_execute", capture)
+
+        assert response.headers[REQUEST_ID_HEADER] == "agent-run-7"
+        assert statements
+        assert all("request_id='agent-run-7'" in statement for statement in statements)
+
+    def test_rejects_unsafe_request_id(self, client: TestClient) -> None:
+        """Test IDs that could escape the SQL comment are replaced."""
+        response = client.get("/api/v1/areas/", headers={REQUEST_ID_HEADER: "x*/ DROP TABLE areas; --"})
+
+        assert response.status_code == 200
+        assert response.headers[REQUEST_ID_HEADER] != "x*/ DROP TABLE areas; --"
+
+    def test_admin_trace_breakdown(self, client: TestClient) -> None:
+        """Test admins can look up a request's spans by its correlation ID."""
+        headers = _auth_headers(client, "admin@test.com", "admin")
+        client.get("/api/v1/areas/", headers={REQUEST_ID_HEADER: "lookup-me"})
+
+        response = client.get("/api/v1/admin/traces/lookup-me", headers=headers)
+
+        assert response.status_code == 200
+        trace = response.json()["data"]
+        assert trace["name"].startswith("GET ") and trace["name"].endswith("/areas/")
+        assert trace["breakdown"]["http.server"]["count"] == 1
+        assert trace["breakdown"]["db"]["count"] >= 1
+
+        listing = client.get("/api/v1/admin/traces", params={"limit": 5}, headers=headers)
+        assert listing.status_code == 200
+        assert len(listing.json()["data"]) <= 5
+
+        assert client.get("/api/v1/admin/traces/unknown", headers=headers).status_code == 404
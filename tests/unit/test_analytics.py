@@ -0,0 +1,61 @@
+"""
+Unit tests for the analytics helpers.
+"""
+import datetime
+
+import pytest # type: ignore
+
+from cims.core.analytics import build_leaderboard, period_end, period_start
+
+
+class TestPeriods:
+    """Test period bucketing of days."""
+
+    @pytest.mark.parametrize("period, day, start, end", [
+        ("week", datetime.date(2025, 3, 16), datetime.date(2025, 3, 10), datetime.date(2025, 3, 16)),
+        ("week", datetime.date(2025, 1, 1), datetime.date(2024, 12, 30), datetime.date(2025, 1, 5)),
+        ("month", datetime.date(2024, 2, 29), datetime.date(2024, 2, 1), datetime.date(2024, 2, 29)),
+        ("quarter", datetime.date(2025, 6, 30), datetime.date(2025, 4, 1), datetime.date(2025, 6, 30)),
+        ("quarter", datetime.date(2025, 11, 5), datetime.date(2025, 10, 1), datetime.date(2025, 12, 31)),
+    ])
+    def test_period_bounds(self, period: str, day: datetime.date, start: datetime.date, end: datetime.date) -> None:
+        """Test weeks start on Monday and months and quarters end on their last day."""
+        assert period_start(day, period) == start
+        assert period_end(start, period) == end
+
+
+class TestLeaderboard:
+    """Test ranking of headhunters within periods."""
+
+    @staticmethod
+    def _row(headhunter_id: int, start: datetime.date, nominees: int, hired: int) -> dict:
+        return {
+            "headhunter_id": headhunter_id, "headhunter_name": f"H{headhunter_id}", "period_start": start,
+            "candidates_sourced": 0, "nominees": nominees, "stage_counts": {"KYHOPDONG": hired},
+        }
+
+    def test_competition_ranking_per_period(self) -> None:
+        """Test ties share a rank, the next rank is skipped and periods are ranked separately."""
+        march, april = datetime.date(2025, 3, 1), datetime.date(2025, 4, 1)
+        rows = [
+            self._row(3, march, 4, 1), self._row(1, march, 2, 2), self._row(2, march, 5, 2),
+            self._row(3, april, 1, 0),
+        ]
+
+        periods = build_leaderboard(rows, "month", "contracts_signed", limit=10)
+
+        assert [period["period_start"] for period in periods] == [march, april]
+        assert [(entry["headhunter_id"], entry["rank"]) for entry in periods[0]["entries"]] == [(1, 1), (2, 1), (3, 3)]
+        assert periods[0]["entries"][0]["contract_rate"] == 1.0
+        assert periods[1]["entries"][0]["contract_rate"] == 0.0
+
+    def test_limit_keeps_headhunter_count(self) -> None:
+        """Test the limit trims entries but the period still reports every active headhunter."""
+        march = datetime.date(2025, 3, 3)
+        rows = [self._row(headhunter_id, march, headhunter_id, 0) for headhunter_id in range(1, 6)]
+
+        periods = build_leaderboard(rows, "week", "nominees", limit=2)
+
+        assert periods[0]["headhunters"] == 5
+        assert [entry["headhunter_id"] for entry in periods[0]["entries"]] == [5, 4]
+        assert periods[0]["period_end"] == datetime.date(2025, 3, 9)
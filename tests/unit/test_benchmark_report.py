@@ -0,0 +1,49 @@
+"""
+Unit tests for benchmark latency summaries and run comparison.
+"""
+from benchmarks.report import compare, percentile, summarize
+
+
+class TestBenchmarkReport:
+    """Test suite for benchmarks.report."""
+
+    def test_percentile_interpolates(self) -> None:
+        """Test percentiles interpolate between neighbouring values."""
+        values = [1.0, 2.0, 3.0, 4.0]
+
+        assert percentile(values, 0) == 1.0
+        assert percentile(values, 50) == 2.5
+        assert percentile(values, 100) == 4.0
+        assert percentile([], 95) == 0.0
+
+    def test_summarize_reports_milliseconds(self) -> None:
+        """Test latencies in seconds are summarized in milliseconds."""
+        summary = summarize([0.010, 0.020, 0.030], errors=1, elapsed=0.5)
+
+        assert summary["requests"] == 3
+        assert summary["errors"] == 1
+        assert summary["throughput_rps"] == 6.0
+        assert summary["p50_ms"] == 20.0
+        assert summary["max_ms"] == 30.0
+
+    def test_compare_flags_regressions(self) -> None:
+        """Test slowdowns beyond the tolerance and new errors are regressions."""
+        baseline = {"scenarios": {
+            "fast": {"p95_ms": 10.0, "errors": 0},
+            "steady": {"p95_ms": 10.0, "errors": 0},
+            "failing": {"p95_ms": 10.0, "errors": 0},
+            "removed": {"p95_ms": 10.0, "errors": 0},
+        }}
+        current = {"scenarios": {
+            "fast": {"p95_ms": 12.0, "errors": 0},
+            "steady": {"p95_ms": 10.5, "errors": 0},
+            "failing": {"p95_ms": 9.0, "errors": 2},
+            "added": {"p95_ms": 1.0, "errors": 0},
+        }}
+
+        rows = {row["scenario"]: row for row in compare(baseline, current, tolerance=0.10)}
+
+        assert set(rows) == {"fast", "steady", "failing"}
+        assert rows["fast"]["regressed"] is True
+        assert rows["steady"]["regressed"] is False
+        assert rows["failing"]["regressed"] is True
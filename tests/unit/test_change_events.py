@@ -0,0 +1,77 @@
+"""
+Unit tests for the change event bus and the after-commit collection feeding it.
+"""
+import asyncio
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from cims.core.change_events import ChangeEvent, ChangeEventBus, ChangeEventFilter
+from cims.integrations.sqlalchemy.after_commit import collect_after_commit
+
+
+def _events(count: int, project_id: int = 1) -> list[ChangeEvent]:
+    return [ChangeEvent("nominee", "updated", entity_id, project_ids=[project_id], customer_ids=[7]) for entity_id in range(count)]
+
+
+class TestChangeEventBus:
+    """Test numbering, resuming, filtering and delivery."""
+
+    def test_filter(self) -> None:
+        """Test entity type, project and customer all have to match."""
+        event = ChangeEvent("nominee", "created", 1, project_ids=[3], customer_ids=[7])
+
+        assert ChangeEventFilter().matches(event)
+        assert ChangeEventFilter(["nominee", "project"], project_id=3, customer_id=7).matches(event)
+        assert not ChangeEventFilter(["project"]).matches(event)
+        assert not ChangeEventFilter(project_id=4).matches(event)
+
+    def test_resume_from_backlog_or_reset(self) -> None:
+        """Test missed events are replayed while in the backlog and a reset is asked for otherwise."""
+        bus = ChangeEventBus(backlog_size=3)
+        bus.publish(_events(5))
+
+        async def missed(last_event_id: str) -> list[int] | None:
+            subscription, events = bus.subscribe(ChangeEventFilter(), last_event_id)
+            bus.unsubscribe(subscription)
+            return [event.sequence for event in events] if events is not None else None
+
+        assert asyncio.run(missed(f"{bus.epoch}-2")) == [3, 4, 5]
+        assert asyncio.run(missed(f"{bus.epoch}-5")) == []
+        assert asyncio.run(missed(f"{bus.epoch}-1")) is None
+        assert asyncio.run(missed(f"{bus.epoch}-9")) is None
+        assert asyncio.run(missed("other-2")) is None
+
+    def test_live_delivery_and_overflow(self) -> None:
+        """Test matching events reach a subscriber in order and a slow one is cut off."""
+        bus = ChangeEventBus()
+
+        async def scenario() -> None:
+            subscription, _ = bus.subscribe(ChangeEventFilter(project_id=1), max_pending=2)
+            bus.publish(_events(1, project_id=2) + _events(2))
+            assert [event.sequence for event in await subscription.next_events(1.0)] == [2, 3]
+            assert await subscription.next_events(0.01) == []
+
+            bus.publish(_events(3))
+            assert await subscription.next_events(1.0) == []
+            assert subscription.overflowed
+
+        asyncio.run(scenario())
+
+
+class TestCollectAfterCommit:
+    """Test items collected in a transaction are handed over only on commit."""
+
+    def test_commit_and_rollback(self) -> None:
+        """Test a rolled back transaction drops its items and one commit hands all of them over together."""
+        handed_over: list[list[str]] = []
+        with Session(create_engine("sqlite://")) as db_session:
+            db_session.execute(text("SELECT 1"))
+            collect_after_commit(db_session, "items", handed_over.append).append("rolled back")
+            db_session.rollback()
+            db_session.execute(text("SELECT 1"))
+            collect_after_commit(db_session, "items", handed_over.append).append("first")
+            collect_after_commit(db_session, "items", handed_over.append).append("second")
+            db_session.commit()
+
+        assert handed_over == [["first", "second"]]
@@ -0,0 +1,54 @@
+"""
+Unit tests for candidate duplicate keys and clustering.
+"""
+from typing import Optional
+
+import pytest # type: ignore
+
+from cims.core.dedup import cluster_blocks, name_key, normalize_email, normalize_phone
+
+
+class TestDuplicateKeys:
+    """Test normalization of phone, email and name keys."""
+
+    @pytest.mark.parametrize("phone, expected", [
+        ("+84 (91) 234-5678", "0912345678"),
+        ("0084 912 345 678", "0912345678"),
+        ("091.234.5678", "0912345678"),
+        ("n/a", None),
+    ])
+    def test_normalize_phone(self, phone: str, expected: Optional[str]) -> None:
+        """Test country codes become a leading zero and separators are dropped."""
+        assert normalize_phone(phone) == expected
+
+    @pytest.mark.parametrize("email, expected", [
+        (" Nguyen.An+jobs@GMail.com", "nguyenan@gmail.com"),
+        ("nguyen.an@googlemail.com", "nguyenan@gmail.com"),
+        ("nguyen.an+cv@company.vn", "nguyen.an@company.vn"),
+        ("not-an-address", None),
+    ])
+    def test_normalize_email(self, email: str, expected: Optional[str]) -> None:
+        """Test tags are dropped everywhere and dots only for providers that ignore them."""
+        assert normalize_email(email) == expected
+
+    def test_name_key_folds_accents_and_word_order(self) -> None:
+        """Test spellings with and without tone marks and in either order share a key."""
+        assert name_key("Nguyễn Văn Đạt", 1990) == name_key("dat NGUYEN van", 1990) == "dat nguyen van|1990"
+        assert name_key("Nguyễn Văn Đạt", 1991) != name_key("Nguyễn Văn Đạt", 1990)
+
+
+class TestClusterBlocks:
+    """Test merging key blocks into clusters."""
+
+    def test_blocks_merge_transitively(self) -> None:
+        """Test candidates linked through different keys end up in one cluster with every reason."""
+        blocks = [("phone_key", [1, 2]), ("email_key", [2, 5]), ("name_key", [7, 8]), ("email_key", [9, 10])]
+
+        clusters = cluster_blocks(blocks)
+
+        assert clusters == [
+            {"candidate_ids": [1, 2, 5], "reasons": ["phone_key", "email_key"]},
+            {"candidate_ids": [7, 8], "reasons": ["name_key"]},
+            {"candidate_ids": [9, 10], "reasons": ["email_key"]},
+        ]
+        assert cluster_blocks(blocks, min_size=3) == clusters[:1]
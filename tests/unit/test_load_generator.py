@@ -0,0 +1,35 @@
+"""
+Unit tests for the async load generator, driven in-process through ASGI.
+"""
+import asyncio
+
+import httpx
+from fastapi.testclient import TestClient
+
+from benchmarks.load import TRAFFIC_MIX, generate_load
+
+
+class TestLoadGenerator:
+    """Test suite for benchmarks.load."""
+
+    def test_generates_mixed_traffic_and_reports_errors(self, client: TestClient) -> None:
+        """Test the mix runs every flow type and counts failed requests as errors."""
+        client.post("/api/v1/auth/register", json={
+            "name": "Load Test User",
+            "phone": "1234567890",
+            "email": "load@test.com",
+            "area_id": 1,
+            "password": "password123"
+        })
+        transport = httpx.ASGITransport(app=client.app)
+
+        results = asyncio.run(generate_load(
+            "http://testserver", rps=200, concurrency=4, duration=0.5, seed=3, transport=transport
+        ))
+
+        assert set(results["meta"]["flows"]) == {flow.name for flow in TRAFFIC_MIX}
+        assert results["overall"]["requests"] == sum(result["requests"] for result in results["scenarios"].values())
+        # No nominees exist, so every status update is a 404
+        updates = results["scenarios"]["nominee_status_update"]
+        assert updates["errors"] == updates["requests"]
+        assert results["overall"]["error_rate"] > 0
@@ -0,0 +1,93 @@
+"""
+Unit tests for the logging pipeline in cims.config.
+"""
+import io
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueListener
+
+from cims.config import (
+    ColorFormatter,
+    ErrorSamplingFilter,
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    _build_formatter,
+    _stop_queue_listener,
+)
+from cims.metrics import LOG_RECORDS_DROPPED
+
+
+def _dropped() -> float:
+    return next((float(line.split()[1]) for line in LOG_RECORDS_DROPPED.collect()), 0.0)
+
+
+def _record(message: str, level: int = logging.ERROR, lineno: int = 10) -> logging.LogRecord:
+    return logging.LogRecord("cims.test", level, "/app/module.py", lineno, message, None, None)
+
+
+class TestLogging:
+    """Test suite for formatters, error sampling and the queue handler."""
+
+    def test_json_formatter_includes_exception(self) -> None:
+        """Test JSON lines carry the message, location and traceback."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord("cims.test", logging.ERROR, "/app/module.py", 7, "failed %s", ("login",), sys.exc_info())
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["message"] == "failed login"
+        assert entry["level"] == "ERROR"
+        assert entry["location"] == "module.py:7"
+        assert "ValueError: boom" in entry["exception"]
+
+    def test_no_color_when_not_a_tty(self) -> None:
+        """Test escape codes are only used for terminals."""
+        class Terminal(io.StringIO):
+            def isatty(self) -> bool:
+                return True
+
+        assert isinstance(_build_formatter(Terminal()), ColorFormatter)
+        formatter = _build_formatter(io.StringIO())
+        assert not isinstance(formatter, ColorFormatter)
+        assert "\033[" not in formatter.format(_record("plain"))
+
+    def test_error_sampling_per_call_site(self) -> None:
+        """Test repeated errors are dropped after the burst and reported once the window ends."""
+        sampling = ErrorSamplingFilter(burst=2, window=60.0)
+
+        passed = [sampling.filter(_record(f"error {i}")) for i in range(5)]
+
+        assert passed == [True, True, False, False, False]
+        assert sampling.filter(_record("other site", lineno=20)) is True
+        assert sampling.filter(_record("warning", level=logging.WARNING)) is True
+
+        sampling.window = 0.0
+        record = _record("after window")
+        assert sampling.filter(record) is True
+        assert record.getMessage() == "after window [3 similar messages suppressed]"
+
+    def test_queue_handler_formats_on_listener_and_drops_when_full(self) -> None:
+        """Test records reach the listener's handler and a full queue never blocks the caller."""
+        log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=1)
+        handler = NonBlockingQueueHandler(log_queue)
+        dropped_before = _dropped()
+
+        handler.handle(_record("first %s", level=logging.INFO))
+        handler.handle(_record("second", level=logging.INFO))
+
+        assert handler.dropped == 1
+        assert _dropped() == dropped_before + 1
+        output = io.StringIO()
+        stream_handler = logging.StreamHandler(output)
+        stream_handler.setFormatter(JsonFormatter())
+        listener = QueueListener(log_queue, stream_handler)
+        listener.start()
+        _stop_queue_listener(listener, handler, stream_handler)
+        first, summary = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert first["message"] == "first %s"
+        assert summary["level"] == "WARNING"
+        assert summary["message"].startswith("1 log records were dropped")
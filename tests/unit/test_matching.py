@@ -0,0 +1,90 @@
+"""
+Unit tests for the candidate matching index.
+"""
+from typing import Any, Optional
+import threading
+
+from cims.core.matching import CandidateIndex, outcome_score
+
+PROJECT = {"expertise_id": 1, "level_id": 3, "area_id": 1, "field_id": 1}
+
+
+def _profile(candidate_id: int, **attributes: Any) -> dict[str, Any]:
+    return {
+        "candidate_id": candidate_id, "name": f"C{candidate_id}", "headhunter_id": 1,
+        "expertise_id": 1, "field_id": 1, "area_id": 1, "level_id": 3, "source": "LinkedIn",
+        "nominations": 0, "advanced": 0, **attributes,
+    }
+
+
+class TestCandidateIndex:
+    """Test index maintenance and scoring."""
+
+    def test_refresh_reloads_only_stale_candidates(self) -> None:
+        """Test a full build happens once and later refreshes load just the stale IDs."""
+        rows = {1: _profile(1), 2: _profile(2, level_id=4)}
+        calls: list[Optional[list[int]]] = []
+
+        def load(candidate_ids: Optional[list[int]]) -> list[dict[str, Any]]:
+            calls.append(candidate_ids)
+            return [rows[candidate_id] for candidate_id in (candidate_ids or rows) if candidate_id in rows]
+
+        index = CandidateIndex()
+        index.refresh(load, max_age_seconds=60)
+        index.refresh(load, max_age_seconds=60)
+        rows[2] = _profile(2, level_id=3)
+        del rows[1]
+        index.mark_stale([1, 2])
+        index.refresh(load, max_age_seconds=60)
+
+        assert calls == [None, [1, 2]]
+        assert len(index) == 1
+        assert index.postings("level_id", 4) == set()
+        assert index.postings("level_id", 3) == {2}
+
+    def test_matches_served_during_rebuild(self) -> None:
+        """Test a full rebuild loads without holding the index, which keeps answering until the swap."""
+        loading, release = threading.Event(), threading.Event()
+
+        def load(candidate_ids: Optional[list[int]]) -> list[dict[str, Any]]:
+            loading.set()
+            release.wait(5)
+            return [_profile(2)]
+
+        index = CandidateIndex()
+        index.refresh(lambda candidate_ids: [_profile(1)], max_age_seconds=60)
+        rebuild = threading.Thread(target=index.refresh, args=(load,), kwargs={"max_age_seconds": 0})
+        rebuild.start()
+        assert loading.wait(5)
+
+        assert [match["candidate_id"] for match in index.match(PROJECT)[1]] == [1]
+        release.set()
+        rebuild.join(5)
+        assert [match["candidate_id"] for match in index.match(PROJECT)[1]] == [2]
+
+    def test_scores_and_ties(self) -> None:
+        """Test adjacency credit, outcome smoothing, exclusion and tie-breaking by ID."""
+        index = CandidateIndex()
+        for profile in [
+            _profile(1), _profile(2), _profile(3, level_id=2, nominations=2, advanced=2),
+            _profile(4, expertise_id=9, field_id=9, area_id=9, level_id=9), _profile(5),
+        ]:
+            index.upsert(profile)
+
+        scored, matches = index.match(PROJECT, limit=3, exclude=[5])
+
+        assert scored == 3
+        assert [match["candidate_id"] for match in matches] == [1, 2, 3]
+        assert matches[0]["score"] == round(0.85 + 0.15 * outcome_score(0, 0), 4)
+        assert matches[2]["components"]["level"] == 0.1
+        assert matches[2]["components"]["outcomes"] == round(0.15 * 0.75, 4)
+
+    def test_source_filter(self) -> None:
+        """Test only candidates from the requested source are returned."""
+        index = CandidateIndex()
+        index.upsert(_profile(1))
+        index.upsert(_profile(2, source="Referral"))
+
+        _, matches = index.match(PROJECT, source="Referral")
+
+        assert [match["candidate_id"] for match in matches] == [2]
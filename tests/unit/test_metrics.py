@@ -0,0 +1,50 @@
+"""
+Unit tests for the in-process metrics registry.
+"""
+import pytest # type: ignore
+
+from cims.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Test metric recording and Prometheus text rendering."""
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """Test histogram samples land in cumulative buckets with sum and count."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("test_latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+
+        histogram.observe(0.05, route="/a")
+        histogram.observe(0.5, route="/a")
+        histogram.observe(3.0, route="/a")
+
+        output = registry.render()
+        assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 1' in output
+        assert 'test_latency_seconds_bucket{route="/a",le="1"} 2' in output
+        assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 3' in output
+        assert 'test_latency_seconds_count{route="/a"} 3' in output
+        assert "# TYPE test_latency_seconds histogram" in output
+
+    def test_gauge_and_collector(self) -> None:
+        """Test gauges refreshed by a collector at render time."""
+        registry = MetricsRegistry()
+        gauge = registry.gauge("test_pool_checked_out", "Checked out connections")
+        registry.add_collector(lambda: gauge.set(7))
+
+        assert "test_pool_checked_out 7" in registry.render()
+
+    def test_label_mismatch_rejected(self) -> None:
+        """Test recording with the wrong labels raises an error."""
+        registry = MetricsRegistry()
+        counter = registry.counter("test_total", "Total", ("route",))
+
+        with pytest.raises(ValueError):
+            counter.inc(method="GET")
+
+    def test_duplicate_registration_rejected(self) -> None:
+        """Test registering the same metric name twice raises an error."""
+        registry = MetricsRegistry()
+        registry.counter("test_total", "Total")
+
+        with pytest.raises(ValueError):
+            registry.counter("test_total", "Total again")
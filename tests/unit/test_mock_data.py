@@ -0,0 +1,82 @@
+"""
+Unit tests for the mock data generator in inject_mock_data.py.
+"""
+from dataclasses import replace
+import csv
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from cims.database.models import Base, CandidateDB, HeadhunterDB, NomineeDB
+from inject_mock_data import DatasetSpec, MockDataInjector, export_dataset, generate_dataset
+
+
+class _SQLiteFactory:
+    def __init__(self) -> None:
+        self.engine = create_engine("sqlite://")
+        self.SessionLocal = sessionmaker(bind=self.engine)
+
+    def create_tables(self) -> None:
+        Base.metadata.create_all(self.engine)
+
+    def get_session(self) -> Session:
+        return self.SessionLocal()
+
+
+SPEC = replace(DatasetSpec(), candidates=120, nominees=300, reference_date="2025-01-01")
+
+
+class TestMockDataGenerator:
+    """Test suite for deterministic, scalable mock data generation."""
+
+    def test_scaled_counts(self) -> None:
+        """Test scale multiplies the defaults and explicit counts override it."""
+        spec = DatasetSpec.scaled(10, nominees=5)
+
+        assert spec.candidates == 700
+        assert spec.headhunters == 100
+        assert spec.nominees == 5
+
+    def test_output_is_deterministic_across_workers(self) -> None:
+        """Test the same seed yields the same rows with one or several processes."""
+        sequential = list(generate_dataset(SPEC, workers=1, password_hash="hash"))
+        parallel = list(generate_dataset(SPEC, workers=2, password_hash="hash"))
+
+        assert sequential == parallel
+        candidates = [row for table, rows in sequential if table == "candidates" for row in rows]
+        assert [row["candidate_id"] for row in candidates] == list(range(1, 121))
+
+    def test_nominees_use_distinct_candidates_when_possible(self) -> None:
+        """Test nominees are spread over distinct candidates when there are enough of them."""
+        spec = replace(SPEC, nominees=100)
+        nominees = [row for table, rows in generate_dataset(spec, password_hash="hash") if table == "nominees" for row in rows]
+
+        assert len({row["candidate_id"] for row in nominees}) == 100
+
+    def test_inject_and_reload_dataset(self, tmp_path: Path) -> None:
+        """Test injected rows and a reloaded dataset file match, with a shared password hash."""
+        first = _SQLiteFactory()
+        first.create_tables()
+        counts = MockDataInjector(session_factory=first).inject_all_data(
+            SPEC, reuse_password_hash=True, dataset_dir=tmp_path
+        )
+        second = _SQLiteFactory()
+        second.create_tables()
+        reloaded = MockDataInjector(session_factory=second).load_dataset(tmp_path)
+
+        assert counts == reloaded
+        assert counts["nominees"] == 300
+        with first.get_session() as a, second.get_session() as b:
+            statement = select(CandidateDB.name, CandidateDB.email, CandidateDB.created_at).order_by(CandidateDB.candidate_id)
+            assert a.execute(statement).all() == b.execute(statement).all()
+            assert b.scalar(select(func.count(func.distinct(HeadhunterDB.hashed_password)))) == 1
+            assert b.scalar(select(func.max(NomineeDB.candidate_id))) <= 120
+
+    def test_export_dataset_without_database(self, tmp_path: Path) -> None:
+        """Test dataset files can be written without a database."""
+        counts = export_dataset(SPEC, tmp_path, reuse_password_hash=True)
+
+        assert (tmp_path / "manifest.json").exists()
+        with open(tmp_path / "candidates.csv", newline="") as handle:
+            assert len(list(csv.DictReader(handle))) == counts["candidates"]
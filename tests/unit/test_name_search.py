@@ -0,0 +1,102 @@
+"""
+Unit tests for the fuzzy name search index.
+"""
+import threading
+
+from cims.core import name_search
+from cims.core.name_search import NameSearchIndex, word_trigrams
+
+NAMES = [(1, "Nguyễn Văn An"), (2, "Nguyen Van Anh"), (3, "Trần Thị Bình"), (4, "Lê Nguyễn Hoàng"), (5, "Nguyễn Văn An")]
+
+
+def _index() -> NameSearchIndex:
+    index = NameSearchIndex()
+    index.build(NAMES)
+    return index
+
+
+class TestNameSearchIndex:
+    """Test matching, ranking and incremental maintenance."""
+
+    def test_queries_ignore_diacritics_and_case(self) -> None:
+        """Test a name with and without tone marks finds the same names."""
+        index = _index()
+
+        assert index.search("Trần Thị Bình") == index.search("TRAN thi  binh") == (1, [3])
+        assert {"  n", " ng", "en "} <= word_trigrams("nguyen")
+
+    def test_ranking_and_typos(self) -> None:
+        """Test every word must match, exact words rank first, ties go by ID and typos and prefixes match."""
+        index = _index()
+
+        assert index.search("nguyen van an") == (3, [1, 5, 2])
+        assert index.search("an van") == (3, [1, 5, 2])
+        assert index.search("Nguyne") == (4, [1, 2, 4, 5])
+        assert index.search("bin")[1] == [3]
+        assert index.search("nguyen binh") == (0, [])
+        assert index.search("xyz") == (0, [])
+
+    def test_pagination_and_restriction(self) -> None:
+        """Test offset and limit page through the ranking and restrict_to filters it."""
+        index = _index()
+
+        assert index.search("nguyen", offset=1, limit=2) == (4, [2, 4])
+        assert index.search("nguyen", restrict_to=[2, 4]) == (2, [2, 4])
+
+    def test_incremental_updates_and_compaction(self, monkeypatch) -> None:
+        """Test renames and removals are visible before and after delta postings are merged."""
+        monkeypatch.setattr(name_search, "COMPACT_THRESHOLD", 8)
+        index = _index()
+
+        index.upsert(3, "Phạm Minh Châu")
+        index.remove(4)
+        assert index.search("binh") == (0, [])
+        assert index.search("chau")[1] == [3]
+
+        index.upsert(6, "Châu Hà")
+        index.upsert(7, "Đỗ Thanh Tâm")
+        assert index._delta == {}
+        assert index.search("chau")[1] == [6, 3]  # the shorter name first
+        assert index.search("nguyen")[0] == 3
+
+    def test_refresh_reloads_only_stale_names(self) -> None:
+        """Test a full build happens once and stale IDs are reloaded or dropped."""
+        rows = dict(NAMES)
+        calls = []
+
+        def load(entity_ids):
+            calls.append(entity_ids)
+            return [(entity_id, rows[entity_id]) for entity_id in (entity_ids or rows) if entity_id in rows]
+
+        index = NameSearchIndex()
+        index.refresh(load, max_age_seconds=60)
+        rows[2] = "Vũ Quốc Khánh"
+        del rows[5]
+        index.mark_stale([2, 5])
+        index.refresh(load, max_age_seconds=60)
+
+        assert calls == [None, [2, 5]]
+        assert len(index) == 4
+        assert index.search("khanh")[1] == [2]
+        assert index.search("nguyen van an")[1] == [1]
+
+    def test_searches_served_during_rebuild(self) -> None:
+        """Test a rebuild loads without holding the index and a concurrent refresh does not wait for it."""
+        loading, release = threading.Event(), threading.Event()
+
+        def load(entity_ids):
+            loading.set()
+            release.wait(5)
+            return [(6, "Phạm Văn An")]
+
+        index = _index()
+        rebuild = threading.Thread(target=index.refresh, args=(load,), kwargs={"max_age_seconds": 0})
+        rebuild.start()
+        assert loading.wait(5)
+
+        index.refresh(load, max_age_seconds=0)
+        assert index.search("tran thi binh")[1] == [3]
+        release.set()
+        rebuild.join(5)
+        assert index.search("tran thi binh")[1] == []
+        assert index.search("pham van an")[1] == [6]
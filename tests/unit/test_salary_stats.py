@@ -0,0 +1,108 @@
+"""
+Unit tests for the vectorized salary statistics.
+"""
+import numpy as np
+import pytest # type: ignore
+
+from cims.core.salary_stats import SalaryStatsCache, compute_salary_stats, percentile_rank
+
+
+def _columns(size: int, seed: int = 7) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    years = rng.integers(0, 20, size)
+    return {
+        "salary_expectation": 40000 + 3000 * years + rng.normal(0, 5000, size),
+        "years_of_experience": years,
+        "expertise_id": rng.integers(1, 4, size),
+        "level_id": rng.integers(1, 3, size),
+        "area_id": rng.integers(1, 3, size),
+    }
+
+
+class TestComputeSalaryStats:
+    """Test the grouped statistics against NumPy's per-array functions."""
+
+    def test_matches_per_group_numpy(self) -> None:
+        """Test percentiles, histogram and regression of every group."""
+        columns = _columns(2000)
+
+        groups = compute_salary_stats(columns, ["expertise", "level"], bins=5)
+
+        assert len(groups) == 6
+        assert sum(group["count"] for group in groups) == 2000
+        for group in groups:
+            mask = (columns["expertise_id"] == group["expertise_id"]) & (columns["level_id"] == group["level_id"])
+            salaries, years = columns["salary_expectation"][mask], columns["years_of_experience"][mask]
+            assert group["area_id"] is None
+            assert group["percentiles"]["p25"] == pytest.approx(np.percentile(salaries, 25), abs=0.01)
+            assert group["percentiles"]["p90"] == pytest.approx(np.percentile(salaries, 90), abs=0.01)
+            assert group["std"] == pytest.approx(salaries.std(), abs=0.01)
+            assert group["histogram"]["counts"] == np.histogram(salaries, bins=5)[0].tolist()
+            slope, intercept = np.polyfit(years, salaries, 1)
+            assert group["regression"]["slope"] == pytest.approx(slope, abs=0.01)
+            assert group["regression"]["intercept"] == pytest.approx(intercept, abs=0.01)
+            assert group["regression"]["r_squared"] == pytest.approx(np.corrcoef(years, salaries)[0, 1] ** 2, abs=1e-4)
+
+    def test_degenerate_groups(self) -> None:
+        """Test single-value groups and groups without experience spread."""
+        columns = {
+            "salary_expectation": np.array([1000.0, 1000.0, 2000.0]),
+            "years_of_experience": np.array([3, 3, 1]),
+            "expertise_id": np.array([1, 1, 2]),
+            "level_id": np.array([1, 1, 1]),
+            "area_id": np.array([1, 1, 1]),
+        }
+
+        groups = compute_salary_stats(columns, ["expertise"], bins=4)
+
+        assert groups[0]["regression"] is None
+        assert groups[0]["histogram"]["counts"] == [2, 0, 0, 0]
+        assert groups[1]["percentiles"]["p50"] == 2000.0
+
+    def test_min_samples_and_empty_input(self) -> None:
+        """Test small groups are left out and no samples give no groups."""
+        columns = _columns(50)
+
+        groups = compute_salary_stats(columns, ["expertise", "level", "area"], min_samples=10)
+
+        assert all(group["count"] >= 10 for group in groups)
+        assert compute_salary_stats({name: values[:0] for name, values in columns.items()}, []) == []
+
+    def test_overall_group(self) -> None:
+        """Test grouping by nothing describes every sample together."""
+        columns = _columns(100)
+
+        groups = compute_salary_stats(columns, [])
+
+        assert len(groups) == 1
+        assert groups[0]["count"] == 100
+        assert groups[0]["percentiles"]["p50"] == pytest.approx(np.median(columns["salary_expectation"]), abs=0.01)
+
+    def test_percentile_rank(self) -> None:
+        """Test the share of salaries at or below a value."""
+        assert percentile_rank(np.array([1.0, 2.0, 3.0, 4.0]), 2.0) == 0.5
+        assert percentile_rank(np.array([]), 2.0) is None
+
+
+class TestSalaryStatsCache:
+    """Test cache expiry and invalidation."""
+
+    def test_invalidate_drops_entries_and_stale_puts(self) -> None:
+        """Test results computed before an invalidation are not stored."""
+        cache = SalaryStatsCache(ttl_seconds=60)
+        generation = cache.generation
+        cache.put("a", 1, generation)
+        assert cache.get("a") == 1
+
+        cache.invalidate()
+        cache.put("b", 2, generation)
+
+        assert cache.get("a") is None
+        assert cache.get("b") is None
+
+    def test_zero_ttl_disables(self) -> None:
+        """Test a zero TTL stores nothing."""
+        cache = SalaryStatsCache(ttl_seconds=0)
+        cache.put("a", 1, cache.generation)
+
+        assert cache.get("a") is None
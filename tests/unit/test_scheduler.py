@@ -0,0 +1,106 @@
+"""
+Unit tests for the periodic job scheduler: locking, once-per-interval runs and bookkeeping.
+"""
+import asyncio
+import pathlib
+
+import pytest # type: ignore
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from cims.database.models import Base, ScheduledJobDB
+from cims.integrations.sqlalchemy.scheduler import FileJobLock, JobScheduler, ScheduledJob, advisory_lock_key
+from cims.metrics import JOB_RUNS
+
+
+@pytest.fixture
+def engine(tmp_path: pathlib.Path) -> Engine:
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def scheduler(engine: Engine, tmp_path: pathlib.Path, jobs: list[ScheduledJob], runner_id: str) -> JobScheduler:
+    return JobScheduler(sessionmaker(bind=engine, autoflush=False), engine, jobs, lock=FileJobLock(str(tmp_path)), runner_id=runner_id, jitter=0.1)
+
+
+def job_runs(job: str, outcome: str) -> float:
+    prefix = f'cims_job_runs_total{{job="{job}",outcome="{outcome}"}} '
+    return next((float(line[len(prefix):]) for line in JOB_RUNS.collect() if line.startswith(prefix)), 0.0)
+
+
+class TestJobScheduler:
+    """Test exclusive jobs run once per interval across schedulers and local jobs run everywhere."""
+
+    def test_exclusive_job_runs_once_per_interval(self, engine: Engine, tmp_path: pathlib.Path) -> None:
+        """Test a second scheduler skips a job run elsewhere and waits for that run's next turn."""
+        runs: list[str] = []
+        job = ScheduledJob("test_exclusive", 100.0, lambda db_session: runs.append("ran"))
+        first = scheduler(engine, tmp_path, [job], "first")
+        second = scheduler(engine, tmp_path, [job], "second")
+        skipped = job_runs("test_exclusive", "skipped")
+
+        assert 90.0 <= first.run_job(job) <= 110.0
+        assert 90.0 <= second.run_job(job) <= 110.0
+
+        assert runs == ["ran"]
+        assert job_runs("test_exclusive", "skipped") == skipped + 1
+        with Session(engine) as db_session:
+            state = db_session.get(ScheduledJobDB, "test_exclusive")
+            assert (state.runner, state.last_status, state.last_error) == ("first", "succeeded", None)
+            assert state.last_duration_seconds >= 0
+
+    def test_locked_job_skipped(self, engine: Engine, tmp_path: pathlib.Path) -> None:
+        """Test a job whose lock another process holds is not run."""
+        runs: list[str] = []
+        job = ScheduledJob("test_locked", 100.0, lambda db_session: runs.append("ran"))
+        lock = FileJobLock(str(tmp_path))
+
+        with lock.hold("test_locked") as acquired:
+            assert acquired
+            with FileJobLock(str(tmp_path)).hold("test_locked") as other:
+                assert not other
+            scheduler(engine, tmp_path, [job], "first").run_job(job)
+
+        assert runs == []
+
+    def test_failed_job_recorded(self, engine: Engine, tmp_path: pathlib.Path) -> None:
+        """Test a failing job is rolled back, counted and its error kept with its last run."""
+        def fail(db_session: Session) -> None:
+            raise RuntimeError("broken")
+
+        job = ScheduledJob("test_failing", 100.0, fail)
+        failed = job_runs("test_failing", "failed")
+
+        scheduler(engine, tmp_path, [job], "first").run_job(job)
+
+        assert job_runs("test_failing", "failed") == failed + 1
+        with Session(engine) as db_session:
+            state = db_session.get(ScheduledJobDB, "test_failing")
+            assert (state.last_status, state.last_error) == ("failed", "RuntimeError: broken")
+
+    def test_run_loop(self, engine: Engine, tmp_path: pathlib.Path) -> None:
+        """Test local jobs run in every scheduler and disabled jobs are left out."""
+        runs: list[str] = []
+        jobs = [
+            ScheduledJob("test_local", 0.05, lambda db_session: runs.append("local"), exclusive=False),
+            ScheduledJob("test_disabled", 0, lambda db_session: runs.append("disabled")),
+        ]
+        job_scheduler = scheduler(engine, tmp_path, jobs, "first")
+
+        async def scenario() -> None:
+            task = asyncio.create_task(job_scheduler.run())
+            await asyncio.sleep(0.3)
+            job_scheduler.stop()
+            await task
+
+        asyncio.run(scenario())
+
+        assert len(runs) >= 2
+        assert set(runs) == {"local"}
+
+    def test_advisory_lock_key(self) -> None:
+        """Test job names map to stable, distinct signed 64-bit keys."""
+        assert advisory_lock_key("project_summaries") == advisory_lock_key("project_summaries")
+        assert advisory_lock_key("project_summaries") != advisory_lock_key("headhunter_stats")
+        assert -2 ** 63 <= advisory_lock_key("outbox_purge") < 2 ** 63
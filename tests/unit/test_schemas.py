@@ -8,7 +8,13 @@ from pydantic import ValidationError
 from cims.schemas.area import AreaCreate, AreaUpdate, AreaResponse
 from cims.schemas.customer import CustomerCreate, CustomerUpdate
 from cims.schemas.project import ProjectCreate
-from cims.schemas.utils import create_list_response, entity_to_response_model
+from cims.schemas.utils import (
+    create_list_response,
+    entity_to_response_model,
+    parse_fields_param,
+    parse_include_param,
+    sparse_columns,
+)
 from cims.core.entities.area import Area
 
 class TestSchemaValidation:
@@ -154,6 +160,37 @@ class TestSchemaUtils:
         assert response_model.created_at is not None
         assert response_model.updated_at is not None
 
+    def test_parse_fields_param(self) -> None:
+        """Test parsing a sparse fieldset keeps response model order and adds required fields."""
+        selected = parse_fields_param(" name , created_at", AreaResponse, always_include=("area_id",))
+        
+        assert selected == ["name", "area_id", "created_at"]
+        assert parse_fields_param(None, AreaResponse) is None
+        assert parse_fields_param("  ", AreaResponse) is None
+    
+    def test_parse_fields_param_unknown_field(self) -> None:
+        """Test parsing a sparse fieldset with an unknown field fails."""
+        with pytest.raises(ValueError):
+            parse_fields_param("name,unknown", AreaResponse)
+    
+    def test_sparse_columns(self) -> None:
+        """Test sparse columns include the IDs needed to resolve requested names."""
+        columns = sparse_columns(["name", "level_name"], {"level_name": "level_id", "area_name": "area_id"})
+        
+        assert columns == ["name", "level_name", "level_id"]
+    
+    def test_parse_include_param(self) -> None:
+        """Test nested include paths also include their parents."""
+        allowed = {"candidate", "project", "project.customer"}
+        
+        assert parse_include_param("candidate, project.customer", allowed) == {"candidate", "project", "project.customer"}
+        assert parse_include_param(None, allowed) == set()
+    
+    def test_parse_include_param_unsupported(self) -> None:
+        """Test unsupported include paths fail."""
+        with pytest.raises(ValueError):
+            parse_include_param("candidate.nominees", {"candidate"})
+
 class TestSchemaUpdate:
     """Test update schema functionality."""
     